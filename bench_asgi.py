@@ -0,0 +1,115 @@
+"""
+Load test of the Flask and ASGI HTTP servers under a mixed workload.
+
+Starts each server in its own process against a local mock completions
+endpoint, then runs concurrent clients for a fixed time. Most requests are
+fast lookups (latest posts, statistics, category listings), some are
+semantic searches, and a few evaluate posts, each taking the mock's round
+trip. Reports requests per second and p50/p99 latency per kind of request;
+the lookup latency shows how much slow evaluations hold up fast queries.
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+from src.scripts.mock_completions import MockCompletionsServer
+
+SERVERS = {
+    'flask': "from src.api_server import app; app.run(host='127.0.0.1', port={port}, threaded=True)",
+    'asgi': "import uvicorn; from src.asgi_server import app; "
+            "uvicorn.run(app, host='127.0.0.1', port={port}, log_level='warning')",
+}
+
+# Share of requests by kind, and the paths sent for each
+WORKLOAD = [
+    ('lookup', 0.8, ['/query?type=latest&limit=5', '/query?type=stats',
+                     '/query?type=category&category=Governance&limit=10', '/query?type=most-viewed&limit=5']),
+    ('search', 0.15, ['/query?type=search&q=validator rewards', '/query?type=search&q=priority fees',
+                      '/query?type=search&q=stake delegation inflation']),
+    ('evaluate', 0.05, ['/query?type=evaluate&post_id={post_id}']),
+]
+
+
+def start_server(name: str, port: int, environment: dict) -> subprocess.Popen:
+    """Start a server process and wait until it answers."""
+    process = subprocess.Popen([sys.executable, "-c", SERVERS[name].format(port=port)], env=environment,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"The {name} server did not start")
+
+
+async def client(base_url: str, post_ids: list, deadline: float, timings: dict, rng: random.Random):
+    """Send requests one after another until the deadline."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+        while time.monotonic() < deadline:
+            kind, _, paths = rng.choices(WORKLOAD, weights=[share for _, share, _ in WORKLOAD])[0]
+            path = rng.choice(paths).format(post_id=rng.choice(post_ids))
+            start = time.perf_counter()
+            response = await http.get(path)
+            elapsed = time.perf_counter() - start
+            timings[kind if response.status_code == 200 else 'error'].append(elapsed)
+
+
+async def load(base_url: str, post_ids: list, clients: int, seconds: float) -> dict:
+    """Run the clients concurrently and collect latencies by kind of request."""
+    timings = defaultdict(list)
+    deadline = time.monotonic() + seconds
+    await asyncio.gather(*(client(base_url, post_ids, deadline, timings, random.Random(i)) for i in range(clients)))
+    return timings
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(clients: int = 32, seconds: float = 10.0, latency: float = 1.5):
+    """Run the benchmark."""
+    from src.utils import load_json
+    data = load_json("solana_forum_posts")
+    post_ids = [post['id'] for posts in data.values() for post in posts]
+
+    print(f"\n{clients} clients for {seconds:.0f} s per server, evaluations take {latency * 1e3:.0f} ms, "
+          f"{os.cpu_count()} CPU(s)\n")
+    print(f"{'server':6} {'kind':9} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+
+    # The ASGI server runs evaluations on the evaluation job workers, so give
+    # it enough for the evaluations in progress at once; Flask starts a thread
+    # per request regardless
+    with MockCompletionsServer(latency=latency) as mock, tempfile.TemporaryDirectory() as cache:
+        environment = dict(os.environ, OPENAI_API_KEY="bench", OPENAI_BASE_URL=mock.base_url,
+                           EVALUATION_CACHE="0", EVALUATION_WORKERS="16", CACHE_DIRECTORY=cache,
+                           PYTHONPATH=os.getcwd())
+        for port, name in enumerate(SERVERS, start=5091):
+            process = start_server(name, port, environment)
+            try:
+                timings = asyncio.run(load(f"http://127.0.0.1:{port}", post_ids, clients, seconds))
+            finally:
+                process.terminate()
+                process.wait()
+
+            everything = [elapsed for values in timings.values() for elapsed in values]
+            for kind, values in [('all', everything)] + sorted(timings.items()):
+                print(f"{name:6} {kind:9} {len(values):8d} {len(values) / seconds:8.1f} "
+                      f"{statistics.median(values) * 1e3:8.1f} {percentile(values, 0.99) * 1e3:8.1f}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
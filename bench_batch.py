@@ -0,0 +1,55 @@
+"""
+Dashboard page load: a dozen /query requests against one POST /batch.
+
+Sends the same mix of lookups, statistics, semantic searches and natural
+language queries to the Flask app (through its test client, so the
+numbers leave out the network) as separate GET /query requests, one after
+another as a page issuing them in sequence would, then as one /batch
+request, and reports the time per page load of each.
+"""
+
+import time
+
+from src.api_server import app
+
+QUERIES = [
+    {'type': 'latest', 'limit': 10}, {'type': 'stats'}, {'type': 'most-viewed', 'limit': 5},
+    {'type': 'category', 'category': 'Governance', 'limit': 10}, {'type': 'top-authors', 'metric': 'posts'},
+    {'type': 'search', 'q': 'validator rewards'}, {'type': 'search', 'q': 'priority fees'},
+    {'type': 'search', 'q': 'stake delegation inflation'}, {'type': 'search', 'q': 'governance proposal vote'},
+    {'type': 'search', 'q': 'token extensions', 'dedup': True}, {'query': 'search for firedancer client'},
+    {'query': 'latest posts in Research'},
+]
+
+
+def main(rounds: int = 20):
+    """Run the benchmark."""
+    client = app.test_client()
+    print(f"\n{len(QUERIES)} queries per page load, {rounds} page loads\n")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            if 'query' in query:
+                client.post("/query", json=query)
+            else:
+                client.get("/query", query_string=query)
+    separate = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        client.post("/batch", json={'queries': QUERIES})
+    batched = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        client.post("/batch", json={'queries': QUERIES, 'stream': True}).get_data()
+    streamed = (time.perf_counter() - start) / rounds
+
+    print(f"{'separate requests':18} {separate * 1e3:8.1f} ms")
+    print(f"{'one batch':18} {batched * 1e3:8.1f} ms  ({separate / batched:.1f}x)")
+    print(f"{'one streamed batch':18} {streamed * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
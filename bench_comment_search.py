@@ -0,0 +1,73 @@
+"""
+Scaling benchmark for the comment passage index.
+
+Builds the passage index over the dataset's comment threads replicated
+1x, 4x and 16x, and reports index size, build time and query latency. For
+comparison it also reports the size of folding the same comments into a
+title/description-style TF-IDF with a vocabulary (the naive approach).
+"""
+
+import sys
+import time
+from typing import List
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.passage_index import PassageIndex
+from src.utils import load_json
+
+QUERIES = [
+    "inflation staking rewards",
+    "validator commission",
+    "priority fees and compute units",
+    "governance vote quorum",
+    "token extensions confidential transfers",
+]
+
+
+def matrix_bytes(matrix) -> int:
+    """Bytes held by a CSR matrix's arrays."""
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def measure(threads: List[str], rounds: int) -> None:
+    """Build the passage index over ``threads`` and print its cost."""
+    start = time.perf_counter()
+    index = PassageIndex(threads)
+    build = time.perf_counter() - start
+
+    offsets = index.post.nbytes + index.comment.nbytes + index.start.nbytes + index.end.nbytes
+    size = (matrix_bytes(index.matrix) + offsets) / 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            index.search(query, 5)
+    latency = (time.perf_counter() - start) / (rounds * len(QUERIES))
+
+    print(f"{len(threads):>6} threads {len(index):>8} passages {size:8.2f} MB "
+          f"build {build:6.2f} s  query {latency * 1e3:7.2f} ms")
+
+
+def naive_size(threads: List[str]) -> None:
+    """Print the size of a vocabulary TF-IDF over whole comment threads."""
+    vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+    matrix = vectorizer.fit_transform(threads)
+    vocabulary = sum(sys.getsizeof(term) for term in vectorizer.vocabulary_) + sys.getsizeof(vectorizer.vocabulary_)
+    print(f"{len(threads):>6} threads naive TF-IDF {matrix_bytes(matrix) / 1e6:8.2f} MB matrix "
+          f"+ {vocabulary / 1e6:.2f} MB vocabulary ({len(vectorizer.vocabulary_)} terms)")
+
+
+def main(rounds: int = 20):
+    """Run the benchmark."""
+    data = load_json("solana_forum_posts")
+    threads = [post.get('comments') or '' for posts in data.values() for post in posts]
+
+    for scale in (1, 4, 16):
+        measure(threads * scale, rounds)
+    print()
+    naive_size(threads)
+
+
+if __name__ == "__main__":
+    main()
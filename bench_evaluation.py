@@ -0,0 +1,50 @@
+"""
+Cost and latency of post evaluation modes against a local mock endpoint.
+
+Evaluates a sample of posts with one completion per perspective and with a
+single combined JSON completion (with and without an invalid entry that
+falls back to a separate request), and reports requests, tokens and latency
+per evaluation. The mock answers after a fixed round trip plus a delay per
+completion token, so longer combined replies take longer to generate.
+"""
+
+import statistics
+import time
+
+from src.evaluation import COMBINED, SEPARATE, PostEvaluator
+from src.scripts.mock_completions import MockCompletionsServer
+from src.utils import load_json
+
+SCENARIOS = [
+    ("separate", SEPARATE, ()),
+    ("combined", COMBINED, ()),
+    ("combined, 1 fallback", COMBINED, ("decentralization",)),
+]
+
+
+def main(posts: int = 10, latency: float = 0.3, token_latency: float = 0.01):
+    """Run the benchmark."""
+    data = load_json("solana_forum_posts")
+    sample = [post for category_posts in data.values() for post in category_posts][:posts]
+    contents = [f"Title: {post.get('title', '')}\n\nDescription: {post.get('description', '')}" for post in sample]
+    print(f"\n{len(contents)} posts, {latency * 1e3:.0f} ms round trip + {token_latency * 1e3:.0f} ms per completion token\n")
+    print(f"{'mode':22} {'requests':>8} {'prompt tok':>10} {'output tok':>10} {'mean ms':>8} {'max ms':>8}")
+
+    for name, mode, malformed in SCENARIOS:
+        with MockCompletionsServer(latency=latency, token_latency=token_latency, malformed=malformed) as mock:
+            evaluator = PostEvaluator("bench", base_url=mock.base_url, mode=mode)
+            timings = []
+            for content in contents:
+                start = time.perf_counter()
+                evaluator.evaluate(content)
+                timings.append(time.perf_counter() - start)
+            evaluator.close()
+
+        usage = evaluator.usage
+        print(f"{name:22} {usage['requests'] / len(contents):8.1f} "
+              f"{usage['prompt_tokens'] / len(contents):10.0f} {usage['completion_tokens'] / len(contents):10.0f} "
+              f"{statistics.mean(timings) * 1e3:8.0f} {max(timings) * 1e3:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Latency and accuracy benchmark for typo-tolerant query correction.
+
+Makes misspellings of vocabulary terms with one random edit (deletion,
+insertion, substitution or transposition), corrects them with the server's
+trigram matcher, and reports how often the original term comes back and
+the latency per word with a cold and a warm correction cache.
+"""
+
+import random
+import string
+import time
+
+import numpy as np
+
+from src.fuzzy import max_edits
+from src.mcp_server import SolanaForumMCPServer
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Apply one random edit to a word."""
+    i = rng.randrange(len(word) - 1)
+    edit = rng.choice(['delete', 'insert', 'substitute', 'transpose'])
+    if edit == 'delete':
+        return word[:i] + word[i + 1:]
+    if edit == 'insert':
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+    if edit == 'substitute':
+        return word[:i] + rng.choice(string.ascii_lowercase.replace(word[i], '')) + word[i + 1:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def main(samples: int = 2000, seed: int = 0):
+    """Run the benchmark."""
+    server = SolanaForumMCPServer()
+    matcher = server.fuzzy_matcher
+    rng = random.Random(seed)
+
+    terms = [term for term in matcher.terms if term.isalpha() and max_edits(term)]
+    pairs = []
+    while len(pairs) < samples:
+        term = rng.choice(terms)
+        typo = misspell(term, rng)
+        if typo not in matcher.vocabulary:
+            pairs.append((term, typo))
+    print(f"\nVocabulary: {len(matcher):,} terms, {len(matcher.postings):,} trigrams; {samples:,} misspellings\n")
+
+    for label in ('cold cache', 'warm cache'):
+        if label == 'cold cache':
+            matcher.correct_word.cache_clear()
+        timings, corrected = [], 0
+        for term, typo in pairs:
+            start = time.perf_counter()
+            _, corrections = matcher.correct(typo)
+            timings.append(time.perf_counter() - start)
+            corrected += corrections.get(typo) == term
+        timings = np.array(timings) * 1e6
+        print(f"{label:<12} p50 {np.percentile(timings, 50):7.1f} us   p99 {np.percentile(timings, 99):7.1f} us   "
+              f"restored {corrected / samples:.0%}")
+
+    start = time.perf_counter()
+    for _ in range(200):
+        server.semantic_search("validator rewards")
+    search = (time.perf_counter() - start) / 200 * 1e6
+    print(f"\nFor scale, one semantic search takes {search:,.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Memory report for the server's default and low-memory modes.
+
+Builds the server in each mode and reports the memory it retains (traced
+with tracemalloc), per post and per component. Component sizes are deep
+sizes and count strings shared between components once per component, so
+they add up to more than the traced total in the default mode.
+"""
+
+import gc
+import tracemalloc
+from typing import Any, Dict
+
+from src.mcp_server import SolanaForumMCPServer
+from src.utils import deep_size
+
+
+def components(server: SolanaForumMCPServer) -> Dict[str, int]:
+    """Deep sizes of the parts of the server that hold post data."""
+    return {
+        'data (nested JSON)': deep_size(server.data),
+        'posts': deep_size(server.posts),
+        'df': deep_size(server.df),
+        'text_data': deep_size(server.text_data),
+        'tfidf_matrix': deep_size(server.tfidf_matrix),
+        'vectorizer': deep_size(server.vectorizer.vocabulary_) + deep_size(getattr(server.vectorizer, 'stop_words_', None)),
+        'passage_index': deep_size(server.passage_index.matrix) + sum(
+            a.nbytes for a in (server.passage_index.post, server.passage_index.comment,
+                               server.passage_index.start, server.passage_index.end)
+        ),
+        'snippet_index': sum(
+            a.nbytes for a in (server.snippet_index.term, server.snippet_index.start, server.snippet_index.length)
+        ),
+    }
+
+
+def measure(low_memory: bool) -> Dict[str, Any]:
+    """Build a server in one mode and report what it retains."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    server = SolanaForumMCPServer(low_memory=low_memory)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    report = {
+        'posts': len(server.posts),
+        'retained': retained,
+        'components': components(server),
+        'features': server.tfidf_matrix.shape[1],
+        'dtype': server.tfidf_matrix.dtype,
+        'index_dtype': server.tfidf_matrix.indices.dtype,
+    }
+    del server
+    gc.collect()
+    return report
+
+
+def main():
+    """Run the report."""
+    reports = {'default': measure(False), 'low-memory': measure(True)}
+
+    print()
+    for mode, report in reports.items():
+        posts = report['posts']
+        print(f"{mode}: {report['retained'] / 1e6:.2f} MB retained, "
+              f"{report['retained'] / posts:,.0f} bytes/post "
+              f"(index: {report['features']} features, {report['dtype']} / {report['index_dtype']})")
+        for name, size in report['components'].items():
+            print(f"    {name:<20} {size / 1e3:>10,.1f} KB {size / posts:>10,.0f} bytes/post")
+        print()
+
+    before = reports['default']['retained']
+    after = reports['low-memory']['retained']
+    print(f"Low-memory mode retains {100 * (1 - after / before):.0f}% less")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Prompt size and latency of post evaluation under different token budgets.
+
+Packs the longest posts with their most relevant comment excerpts into each
+budget (0 sends the full title and description without comments, as before
+packing) and evaluates them against a local mock endpoint whose replies take
+a fixed round trip plus a delay per prompt and per completion token. Reports
+the packed tokens (by the packer's tokenizer), the prompt tokens billed per
+evaluation, the comment excerpts included, the time spent packing and the
+evaluation latency.
+"""
+
+import statistics
+import time
+
+from src.evaluation import COMBINED, PostEvaluator
+from src.mcp_server import SolanaForumMCPServer
+from src.prompt_packer import TOKENIZER, PromptPacker
+from src.scripts.mock_completions import MockCompletionsServer
+
+BUDGETS = [0, 2000, 1500, 1000, 500]
+
+
+def main(posts: int = 10, latency: float = 0.2, prompt_latency: float = 0.0005, token_latency: float = 0.005):
+    """Run the benchmark."""
+    server = SolanaForumMCPServer(openai_api_key="bench")
+    sample = sorted(server.posts, key=lambda post: -len(post.get('description') or ''))[:posts]
+    print(f"\n{len(sample)} longest posts, {TOKENIZER} tokenizer, {latency * 1e3:.0f} ms round trip "
+          f"+ {prompt_latency * 1e3:.1f} ms per prompt token + {token_latency * 1e3:.0f} ms per completion token\n")
+    print(f"{'budget':>6} {'packed tok':>10} {'max tok':>8} {'prompt tok':>10} {'excerpts':>8} "
+          f"{'pack ms':>8} {'mean ms':>8} {'max ms':>8}")
+
+    for budget in BUDGETS:
+        server.prompt_packer = PromptPacker(budget)
+        start = time.perf_counter()
+        packed = [server._pack_for_evaluation(post) for post in sample]
+        pack_time = (time.perf_counter() - start) / len(sample)
+
+        with MockCompletionsServer(latency=latency, prompt_latency=prompt_latency,
+                                   token_latency=token_latency) as mock:
+            evaluator = PostEvaluator("bench", base_url=mock.base_url, mode=COMBINED)
+            timings = []
+            for content in packed:
+                start = time.perf_counter()
+                evaluator.evaluate(content.text)
+                timings.append(time.perf_counter() - start)
+            evaluator.close()
+
+        totals = [content.total_tokens for content in packed]
+        print(f"{budget or 'none':>6} {statistics.mean(totals):10.0f} {max(totals):8d} "
+              f"{evaluator.usage['prompt_tokens'] / len(sample):10.0f} "
+              f"{statistics.mean(content.excerpts for content in packed):8.1f} {pack_time * 1e3:8.1f} "
+              f"{statistics.mean(timings) * 1e3:8.0f} {max(timings) * 1e3:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Memory of the preforked API server's workers, with and without gc.freeze.
+
+Starts the launcher (python -m src.prefork) with several workers, sends
+them a mixed load of lookups, searches and natural language queries so
+every worker allocates and collects garbage, then measures each process
+from /proc/<pid>/smaps_rollup. Reports each worker's unique memory (USS,
+what one more worker costs), the total PSS of the parent and workers (what
+they use together) and, for comparison, one independent server's RSS per
+worker. Linux only.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.prefork import worker_pids
+from src.utils import process_memory
+
+PATHS = ['/query?type=latest&limit=20', '/query?type=stats', '/query?type=search&q=validator rewards',
+         '/query?type=search&q=priority fees&dedup=1', '/query?q=most viewed posts in Governance',
+         '/query?type=comments&q=inflation', '/query?type=topics', '/query?type=duplicates']
+
+MB = 1024 * 1024
+
+
+def start(port: int, workers: int, server: str, freeze: bool) -> subprocess.Popen:
+    """Start the launcher and wait until every worker answers."""
+    command = [sys.executable, "-m", "src.prefork", "--server", server, "--workers", str(workers),
+               "--host", "127.0.0.1", "--port", str(port)]
+    if not freeze:
+        command.append("--no-freeze")
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/", timeout=1).ok and len(worker_pids(process.pid)) == workers:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("The launcher did not start")
+
+
+def main(workers: int = 4, requests_sent: int = 2000, server: str = 'flask'):
+    """Run the benchmark."""
+    if process_memory() is None:
+        print("Per-process memory needs Linux's /proc/<pid>/smaps_rollup")
+        return
+
+    print(f"\n{workers} {server} workers, {requests_sent} requests\n")
+    print(f"{'mode':10} {'parent RSS':>10} {'worker USS':>10} {'max USS':>8} {'total PSS':>9} {'independent':>11}")
+    for port, freeze in ((5093, True), (5094, False)):
+        process = start(port, workers, server, freeze)
+        try:
+            session = requests.Session()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda i: session.get(f"http://127.0.0.1:{port}{PATHS[i % len(PATHS)]}"),
+                                  range(requests_sent)))
+            parent = process_memory(process.pid)
+            children = [process_memory(pid) for pid in worker_pids(process.pid)]
+        finally:
+            process.terminate()
+            process.wait()
+
+        uss = [memory['uss'] for memory in children]
+        total_pss = parent['pss'] + sum(memory['pss'] for memory in children)
+        print(f"{'freeze' if freeze else 'no freeze':10} {parent['rss'] / MB:10.1f} {sum(uss) / len(uss) / MB:10.1f} "
+              f"{max(uss) / MB:8.1f} {total_pss / MB:9.1f} {parent['rss'] * workers / MB:11.1f}")
+    print("\nMB; independent is one server's RSS per worker, as if each worker built its own engines")
+
+
+if __name__ == "__main__":
+    main(server=sys.argv[1] if len(sys.argv) > 1 else 'flask')
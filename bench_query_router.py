@@ -0,0 +1,91 @@
+"""
+Throughput benchmark for the compiled query router.
+
+Parses a corpus of real query strings (the README and CLI examples) with the
+single-pass router, both cold and memoized, and compares it with the regex
+cascade that ``SolanaForumMCPServer.query`` used before the router existed.
+"""
+
+import re
+import time
+from typing import Callable, List
+
+from src.query_router import QueryRouter
+from src.utils import load_json
+
+QUERIES = [
+    "What are the latest posts?",
+    "Show me recent posts in the Governance category",
+    "What's new in the sRFC category?",
+    "What are the most viewed posts?",
+    "Show me popular posts in the Research category",
+    "What are the top posts on Solana?",
+    "Give me all posts on Governance",
+    "All posts in Research",
+    "Posts from Announcements",
+    "For this post id 123, give me its evaluation",
+    "Evaluate post 456",
+    "Which posts have the most comments?",
+    "Show me the most discussed topics",
+    "What are the most active discussions?",
+    "Show me forum statistics",
+    "What are the stats for the Solana forum?",
+    "Give me a summary of the forum data",
+    "Tell me about Solana validators",
+    "What are people saying about staking?",
+    "Find posts about performance improvements",
+    "How does Solana achieve high throughput?",
+    "What are the latest developments in Solana's governance?",
+    "Tell me about Solana's approach to smart contracts",
+    "Latest validator posts in Governance",
+    "Top 10 posts in sRFC about SIMD-0096 fees",
+]
+
+
+def legacy_route(query_text: str, categories: List[str]) -> str:
+    """The regex cascade the router replaced, kept as a baseline."""
+    query_text = query_text.lower().strip()
+    if re.search(r'(give me all posts on|all posts in|posts from) (\w+)', query_text):
+        return 'category_posts'
+    if re.search(r'(for this post id|evaluate post|post id) (\d+)', query_text):
+        return 'evaluate'
+    if re.search(r'latest|recent|new', query_text):
+        if re.search(r'category|discussion|forum', query_text):
+            next((c for c in categories if c.lower() in query_text), None)
+        return 'latest_posts'
+    if re.search(r'most viewed|popular|top', query_text):
+        if re.search(r'category|discussion|forum', query_text):
+            next((c for c in categories if c.lower() in query_text), None)
+        return 'most_viewed_posts'
+    if re.search(r'comments|discussed|active', query_text):
+        return 'most_commented_posts'
+    if re.search(r'statistics|stats|summary', query_text):
+        return 'forum_statistics'
+    return 'semantic_search'
+
+
+def measure(label: str, parse: Callable[[str], object], rounds: int) -> None:
+    """Time ``rounds`` passes over the query corpus and print throughput."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            parse(query)
+    elapsed = time.perf_counter() - start
+    total = rounds * len(QUERIES)
+    print(f"{label:<28} {total / elapsed:>12,.0f} queries/s  {elapsed / total * 1e6:8.2f} us/query")
+
+
+def main(rounds: int = 2000):
+    """Run the benchmark."""
+    categories = list(load_json("solana_forum_posts").keys())
+    router = QueryRouter(categories)
+
+    print(f"Corpus: {len(QUERIES)} queries x {rounds} rounds\n")
+    measure("legacy regex cascade", lambda q: legacy_route(q, categories), rounds)
+    measure("compiled router (cold)", router._parse, rounds)
+    measure("compiled router (memoized)", router.parse, rounds)
+    print(f"\nParse cache: {router.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Throughput benchmark for sharded multi-process search.
+
+Tiles the dataset's TF-IDF matrix into a large synthetic archive and
+compares in-process scoring with sharded search over 1, 2, 4, ... worker
+processes (up to the CPU count), hash-sharded so every worker gets work.
+Speedups need as many free cores as workers.
+"""
+
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.mcp_server import SolanaForumMCPServer
+from src.sharded_search import ShardedSearch, top_k
+
+QUERIES = [
+    "validator rewards and staking",
+    "priority fees and compute units",
+    "governance vote quorum",
+    "token extensions confidential transfers",
+    "indexer tooling for developers",
+]
+
+
+def measure(label: str, search, queries, rounds: int) -> None:
+    """Time ``rounds`` passes over the query vectors and print latency."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            search(query)
+    elapsed = time.perf_counter() - start
+    total = rounds * len(queries)
+    print(f"{label:<24} {total / elapsed:>8,.1f} queries/s  {elapsed / total * 1e3:8.2f} ms/query")
+
+
+def main(copies: int = 4000, rounds: int = 5, k: int = 10):
+    """Run the benchmark."""
+    server = SolanaForumMCPServer(search_workers=0)
+    matrix = sp.vstack([server.tfidf_matrix] * copies).tocsr()
+    positions = np.arange(matrix.shape[0])
+    queries = [server.vectorizer.transform([query]) for query in QUERIES]
+    print(f"\nArchive: {matrix.shape[0]:,} posts, {matrix.nnz:,} nonzeros; {os.cpu_count()} CPUs\n")
+
+    measure("in-process", lambda q: top_k((matrix @ q.T).toarray().ravel(), positions, k), queries, rounds)
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        sharded = ShardedSearch(matrix, workers=workers, strategy='hash')
+        measure(f"sharded, {workers} workers", lambda q: sharded.search(q, k), queries, rounds)
+        sharded.close()
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
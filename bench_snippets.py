@@ -0,0 +1,47 @@
+"""
+Cost of query-aware snippets for search results.
+
+Times semantic searches with the server's snippet step against building the
+snippets alone, per result, over a few queries.
+"""
+
+import time
+
+from src.mcp_server import SolanaForumMCPServer
+
+QUERIES = [
+    "validator rewards",
+    "priority fees burn",
+    "inflation schedule",
+    "governance vote quorum",
+    "token extensions confidential transfers",
+]
+
+
+def main(rounds: int = 50, limit: int = 5):
+    """Run the benchmark."""
+    server = SolanaForumMCPServer()
+    hits = {query: [server._position_by_id[post['id']] for post in server.semantic_search(query, limit)['posts']]
+            for query in QUERIES}
+    print(f"\nPositional index: {len(server.snippet_index):,} words\n")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in QUERIES:
+            server.semantic_search(query, limit)
+    search = (time.perf_counter() - start) / (rounds * len(QUERIES))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query, positions in hits.items():
+            for position in positions:
+                server.snippet_index.snippet(position, query)
+    snippets = (time.perf_counter() - start) / (rounds * len(QUERIES))
+
+    print(f"search with snippets   {search * 1e3:7.2f} ms/query")
+    print(f"snippets alone         {snippets * 1e3:7.2f} ms/query "
+          f"({snippets / limit * 1e6:.0f} us per result, {snippets / search:.0%} of the search)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-keystroke latency benchmark for title suggestions.
+
+Replays typing a handful of queries one character at a time against the
+prefix index, over the dataset and over a synthetic archive made by tiling
+its titles, and reports the median and tail latency per keystroke. Index
+lookups only; HTTP overhead is not included.
+"""
+
+import time
+
+import numpy as np
+
+from src.mcp_server import SolanaForumMCPServer
+from src.prefix_index import PrefixIndex
+
+QUERIES = [
+    "validator rewards",
+    "priority fee",
+    "governance vote",
+    "simd-0096",
+    "token extensions",
+    "rfp",
+]
+
+
+def keystrokes(queries):
+    """Every prefix typed on the way to each query."""
+    return [query[:length] for query in queries for length in range(1, len(query) + 1)]
+
+
+def measure(label: str, index: PrefixIndex, rounds: int = 20) -> None:
+    """Time every keystroke ``rounds`` times and print latency percentiles."""
+    prefixes = keystrokes(QUERIES)
+    timings = []
+    for _ in range(rounds):
+        for prefix in prefixes:
+            start = time.perf_counter()
+            index.suggest(prefix)
+            timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1e6
+    print(f"{label:<28} p50 {np.percentile(timings, 50):7.1f} us   "
+          f"p99 {np.percentile(timings, 99):7.1f} us   max {timings.max():8.1f} us")
+
+
+def main(copies: int = (1, 100, 1000)):
+    """Run the benchmark."""
+    server = SolanaForumMCPServer()
+    titles = [post.get('title') or '' for post in server.posts]
+    categories = server.df['category_name'].tolist()
+    views = server.df['views'].tolist()
+    print()
+
+    for factor in copies:
+        start = time.perf_counter()
+        index = PrefixIndex(titles * factor, categories * factor, views * factor)
+        built = time.perf_counter() - start
+        print(f"{len(titles) * factor:,} posts, {len(index):,} entries, "
+              f"{len(index.ranked):,} precomputed prefixes, built in {built:.2f}s")
+        measure(f"{len(titles) * factor:,} posts", index)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def data_directories(tmp_path_factory):
+    """Point the index, cache and snapshot directories at temporary ones, so tests never write into data/."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name in ('INDEX_DIRECTORY', 'CACHE_DIRECTORY', 'SNAPSHOT_DIRECTORY'):
+            monkeypatch.setenv(name, str(tmp_path_factory.mktemp(name.split('_')[0].lower())))
+        yield
@@ -13,10 +13,16 @@ setup(
         "flask-cors>=3.0.10",
         "python-dotenv>=0.19.0",
     ],
+    extras_require={
+        "tokens": ["tiktoken>=0.5"],
+        "asgi": ["starlette>=0.27", "uvicorn>=0.23"],
+    },
     entry_points={
         "console_scripts": [
             "solana-cli=src.cli:main",
             "solana-api=src.api_server:run_app",
+            "solana-api-async=src.asgi_server:run_app",
+            "solana-api-prefork=src.prefork:main",
             "solana-download=src.scripts.download_data:main",
         ],
     },
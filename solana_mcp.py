@@ -5,6 +5,7 @@ This server provides an interface to query the Solana forum data
 using different approaches based on the query type.
 """
 
+import asyncio
 import json
 import re
 import os
@@ -20,25 +21,49 @@ import httpx
 from mcp.server.fastmcp import FastMCP
 # Import utility functions
 from src.utils import load_json, get_data_directory
-from src.mcp_server import SolanaForumMCPServer
+from src.engine_registry import EngineRegistry
+from src.evaluation_jobs import EvaluationJobQueue
 
 # Initialize the MCP server
 mcp = FastMCP("solana")
 
-# Initialize the Solana Forum MCP server
+# Initialize the dataset engines; other datasets load on first use, and
+# every dataset shares one queue of background evaluation jobs
 # Get OpenAI API key from environment variable if available
 openai_api_key = os.environ.get("OPENAI_API_KEY")
-solana_server = SolanaForumMCPServer(openai_api_key=openai_api_key)
+evaluation_jobs = EvaluationJobQueue()
+registry = EngineRegistry(openai_api_key=openai_api_key, evaluation_jobs=evaluation_jobs)
+registry.preload()
+
+def format_posts(posts: List[Dict[str, Any]]) -> str:
+    """Format a list of posts as readable text for the AI assistant."""
+    formatted_posts = []
+    
+    for post in posts:
+        formatted_post = f"""
+Title: {post.get('title', 'Unknown')}
+Category: {post.get('category_name', 'Unknown')}
+Author: {post.get('original_poster', 'Unknown')}
+Date: {post.get('created_at', 'Unknown')}
+Views: {post.get('views', 0)}
+Comments: {post.get('comment_count', 0)}
+URL: {post.get('url', 'Unknown')}
+"""
+        formatted_posts.append(formatted_post)
+    
+    return "\n---\n".join(formatted_posts)
 
 @mcp.tool()
-async def get_latest_posts(category: Optional[str] = None, limit: int = 5) -> str:
+async def get_latest_posts(category: Optional[str] = None, limit: int = 5, dedup: bool = False, dataset: Optional[str] = None) -> str:
     """Get the latest posts from the Solana forum.
     
     Args:
         category: Optional category to filter posts by
         limit: Maximum number of posts to return (default: 5)
+        dedup: Collapse near-duplicate (cross-posted) posts into one result
+        dataset: Optional dataset to query (default dataset when omitted)
     """
-    result = solana_server.get_latest_posts(category=category, limit=limit)
+    result = registry.get(dataset).get_latest_posts(category=category, limit=limit, dedup=dedup)
     
     if not result or "posts" not in result or not result["posts"]:
         return "No posts found."
@@ -61,14 +86,16 @@ URL: {post.get('url', 'Unknown')}
     return "\n---\n".join(formatted_posts)
 
 @mcp.tool()
-async def get_most_viewed_posts(category: Optional[str] = None, limit: int = 5) -> str:
+async def get_most_viewed_posts(category: Optional[str] = None, limit: int = 5, dedup: bool = False, dataset: Optional[str] = None) -> str:
     """Get the most viewed posts from the Solana forum.
     
     Args:
         category: Optional category to filter posts by
         limit: Maximum number of posts to return (default: 5)
+        dedup: Collapse near-duplicate (cross-posted) posts into one result
+        dataset: Optional dataset to query (default dataset when omitted)
     """
-    result = solana_server.get_most_viewed_posts(category=category, limit=limit)
+    result = registry.get(dataset).get_most_viewed_posts(category=category, limit=limit, dedup=dedup)
     
     if not result or "posts" not in result or not result["posts"]:
         return "No posts found."
@@ -91,13 +118,14 @@ URL: {post.get('url', 'Unknown')}
     return "\n---\n".join(formatted_posts)
 
 @mcp.tool()
-async def get_most_commented_posts(limit: int = 5) -> str:
+async def get_most_commented_posts(limit: int = 5, dataset: Optional[str] = None) -> str:
     """Get the most commented posts from the Solana forum.
     
     Args:
         limit: Maximum number of posts to return (default: 5)
+        dataset: Optional dataset to query (default dataset when omitted)
     """
-    result = solana_server.get_most_commented_posts(limit=limit)
+    result = registry.get(dataset).get_most_commented_posts(limit=limit)
     
     if not result or "posts" not in result or not result["posts"]:
         return "No posts found."
@@ -120,9 +148,51 @@ URL: {post.get('url', 'Unknown')}
     return "\n---\n".join(formatted_posts)
 
 @mcp.tool()
-async def get_forum_statistics() -> str:
-    """Get general statistics about the Solana forum."""
-    result = solana_server.get_forum_statistics()
+async def get_posts_between(start: str, end: Optional[str] = None, category: Optional[str] = None, limit: int = 20, dataset: Optional[str] = None) -> str:
+    """Get posts created within a date window, newest first.
+    
+    Args:
+        start: Start of the window as an ISO date or datetime (e.g. 2024-01-01)
+        end: Optional end of the window; dates include the whole day (default: open)
+        category: Optional category to filter posts by
+        limit: Maximum number of posts to return (default: 20)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).posts_between(start=start, end=end, category=category, limit=limit)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    if not result["posts"]:
+        return "No posts found in that window."
+    
+    return format_posts(result["posts"])
+
+@mcp.tool()
+async def get_posts_since(days: float, category: Optional[str] = None, limit: int = 20, dataset: Optional[str] = None) -> str:
+    """Get posts created in the last N days, newest first.
+    
+    Args:
+        days: Number of days to look back
+        category: Optional category to filter posts by
+        limit: Maximum number of posts to return (default: 20)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).posts_since(days=days, category=category, limit=limit)
+    
+    if not result["posts"]:
+        return f"No posts found in the last {days:g} days."
+    
+    return format_posts(result["posts"])
+
+@mcp.tool()
+async def get_forum_statistics(dataset: Optional[str] = None) -> str:
+    """Get general statistics about the Solana forum.
+    
+    Args:
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).get_forum_statistics()
     
     if not result:
         return "Unable to fetch forum statistics."
@@ -145,28 +215,140 @@ Average Comments per Post: {result.get('avg_comments_per_post', 'Unknown')}
     return stats
 
 @mcp.tool()
-async def semantic_search(query_text: str, limit: int = 5) -> str:
+async def get_forum_analytics(period: str = "week", category: Optional[str] = None, metric: Optional[str] = None, dataset: Optional[str] = None) -> str:
+    """Get time-bucketed analytics: posts, views and comments per period, author activity and reply latency.
+    
+    Args:
+        period: Bucket size, "week" or "month" (default: week)
+        category: Optional category to restrict the analytics to
+        metric: Optional single section: "activity", "authors" or "reply_latency"
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).get_forum_analytics(period=period, category=category, metric=metric)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    return json.dumps(result, indent=2)
+
+@mcp.tool()
+async def get_posts_by_author(author: str, limit: int = 20, dataset: Optional[str] = None) -> str:
+    """Get the posts a user started and the posts they commented on.
+    
+    Args:
+        author: The username (case-insensitive)
+        limit: Maximum number of posts to return in each list (default: 20)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).get_posts_by_author(author=author, limit=limit)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    output = f"Posts by {result['author']}:\n"
+    output += format_posts(result["posts"]) if result["posts"] else "\nNo posts started.\n"
+    
+    if result.get("commented_posts"):
+        output += f"\n\nThreads {result['author']} commented on:\n"
+        for post in result["commented_posts"]:
+            output += f"- {post.get('title')} ({post['author_comment_count']} comments) {post.get('url')}\n"
+    
+    return output
+
+@mcp.tool()
+async def get_author_summary(author: str, dataset: Optional[str] = None) -> str:
+    """Summarize a user's posting and commenting activity.
+    
+    Args:
+        author: The username (case-insensitive)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).get_author_summary(author=author)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    return json.dumps(result, indent=2)
+
+@mcp.tool()
+async def get_top_authors(metric: str = "posts", category: Optional[str] = None, period: Optional[str] = None, limit: int = 10, dataset: Optional[str] = None) -> str:
+    """Rank users by activity.
+    
+    Args:
+        metric: "posts" (topics started), "comments" (replies written) or "views" (views of their topics)
+        category: Optional category to restrict the ranking to
+        period: Optional period: day, week, month, quarter, year or a number of days (default: all time)
+        limit: Maximum number of users to return (default: 10)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).top_authors(metric=metric, category=category, period=period, limit=limit)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    if not result["authors"]:
+        return "No activity found."
+    
+    return "\n".join(
+        f"{i + 1}. {entry['author']}: {entry[metric]} {metric}"
+        for i, entry in enumerate(result["authors"])
+    )
+
+@mcp.tool()
+async def get_topics(category: Optional[str] = None, period: Optional[str] = None, limit: int = 10, dataset: Optional[str] = None) -> str:
+    """Get the main themes among posts, with keywords and top posts for each.
+    
+    Args:
+        category: Optional category to restrict to
+        period: Optional period: day, week, month, quarter, year or a number of days (default: all time)
+        limit: Maximum number of topics to return (default: 10)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).get_topics(category=category, period=period, limit=limit)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    if not result["topics"]:
+        return "No posts found for this category and period."
+    
+    formatted_topics = []
+    for i, topic in enumerate(result["topics"]):
+        lines = [f"{i + 1}. {', '.join(topic['keywords'])} ({topic['post_count']} posts, {topic['share']:.0%})"]
+        for post in topic["top_posts"]:
+            lines.append(f"   - {post['title']} ({post['url']})")
+        formatted_topics.append("\n".join(lines))
+    
+    return "\n\n".join(formatted_topics)
+
+@mcp.tool()
+async def semantic_search(query_text: str, limit: int = 5, dedup: bool = False, fuzzy: bool = True, dataset: Optional[str] = None) -> str:
     """Search for posts semantically related to the query.
     
     Args:
         query_text: The search query text
         limit: Maximum number of posts to return (default: 5)
+        dedup: Collapse near-duplicate (cross-posted) posts into one result
+        fuzzy: Correct misspelt words before searching (default: true)
+        dataset: Optional dataset to query (default dataset when omitted)
     """
-    result = solana_server.semantic_search(query_text=query_text, limit=limit)
+    result = registry.get(dataset).semantic_search(query_text=query_text, limit=limit, dedup=dedup, fuzzy=fuzzy)
     
     if not result or "posts" not in result or not result["posts"]:
         return "No matching posts found."
     
     posts = result["posts"]
     formatted_posts = []
+    if result.get("corrected_query"):
+        formatted_posts.append(f"Searched for: {result['corrected_query']}")
     
     for post in posts:
         formatted_post = f"""
 Title: {post.get('title', 'Unknown')}
-Category: {post.get('category', 'Unknown')}
-Author: {post.get('author', 'Unknown')}
-Date: {post.get('date', 'Unknown')}
-Relevance Score: {post.get('score', 0):.2f}
+Category: {post.get('category_name', 'Unknown')}
+Author: {post.get('original_poster', 'Unknown')}
+Date: {post.get('created_at', 'Unknown')}
+Relevance Score: {post.get('similarity_score', 0):.2f}
 Snippet: {post.get('snippet', 'No snippet available')}
 URL: {post.get('url', 'Unknown')}
 """
@@ -175,14 +357,149 @@ URL: {post.get('url', 'Unknown')}
     return "\n---\n".join(formatted_posts)
 
 @mcp.tool()
-async def get_posts_by_category(category: str, limit: int = 20) -> str:
+async def search_comments(query_text: str, category: Optional[str] = None, limit: int = 5, dataset: Optional[str] = None) -> str:
+    """Search comment threads for the passages that best match the query.
+    
+    Args:
+        query_text: The search query text
+        category: Optional category to restrict the search to
+        limit: Maximum number of passages to return (default: 5)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).search_comments(query_text=query_text, limit=limit, category=category)
+    
+    if not result["passages"]:
+        return "No matching comments found."
+    
+    formatted_passages = []
+    for passage in result["passages"]:
+        formatted_passages.append(f"""
+Topic: {passage['title']}
+Category: {passage['category_name']}
+Commenter: {passage['author']}
+Relevance Score: {passage['similarity_score']:.2f}
+Passage: {passage['text']}
+URL: {passage['url']}
+""")
+    
+    return "\n---\n".join(formatted_passages)
+
+@mcp.tool()
+async def get_related_posts(post_id: int, limit: int = 5, dataset: Optional[str] = None) -> str:
+    """Get the posts most similar to a post, answered from a precomputed neighbour graph.
+    
+    Args:
+        post_id: The ID of the post to find related posts for
+        limit: Maximum number of posts to return (default: 5)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).get_related_posts(post_id=post_id, k=limit)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    if not result["posts"]:
+        return f"No posts related to '{result['post_title']}' found."
+    
+    return format_posts(result["posts"])
+
+@mcp.tool()
+async def get_top_scored_posts(category: Optional[str] = None, limit: int = 10, dataset: Optional[str] = None) -> str:
+    """Get the highest-scoring posts from stored evaluations, e.g. the best proposals in Governance or sRFC.
+    Scores come from earlier evaluations and bulk evaluation jobs, so no posts are evaluated.
+    
+    Args:
+        category: Optional category to filter by
+        limit: Maximum number of posts to return (default: 10)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).get_top_scored_posts(category, limit)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    if not result["posts"]:
+        return "No posts have been evaluated yet. Run: python -m src.cli evaluate-bulk --category <name>"
+    
+    lines = []
+    for post in result["posts"]:
+        stale = " (edited since it was scored)" if post["stale"] else ""
+        scores = ", ".join(f"{perspective}: {score:.2f}" for perspective, score in post["scores"].items())
+        lines.append(f"{post['title']} [{post['category_name']}] - overall {post['overall_score']:.2f}{stale}\n"
+                     f"URL: {post['url']}\n{scores}")
+    return "\n---\n".join(lines)
+
+@mcp.tool()
+async def get_changes(since_version: str, until_version: Optional[str] = None, limit: int = 20,
+                      dataset: Optional[str] = None) -> str:
+    """Show what changed in the forum between two dataset snapshot versions:
+    new, removed and edited topics, and the largest view and comment count changes.
+    
+    Args:
+        since_version: The older snapshot version
+        until_version: The newer snapshot version (default: latest)
+        limit: Maximum number of entries per kind of change (default: 20)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).diff(since_version, until_version, limit)
+    
+    if "error" in result:
+        versions = ", ".join(result.get("available_versions", [])) or "none"
+        return f"Error: {result['error']}. Available versions: {versions}"
+    
+    lines = [f"Changes from {result['since']} to {result['until']}:"]
+    for kind, label in (("new_topics", "New topics"), ("removed_topics", "Removed topics"),
+                        ("edited_topics", "Edited topics")):
+        if result[kind]:
+            lines.append(f"\n{label} ({result['totals'][kind]}):")
+            lines.extend(f"- [{post['category_name']}] {post['title']} (ID: {post['id']})" for post in result[kind])
+    for kind, label in (("view_changes", "Views"), ("comment_changes", "Comments")):
+        if result[kind]:
+            lines.append(f"\n{label} ({result['totals'][kind]} topics changed):")
+            lines.extend(f"- {change['title']}: {change['before']} -> {change['after']} ({change['delta']:+d})"
+                         for change in result[kind])
+    if not result["count"]:
+        lines.append("No changes.")
+    return "\n".join(lines)
+
+@mcp.tool()
+async def find_duplicates(category: Optional[str] = None, threshold: Optional[float] = None, limit: int = 20, dataset: Optional[str] = None) -> str:
+    """Find clusters of near-duplicate posts, such as proposals cross-posted to several categories.
+    
+    Args:
+        category: Optional category; only clusters with a post in it are returned
+        threshold: Optional minimum similarity between 0.5 and 1.0 (default: 0.8)
+        limit: Maximum number of clusters to return (default: 20)
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).find_duplicates(category=category, threshold=threshold, limit=limit)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    if not result["clusters"]:
+        return "No near-duplicate posts found."
+    
+    formatted_clusters = []
+    for cluster in result["clusters"]:
+        lines = [f"Similarity: {cluster['similarity']:.2f}"]
+        for post in cluster["posts"]:
+            lines.append(f"- [{post['category_name']}] {post['title']} ({post['url']})")
+        formatted_clusters.append("\n".join(lines))
+    
+    return "\n\n".join(formatted_clusters)
+
+@mcp.tool()
+async def get_posts_by_category(category: str, limit: int = 20, dedup: bool = False, dataset: Optional[str] = None) -> str:
     """Get posts from a specific category.
     
     Args:
         category: The category name to filter by
         limit: Maximum number of posts to return (default: 20)
+        dedup: Collapse near-duplicate (cross-posted) posts into one result
+        dataset: Optional dataset to query (default dataset when omitted)
     """
-    result = solana_server.get_posts_by_category(category=category, limit=limit)
+    result = registry.get(dataset).get_posts_by_category(category=category, limit=limit, dedup=dedup)
     
     if not result or "posts" not in result or not result["posts"]:
         return f"No posts found in category '{category}'."
@@ -204,15 +521,17 @@ URL: {post.get('url', 'Unknown')}
     return f"Posts in category '{category}':\n\n" + "\n---\n".join(formatted_posts)
 
 @mcp.tool()
-async def evaluate_post(post_id: int) -> str:
+async def evaluate_post(post_id: int, dataset: Optional[str] = None) -> str:
     """Evaluate a specific post for sentiment, quality, and relevance.
     
     Args:
         post_id: The ID of the post to evaluate
+        dataset: Optional dataset to query (default dataset when omitted)
     """
     try:
-        # Try to get the post from the server
-        result = solana_server.evaluate_post(post_id=post_id)
+        # Try to get the post from the server; evaluating off the event loop
+        # lets concurrent requests for the same post share one evaluation
+        result = await asyncio.to_thread(registry.get(dataset).evaluate_post, post_id=post_id)
         
         # If the post doesn't exist in the database, create a synthetic post and evaluation
         if not result or "post" not in result:
@@ -308,16 +627,85 @@ Recommendations:
         # Handle any errors gracefully
         return f"Error evaluating post with ID {post_id}: {str(e)}"
 
+def format_evaluation_job(job: Dict[str, Any]) -> str:
+    """Format an evaluation job's status, or its scores once it is done."""
+    title = job.get('post_title') or f"post {job.get('post_id')}"
+    if job['status'] == 'queued':
+        return (f"Evaluation job {job['job_id']} for '{title}' is queued (position {job['queue_position']}). "
+                f"Check again with get_evaluation_job.")
+    if job['status'] == 'running':
+        return (f"Evaluation job {job['job_id']} for '{title}' is running ({job['elapsed']:.0f} s so far). "
+                f"Check again with get_evaluation_job.")
+    if job['status'] == 'failed':
+        return f"Evaluation job {job['job_id']} for '{title}' failed: {job['error']}"
+    
+    result = job['result']
+    cached = " (cached)" if result.get('cached') else ""
+    lines = [f"Post: {result.get('post_title')}",
+             f"URL: {result.get('post_url')}",
+             f"Category: {result.get('category')}",
+             f"Overall Score: {result['overall_score']:.2f}/1.00{cached}", ""]
+    for perspective, evaluation in result['evaluations'].items():
+        lines.append(f"{perspective.title()} - {evaluation['score']:.2f}: {evaluation['explanation']}")
+    return "\n".join(lines)
+
+@mcp.tool()
+async def submit_evaluation(post_id: int, refresh: bool = False, dataset: Optional[str] = None) -> str:
+    """Start evaluating a post in the background and return a job ID at once.
+    Use get_evaluation_job to fetch the result; this avoids waiting on the model.
+    
+    Args:
+        post_id: The ID of the post to evaluate
+        refresh: Ignore cached evaluations and evaluate the post afresh
+        dataset: Optional dataset to query (default dataset when omitted)
+    """
+    result = registry.get(dataset).submit_evaluation(post_id, refresh)
+    
+    if "error" in result:
+        return f"Error: {result['error']}"
+    
+    return format_evaluation_job(result)
+
+@mcp.tool()
+async def get_evaluation_job(job_id: str, wait_seconds: float = 20) -> str:
+    """Get the status of a background evaluation job, or its scores once it is done.
+    
+    Args:
+        job_id: The job ID returned by submit_evaluation
+        wait_seconds: Seconds to wait for the job to finish before answering (default: 20, at most 60)
+    """
+    job = await asyncio.to_thread(evaluation_jobs.get, job_id, min(max(wait_seconds, 0), 60))
+    
+    if job is None:
+        return f"Error: Evaluation job {job_id} not found (finished jobs are kept for an hour)"
+    
+    return format_evaluation_job(job)
+
+@mcp.tool()
+async def list_datasets() -> str:
+    """List the datasets that can be queried with the dataset argument of the other tools."""
+    result = registry.describe()
+    lines = []
+    for name in result["available"]:
+        notes = []
+        if name == result["default"]:
+            notes.append("default")
+        if name in result["loaded"]:
+            notes.append(f"loaded, {result['loaded'][name]} MB")
+        lines.append(f"- {name}" + (f" ({', '.join(notes)})" if notes else ""))
+    return "Available datasets:\n" + "\n".join(lines)
+
 @mcp.tool()
-async def universal_query(query_text: str) -> str:
+async def universal_query(query_text: str, dataset: Optional[str] = None) -> str:
     """Process any type of query about Solana forum data.
     
     This tool analyzes the query and routes it to the appropriate specialized function.
     
     Args:
         query_text: The query text to process
+        dataset: Optional dataset to query (default dataset when omitted)
     """
-    result = solana_server.query(query_text=query_text)
+    result = registry.get(dataset).query(query_text=query_text)
     
     if not result or "response" not in result:
         return "Unable to process your query."
@@ -325,11 +713,12 @@ async def universal_query(query_text: str) -> str:
     return result["response"]
 
 @mcp.tool()
-async def query_post_evaluation(query_text: str) -> str:
+async def query_post_evaluation(query_text: str, dataset: Optional[str] = None) -> str:
     """Process natural language queries about post evaluations.
     
     Args:
         query_text: The query text about post evaluation
+        dataset: Optional dataset to query (default dataset when omitted)
     """
     try:
         # Extract post ID from the query using regex
@@ -346,7 +735,7 @@ async def query_post_evaluation(query_text: str) -> str:
         
         if post_id:
             # Call the evaluate_post function with the extracted post ID
-            return await evaluate_post(post_id)
+            return await evaluate_post(post_id, dataset)
         else:
             return "I couldn't identify a post ID in your query. Please specify a post ID, for example: 'Evaluate post 3294' or 'Give me evaluation for post ID 1456'."
     
@@ -0,0 +1,223 @@
+"""
+Time-bucketed forum analytics for the Solana Forum MCP server.
+
+All tables are computed with vectorized pandas groupbys over the post
+DataFrame once, when the server loads. Queries only slice and serialize the
+precomputed frames, and serialized results are memoized, so dashboards that
+poll every minute never rescan the corpus.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.time_index import MISSING_TIMESTAMP, parse_timestamps
+
+# Supported bucket sizes and the pandas period frequency behind each
+PERIODS = {'week': 'W-SUN', 'month': 'M'}
+
+# Reply-latency histogram buckets as (label, upper bound in hours)
+LATENCY_BUCKETS = [
+    ('< 1 hour', 1),
+    ('1-6 hours', 6),
+    ('6-24 hours', 24),
+    ('1-3 days', 72),
+    ('3-7 days', 168),
+    ('1-4 weeks', 672),
+    ('> 4 weeks', np.inf),
+]
+
+LATENCY_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Sections a caller can ask for individually
+METRICS = ('activity', 'authors', 'reply_latency')
+
+# Serialized results memoized by each instance
+RESULT_CACHE_SIZE = 256
+
+
+class ForumAnalytics:
+    """
+    Precomputed per-period activity, author activity and reply latencies.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Precompute every analytics table from the post DataFrame.
+
+        Args:
+            df: Post DataFrame with ``created_ts``, ``category_name``,
+                ``original_poster``, ``views`` and ``comment_count`` columns
+        """
+        frame = pd.DataFrame({
+            'category': df['category_name'],
+            'author': df['original_poster'] if 'original_poster' in df else None,
+            'views': self._numeric(df, 'views'),
+            'comments': self._numeric(df, 'comment_count'),
+            'created_ts': df['created_ts'],
+        })
+        frame = frame[frame['created_ts'] != MISSING_TIMESTAMP]
+        created = pd.to_datetime(frame['created_ts'], unit='s')
+
+        self.activity: Dict[str, pd.DataFrame] = {}
+        self.author_activity: Dict[str, pd.DataFrame] = {}
+        self.author_category_activity: Dict[str, pd.DataFrame] = {}
+        for period, freq in PERIODS.items():
+            frame = frame.assign(period=created.dt.to_period(freq).dt.start_time.dt.strftime('%Y-%m-%d'))
+            authored = frame.dropna(subset=['author'])
+            self.activity[period] = self._aggregate(frame, ['period', 'category'])
+            self.author_activity[period] = self._aggregate(authored, ['period', 'author'])
+            self.author_category_activity[period] = self._aggregate(authored, ['period', 'category', 'author'])
+
+        self.latency_hours, self.latency_basis = self._reply_latency_hours(df)
+        self.latency_categories = df['category_name'].to_numpy()
+
+        self.totals = {
+            'total_posts': int(len(df)),
+            'total_views': int(self._numeric(df, 'views').sum()),
+            'total_comments': int(self._numeric(df, 'comment_count').sum()),
+            'posts_per_category': {
+                category: int(count) for category, count in df['category_name'].value_counts(sort=False).items()
+            },
+        }
+
+        # Memoized per instance, so an evicted engine's tables can be freed
+        self._results: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._results_lock = threading.Lock()
+
+    @staticmethod
+    def _numeric(df: pd.DataFrame, column: str) -> pd.Series:
+        """Get a column as int64, treating missing or invalid values as 0."""
+        if column not in df:
+            return pd.Series(0, index=df.index, dtype='int64')
+        return pd.to_numeric(df[column], errors='coerce').fillna(0).astype('int64')
+
+    @staticmethod
+    def _aggregate(frame: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        """Sum posts, views and comments per group."""
+        return (
+            frame.groupby(keys, sort=True)
+            .agg(posts=('views', 'size'), views=('views', 'sum'), comments=('comments', 'sum'))
+            .reset_index()
+        )
+
+    @staticmethod
+    def _reply_latency_hours(df: pd.DataFrame):
+        """
+        Compute hours from posting to reply for every post with replies.
+
+        Uses ``first_reply_at`` when the dataset records it, otherwise falls
+        back to ``last_posted_at`` (time to the latest reply).
+
+        Returns:
+            Tuple of (float array with NaN for posts without replies, basis name)
+        """
+        column, basis = 'first_reply_at', 'first_reply'
+        if column not in df or df[column].replace('', np.nan).isna().all():
+            column, basis = 'last_posted_at', 'last_reply'
+        if column not in df:
+            return np.full(len(df), np.nan), basis
+
+        replied_ts = parse_timestamps(df[column].to_numpy()).astype('float64')
+        created_ts = df['created_ts'].to_numpy().astype('float64')
+        has_reply = (
+            (ForumAnalytics._numeric(df, 'comment_count').to_numpy() > 0)
+            & (replied_ts != MISSING_TIMESTAMP)
+            & (created_ts != MISSING_TIMESTAMP)
+        )
+
+        hours = np.where(has_reply, (replied_ts - created_ts) / 3600.0, np.nan)
+        return np.where(hours >= 0, hours, np.nan), basis
+
+    def _latency_distribution(self, category: Optional[str]) -> Dict[str, Any]:
+        """Summarize the reply-latency distribution, optionally per category."""
+        hours = self.latency_hours
+        if category:
+            hours = hours[self.latency_categories == category]
+        hours = hours[~np.isnan(hours)]
+
+        bounds = [upper for _, upper in LATENCY_BUCKETS]
+        counts = np.histogram(hours, bins=[0.0] + bounds)[0] if len(hours) else np.zeros(len(bounds), dtype=int)
+
+        return {
+            'basis': self.latency_basis,
+            'posts_with_replies': int(len(hours)),
+            'mean_hours': round(float(hours.mean()), 2) if len(hours) else None,
+            'percentiles_hours': {
+                f"p{p}": round(float(value), 2)
+                for p, value in zip(LATENCY_PERCENTILES, np.percentile(hours, LATENCY_PERCENTILES))
+            } if len(hours) else {},
+            'histogram': [
+                {'bucket': label, 'count': int(count)}
+                for (label, _), count in zip(LATENCY_BUCKETS, counts)
+            ]
+        }
+
+    def get(self, period: str = 'week', category: Optional[str] = None,
+            metric: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get analytics for a bucket size, optionally for one category.
+
+        The last RESULT_CACHE_SIZE results are memoized; callers must treat
+        them as read-only.
+
+        Args:
+            period: Bucket size, 'week' or 'month'
+            category: Optional category to restrict to
+            metric: Optional section to return ('activity', 'authors' or
+                    'reply_latency'); all sections when omitted
+
+        Returns:
+            Dictionary with the requested analytics sections
+
+        Raises:
+            ValueError: If the period or metric is not supported
+        """
+        key = (period, category, metric)
+        with self._results_lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+
+        result = self._serialize(period, category, metric)
+        with self._results_lock:
+            self._results[key] = result
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return result
+
+    def _serialize(self, period: str, category: Optional[str], metric: Optional[str]) -> Dict[str, Any]:
+        """Slice and serialize the precomputed tables for get."""
+        if period not in PERIODS:
+            raise ValueError(f"Unsupported period '{period}'. Use one of: {', '.join(PERIODS)}")
+        if metric is not None and metric not in METRICS:
+            raise ValueError(f"Unsupported metric '{metric}'. Use one of: {', '.join(METRICS)}")
+
+        result: Dict[str, Any] = {
+            'query_type': 'forum_analytics',
+            'period': period,
+            'category': category,
+        }
+
+        if metric in (None, 'activity'):
+            activity = self.activity[period]
+            if category:
+                activity = activity[activity['category'] == category]
+            result['activity'] = activity.to_dict('records')
+
+        if metric in (None, 'authors'):
+            if category:
+                authors = self.author_category_activity[period]
+                authors = authors[authors['category'] == category].drop(columns='category')
+            else:
+                authors = self.author_activity[period]
+            result['author_activity'] = authors.to_dict('records')
+
+        if metric in (None, 'reply_latency'):
+            result['reply_latency'] = self._latency_distribution(category)
+
+        return result
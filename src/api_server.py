@@ -8,23 +8,41 @@ import json
 import sys
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 # Now import from src
-from src.mcp_server import SolanaForumMCPServer
+from src.engine_registry import EngineRegistry
+from src.evaluation_jobs import EvaluationJobQueue
+from src.http_api import API_DOCS, InvalidQuery, batch_queries, query_call, run_batch
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize the MCP server
+# Initialize the dataset engines, which share one queue of background
+# evaluation jobs
 # Get OpenAI API key from environment variable
 openai_api_key = os.environ.get("OPENAI_API_KEY")
-mcp_server = SolanaForumMCPServer(openai_api_key=openai_api_key)
+evaluation_jobs = EvaluationJobQueue()
+registry = EngineRegistry(openai_api_key=openai_api_key, evaluation_jobs=evaluation_jobs)
+registry.preload()
+
+# Longest a GET /jobs/<id> request may wait for a change, and stream, in seconds
+MAX_JOB_WAIT = 60
+MAX_JOB_STREAM = 600
+
+# Threads answering the queries of POST /batch requests
+batch_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("BATCH_THREADS") or 8),
+                                    thread_name_prefix='batch')
+
+def dataset_error(error: ValueError):
+    """Build the response for a request naming an unknown dataset."""
+    return jsonify({'error': str(error), 'available_datasets': registry.available()}), 404
 
 @app.route('/query', methods=['GET', 'POST'])
 def query():
@@ -40,10 +58,25 @@ def query():
     
     For GET requests, use query parameters:
     - q: The query text
-    - type: Optional query type (latest, most-viewed, most-commented, stats, search, category, evaluate)
+    - type: Optional query type (latest, most-viewed, most-commented, stats, analytics, search, category, evaluate,
+            between, since, author, author-summary, top-authors, duplicates, related, comments, topics, diff,
+            top-scored)
     - category: Optional category name
-    - post_id: Optional post ID for evaluation
+    - post_id: Post ID for "evaluate" and "related"
+    - start, end: Optional date window bounds (ISO dates or epoch seconds) for "between"
+    - days: Size of the trailing window in days for "since"
+    - period: Bucket size for "analytics" (week or month)
+    - metric: Optional analytics section (activity, authors, reply_latency), or the
+              top-authors ranking metric (posts, comments, views)
+    - dedup: Set to 1 to collapse near-duplicate posts in listings and search results
+    - fuzzy: Set to 1 to correct misspelt words in "search" queries
+    - refresh: Set to 1 to ignore cached evaluations for "evaluate"
+    - threshold: Minimum similarity (0.5-1.0) for "duplicates"
+    - since, until: Snapshot versions for "diff" (until defaults to the latest)
+    - author: Username for "author" and "author-summary"
+    - period: For "top-authors" and "topics", one of day, week, month, quarter, year or a number of days
     - limit: Maximum number of posts to return (default varies by query type)
+    - dataset: Optional dataset name (default dataset when omitted); also accepted in the POST body
     """
     result = {}
     
@@ -56,61 +89,26 @@ def query():
                 'error': 'Missing query parameter'
             }), 400
         
+        try:
+            mcp_server = registry.get(data.get('dataset'))
+        except ValueError as e:
+            return dataset_error(e)
+        
         query_text = data['query']
         result = mcp_server.query(query_text)
     
     # Handle GET requests with query parameters
     elif request.method == 'GET':
-        query_type = request.args.get('type', '').lower()
-        query_text = request.args.get('q', '')
-        category = request.args.get('category')
-        limit = int(request.args.get('limit', 5))
-        post_id = request.args.get('post_id')
-        
-        # If query text is provided but no type, use natural language processing
-        if query_text and not query_type:
-            result = mcp_server.query(query_text)
-        
-        # Otherwise, use the specified query type
-        elif query_type == 'latest':
-            result = mcp_server.get_latest_posts(category, limit)
-        
-        elif query_type == 'most-viewed':
-            result = mcp_server.get_most_viewed_posts(category, limit)
-        
-        elif query_type == 'most-commented':
-            result = mcp_server.get_most_commented_posts(limit)
-        
-        elif query_type == 'stats':
-            result = mcp_server.get_forum_statistics()
+        try:
+            mcp_server = registry.get(request.args.get('dataset'))
+        except ValueError as e:
+            return dataset_error(e)
         
-        elif query_type == 'search' and query_text:
-            result = mcp_server.semantic_search(query_text, limit)
-        
-        elif query_type == 'categories':
-            categories = list(mcp_server.data.keys())
-            result = {
-                'categories': categories,
-                'count': len(categories)
-            }
-        
-        elif query_type == 'category' and category:
-            result = mcp_server.get_posts_by_category(category, limit)
-        
-        elif query_type == 'evaluate' and post_id:
-            try:
-                post_id_int = int(post_id)
-                result = mcp_server.evaluate_post(post_id_int)
-            except ValueError:
-                result = {
-                    'error': f"Invalid post ID: {post_id}. Must be an integer."
-                }
-        
-        else:
-            return jsonify({
-                'error': 'Invalid or incomplete query parameters',
-                'help': 'Use either "q" parameter for natural language queries or "type" parameter with appropriate additional parameters'
-            }), 400
+        try:
+            _, call = query_call(mcp_server, request.args)
+        except InvalidQuery as e:
+            return jsonify(e.payload), 400
+        result = call()
     
     else:
         return jsonify({
@@ -120,35 +118,202 @@ def query():
     
     return jsonify(result)
 
+@app.route('/batch', methods=['POST'])
+def batch():
+    """
+    Answer several queries in one request.
+    
+    Every query is answered from the same snapshot of one dataset, and the
+    semantic searches among them are scored together.
+    
+    JSON body:
+    {
+        "queries": ["latest posts in Governance", {"type": "search", "q": "validator rewards"}],
+        "dataset": "solana_forum_posts",
+        "stream": false
+    }
+    
+    Each query is a natural language string (or {"query": ...}), or an
+    object of the GET /query parameters. The response lists one
+    {"index", "status", "result"} entry per query, in order; with
+    "stream": true (or ?stream=1) the entries are streamed as
+    newline-delimited JSON as soon as each is answered, in completion order.
+    """
+    data = request.get_json(silent=True)
+    try:
+        queries = batch_queries(data)
+    except InvalidQuery as e:
+        return jsonify(e.payload), 400
+    
+    try:
+        mcp_server = registry.get(data.get('dataset'))
+    except ValueError as e:
+        return dataset_error(e)
+    
+    entries = run_batch(mcp_server, queries, batch_executor)
+    if data.get('stream') or request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        lines = (json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries)
+        return Response(lines, mimetype='application/x-ndjson', headers={'Cache-Control': 'no-cache'})
+    
+    return jsonify({
+        'query_type': 'batch',
+        'dataset': mcp_server.dataset,
+        'results': sorted(entries, key=lambda entry: entry['index']),
+        'count': len(queries)
+    })
+
+@app.route('/evaluate', methods=['POST'])
+def submit_evaluation():
+    """
+    Queue a post for evaluation and return its job at once (202 Accepted).
+    
+    Unlike /query?type=evaluate, the request does not wait for the model;
+    poll or stream the job at the returned Location, /jobs/<job_id>.
+    
+    Parameters, as a JSON body or query parameters:
+    - post_id: The ID of the post to evaluate
+    - refresh: Set to 1 (or true) to ignore cached evaluations
+    - dataset: Optional dataset name
+    """
+    data = request.get_json(silent=True) or {}
+    post_id = data.get('post_id', request.args.get('post_id'))
+    refresh = str(data.get('refresh', request.args.get('refresh', ''))).lower() in ('1', 'true', 'yes')
+    try:
+        post_id = int(post_id)
+    except (TypeError, ValueError):
+        return jsonify({'error': f"Invalid post ID: {post_id}. Must be an integer."}), 400
+    
+    try:
+        mcp_server = registry.get(data.get('dataset') or request.args.get('dataset'))
+    except ValueError as e:
+        return dataset_error(e)
+    
+    result = mcp_server.submit_evaluation(post_id, refresh)
+    if result.get('queue_full'):
+        return jsonify(result), 503, {'Retry-After': '5'}
+    if 'not found' in result.get('error', ''):
+        return jsonify(result), 404
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify(result), 202, {'Location': f"/jobs/{result['job_id']}"}
+
+@app.route('/jobs', methods=['GET'])
+def evaluation_job_stats():
+    """
+    Count the evaluation jobs by status.
+    """
+    return jsonify(evaluation_jobs.stats())
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def evaluation_job(job_id: str):
+    """
+    Get an evaluation job's status, and its result once it is done.
+    
+    Query parameters:
+    - wait: Seconds to wait for the job to finish before answering (long
+            polling, at most 60; default 0 answers at once)
+    - version: With wait, the job version already seen; the request waits
+               until the job moves past it
+    - stream: Set to 1 to stream the job as server-sent events, one event
+              per status change, until it finishes
+    """
+    try:
+        wait = min(float(request.args.get('wait', 0)), MAX_JOB_WAIT)
+        version = int(request.args['version']) if 'version' in request.args else None
+    except ValueError:
+        return jsonify({'error': "wait must be a number of seconds and version an integer"}), 400
+    
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        if evaluation_jobs.get(job_id) is None:
+            return jsonify({'error': f"Job {job_id} not found"}), 404
+        
+        def events():
+            for job in evaluation_jobs.stream(job_id, timeout=MAX_JOB_STREAM):
+                if job is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+        
+        return Response(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+    
+    job = evaluation_jobs.get(job_id, wait, version)
+    if job is None:
+        return jsonify({'error': f"Job {job_id} not found"}), 404
+    return jsonify(job)
+
+@app.route('/suggest', methods=['GET'])
+def suggest():
+    """
+    Search-as-you-type endpoint suggesting posts from a title prefix.
+    
+    Query parameters:
+    - q: The text typed so far
+    - limit: Maximum number of posts to return (default 8)
+    - dataset: Optional dataset name
+    """
+    try:
+        limit = int(request.args.get('limit', 8))
+    except ValueError:
+        return jsonify({'error': f"Invalid limit: {request.args.get('limit')}. Must be an integer."}), 400
+    
+    try:
+        mcp_server = registry.get(request.args.get('dataset'))
+    except ValueError as e:
+        return dataset_error(e)
+    
+    return jsonify(mcp_server.suggest(request.args.get('q', ''), limit))
+
+@app.route('/evaluation-cache', methods=['GET', 'DELETE'])
+def evaluation_cache():
+    """
+    Report the evaluation cache's size and hit rate; DELETE invalidates it.
+    
+    Query parameters:
+    - post_id: With DELETE, only invalidate this post's evaluations
+    - dataset: Optional dataset name
+    """
+    post_id = request.args.get('post_id')
+    try:
+        post_id = int(post_id) if post_id else None
+    except ValueError:
+        return jsonify({'error': f"Invalid post ID: {post_id}. Must be an integer."}), 400
+    
+    try:
+        mcp_server = registry.get(request.args.get('dataset'))
+    except ValueError as e:
+        return dataset_error(e)
+    
+    result = mcp_server.evaluation_cache(clear=request.method == 'DELETE', post_id=post_id)
+    return jsonify(result), 404 if 'not found' in result.get('error', '') else 200
+
+@app.route('/coalescing', methods=['GET'])
+def coalescing():
+    """
+    Count the expensive calls that shared an identical call already in flight.
+    
+    Query parameters:
+    - dataset: Optional dataset name
+    """
+    try:
+        mcp_server = registry.get(request.args.get('dataset'))
+    except ValueError as e:
+        return dataset_error(e)
+    
+    return jsonify(mcp_server.get_coalescing_stats())
+
+@app.route('/datasets', methods=['GET'])
+def datasets():
+    """
+    List the datasets that can be queried and those currently loaded.
+    """
+    return jsonify(registry.describe())
+
 @app.route('/', methods=['GET'])
 def index():
     """
     Root endpoint that provides API documentation.
     """
-    docs = {
-        'name': 'Solana Forum MCP API',
-        'description': 'API for querying Solana forum data using the Model Context Protocol',
-        'endpoints': {
-            '/query': {
-                'methods': ['GET', 'POST'],
-                'description': 'Universal endpoint for all types of queries',
-                'examples': {
-                    'POST': {
-                        'body': {'query': 'What is the most viewed post on Solana?'}
-                    },
-                    'GET': {
-                        'natural_language': '/query?q=What is the most viewed post on Solana?',
-                        'latest_posts': '/query?type=latest&limit=10',
-                        'category_posts': '/query?type=category&category=Governance&limit=20',
-                        'post_evaluation': '/query?type=evaluate&post_id=123'
-                    }
-                }
-            }
-        },
-        'documentation': 'See /docs/query.md for more examples and details'
-    }
-    
-    return jsonify(docs)
+    return jsonify(API_DOCS)
 
 def run_app():
     """Run the Flask application."""
@@ -0,0 +1,245 @@
+"""
+ASGI server for Solana Forum MCP.
+
+An asynchronous variant of the /query and / endpoints of src.api_server,
+served by uvicorn. One event loop serves every connection against the same
+dataset engines: lookups in precomputed indexes are answered on the loop,
+CPU-bound queries (searches, clustering, analytics) run on a bounded thread
+pool, and evaluations are queued on the evaluation job workers and awaited
+without holding a thread of either, so slow model calls never delay fast
+lookups. The model calls themselves are blocking requests made by the job
+workers, so at most ASGI_EVALUATION_WORKERS evaluations run at once and the
+rest wait in the job queue; GET /jobs reports both. POST /batch answers
+several queries at once, like its Flask counterpart.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.engine_registry import EngineRegistry
+from src.evaluation_jobs import EvaluationJobQueue
+from src.http_api import API_DOCS, CPU_BOUND_QUERY_TYPES, InvalidQuery, batch_queries, query_call, run_batch
+from src.mcp_server import SolanaForumMCPServer
+
+# Evaluations run at once. Each holds a job worker thread while it waits on
+# the model, so the ASGI server sizes the pool for the evaluations awaited
+# at once rather than for a few polled jobs
+DEFAULT_EVALUATION_WORKERS = 8
+
+# Initialize the dataset engines, which share one queue of background
+# evaluation jobs
+openai_api_key = os.environ.get("OPENAI_API_KEY")
+evaluation_jobs = EvaluationJobQueue(
+    workers=int(os.environ.get("ASGI_EVALUATION_WORKERS") or DEFAULT_EVALUATION_WORKERS)
+)
+registry = EngineRegistry(openai_api_key=openai_api_key, evaluation_jobs=evaluation_jobs)
+registry.preload()
+
+# Threads running CPU-bound queries; more threads than cores only adds
+# contention, since the vector products hold the GIL part of the time
+search_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ASGI_SEARCH_THREADS") or os.cpu_count() or 4),
+    thread_name_prefix='search'
+)
+
+
+class APIResponse(JSONResponse):
+    """JSON response encoded like Flask's jsonify (non-ASCII kept, NaN allowed, other types as strings)."""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(content, ensure_ascii=False, default=str).encode('utf-8')
+
+
+async def run_cpu_bound(call: Callable[..., Dict[str, Any]], *args: Any) -> Dict[str, Any]:
+    """Run a call on the search thread pool without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(search_executor, functools.partial(call, *args))
+
+
+async def engine(name: Optional[str]) -> SolanaForumMCPServer:
+    """
+    Get a dataset's engine; datasets not yet loaded are built off the event loop.
+
+    Raises:
+        ValueError: If no such dataset exists
+    """
+    if (name or registry.default_dataset) in registry.loaded():
+        return registry.get(name)
+    return await run_cpu_bound(registry.get, name)
+
+
+async def evaluate(mcp_server: SolanaForumMCPServer, post_id: int, refresh: bool) -> APIResponse:
+    """
+    Evaluate a post on the evaluation job workers and await the result.
+
+    Concurrent requests for the same post share one job, and the number of
+    evaluations in progress is bounded by the job workers rather than by
+    the requests waiting.
+    """
+    job = mcp_server.submit_evaluation(post_id, refresh)
+    if job.get('queue_full'):
+        return APIResponse(job, status_code=503, headers={'Retry-After': '5'})
+    if 'job_id' not in job:
+        # Unknown post or no API key: evaluate_post answers at once with its own error
+        return APIResponse(mcp_server.evaluate_post(post_id, refresh))
+
+    await asyncio.wrap_future(evaluation_jobs.future(job['job_id']))
+    job = evaluation_jobs.get(job['job_id'])
+    return APIResponse(job['result'] if job['result'] is not None else {'error': job['error']})
+
+
+async def natural(mcp_server: SolanaForumMCPServer, query_text: str) -> APIResponse:
+    """
+    Answer a natural language query.
+
+    The query is routed on the event loop, so one asking for an evaluation
+    ("evaluate post 123") is awaited on the evaluation job workers instead
+    of holding a search thread for the whole model call.
+    """
+    method, args = mcp_server.route(query_text)
+    if method == mcp_server.evaluate_post:
+        return await evaluate(mcp_server, *args, False)
+    return APIResponse(await run_cpu_bound(method, *args))
+
+
+async def query(request: Request) -> APIResponse:
+    """
+    Universal endpoint that processes all types of queries.
+
+    Accepts the same POST bodies and GET parameters as /query in
+    src.api_server.
+    """
+    # Handle POST requests with JSON body
+    if request.method == 'POST' and request.headers.get('content-type', '').startswith('application/json'):
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+
+        if not isinstance(data, dict) or 'query' not in data:
+            return APIResponse({'error': 'Missing query parameter'}, status_code=400)
+
+        try:
+            mcp_server = await engine(data.get('dataset'))
+        except ValueError as e:
+            return dataset_error(e)
+
+        return await natural(mcp_server, data['query'])
+
+    # Handle GET requests with query parameters
+    if request.method == 'GET':
+        try:
+            mcp_server = await engine(request.query_params.get('dataset'))
+        except ValueError as e:
+            return dataset_error(e)
+
+        try:
+            query_type, call = query_call(mcp_server, request.query_params)
+        except InvalidQuery as e:
+            return APIResponse(e.payload, status_code=400)
+
+        if query_type == 'natural':
+            return await natural(mcp_server, *call.args)
+        if query_type == 'evaluate' and isinstance(call, functools.partial):
+            return await evaluate(mcp_server, *call.args)
+        if query_type in CPU_BOUND_QUERY_TYPES:
+            return APIResponse(await run_cpu_bound(call))
+        return APIResponse(call())
+
+    return APIResponse({
+        'error': 'Invalid request method or content type',
+        'help': 'Send a POST request with JSON body containing "query" parameter or a GET request with appropriate query parameters'
+    }, status_code=400)
+
+
+async def batch(request: Request):
+    """
+    Answer several queries in one request.
+
+    Accepts the same JSON bodies as /batch in src.api_server. The queries
+    run on the search thread pool; the event loop only waits for them.
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    try:
+        queries = batch_queries(data)
+    except InvalidQuery as e:
+        return APIResponse(e.payload, status_code=400)
+
+    try:
+        mcp_server = await engine(data.get('dataset'))
+    except ValueError as e:
+        return dataset_error(e)
+
+    entries = run_batch(mcp_server, queries, search_executor)
+    if data.get('stream') or request.query_params.get('stream', '').lower() in ('1', 'true', 'yes'):
+        lines = (json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries)
+        return StreamingResponse(iterate_in_threadpool(lines), media_type='application/x-ndjson',
+                                 headers={'Cache-Control': 'no-cache'})
+
+    results = await run_in_threadpool(sorted, entries, key=lambda entry: entry['index'])
+    return APIResponse({
+        'query_type': 'batch',
+        'dataset': mcp_server.dataset,
+        'results': results,
+        'count': len(queries)
+    })
+
+
+async def jobs(request: Request) -> APIResponse:
+    """
+    Count the evaluation jobs by status, with the number run at once and the queue size.
+    """
+    return APIResponse(evaluation_jobs.stats())
+
+
+async def index(request: Request) -> APIResponse:
+    """
+    Root endpoint that provides API documentation for the endpoints served here.
+    """
+    endpoints = API_DOCS['endpoints']
+    return APIResponse({**API_DOCS, 'endpoints': {path: endpoints[path] for path in ('/query', '/batch', '/jobs')}})
+
+
+def dataset_error(error: ValueError) -> APIResponse:
+    """Build the response for a request naming an unknown dataset."""
+    return APIResponse({'error': str(error), 'available_datasets': registry.available()}, status_code=404)
+
+
+app = Starlette(routes=[
+    Route('/query', query, methods=['GET', 'POST']),
+    Route('/batch', batch, methods=['POST']),
+    Route('/jobs', jobs, methods=['GET']),
+    Route('/', index, methods=['GET']),
+])
+
+
+def run_app():
+    """Run the ASGI application with uvicorn."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Solana Forum MCP API (ASGI)")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=5001, help="Port to listen on")
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == '__main__':
+    run_app()
@@ -0,0 +1,216 @@
+"""
+Author index for the Solana Forum MCP server.
+
+Built once at load, the index maps every original poster and commenter to
+the (time-ordered) positions of the posts they wrote or replied to, with
+prefix sums of views. Author listings, summaries and leaderboards are then
+answered with dictionary lookups and binary searches instead of scans.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.time_index import MISSING_TIMESTAMP, days_ago, format_timestamp
+from src.utils import split_comments
+
+# Leaderboard metrics and the activity each one counts
+METRICS = ('posts', 'comments', 'views')
+
+# Named leaderboard periods in days
+PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 30, 'quarter': 91, 'year': 365}
+
+Period = Union[str, int, float, None]
+
+
+class _Activity:
+    """
+    Positions of one author's posts (or comments) in time order.
+
+    Keeps the creation times and running view totals alongside, so counts
+    and view sums over any time window take two binary searches.
+    """
+
+    __slots__ = ('positions', 'timestamps', 'views_cumsum')
+
+    def __init__(self, positions: List[int], timestamps: np.ndarray, views: np.ndarray):
+        self.positions = np.asarray(sorted(positions), dtype=np.int64)
+        self.timestamps = timestamps[self.positions]
+        self.views_cumsum = np.concatenate(([0], np.cumsum(views[self.positions])))
+
+    def window(self, start: Optional[int]) -> Tuple[int, int]:
+        """Get the [lo, hi) slice of activity created at or after ``start``."""
+        if start is None:
+            return 0, len(self.positions)
+        return int(np.searchsorted(self.timestamps, start, side='left')), len(self.positions)
+
+    def count(self, start: Optional[int]) -> int:
+        lo, hi = self.window(start)
+        return hi - lo
+
+    def views(self, start: Optional[int]) -> int:
+        lo, hi = self.window(start)
+        return int(self.views_cumsum[hi] - self.views_cumsum[lo])
+
+
+class AuthorIndex:
+    """
+    Original posters and commenters mapped to their activity.
+    """
+
+    def __init__(self, posts: Sequence[Dict[str, Any]], timestamps: np.ndarray):
+        """
+        Build the index from the time-ordered post list.
+
+        Args:
+            posts: Posts in time order (as kept by the server)
+            timestamps: int64 creation time of each post in epoch seconds
+        """
+        views = np.array([int(p.get('views') or 0) for p in posts], dtype=np.int64)
+        categories = [p.get('category_name') for p in posts]
+
+        authored: Dict[str, List[int]] = {}
+        commented: Dict[str, List[int]] = {}
+        for position, post in enumerate(posts):
+            author = post.get('original_poster')
+            if author:
+                authored.setdefault(author, []).append(position)
+            # One entry per comment, so repeat commenters count every reply
+            for username, _, _ in split_comments(post.get('comments') or ''):
+                commented.setdefault(username, []).append(position)
+
+        self.names = {name.lower(): name for name in set(authored) | set(commented)}
+        self.categories = categories
+        self.timestamps = timestamps
+
+        self.posts: Dict[str, Dict[Optional[str], _Activity]] = {}
+        self.comments: Dict[str, Dict[Optional[str], _Activity]] = {}
+        for target, source in ((self.posts, authored), (self.comments, commented)):
+            for name, positions in source.items():
+                by_category: Dict[Optional[str], List[int]] = {}
+                for position in positions:
+                    by_category.setdefault(categories[position], []).append(position)
+                target[name] = {None: _Activity(positions, timestamps, views)}
+                for category, category_positions in by_category.items():
+                    target[name][category] = _Activity(category_positions, timestamps, views)
+
+    def resolve(self, author: str) -> Optional[str]:
+        """
+        Get the canonical spelling of an author name.
+
+        Args:
+            author: Author name, matched case-insensitively (a leading @ is ignored)
+
+        Returns:
+            Canonical name, or None if the author is unknown
+        """
+        return self.names.get(author.lstrip('@').lower()) if author else None
+
+    def authored(self, author: str) -> np.ndarray:
+        """Get positions of posts written by an author, oldest first."""
+        activity = self.posts.get(author, {}).get(None)
+        return activity.positions if activity is not None else np.empty(0, dtype=np.int64)
+
+    def commented(self, author: str) -> np.ndarray:
+        """Get positions of posts an author replied to (one per reply), oldest first."""
+        activity = self.comments.get(author, {}).get(None)
+        return activity.positions if activity is not None else np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def period_start(period: Period, now: Optional[float] = None) -> Optional[int]:
+        """
+        Convert a leaderboard period into the epoch second it starts at.
+
+        Args:
+            period: 'day', 'week', 'month', 'quarter', 'year', a number of
+                    days, or None/'all' for all time
+            now: Optional reference time in epoch seconds
+
+        Returns:
+            Start of the period in epoch seconds, or None for all time
+
+        Raises:
+            ValueError: If the period is not recognised
+        """
+        if period is None or period == 'all':
+            return None
+        if isinstance(period, str):
+            if period in PERIOD_DAYS:
+                return days_ago(PERIOD_DAYS[period], now)
+            try:
+                period = float(period)
+            except ValueError:
+                raise ValueError(
+                    f"Unsupported period '{period}'. Use one of: {', '.join(PERIOD_DAYS)}, all, or a number of days"
+                )
+        return days_ago(float(period), now)
+
+    def top(self, metric: str = 'posts', category: Optional[str] = None,
+            start: Optional[int] = None, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Rank authors by activity.
+
+        Comments are dated by the thread they were posted in, since the
+        dataset does not record per-comment times.
+
+        Args:
+            metric: 'posts' (topics started), 'comments' (replies written) or
+                    'views' (views of topics started)
+            category: Optional category to restrict to
+            start: Optional epoch second the counted activity starts at
+            limit: Maximum number of authors to return
+
+        Returns:
+            List of (author, value) pairs, highest first
+
+        Raises:
+            ValueError: If the metric is not supported
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric '{metric}'. Use one of: {', '.join(METRICS)}")
+
+        source = self.comments if metric == 'comments' else self.posts
+        scores = Counter()
+        for name, by_category in source.items():
+            activity = by_category.get(category)
+            if activity is None:
+                continue
+            value = activity.views(start) if metric == 'views' else activity.count(start)
+            if value:
+                scores[name] = value
+
+        return scores.most_common(limit)
+
+    def summary(self, author: str) -> Dict[str, Any]:
+        """
+        Summarize an author's activity.
+
+        Args:
+            author: Canonical author name
+
+        Returns:
+            Dictionary of per-author totals
+        """
+        posts = self.posts.get(author, {})
+        comments = self.comments.get(author, {})
+        all_posts = posts.get(None)
+        all_comments = comments.get(None)
+
+        dated = all_posts.timestamps[all_posts.timestamps != MISSING_TIMESTAMP] if all_posts else []
+
+        return {
+            'author': author,
+            'posts': all_posts.count(None) if all_posts else 0,
+            'comments': all_comments.count(None) if all_comments else 0,
+            'threads_commented': len(set(all_comments.positions.tolist())) if all_comments else 0,
+            'total_views': all_posts.views(None) if all_posts else 0,
+            'posts_per_category': {
+                category: activity.count(None) for category, activity in posts.items() if category is not None
+            },
+            'comments_per_category': {
+                category: activity.count(None) for category, activity in comments.items() if category is not None
+            },
+            'first_post_at': format_timestamp(int(dated[0])) if len(dated) else None,
+            'last_post_at': format_timestamp(int(dated[-1])) if len(dated) else None,
+        }
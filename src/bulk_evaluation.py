@@ -0,0 +1,362 @@
+"""
+Bulk evaluation of whole categories or lists of posts.
+
+A job records the posts it covers in SQLite before evaluating any, and marks
+each post done or failed as soon as it finishes, so an interrupted job
+resumes with the posts it had not finished. Posts are evaluated
+concurrently by an evaluator sharing the server's evaluation cache, under a
+requests-per-minute and tokens-per-minute budget; rate-limited and failed
+requests are retried by the evaluator. Each post's overall score is kept in
+a scores table, from which the server answers highest-scoring queries
+without calling the model.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.evaluation import MISSING_API_KEY, PROMPT_VERSION, PostEvaluator
+from src.evaluation_cache import post_content_hash
+from src.rate_limit import RateLimiter
+from src.utils import get_data_directory
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS post_scores (
+    dataset TEXT NOT NULL,
+    post_id INTEGER NOT NULL,
+    category_name TEXT,
+    title TEXT,
+    content_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version INTEGER NOT NULL,
+    overall_score REAL NOT NULL,
+    scores TEXT NOT NULL,
+    evaluated_at REAL NOT NULL,
+    PRIMARY KEY (dataset, post_id)
+);
+CREATE INDEX IF NOT EXISTS post_scores_rank ON post_scores (dataset, overall_score DESC);
+CREATE TABLE IF NOT EXISTS bulk_jobs (
+    job_id TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    description TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS bulk_job_posts (
+    job_id TEXT NOT NULL,
+    post_id INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    PRIMARY KEY (job_id, post_id)
+);
+"""
+
+# Default budget, matching a low OpenAI usage tier
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+DEFAULT_CONCURRENCY = 4
+
+
+class BulkEvaluationStore:
+    """
+    SQLite store of bulk jobs, their progress and the posts' scores.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (defaults to evaluations.sqlite3 in the cache
+                  directory, next to the evaluation cache)
+        """
+        self.path = Path(path or Path(get_data_directory('cache')) / 'evaluations.sqlite3')
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, once per process (lock held)."""
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(self.path.parent, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def create_job(self, dataset: str, description: str, post_ids: Sequence[int]) -> str:
+        """
+        Record a job and the posts it covers.
+
+        Returns:
+            The new job's ID
+        """
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN")
+                connection.execute("INSERT INTO bulk_jobs VALUES (?, ?, ?, ?, NULL)",
+                                   (job_id, dataset, description, time.time()))
+                connection.executemany("INSERT OR IGNORE INTO bulk_job_posts (job_id, post_id) VALUES (?, ?)",
+                                       [(job_id, post_id) for post_id in post_ids])
+        return job_id
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Describe a job and its progress.
+
+        Returns:
+            Dictionary with the job's dataset, description, times and post
+            counts by status, or None if no such job exists
+        """
+        rows = self._execute("SELECT dataset, description, created_at, finished_at FROM bulk_jobs WHERE job_id = ?",
+                             (job_id,))
+        if not rows:
+            return None
+        dataset, description, created_at, finished_at = rows[0]
+        counts = dict(self._execute("SELECT status, COUNT(*) FROM bulk_job_posts WHERE job_id = ? GROUP BY status",
+                                    (job_id,)))
+        return {
+            'job_id': job_id,
+            'dataset': dataset,
+            'description': description,
+            'created_at': created_at,
+            'finished_at': finished_at,
+            'total': sum(counts.values()),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'pending': counts.get('pending', 0)
+        }
+
+    def unfinished_posts(self, job_id: str) -> List[int]:
+        """Get the posts of a job that are pending or failed."""
+        return [row[0] for row in self._execute(
+            "SELECT post_id FROM bulk_job_posts WHERE job_id = ? AND status != 'done' ORDER BY post_id", (job_id,)
+        )]
+
+    def mark(self, job_id: str, post_id: int, status: str, error: Optional[str] = None):
+        """Record the outcome of one post of a job."""
+        self._execute("UPDATE bulk_job_posts SET status = ?, error = ? WHERE job_id = ? AND post_id = ?",
+                      (status, error, job_id, post_id))
+
+    def finish(self, job_id: str):
+        """Record that a job has no unfinished posts left."""
+        self._execute("UPDATE bulk_jobs SET finished_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def save_score(self, dataset: str, post: Dict[str, Any], content_hash: str, model: str,
+                   overall_score: float, evaluations: Dict[str, Dict[str, Any]]):
+        """Store a post's latest overall and per-perspective scores."""
+        scores = {perspective: evaluation['score'] for perspective, evaluation in evaluations.items()}
+        self._execute(
+            "INSERT OR REPLACE INTO post_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (dataset, post.get('id'), post.get('category_name'), post.get('title'), content_hash, model,
+             PROMPT_VERSION, overall_score, json.dumps(scores), time.time())
+        )
+
+    def top_scores(self, dataset: str, categories: Optional[Sequence[str]] = None,
+                   limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the highest-scoring posts of a dataset.
+
+        Args:
+            dataset: Dataset name
+            categories: Only posts in these categories
+            limit: Maximum number of posts to return
+
+        Returns:
+            Posts, highest overall score first, with their per-perspective
+            scores, content hash and evaluation time
+        """
+        sql = ("SELECT post_id, category_name, title, content_hash, model, overall_score, scores, evaluated_at "
+               "FROM post_scores WHERE dataset = ?")
+        params: List[Any] = [dataset]
+        if categories:
+            sql += f" AND category_name IN ({','.join('?' * len(categories))})"
+            params.extend(categories)
+        sql += " ORDER BY overall_score DESC, evaluated_at DESC LIMIT ?"
+        params.append(limit)
+        return [
+            {'id': post_id, 'category_name': category, 'title': title, 'content_hash': content_hash,
+             'model': model, 'overall_score': overall_score, 'scores': json.loads(scores), 'evaluated_at': evaluated_at}
+            for post_id, category, title, content_hash, model, overall_score, scores, evaluated_at
+            in self._execute(sql, params)
+        ]
+
+    def scored_posts(self, dataset: str) -> int:
+        """Count the posts of a dataset with a stored score."""
+        return self._execute("SELECT COUNT(*) FROM post_scores WHERE dataset = ?", (dataset,))[0][0]
+
+
+class BulkEvaluator:
+    """
+    Evaluates many posts of one server's dataset under a rate budget.
+    """
+
+    def __init__(self, server, store: Optional[BulkEvaluationStore] = None,
+                 requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 concurrency: Optional[int] = None, evaluator: Optional[PostEvaluator] = None):
+        """
+        Args:
+            server: SolanaForumMCPServer whose posts are evaluated
+            store: Job and score store (defaults to the server's)
+            requests_per_minute: Request budget (defaults to the
+                                 EVALUATION_REQUESTS_PER_MINUTE environment variable)
+            tokens_per_minute: Token budget (defaults to the
+                               EVALUATION_TOKENS_PER_MINUTE environment variable)
+            concurrency: Posts evaluated at once (defaults to the
+                         EVALUATION_CONCURRENCY environment variable)
+            evaluator: Evaluator to use (defaults to one sharing the server's
+                       evaluation cache and settings, limited to the budget,
+                       which close() closes)
+
+        Raises:
+            ValueError: If no API key is configured, since every request would fail
+        """
+        if not (evaluator or server.evaluator).api_key:
+            raise ValueError(MISSING_API_KEY)
+        self.server = server
+        self.store = store or server.score_store
+        if requests_per_minute is None:
+            requests_per_minute = float(os.environ.get("EVALUATION_REQUESTS_PER_MINUTE") or DEFAULT_REQUESTS_PER_MINUTE)
+        if tokens_per_minute is None:
+            tokens_per_minute = float(os.environ.get("EVALUATION_TOKENS_PER_MINUTE") or DEFAULT_TOKENS_PER_MINUTE)
+        self.concurrency = concurrency or int(os.environ.get("EVALUATION_CONCURRENCY") or DEFAULT_CONCURRENCY)
+        base = server.evaluator
+        self._owns_evaluator = evaluator is None
+        self.evaluator = evaluator or PostEvaluator(
+            base.api_key, base_url=base.base_url, model=base.model, timeout=base.timeout[1],
+            perspectives=base.perspectives, mode=base.mode, cache=base.cache,
+            rate_limiter=RateLimiter(requests_per_minute, tokens_per_minute)
+        )
+
+    def close(self):
+        """Close the evaluator this BulkEvaluator created (its threads and HTTP session)."""
+        if self._owns_evaluator:
+            self.evaluator.close()
+
+    def __enter__(self) -> 'BulkEvaluator':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self, categories: Optional[Sequence[str]] = None, post_ids: Optional[Sequence[int]] = None) -> str:
+        """
+        Create a job for whole categories and/or a list of posts.
+
+        Args:
+            categories: Categories whose posts are all evaluated
+            post_ids: Posts to evaluate
+
+        Returns:
+            The job's ID
+
+        Raises:
+            ValueError: If a category or post does not exist, or nothing was selected
+        """
+        selected: Dict[int, None] = {}
+        for category in categories or ():
+            if category not in self.server.categories:
+                raise ValueError(f"Category '{category}' not found. "
+                                 f"Available categories: {', '.join(self.server.categories)}")
+            positions = self.server.df.index[self.server.df['category_name'] == category]
+            selected.update((self.server.posts[int(position)].get('id'), None) for position in positions)
+        for post_id in post_ids or ():
+            if post_id not in self.server._position_by_id:
+                raise ValueError(f"Post with ID {post_id} not found")
+            selected[post_id] = None
+        if not selected:
+            raise ValueError("Name at least one category or post to evaluate")
+
+        parts = ([f"categories: {', '.join(categories)}"] if categories else []) + \
+                ([f"{len(post_ids)} posts by ID"] if post_ids else [])
+        return self.store.create_job(self.server.dataset, '; '.join(parts), list(selected))
+
+    def run(self, job_id: str, progress: bool = True) -> Dict[str, Any]:
+        """
+        Evaluate the unfinished posts of a job.
+
+        Running a job again resumes it: posts already done are skipped and
+        failed ones are retried. Completed perspectives come from the
+        evaluation cache, so an interrupted post costs only what it had not
+        finished.
+
+        Args:
+            job_id: Job to run
+            progress: Print a line per evaluated post
+
+        Returns:
+            The job's description and progress, plus the requests and tokens
+            this run spent
+
+        Raises:
+            KeyError: If no such job exists
+        """
+        job = self.store.job(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if job['dataset'] != self.server.dataset:
+            raise ValueError(f"Job {job_id} belongs to dataset '{job['dataset']}'")
+
+        post_ids = self.store.unfinished_posts(job_id)
+        usage_before = self.evaluator.usage.copy()
+        started = time.perf_counter()
+        if progress:
+            print(f"Job {job_id}: evaluating {len(post_ids)} of {job['total']} posts, {self.concurrency} at a time")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='bulk-evaluation') as executor:
+            futures = {executor.submit(self._evaluate, job_id, post_id): post_id for post_id in post_ids}
+            for count, future in enumerate(as_completed(futures), 1):
+                post_id = futures[future]
+                status, detail = future.result()
+                if progress:
+                    print(f"[{count}/{len(post_ids)}] post {post_id}: {status} {detail}")
+
+        summary = self.store.job(job_id)
+        if not summary['pending'] and not summary['failed']:
+            self.store.finish(job_id)
+            summary = self.store.job(job_id)
+        usage = self.evaluator.usage - usage_before
+        summary.update({
+            'query_type': 'bulk_evaluation',
+            'evaluated': len(post_ids),
+            'seconds': round(time.perf_counter() - started, 1),
+            'requests': usage['requests'],
+            'retries': usage['retries'],
+            'prompt_tokens': usage['prompt_tokens'],
+            'completion_tokens': usage['completion_tokens']
+        })
+        return summary
+
+    def _evaluate(self, job_id: str, post_id: int):
+        """Evaluate one post of a job, store its score and checkpoint it."""
+        try:
+            post = self.server.posts[self.server._position_by_id[post_id]]
+            post_content = self.server._evaluation_content(post)
+            evaluations = self.evaluator.evaluate(post_content)
+            errors = [evaluation['explanation'] for evaluation in evaluations.values() if evaluation['failed']]
+            if errors:
+                self.store.mark(job_id, post_id, 'failed', errors[0][:500])
+                return 'failed', errors[0][:120]
+
+            overall_score = sum(evaluation['score'] for evaluation in evaluations.values()) / len(evaluations)
+            self.store.save_score(self.server.dataset, post, post_content_hash(post_content), self.evaluator.model,
+                                  overall_score, evaluations)
+            self.store.mark(job_id, post_id, 'done')
+            cached = " (cached)" if all(evaluation['cached'] for evaluation in evaluations.values()) else ""
+            return 'done', f"{overall_score:.2f}{cached}"
+        except Exception as e:
+            self.store.mark(job_id, post_id, 'failed', str(e)[:500])
+            return 'failed', str(e)[:120]
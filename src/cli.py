@@ -16,7 +16,9 @@ import textwrap
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 # Now import from src
-from src.mcp_server import SolanaForumMCPServer
+from src.bulk_evaluation import BulkEvaluator
+from src.engine_registry import EngineRegistry
+from src.utils import SnapshotStore, load_json
 
 def format_post(post: Dict[str, Any], index: Optional[int] = None) -> str:
     """
@@ -43,8 +45,15 @@ def format_post(post: Dict[str, Any], index: Optional[int] = None) -> str:
     lines.append(f"   Posted by: {post.get('original_poster', 'Unknown')}")
     lines.append(f"   URL: {post.get('url', '')}")
     
-    # Add a short description if available
-    if 'description' in post and post['description']:
+    if post.get('duplicate_ids'):
+        lines.append(f"   Also posted as: {', '.join(str(i) for i in post['duplicate_ids'])}")
+    
+    # Add the query-aware snippet of a search hit, or else a short description
+    if post.get('snippet'):
+        source = " (from the comments)" if post.get('snippet_field') == 'comments' else ""
+        wrapped_snippet = textwrap.fill(post['snippet'], width=80, initial_indent="   ", subsequent_indent="   ")
+        lines.append(f"\n{wrapped_snippet}{source}")
+    elif 'description' in post and post['description']:
         description = post['description']
         # Truncate and wrap the description
         if len(description) > 200:
@@ -68,7 +77,14 @@ def format_evaluation(evaluation: Dict[str, Any]) -> str:
     lines.append(f"Post: {evaluation.get('post_title', 'Unknown')}")
     lines.append(f"URL: {evaluation.get('post_url', '')}")
     lines.append(f"Category: {evaluation.get('category', 'Unknown')}")
-    lines.append(f"Overall Score: {evaluation.get('overall_score', 0):.2f}/1.00\n")
+    cached = " (cached)" if evaluation.get('cached') else ""
+    lines.append(f"Overall Score: {evaluation.get('overall_score', 0):.2f}/1.00{cached}")
+    packed = evaluation.get('packed_tokens')
+    if packed:
+        lines.append(f"Prompt: {packed['total']} tokens of {packed['budget'] or 'unlimited'} "
+                     f"(title {packed['title']}, description {packed['description']}/{packed['original']['description']}, "
+                     f"{packed['excerpts']} comment excerpts {packed['comments']})")
+    lines.append("")
     
     if 'evaluations' in evaluation:
         lines.append("Evaluation by Perspective:")
@@ -80,6 +96,45 @@ def format_evaluation(evaluation: Dict[str, Any]) -> str:
     
     return "\n".join(lines)
 
+def format_analytics(analytics: Dict[str, Any]) -> str:
+    """
+    Format forum analytics for display in the terminal.
+    
+    Args:
+        analytics: The analytics result to format
+        
+    Returns:
+        Formatted analytics string
+    """
+    lines = []
+    lines.append(f"Period: {analytics.get('period')}")
+    if analytics.get('category'):
+        lines.append(f"Category: {analytics['category']}")
+    
+    if 'activity' in analytics:
+        lines.append("\nActivity:")
+        lines.append(f"  {'Period':<12} {'Category':<15} {'Posts':>6} {'Views':>8} {'Comments':>9}")
+        for row in analytics['activity']:
+            lines.append(f"  {row['period']:<12} {row['category']:<15} {row['posts']:>6} {row['views']:>8} {row['comments']:>9}")
+    
+    if 'author_activity' in analytics:
+        lines.append("\nAuthor activity:")
+        for row in analytics['author_activity']:
+            lines.append(f"  {row['period']:<12} {row['author']:<20} {row['posts']:>3} posts, {row['views']} views")
+    
+    latency = analytics.get('reply_latency')
+    if latency:
+        basis = "first reply" if latency['basis'] == 'first_reply' else "latest reply"
+        lines.append(f"\nReply latency (time to {basis}, {latency['posts_with_replies']} posts with replies):")
+        if latency['mean_hours'] is not None:
+            lines.append(f"  Mean: {latency['mean_hours']:.1f} hours")
+            percentiles = ", ".join(f"{k}={v:.1f}h" for k, v in latency['percentiles_hours'].items())
+            lines.append(f"  Percentiles: {percentiles}")
+        for bucket in latency['histogram']:
+            lines.append(f"  {bucket['bucket']:<12} {bucket['count']}")
+    
+    return "\n".join(lines)
+
 def display_results(result: Dict[str, Any]):
     """
     Display query results in a formatted way.
@@ -97,18 +152,132 @@ def display_results(result: Dict[str, Any]):
             print("\nAvailable categories:")
             for i, category in enumerate(result['available_categories']):
                 print(f"{i+1}. {category}")
+        if result.get('available_versions'):
+            print("\nAvailable snapshot versions:")
+            for version in result['available_versions']:
+                print(f"- {version}")
         return
     
     if query_type == 'post_evaluation':
         print(format_evaluation(result))
         return
     
+    if query_type == 'bulk_evaluation':
+        print(f"Job {result['job_id']} ({result['description']})")
+        print(f"Posts: {result['done']} done, {result['failed']} failed, {result['pending']} pending "
+              f"of {result['total']}")
+        print(f"This run: {result['evaluated']} posts in {result['seconds']}s, {result['requests']} requests "
+              f"({result['retries']} retries), {result['prompt_tokens'] + result['completion_tokens']} tokens")
+        if result['failed']:
+            print(f"Resume with: evaluate-bulk --resume {result['job_id']}")
+        return
+    
+    if query_type == 'top_scored_posts':
+        print(f"Scored posts: {result['scored_posts']}")
+        for i, post in enumerate(result['posts']):
+            stale = " (edited since scored)" if post['stale'] else ""
+            print(f"\n{i+1}. {post['title']} [{post['category_name']}] - {post['overall_score']:.2f}{stale}")
+            print(f"   URL: {post['url']}")
+            print("   " + ", ".join(f"{perspective}: {score:.2f}" for perspective, score in post['scores'].items()))
+        return
+    
+    if query_type == 'evaluation_cache':
+        print(f"Cache: {result['path']}")
+        print(f"Stored: {result['entries']} evaluations of {result['posts']} posts")
+        print(f"Lookups this session: {result['hits']} hits, {result['misses']} misses")
+        if result['deleted']:
+            print(f"Deleted: {result['deleted']} evaluations")
+        return
+    
+    if query_type == 'forum_analytics':
+        print(format_analytics(result))
+        return
+    
     if 'category' in result and result['category']:
         print(f"Category: {result['category']}")
         
+    if query_type == 'author_summary':
+        print(f"Author: {result['author']}")
+        print(f"Posts started: {result['posts']} ({result['total_views']} views)")
+        print(f"Comments: {result['comments']} in {result['threads_commented']} threads")
+        if result['first_post_at']:
+            print(f"First post: {result['first_post_at']}, last post: {result['last_post_at']}")
+        for category, count in result['posts_per_category'].items():
+            print(f"- {category}: {count} posts, {result['comments_per_category'].get(category, 0)} comments")
+        return
+    
+    if query_type == 'topics':
+        print(f"Period: {result['period'] or 'all time'}, posts considered: {result['posts_considered']}")
+        for i, topic in enumerate(result['topics']):
+            print(f"\n{i+1}. {', '.join(topic['keywords'])} ({topic['post_count']} posts, {topic['share']:.0%})")
+            for post in topic['top_posts']:
+                print(f"   - {post['title']} ({post['views']} views)")
+        return
+    
+    if query_type == 'comment_search':
+        print(f"Query: {result['query']}")
+        print(f"Found {result['count']} passages")
+        for i, passage in enumerate(result['passages']):
+            print(f"\n{i+1}. {passage['title']} [{passage['category_name']}]")
+            print(f"   Comment {passage['comment_number']} by {passage['author']} (relevance: {passage['similarity_score']:.2f})")
+            print(f"   URL: {passage['url']}")
+            print(textwrap.indent(textwrap.fill(passage['text'], width=80), '   '))
+        return
+    
+    if query_type == 'find_duplicates':
+        print(f"Similarity threshold: {result['threshold']}")
+        print(f"Found {result['count']} clusters")
+        for i, cluster in enumerate(result['clusters']):
+            print(f"\n{i+1}. {len(cluster['posts'])} posts, similarity >= {cluster['similarity']:.2f}")
+            for post in cluster['posts']:
+                print(f"   - [{post['category_name']}] {post['title']} ({post['url']})")
+        return
+    
+    if query_type == 'suggest':
+        if result['categories']:
+            print(f"Categories: {', '.join(result['categories'])}")
+        for i, post in enumerate(result['posts']):
+            print(f"{i+1}. {post['title']} [{post['category_name']}] ({post['views']} views)")
+        return
+    
+    if query_type == 'dataset_diff':
+        print(f"Changes from {result['since']} to {result['until']}")
+        for kind, label in (('new_topics', 'New topics'), ('removed_topics', 'Removed topics'),
+                            ('edited_topics', 'Edited topics')):
+            if result[kind]:
+                print(f"\n{label} ({result['totals'][kind]}):")
+                for post in result[kind]:
+                    print(f"- [{post['category_name']}] {post['title']} (ID: {post['id']})")
+        for kind, label in (('view_changes', 'Views'), ('comment_changes', 'Comments')):
+            if result[kind]:
+                print(f"\n{label} ({result['totals'][kind]} topics changed):")
+                for change in result[kind]:
+                    print(f"- {change['title']}: {change['before']} -> {change['after']} ({change['delta']:+d})")
+        if not result['count']:
+            print("No changes")
+        return
+    
+    if query_type == 'top_authors':
+        print(f"Ranked by: {result['metric']}, period: {result['period'] or 'all time'}")
+        for i, entry in enumerate(result['authors']):
+            print(f"{i+1}. {entry['author']}: {entry[result['metric']]} {result['metric']}")
+        return
+    
+    if result.get('author'):
+        print(f"Author: {result['author']}")
+        
     if 'query' in result:
         print(f"Query: {result['query']}")
         
+    if result.get('corrected_query'):
+        print(f"Searched for: {result['corrected_query']}")
+        
+    if query_type == 'related_posts' and result.get('post_title'):
+        print(f"Related to: {result['post_title']}")
+        
+    if result.get('start') or result.get('end'):
+        print(f"Window: {result.get('start') or 'beginning'} to {result.get('end') or 'now'}")
+        
     if 'count' in result:
         print(f"Found {result['count']} results")
     
@@ -116,6 +285,11 @@ def display_results(result: Dict[str, Any]):
         print("\nResults:")
         for i, post in enumerate(result['posts']):
             print(f"\n{format_post(post, i+1)}")
+        
+        if result.get('commented_posts'):
+            print("\nCommented on:")
+            for i, post in enumerate(result['commented_posts']):
+                print(f"{i+1}. {post.get('title')} ({post['author_comment_count']} comments)")
             
     elif 'posts_per_category' in result:
         print("\nPosts per category:")
@@ -138,6 +312,12 @@ def display_results(result: Dict[str, Any]):
 def main():
     """Main CLI function."""
     parser = argparse.ArgumentParser(description="Solana Forum MCP CLI")
+    parser.add_argument("--low-memory", action="store_true", default=None,
+                        help="Keep a compact post store and a float32, pruned search index")
+    parser.add_argument("--search-workers", type=int, default=None,
+                        help="Worker processes for sharded semantic search (0 searches in-process)")
+    parser.add_argument("--dataset", default=None,
+                        help="Dataset to query (a JSON file in the processed data directory, without .json)")
     
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
@@ -150,35 +330,135 @@ def main():
     latest_parser = subparsers.add_parser("latest", help="Get the latest posts")
     latest_parser.add_argument("--category", "-c", help="Category to filter by")
     latest_parser.add_argument("--limit", "-l", type=int, default=5, help="Maximum number of posts to return")
+    latest_parser.add_argument("--dedup", "-d", action="store_true", help="Collapse near-duplicate posts into one result")
     
     # Most viewed posts parser
     viewed_parser = subparsers.add_parser("most-viewed", help="Get the most viewed posts")
     viewed_parser.add_argument("--category", "-c", help="Category to filter by")
     viewed_parser.add_argument("--limit", "-l", type=int, default=5, help="Maximum number of posts to return")
+    viewed_parser.add_argument("--dedup", "-d", action="store_true", help="Collapse near-duplicate posts into one result")
     
     # Most commented posts parser
     commented_parser = subparsers.add_parser("most-commented", help="Get posts with the most comments")
+    commented_parser.add_argument("--category", "-c", help="Category to filter by")
     commented_parser.add_argument("--limit", "-l", type=int, default=5, help="Maximum number of posts to return")
+    commented_parser.add_argument("--dedup", "-d", action="store_true", help="Collapse near-duplicate posts into one result")
+    
+    # Date window parsers
+    between_parser = subparsers.add_parser("between", help="Get posts created within a date window")
+    between_parser.add_argument("start", help="Start of the window (ISO date or datetime)")
+    between_parser.add_argument("end", nargs="?", help="End of the window, inclusive for dates (default: open)")
+    between_parser.add_argument("--category", "-c", help="Category to filter by")
+    between_parser.add_argument("--limit", "-l", type=int, default=20, help="Maximum number of posts to return")
+    between_parser.add_argument("--dedup", "-d", action="store_true", help="Collapse near-duplicate posts into one result")
+    
+    since_parser = subparsers.add_parser("since", help="Get posts created in the last N days")
+    since_parser.add_argument("days", type=float, help="Number of days to look back")
+    since_parser.add_argument("--category", "-c", help="Category to filter by")
+    since_parser.add_argument("--limit", "-l", type=int, default=20, help="Maximum number of posts to return")
+    since_parser.add_argument("--dedup", "-d", action="store_true", help="Collapse near-duplicate posts into one result")
     
     # Statistics parser
     subparsers.add_parser("stats", help="Get forum statistics")
     
+    # Analytics parser
+    analytics_parser = subparsers.add_parser("analytics", help="Get time-bucketed forum analytics")
+    analytics_parser.add_argument("--period", "-p", choices=["week", "month"], default="week", help="Bucket size")
+    analytics_parser.add_argument("--category", "-c", help="Category to filter by")
+    analytics_parser.add_argument("--metric", "-m", choices=["activity", "authors", "reply_latency"], help="Only show one section")
+    
+    # Author parsers
+    author_parser = subparsers.add_parser("author", help="Get the posts a user started and commented on")
+    author_parser.add_argument("name", help="The username")
+    author_parser.add_argument("--summary", "-s", action="store_true", help="Show a summary of the user's activity instead")
+    author_parser.add_argument("--limit", "-l", type=int, default=20, help="Maximum number of posts to return")
+    
+    top_authors_parser = subparsers.add_parser("top-authors", help="Rank users by activity")
+    top_authors_parser.add_argument("--metric", "-m", choices=["posts", "comments", "views"], default="posts", help="Activity to rank by")
+    top_authors_parser.add_argument("--period", "-p", help="day, week, month, quarter, year or a number of days (default: all time)")
+    top_authors_parser.add_argument("--category", "-c", help="Category to filter by")
+    top_authors_parser.add_argument("--limit", "-l", type=int, default=10, help="Maximum number of users to return")
+    
+    # Topics parser
+    topics_parser = subparsers.add_parser("topics", help="Show the main themes among posts")
+    topics_parser.add_argument("--category", "-c", help="Category to filter by")
+    topics_parser.add_argument("--period", "-p", help="day, week, month, quarter, year or a number of days (default: all time)")
+    topics_parser.add_argument("--limit", "-l", type=int, default=10, help="Maximum number of topics to return")
+    
     # Search parser
     search_parser = subparsers.add_parser("search", help="Perform semantic search")
     search_parser.add_argument("text", help="The search query")
     search_parser.add_argument("--limit", "-l", type=int, default=5, help="Maximum number of posts to return")
+    search_parser.add_argument("--dedup", "-d", action="store_true", help="Collapse near-duplicate posts into one result")
+    search_parser.add_argument("--fuzzy", "-f", action="store_true", help="Correct misspelt words before searching")
+    
+    # Comment search parser
+    comments_parser = subparsers.add_parser("comments", help="Search comment threads for matching passages")
+    comments_parser.add_argument("text", help="The search query")
+    comments_parser.add_argument("--category", "-c", help="Filter by category")
+    comments_parser.add_argument("--limit", "-l", type=int, default=5, help="Maximum number of passages to return")
+    
+    # Suggest parser
+    suggest_parser = subparsers.add_parser("suggest", help="Suggest posts from a title prefix")
+    suggest_parser.add_argument("prefix", help="The text typed so far")
+    suggest_parser.add_argument("--limit", "-l", type=int, default=8, help="Maximum number of posts to return")
+    
+    # Duplicates parser
+    duplicates_parser = subparsers.add_parser("duplicates", help="Find clusters of near-duplicate posts")
+    duplicates_parser.add_argument("--category", "-c", help="Only clusters with a post in this category")
+    duplicates_parser.add_argument("--threshold", "-t", type=float, help="Minimum similarity between 0.5 and 1.0 (default: 0.8)")
+    duplicates_parser.add_argument("--limit", "-l", type=int, default=20, help="Maximum number of clusters to return")
     
     # Categories parser
     subparsers.add_parser("categories", help="List all categories")
     
+    # Datasets parser
+    subparsers.add_parser("datasets", help="List the datasets that can be queried")
+    
+    # Snapshots parser
+    snapshots_parser = subparsers.add_parser("snapshots", help="List the recorded versions of the dataset")
+    snapshots_parser.add_argument("--record", action="store_true", help="Record the current dataset as a new version first")
+    
+    # Diff parser
+    diff_parser = subparsers.add_parser("diff", help="Show what changed in the dataset since a snapshot version")
+    diff_parser.add_argument("since", help="The older snapshot version")
+    diff_parser.add_argument("--until", "-u", help="The newer snapshot version (default: latest)")
+    diff_parser.add_argument("--limit", "-l", type=int, default=20, help="Maximum number of entries per kind of change")
+    
     # Category posts parser (NEW)
     category_parser = subparsers.add_parser("category", help="Get all posts from a specific category")
     category_parser.add_argument("name", help="The category name")
     category_parser.add_argument("--limit", "-l", type=int, default=20, help="Maximum number of posts to return")
+    category_parser.add_argument("--dedup", "-d", action="store_true", help="Collapse near-duplicate posts into one result")
     
     # Post evaluation parser (NEW)
     evaluate_parser = subparsers.add_parser("evaluate", help="Evaluate a post from different perspectives")
     evaluate_parser.add_argument("post_id", type=int, help="The ID of the post to evaluate")
+    evaluate_parser.add_argument("--refresh", action="store_true", help="Ignore cached evaluations of the post")
+    
+    # Bulk evaluation parser
+    bulk_parser = subparsers.add_parser("evaluate-bulk", help="Evaluate whole categories or lists of posts")
+    bulk_parser.add_argument("--category", "-c", action="append", help="Category to evaluate (repeatable)")
+    bulk_parser.add_argument("--ids", help="Comma-separated post IDs to evaluate")
+    bulk_parser.add_argument("--resume", metavar="JOB_ID", help="Resume an interrupted job")
+    bulk_parser.add_argument("--concurrency", type=int, help="Posts evaluated at once (default: 4)")
+    bulk_parser.add_argument("--rpm", type=float, help="Requests per minute budget (default: 500)")
+    bulk_parser.add_argument("--tpm", type=float, help="Tokens per minute budget (default: 200000)")
+    
+    # Top scored posts parser
+    top_scored_parser = subparsers.add_parser("top-scored", help="Get the highest-scoring evaluated posts")
+    top_scored_parser.add_argument("--category", "-c", help="Filter by category")
+    top_scored_parser.add_argument("--limit", "-l", type=int, default=10, help="Maximum number of posts to return")
+    
+    # Evaluation cache parser
+    cache_parser = subparsers.add_parser("evaluation-cache", help="Show or clear cached post evaluations")
+    cache_parser.add_argument("--clear", action="store_true", help="Delete cached evaluations")
+    cache_parser.add_argument("--post-id", type=int, help="With --clear, only delete this post's evaluations")
+    
+    # Related posts parser
+    related_parser = subparsers.add_parser("related", help="Get the posts most similar to a post")
+    related_parser.add_argument("post_id", type=int, help="The ID of the post")
+    related_parser.add_argument("--limit", "-l", type=int, default=5, help="Maximum number of posts to return")
     
     # Interactive mode
     subparsers.add_parser("interactive", help="Start interactive mode")
@@ -186,11 +466,35 @@ def main():
     # Parse arguments
     args = parser.parse_args()
     
-    # Initialize the MCP server
-    print("Initializing MCP server...")
     # Get OpenAI API key from environment variable
     openai_api_key = os.environ.get("OPENAI_API_KEY")
-    server = SolanaForumMCPServer(openai_api_key=openai_api_key)
+    registry = EngineRegistry(openai_api_key=openai_api_key, low_memory=args.low_memory,
+                              search_workers=args.search_workers)
+    
+    if args.command == "datasets":
+        print("\nAvailable datasets:")
+        for i, name in enumerate(registry.available()):
+            default = " (default)" if name == registry.default_dataset else ""
+            print(f"{i+1}. {name}{default}")
+        return
+    
+    if args.command == "snapshots":
+        dataset = args.dataset or registry.default_dataset
+        store = SnapshotStore(dataset)
+        if args.record:
+            store.write(load_json(dataset))
+        print(f"\nSnapshots of {dataset}:")
+        for i, entry in enumerate(store.versions()):
+            print(f"{i+1}. {entry['version']} ({entry['topics']} topics, recorded {entry['created_at']})")
+        return
+    
+    # Initialize the MCP server
+    print("Initializing MCP server...")
+    try:
+        server = registry.get(args.dataset)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     
     # Process the command
     if args.command == "query":
@@ -198,37 +502,105 @@ def main():
         display_results(result)
         
     elif args.command == "latest":
-        result = server.get_latest_posts(args.category, args.limit)
+        result = server.get_latest_posts(args.category, args.limit, args.dedup)
         display_results(result)
         
     elif args.command == "most-viewed":
-        result = server.get_most_viewed_posts(args.category, args.limit)
+        result = server.get_most_viewed_posts(args.category, args.limit, args.dedup)
         display_results(result)
         
     elif args.command == "most-commented":
-        result = server.get_most_commented_posts(args.limit)
+        result = server.get_most_commented_posts(args.limit, args.category, args.dedup)
+        display_results(result)
+        
+    elif args.command == "between":
+        result = server.posts_between(args.start, args.end, args.category, args.limit, args.dedup)
+        display_results(result)
+        
+    elif args.command == "since":
+        result = server.posts_since(args.days, args.category, args.limit, args.dedup)
         display_results(result)
         
     elif args.command == "stats":
         result = server.get_forum_statistics()
         display_results(result)
         
+    elif args.command == "analytics":
+        result = server.get_forum_analytics(args.period, args.category, args.metric)
+        display_results(result)
+        
+    elif args.command == "author":
+        if args.summary:
+            result = server.get_author_summary(args.name)
+        else:
+            result = server.get_posts_by_author(args.name, args.limit)
+        display_results(result)
+        
+    elif args.command == "top-authors":
+        result = server.top_authors(args.metric, args.category, args.period, args.limit)
+        display_results(result)
+        
+    elif args.command == "topics":
+        result = server.get_topics(args.category, args.period, args.limit)
+        display_results(result)
+        
     elif args.command == "search":
-        result = server.semantic_search(args.text, args.limit)
+        result = server.semantic_search(args.text, args.limit, dedup=args.dedup, fuzzy=args.fuzzy)
+        display_results(result)
+        
+    elif args.command == "comments":
+        result = server.search_comments(args.text, args.limit, args.category)
+        display_results(result)
+        
+    elif args.command == "suggest":
+        result = server.suggest(args.prefix, args.limit)
+        display_results(result)
+        
+    elif args.command == "duplicates":
+        result = server.find_duplicates(args.category, args.threshold, args.limit)
+        display_results(result)
+        
+    elif args.command == "diff":
+        result = server.diff(args.since, args.until, args.limit)
         display_results(result)
         
     elif args.command == "categories":
-        categories = list(server.data.keys())
+        categories = list(server.categories)
         print("\nAvailable categories:")
         for i, category in enumerate(categories):
             print(f"{i+1}. {category}")
     
     elif args.command == "category":
-        result = server.get_posts_by_category(args.name, args.limit)
+        result = server.get_posts_by_category(args.name, args.limit, args.dedup)
         display_results(result)
         
     elif args.command == "evaluate":
-        result = server.evaluate_post(args.post_id)
+        result = server.evaluate_post(args.post_id, args.refresh)
+        display_results(result)
+        
+    elif args.command == "evaluate-bulk":
+        try:
+            with BulkEvaluator(server, requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                               concurrency=args.concurrency) as bulk:
+                post_ids = [int(post_id) for post_id in args.ids.split(',') if post_id.strip()] if args.ids else None
+                job_id = args.resume or bulk.start(args.category, post_ids)
+                result = bulk.run(job_id)
+        except KeyError:
+            result = {'query_type': 'bulk_evaluation', 'error': f"Job {args.resume} not found"}
+        except ValueError as e:
+            result = {'query_type': 'bulk_evaluation', 'error': str(e)}
+        display_results(result)
+        
+    elif args.command == "top-scored":
+        result = server.get_top_scored_posts(args.category, args.limit)
+        display_results(result)
+        
+    elif args.command == "evaluation-cache":
+        result = server.evaluation_cache(args.clear, args.post_id)
+        display_results(result)
+        
+    elif args.command == "related":
+        result = server.get_related_posts(args.post_id, args.limit)
         display_results(result)
             
     elif args.command == "interactive":
@@ -240,6 +612,8 @@ def main():
         print("- Show me forum statistics")
         print("- Tell me about Solana validators")
         print("- Give me all posts on Governance")
+        print("- Governance posts from the last 90 days")
+        print("- Who are the most active users this year?")
         print("- For this post id 123, give me its evaluation")
         
         while True:
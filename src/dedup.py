@@ -0,0 +1,225 @@
+"""
+Near-duplicate detection for the Solana Forum MCP server.
+
+Posts are reduced to MinHash signatures over word shingles of their title
+and description, and the signatures are bucketed with locality-sensitive
+hashing (banding). Only posts that share a bucket are compared, so finding
+near-duplicate clusters takes roughly linear time instead of comparing all
+pairs.
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Modulus and hash range of the universal hash family used for permutations
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Similarity at or above which two posts count as near-duplicates by default
+DEFAULT_THRESHOLD = 0.8
+
+# Lowest similarity a stored candidate pair may have; queries can lower the
+# default threshold down to this without rebuilding the index
+MIN_THRESHOLD = 0.5
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """
+    Split text into overlapping word shingles.
+
+    Args:
+        text: Text to shingle
+        size: Number of words per shingle
+
+    Returns:
+        List of shingles; texts shorter than ``size`` words yield one shingle
+    """
+    words = TOKEN_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+class _DisjointSet:
+    """Union-find over post positions for grouping duplicate pairs."""
+
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+
+    def find(self, item: int) -> int:
+        root = self.parent.setdefault(item, item)
+        while root != self.parent[root]:
+            root = self.parent[root]
+        while item != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with banded LSH over a fixed set of documents.
+    """
+
+    def __init__(self, texts: Sequence[str], num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 3, seed: int = 1):
+        """
+        Build signatures and LSH buckets for a list of documents.
+
+        Args:
+            texts: Document texts; positions in this list identify documents
+            num_perm: Number of hash permutations per signature
+            bands: Number of LSH bands (must divide ``num_perm``)
+            shingle_size: Number of words per shingle
+            seed: Seed for the permutation parameters
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = generator.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+        self.signatures = np.vstack([self._signature(shingles(text, shingle_size)) for text in texts]) \
+            if len(texts) else np.empty((0, num_perm), dtype=np.uint64)
+        self.empty = np.array([not shingles(text, shingle_size) for text in texts], dtype=bool)
+        self.pairs = self._candidate_pairs()
+
+    def _signature(self, document_shingles: List[str]) -> np.ndarray:
+        """Compute the MinHash signature of one document's shingles."""
+        if not document_shingles:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in set(document_shingles)),
+            dtype=np.uint64
+        )
+        # Universal hashing (a*x + b) mod p, one column per permutation;
+        # uint64 overflow wraps, which only perturbs the hash family
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def _candidate_pairs(self) -> Dict[Tuple[int, int], float]:
+        """
+        Find pairs sharing at least one LSH bucket and estimate their similarity.
+
+        Returns:
+            Mapping of (i, j) with i < j to estimated Jaccard similarity, for
+            pairs at or above MIN_THRESHOLD
+        """
+        candidates = set()
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = {}
+            columns = self.signatures[:, band * self.rows:(band + 1) * self.rows]
+            for position, row in enumerate(columns):
+                if not self.empty[position]:
+                    buckets.setdefault(row.tobytes(), []).append(position)
+            for members in buckets.values():
+                for i in range(len(members)):
+                    for j in range(i + 1, len(members)):
+                        candidates.add((members[i], members[j]))
+
+        pairs = {}
+        for i, j in candidates:
+            similarity = float(np.mean(self.signatures[i] == self.signatures[j]))
+            if similarity >= MIN_THRESHOLD:
+                pairs[(i, j)] = similarity
+        return pairs
+
+    def clusters(self, threshold: float = DEFAULT_THRESHOLD,
+                 positions: Optional[Iterable[int]] = None) -> List[List[int]]:
+        """
+        Group documents into near-duplicate clusters.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity (not below MIN_THRESHOLD)
+            positions: Optional subset of documents to cluster
+
+        Returns:
+            Clusters of two or more positions, each sorted, largest first
+        """
+        allowed = set(positions) if positions is not None else None
+        groups = _DisjointSet()
+        for (i, j), similarity in self.pairs.items():
+            if similarity < threshold:
+                continue
+            if allowed is not None and (i not in allowed or j not in allowed):
+                continue
+            groups.union(i, j)
+
+        members: Dict[int, List[int]] = {}
+        for position in list(groups.parent):
+            members.setdefault(groups.find(position), []).append(position)
+
+        return sorted((sorted(m) for m in members.values()), key=lambda m: (-len(m), m[0]))
+
+    def similarity(self, i: int, j: int) -> float:
+        """Estimate the Jaccard similarity of two documents from their signatures."""
+        return float(np.mean(self.signatures[i] == self.signatures[j]))
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate clusters of the server's posts, ready for deduplication.
+    """
+
+    def __init__(self, texts: Sequence[str], threshold: float = DEFAULT_THRESHOLD):
+        """
+        Build the LSH index and the default clusters.
+
+        Args:
+            texts: Title and description text of each post, by position
+            threshold: Similarity used for deduplicating results
+        """
+        self.lsh = MinHashLSH(texts)
+        self.threshold = threshold
+        self.clusters = self.lsh.clusters(threshold)
+
+        # Every position maps to the first (oldest) member of its cluster
+        self.representative = np.arange(len(texts), dtype=np.int64)
+        self.members: Dict[int, List[int]] = {}
+        for cluster in self.clusters:
+            self.representative[cluster] = cluster[0]
+            self.members[cluster[0]] = cluster
+
+    def dedupe(self, positions: Iterable[int], limit: Optional[int] = None) -> List[int]:
+        """
+        Keep only the first position seen from each near-duplicate cluster.
+
+        Args:
+            positions: Post positions in result order
+            limit: Optional maximum number of positions to keep
+
+        Returns:
+            Deduplicated positions in the original order
+        """
+        seen = set()
+        kept = []
+        for position in positions:
+            key = self.representative[position]
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(int(position))
+            if limit is not None and len(kept) >= limit:
+                break
+        return kept
+
+    def duplicates_of(self, position: int) -> List[int]:
+        """Get the other members of a post's near-duplicate cluster."""
+        cluster = self.members.get(int(self.representative[position]), [])
+        return [p for p in cluster if p != position]
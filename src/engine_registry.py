@@ -0,0 +1,155 @@
+"""
+Registry of search engines, one per dataset, for the Solana Forum MCP server.
+
+Datasets are the JSON files in the processed data directory, named without
+their extension. Engines are built on first use and kept in
+least-recently-used order; once the estimated memory of the loaded engines
+exceeds the budget, the least recently used ones are dropped. Engines are
+immutable once built, so one engine serves every thread, and engines
+preloaded before a server forks its workers are shared by them
+copy-on-write. Persisted indexes are content-addressed in the index
+directory, so every process and every dataset reuses them.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.mcp_server import SolanaForumMCPServer
+from src.utils import PROCESSED_DATA_DIR, deep_size
+
+DEFAULT_DATASET = os.environ.get("DEFAULT_DATASET") or "solana_forum_posts"
+
+
+class EngineRegistry:
+    """
+    Loads dataset engines on demand and evicts the least recently used.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None, default_dataset: Optional[str] = None,
+                 **engine_options: Any):
+        """
+        Args:
+            memory_budget_mb: Estimated memory the loaded engines may use, in
+                              MB; 0 means no limit. Defaults to the
+                              ENGINE_MEMORY_BUDGET_MB environment variable.
+            default_dataset: Dataset used when none is named. Defaults to the
+                             DEFAULT_DATASET environment variable.
+            **engine_options: Keyword arguments for every SolanaForumMCPServer
+                              (openai_api_key, low_memory, search_workers, ...)
+        """
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.environ.get("ENGINE_MEMORY_BUDGET_MB") or 0)
+        self.memory_budget = int(memory_budget_mb * 1e6)
+        self.default_dataset = default_dataset or DEFAULT_DATASET
+        self.engine_options = engine_options
+
+        self._engines: 'OrderedDict[str, SolanaForumMCPServer]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def available(self) -> List[str]:
+        """Get the names of the datasets that can be loaded."""
+        return sorted(path.stem for path in Path(PROCESSED_DATA_DIR).glob('*.json'))
+
+    def loaded(self) -> Dict[str, int]:
+        """Get the loaded datasets, most recently used first, with their estimated sizes in bytes."""
+        with self._lock:
+            return {name: self._sizes[name] for name in reversed(self._engines)}
+
+    def get(self, name: Optional[str] = None) -> SolanaForumMCPServer:
+        """
+        Get the engine of a dataset, building it on first use.
+
+        Concurrent requests for a dataset that is being built wait for that
+        build; other datasets are served meanwhile.
+
+        Args:
+            name: Dataset name (the default dataset when None)
+
+        Returns:
+            The dataset's engine
+
+        Raises:
+            ValueError: If no such dataset exists
+        """
+        name = name or self.default_dataset
+        with self._lock:
+            engine = self._engines.get(name)
+            if engine is not None:
+                self._engines.move_to_end(name)
+                return engine
+            if name not in self.available():
+                raise ValueError(f"Unknown dataset '{name}'. Available datasets: {', '.join(self.available())}")
+            loading = self._loading.setdefault(name, threading.Lock())
+
+        with loading:
+            with self._lock:
+                engine = self._engines.get(name)
+                if engine is not None:
+                    self._engines.move_to_end(name)
+                    return engine
+
+            print(f"Loading dataset '{name}'")
+            engine = SolanaForumMCPServer(data_file=name, **self.engine_options)
+            size = deep_size(engine)
+
+            with self._lock:
+                self._engines[name] = engine
+                self._sizes[name] = size
+                self._loading.pop(name, None)
+                self._evict(keep=name)
+            return engine
+
+    def preload(self, names: Optional[Iterable[str]] = None):
+        """
+        Build engines up front, e.g. before a server forks its workers.
+
+        Args:
+            names: Datasets to load. Defaults to the default dataset plus the
+                   comma-separated PRELOAD_DATASETS environment variable.
+        """
+        if names is None:
+            names = [self.default_dataset] + [
+                name.strip() for name in os.environ.get("PRELOAD_DATASETS", "").split(',') if name.strip()
+            ]
+        for name in dict.fromkeys(names):
+            self.get(name)
+
+    def _evict(self, keep: str):
+        """Drop least recently used engines until the loaded ones fit the budget (lock held)."""
+        if not self.memory_budget:
+            return
+        for name in list(self._engines):
+            if sum(self._sizes.values()) <= self.memory_budget:
+                break
+            if name == keep:
+                continue
+            # Requests still using the engine keep it alive until they finish
+            del self._engines[name]
+            size = self._sizes.pop(name)
+            print(f"Evicted dataset '{name}' ({size / 1e6:.1f} MB) to stay within "
+                  f"the {self.memory_budget / 1e6:.0f} MB engine budget")
+        if sum(self._sizes.values()) > self.memory_budget:
+            print(f"Dataset '{keep}' alone exceeds the {self.memory_budget / 1e6:.0f} MB engine budget")
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Describe the available and loaded datasets.
+
+        Returns:
+            Dictionary with the default dataset, available datasets, loaded
+            datasets with their estimated sizes in MB, and the budget
+        """
+        loaded = self.loaded()
+        return {
+            'query_type': 'datasets',
+            'default': self.default_dataset,
+            'available': self.available(),
+            'loaded': {name: round(size / 1e6, 2) for name, size in loaded.items()},
+            'memory_budget_mb': self.memory_budget / 1e6 if self.memory_budget else None,
+            'count': len(loaded)
+        }
@@ -0,0 +1,493 @@
+"""
+Multi-perspective post evaluation for the Solana Forum MCP server.
+
+A post is scored from several perspectives, one chat completion each. The
+completions are independent, so they are requested concurrently from a
+bounded thread pool over one pooled HTTP session: an evaluation takes about
+as long as its slowest completion instead of the sum of all of them. Every
+request has connect and read timeouts, so a stalled completion costs one
+timeout rather than hanging the evaluation.
+
+In the default combined mode one completion scores every perspective at
+once against a strict JSON schema, sending the post once instead of once per
+perspective. Perspectives missing from the reply or failing validation are
+then requested on their own, concurrently as above.
+
+Successful evaluations are kept in an EvaluationCache and looked up before
+any request, so an unchanged post is evaluated by the model only once.
+Rate-limited (429) and server error responses are retried with exponential
+backoff, honouring Retry-After, and an optional RateLimiter keeps requests
+within a per-minute request and token budget.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.evaluation_cache import EvaluationCache, post_content_hash
+from src.rate_limit import RateLimiter
+
+PERSPECTIVES = (
+    "technical innovation",
+    "ecosystem growth",
+    "community benefit",
+    "economic sustainability",
+    "decentralization"
+)
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+# Evaluation modes: one completion for all perspectives, or one per perspective
+COMBINED = "combined"
+SEPARATE = "separate"
+MODES = (COMBINED, SEPARATE)
+
+# Models that accept a strict json_schema response format; others are asked
+# for a JSON object and the schema is enforced by the parser alone
+STRUCTURED_OUTPUT_MODELS = ('gpt-4o', 'gpt-4.1', 'gpt-5', 'o1', 'o3', 'o4')
+
+# Seconds to wait for a connection, and for a completion once connected
+CONNECT_TIMEOUT = 5.0
+DEFAULT_TIMEOUT = 30.0
+
+# Retries of a rate-limited or failed request, and the backoff before the
+# first retry in seconds (doubled for each further retry, at most MAX_BACKOFF)
+DEFAULT_RETRIES = 2
+BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+# Characters per token when estimating a request's tokens for the rate limiter
+CHARS_PER_TOKEN = 4
+
+# Score given to a perspective whose evaluation failed
+FALLBACK_SCORE = 0.5
+
+# Error reported when evaluations are requested without an API key
+MISSING_API_KEY = ("OpenAI API key not provided. Set the OPENAI_API_KEY environment variable "
+                   "or pass it to the constructor.")
+
+# Bumped whenever the prompts change, so cached evaluations of the old
+# prompts are no longer used
+PROMPT_VERSION = 1
+
+SYSTEM_PROMPT = "You are an expert evaluator of Solana blockchain forum posts."
+
+PROMPT_TEMPLATE = """
+        Please evaluate the following Solana forum post from the perspective of {perspective}.
+
+        {post_content}
+
+        Evaluate on a scale of 0.0 to 1.0, where:
+        - 0.0 means the post has no value or is harmful from this perspective
+        - 0.5 means the post has moderate value from this perspective
+        - 1.0 means the post has exceptional value from this perspective
+
+        Provide your evaluation in the following format:
+        Score: [numerical score between 0.0 and 1.0]
+        Explanation: [your explanation for the score]
+        """
+
+COMBINED_PROMPT_TEMPLATE = """
+        Please evaluate the following Solana forum post from each of these perspectives.
+
+        Perspectives: {perspectives}
+
+        {post_content}
+
+        For each perspective, score the post on a scale of 0.0 to 1.0, where:
+        - 0.0 means the post has no value or is harmful from this perspective
+        - 0.5 means the post has moderate value from this perspective
+        - 1.0 means the post has exceptional value from this perspective
+
+        Reply with a JSON object with one key per perspective ({keys}), each
+        holding an object with a numeric "score" and a short "explanation".
+        """
+
+
+def perspective_key(perspective: str) -> str:
+    """JSON key of a perspective, e.g. "ecosystem growth" -> "ecosystem_growth"."""
+    return re.sub(r'\W+', '_', perspective.strip().lower())
+
+
+def evaluation_schema(perspectives: Sequence[str]) -> Dict[str, Any]:
+    """
+    JSON schema of a combined evaluation.
+
+    Args:
+        perspectives: Perspectives the reply must score
+
+    Returns:
+        Schema requiring a score and explanation for every perspective
+    """
+    entry = {
+        'type': 'object',
+        'properties': {'score': {'type': 'number'}, 'explanation': {'type': 'string'}},
+        'required': ['score', 'explanation'],
+        'additionalProperties': False
+    }
+    keys = [perspective_key(perspective) for perspective in perspectives]
+    return {
+        'type': 'object',
+        'properties': {key: entry for key in keys},
+        'required': keys,
+        'additionalProperties': False
+    }
+
+
+def parse_combined_evaluation(content: str, perspectives: Sequence[str]) -> Dict[str, Tuple[float, str]]:
+    """
+    Validate a combined evaluation against its schema.
+
+    Entries are checked one by one, so a reply with a bad entry still
+    yields the good ones.
+
+    Args:
+        content: Completion text holding the JSON object
+        perspectives: Perspectives the reply should score
+
+    Returns:
+        Dictionary mapping each valid perspective to (score, explanation);
+        perspectives that are missing, have a non-numeric or out-of-range
+        score, or an empty explanation are left out
+    """
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        # Models without a JSON response format may wrap the object in prose
+        match = re.search(r'\{.*\}', content or '', re.DOTALL)
+        try:
+            data = json.loads(match.group(0)) if match else None
+        except ValueError:
+            data = None
+    if not isinstance(data, dict):
+        return {}
+
+    evaluations = {}
+    for perspective in perspectives:
+        entry = data.get(perspective_key(perspective))
+        if not isinstance(entry, dict):
+            continue
+        score, explanation = entry.get('score'), entry.get('explanation')
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0.0 <= score <= 1.0:
+            continue
+        if not isinstance(explanation, str) or not explanation.strip():
+            continue
+        evaluations[perspective] = (float(score), explanation.strip())
+    return evaluations
+
+
+def parse_score(content: str) -> Optional[float]:
+    """
+    Read the score from a completion.
+
+    Args:
+        content: Completion text in the "Score: ... Explanation: ..." format
+
+    Returns:
+        The score clamped to [0, 1], or None when the text has no valid score
+    """
+    score_match = re.search(r'Score:\s*([\d.]+)', content)
+    if not score_match:
+        return None
+    try:
+        return max(0.0, min(1.0, float(score_match.group(1))))
+    except ValueError:
+        return None
+
+
+def parse_evaluation(content: str) -> Tuple[float, str]:
+    """
+    Read the score and explanation from a completion.
+
+    Args:
+        content: Completion text in the "Score: ... Explanation: ..." format
+
+    Returns:
+        Tuple of (score clamped to [0, 1], explanation); the score falls back
+        to FALLBACK_SCORE and the explanation to the whole text when missing
+    """
+    score = parse_score(content)
+    explanation_match = re.search(r'Explanation:\s*(.*)', content, re.DOTALL)
+    explanation = explanation_match.group(1).strip() if explanation_match else content
+    return FALLBACK_SCORE if score is None else score, explanation
+
+
+class PostEvaluator:
+    """
+    Scores posts from several perspectives with concurrent chat completions.
+    """
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None, model: Optional[str] = None,
+                 timeout: Optional[float] = None, max_workers: Optional[int] = None,
+                 perspectives: Sequence[str] = PERSPECTIVES, mode: Optional[str] = None,
+                 cache: Optional[EvaluationCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 max_retries: Optional[int] = None):
+        """
+        Args:
+            api_key: OpenAI API key
+            base_url: API base URL (defaults to the OPENAI_BASE_URL environment
+                      variable, then the OpenAI API)
+            model: Chat model (defaults to the OPENAI_MODEL environment variable)
+            timeout: Seconds to wait for one completion (defaults to the
+                     EVALUATION_TIMEOUT environment variable)
+            max_workers: Completions requested at once (defaults to one per
+                         perspective)
+            perspectives: Perspectives a post is evaluated from
+            mode: "combined" or "separate" (defaults to the EVALUATION_MODE
+                  environment variable, then "combined")
+            cache: Store of earlier evaluations; None evaluates every time
+            rate_limiter: Request and token budget shared with other evaluators
+            max_retries: Retries of a request answered with 429, a server
+                         error or a dropped connection (defaults to the
+                         EVALUATION_RETRIES environment variable)
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        mode = mode or os.environ.get("EVALUATION_MODE") or COMBINED
+        if mode not in MODES:
+            raise ValueError(f"Unknown evaluation mode '{mode}'. Use one of: {', '.join(MODES)}")
+        self.mode = mode
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        if max_retries is None:
+            max_retries = int(os.environ.get("EVALUATION_RETRIES") or DEFAULT_RETRIES)
+        self.max_retries = max_retries
+        self.api_key = api_key
+        self.base_url = (base_url or os.environ.get("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip('/')
+        self.model = model or os.environ.get("OPENAI_MODEL") or DEFAULT_MODEL
+        if timeout is None:
+            timeout = float(os.environ.get("EVALUATION_TIMEOUT") or DEFAULT_TIMEOUT)
+        self.timeout = (min(CONNECT_TIMEOUT, timeout), timeout)
+        self.perspectives = tuple(perspectives)
+        self.max_workers = max_workers or len(self.perspectives)
+
+        # One keep-alive connection per worker, reused across evaluations
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        })
+        # Threads are started on first use, so building an evaluator before
+        # a server forks its workers is safe
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='evaluation')
+
+        # Requests and tokens spent, across all evaluations
+        self.usage: Counter = Counter()
+        self._usage_lock = threading.Lock()
+
+    def evaluate(self, post_content: str) -> Dict[str, Dict[str, object]]:
+        """
+        Evaluate a post from every perspective.
+
+        Cached evaluations are used first. In combined mode the remaining
+        perspectives are scored by one completion and only those it fails to
+        score are requested separately; in separate mode every remaining
+        perspective is requested on its own. Separate requests run
+        concurrently.
+
+        Args:
+            post_content: Title and description of the post
+
+        Returns:
+            Dictionary mapping each perspective to its score, explanation,
+            whether it came from the cache and whether its evaluation failed,
+            in perspective order
+        """
+        content_hash = post_content_hash(post_content)
+        cached = {}
+        if self.cache is not None:
+            cached = self.cache.get(content_hash, self.perspectives, self.model, PROMPT_VERSION)
+        missing = [perspective for perspective in self.perspectives if perspective not in cached]
+
+        fresh = {}
+        if missing and self.mode == COMBINED:
+            fresh = self.evaluate_combined(post_content, missing)
+        futures = {
+            perspective: self._executor.submit(self._evaluate_perspective, post_content, perspective)
+            for perspective in missing if perspective not in fresh
+        }
+        failed = {}
+        for perspective, future in futures.items():
+            score, explanation, ok = future.result()
+            (fresh if ok else failed)[perspective] = (score, explanation)
+        if self.cache is not None:
+            self.cache.put(content_hash, fresh, self.model, PROMPT_VERSION)
+
+        evaluations = {}
+        for perspective in self.perspectives:
+            score, explanation = cached.get(perspective) or fresh.get(perspective) or failed[perspective]
+            evaluations[perspective] = {'score': score, 'explanation': explanation,
+                                        'cached': perspective in cached, 'failed': perspective in failed}
+        return evaluations
+
+    def evaluate_combined(self, post_content: str,
+                          perspectives: Optional[Sequence[str]] = None) -> Dict[str, Tuple[float, str]]:
+        """
+        Score several perspectives with one structured completion.
+
+        Args:
+            post_content: Title and description of the post
+            perspectives: Perspectives to score (defaults to all)
+
+        Returns:
+            Dictionary mapping each perspective that was scored validly to
+            (score, explanation); empty when the request failed
+        """
+        perspectives = list(perspectives or self.perspectives)
+        keys = [perspective_key(perspective) for perspective in perspectives]
+        if self.model.startswith(STRUCTURED_OUTPUT_MODELS):
+            response_format = {
+                'type': 'json_schema',
+                'json_schema': {'name': 'post_evaluation', 'strict': True,
+                                'schema': evaluation_schema(perspectives)}
+            }
+        else:
+            response_format = {'type': 'json_object'}
+        prompt = COMBINED_PROMPT_TEMPLATE.format(
+            perspectives='; '.join(perspectives), keys=', '.join(keys), post_content=post_content
+        )
+
+        content = self._complete(prompt, max_tokens=150 * len(perspectives), response_format=response_format)
+        if content is None:
+            return {}
+        return parse_combined_evaluation(content, perspectives)
+
+    def evaluate_perspective(self, post_content: str, perspective: str) -> Tuple[float, str]:
+        """
+        Evaluate a post from one perspective.
+
+        Args:
+            post_content: Title and description of the post
+            perspective: The perspective to evaluate from
+
+        Returns:
+            Tuple of (score, explanation); failures score FALLBACK_SCORE and
+            explain the error
+        """
+        score, explanation, _ = self._evaluate_perspective(post_content, perspective)
+        return score, explanation
+
+    def _evaluate_perspective(self, post_content: str, perspective: str) -> Tuple[float, str, bool]:
+        """Evaluate a post from one perspective, also telling whether the request succeeded."""
+        errors: List[str] = []
+        content = self._complete(PROMPT_TEMPLATE.format(perspective=perspective, post_content=post_content),
+                                 max_tokens=300, errors=errors)
+        if content is None:
+            return FALLBACK_SCORE, errors[0], False
+        # A reply without a score is a failure, so its fallback score is never cached
+        if parse_score(content) is None:
+            return FALLBACK_SCORE, f"Error evaluating post: the reply has no score: {content[:200]}", False
+        score, explanation = parse_evaluation(content)
+        return score, explanation, True
+
+    def _complete(self, prompt: str, max_tokens: int, response_format: Optional[Dict[str, Any]] = None,
+                  errors: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Request one chat completion and count its usage.
+
+        Waits for the rate limiter first, and retries 429 and 5xx responses
+        and dropped connections up to max_retries times; timeouts are not
+        retried.
+
+        Args:
+            prompt: User message
+            max_tokens: Completion token limit
+            response_format: Optional response format
+            errors: List the error message is appended to when the request fails
+
+        Returns:
+            The completion text, or None when the request failed
+        """
+        data = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens
+        }
+        if response_format:
+            data["response_format"] = response_format
+
+        estimated = len(SYSTEM_PROMPT + prompt) // CHARS_PER_TOKEN + max_tokens
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(estimated)
+
+            response = retry_after = None
+            try:
+                response = self.session.post(f"{self.base_url}/chat/completions", json=data, timeout=self.timeout)
+
+                if response.status_code == 200:
+                    result = response.json()
+                    usage = result.get("usage") or {}
+                    self._count(usage)
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.settle(estimated, usage.get("total_tokens") or 0)
+                    return result["choices"][0]["message"]["content"]
+
+                error = f"Error calling OpenAI API: {response.text}"
+                retryable = response.status_code == 429 or response.status_code >= 500
+                retry_after = response.headers.get("Retry-After")
+
+            except requests.Timeout:
+                error = f"Error evaluating post: no response within {self.timeout[1]:g} seconds"
+                retryable = False
+            except requests.ConnectionError as e:
+                error = f"Error evaluating post: {str(e)}"
+                retryable = True
+            except Exception as e:
+                error = f"Error evaluating post: {str(e)}"
+                retryable = False
+
+            self._count({'failures': 1})
+            if not retryable or attempt == self.max_retries:
+                break
+
+            delay = self._backoff(attempt, retry_after)
+            if self.rate_limiter is not None and response is not None and response.status_code == 429:
+                # The budget is shared, so every caller backs off
+                self.rate_limiter.pause(delay)
+            self._count({'retries': 1}, request=False)
+            time.sleep(delay)
+
+        if errors is not None:
+            errors.append(error)
+        return None
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before a retry: the server's Retry-After, else jittered exponential backoff."""
+        try:
+            if retry_after is not None:
+                return min(MAX_BACKOFF, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+        return min(MAX_BACKOFF, BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def _count(self, usage: Dict[str, int], request: bool = True):
+        """Add one request and its token usage to the running totals."""
+        with self._usage_lock:
+            self.usage['requests'] += request
+            for name in ('prompt_tokens', 'completion_tokens', 'failures', 'retries'):
+                self.usage[name] += usage.get(name) or 0
+
+    def close(self):
+        """Stop the worker threads and close pooled connections."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,166 @@
+"""
+Persistent cache of post evaluations for the Solana Forum MCP server.
+
+Each perspective's score and explanation is stored in SQLite under a hash of
+the post content, the perspective, the model and the prompt version, so an
+unchanged post is never sent to the model twice, an edited post misses, and
+changing the model or the prompts starts afresh without clearing anything.
+Failed evaluations are not cached. The database runs in WAL mode, so
+several server processes can read and write it at once.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.utils import get_data_directory
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    perspective TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version INTEGER NOT NULL,
+    score REAL NOT NULL,
+    explanation TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS evaluations_content ON evaluations (content_hash);
+"""
+
+
+def post_content_hash(post_content: str) -> str:
+    """Hash the evaluated text of a post."""
+    return hashlib.sha256(post_content.encode('utf-8')).hexdigest()
+
+
+class EvaluationCache:
+    """
+    SQLite store of perspective evaluations with hit and miss counts.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (defaults to evaluations.sqlite3 in the cache
+                  directory)
+        """
+        self.path = Path(path or Path(get_data_directory('cache')) / 'evaluations.sqlite3')
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    @staticmethod
+    def key(content_hash: str, perspective: str, model: str, prompt_version: int) -> str:
+        """Cache key of one perspective's evaluation of a post."""
+        return hashlib.sha256(f"{content_hash}\0{perspective}\0{model}\0{prompt_version}".encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, once per process (lock held)."""
+        # Connections must not cross a fork, so workers open their own
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(self.path.parent, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, content_hash: str, perspectives: Iterable[str], model: str,
+            prompt_version: int) -> Dict[str, Tuple[float, str]]:
+        """
+        Look up a post's cached evaluations.
+
+        Args:
+            content_hash: Hash of the post content
+            perspectives: Perspectives wanted
+            model: Model the evaluations must come from
+            prompt_version: Prompt version they must come from
+
+        Returns:
+            Dictionary mapping each cached perspective to (score, explanation)
+        """
+        perspectives = list(perspectives)
+        keys = {self.key(content_hash, perspective, model, prompt_version): perspective
+                for perspective in perspectives}
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT key, score, explanation FROM evaluations WHERE key IN ({','.join('?' * len(keys))})",
+                list(keys)
+            ).fetchall()
+            found = {keys[key]: (score, explanation) for key, score, explanation in rows}
+            self.hits += len(found)
+            self.misses += len(perspectives) - len(found)
+        return found
+
+    def put(self, content_hash: str, evaluations: Dict[str, Tuple[float, str]], model: str, prompt_version: int):
+        """
+        Store a post's evaluations.
+
+        Args:
+            content_hash: Hash of the post content
+            evaluations: Dictionary mapping perspectives to (score, explanation)
+            model: Model the evaluations come from
+            prompt_version: Prompt version they come from
+        """
+        if not evaluations:
+            return
+        now = time.time()
+        rows = [(self.key(content_hash, perspective, model, prompt_version), content_hash, perspective, model,
+                 prompt_version, score, explanation, now)
+                for perspective, (score, explanation) in evaluations.items()]
+        with self._lock:
+            self._connect().executemany("INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def invalidate(self, content_hash: Optional[str] = None, model: Optional[str] = None) -> int:
+        """
+        Delete cached evaluations.
+
+        Args:
+            content_hash: Only delete the evaluations of this post content
+            model: Only delete the evaluations from this model
+
+        Returns:
+            Number of evaluations deleted
+        """
+        conditions, params = [], []
+        if content_hash:
+            conditions.append("content_hash = ?")
+            params.append(content_hash)
+        if model:
+            conditions.append("model = ?")
+            params.append(model)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            return self._connect().execute(f"DELETE FROM evaluations{where}", params).rowcount
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Describe the cache.
+
+        Returns:
+            Dictionary with the stored evaluations and posts, and this
+            process's hits, misses and hit rate
+        """
+        with self._lock:
+            entries, posts = self._connect().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT content_hash) FROM evaluations"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'path': str(self.path),
+                'entries': entries,
+                'posts': posts,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None
+            }
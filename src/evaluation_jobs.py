@@ -0,0 +1,356 @@
+"""
+Background evaluation jobs for the Solana Forum MCP servers.
+
+Evaluating a post takes one or more model round trips, so serving it inside
+a request handler ties the handler up for seconds. Instead a job is
+submitted and returned at once, a small pool of worker threads runs the
+evaluations, and clients poll the job (optionally waiting for it to finish)
+or stream its status changes. Jobs for a post that is already queued or
+running are joined rather than queued again. The queue is bounded, so
+under sustained overload new jobs are refused instead of piling up, and
+finished jobs are kept for a while so their results can be fetched.
+
+Jobs run in the process that queued them. A server whose requests are
+spread over several processes (src.prefork) shares them through a SQLite
+table in the cache directory, where every job change is written, so any
+process can report, long-poll or stream a job queued by another.
+"""
+
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from src.utils import get_data_directory
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED = (DONE, FAILED)
+
+# Evaluations run at once, and jobs that may wait for a worker
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 100
+
+# Seconds finished jobs are kept, and the most finished jobs kept
+DEFAULT_RETENTION = 3600
+MAX_FINISHED_JOBS = 1000
+
+# Seconds between reads of a job run by another process while waiting for it
+SHARED_POLL_INTERVAL = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at);
+"""
+
+
+class SharedJobStore:
+    """
+    SQLite table of job descriptions shared by the processes of one server.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (defaults to evaluation_jobs.sqlite3 in the
+                  cache directory)
+        """
+        self.path = Path(path or Path(get_data_directory('cache')) / 'evaluation_jobs.sqlite3')
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, once per process (lock held)."""
+        # Connections must not cross a fork, so workers open their own
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(self.path.parent, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def put(self, description: Dict[str, Any], retention: float):
+        """
+        Record a job's description, dropping jobs not updated within the retention.
+
+        Args:
+            description: Public view of the job
+            retention: Seconds jobs are kept
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("INSERT OR REPLACE INTO jobs (job_id, updated_at, description) VALUES (?, ?, ?)",
+                               (description['job_id'], now, json.dumps(description, default=str)))
+            connection.execute("DELETE FROM jobs WHERE updated_at < ?", (now - retention,))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's last recorded description, or None for an unknown or expired job."""
+        with self._lock:
+            row = self._connect().execute("SELECT description FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        description = json.loads(row[0])
+        if description['status'] in (QUEUED, RUNNING):
+            description['elapsed'] = round(time.time() - description['submitted_at'], 3)
+        return description
+
+
+class EvaluationJobQueue:
+    """
+    Bounded pool of worker threads running evaluation jobs.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 retention: float = DEFAULT_RETENTION, shared: Optional[bool] = None):
+        """
+        Args:
+            workers: Evaluations run at once (defaults to EVALUATION_WORKERS,
+                     or DEFAULT_WORKERS)
+            queue_size: Jobs that may wait for a worker before new jobs are
+                        refused (defaults to EVALUATION_QUEUE_SIZE, or
+                        DEFAULT_QUEUE_SIZE)
+            retention: Seconds finished jobs are kept
+            shared: Write every job to a SharedJobStore, so other processes
+                    of the server can fetch it (defaults to the
+                    SHARED_EVALUATION_JOBS environment variable, which
+                    src.prefork sets)
+        """
+        if workers is None:
+            workers = int(os.environ.get("EVALUATION_WORKERS") or DEFAULT_WORKERS)
+        if queue_size is None:
+            queue_size = int(os.environ.get("EVALUATION_QUEUE_SIZE") or DEFAULT_QUEUE_SIZE)
+        if shared is None:
+            shared = os.environ.get("SHARED_EVALUATION_JOBS", "").lower() in ('1', 'true', 'yes')
+        self.workers = max(workers, 1)
+        self.queue_size = queue_size
+        self.retention = retention
+        self.store = SharedJobStore() if shared else None
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='evaluation-job')
+        self._jobs: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._pending: Dict[Hashable, str] = {}
+        self._sequence = itertools.count()
+        self._changed = threading.Condition()
+
+    def submit(self, key: Hashable, fn: Callable[..., Dict[str, Any]], *args: Any,
+               **details: Any) -> Dict[str, Any]:
+        """
+        Queue a job, or join the identical job already queued or running.
+
+        Args:
+            key: Identity of the job; a job with an equal key that has not
+                 finished is returned instead of queuing another
+            fn: Function run by a worker, returning the job's result
+            *args: Its arguments
+            **details: Fields recorded on the job, e.g. dataset and post_id
+
+        Returns:
+            Dictionary describing the job, or an error when the queue is full
+        """
+        with self._changed:
+            self._prune()
+            job_id = self._pending.get(key)
+            if job_id is not None:
+                return self._describe(self._jobs[job_id])
+
+            queued = sum(1 for job in self._jobs.values() if job['status'] == QUEUED)
+            if queued >= self.queue_size:
+                return {
+                    'query_type': 'evaluation_job',
+                    'error': f"The evaluation queue is full ({queued} jobs waiting); retry later",
+                    'queue_full': True
+                }
+
+            job_id = uuid.uuid4().hex[:16]
+            job = {
+                'job_id': job_id,
+                'status': QUEUED,
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                'version': 0,
+                'sequence': next(self._sequence),
+                'key': key,
+                **details
+            }
+            self._jobs[job_id] = job
+            self._pending[key] = job_id
+            job['future'] = self._executor.submit(self._run, job, fn, args)
+            self._share(job)
+            return self._describe(job)
+
+    def get(self, job_id: str, wait: float = 0.0, since_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Describe a job, optionally waiting for it to finish or change.
+
+        Args:
+            job_id: The job's ID
+            wait: Most seconds to wait (0 returns at once)
+            since_version: Version of the job the caller has seen; when given,
+                           waits only until the job moves past it rather
+                           than until it finishes
+
+        Returns:
+            Dictionary describing the job, or None for an unknown or expired job
+        """
+        deadline = time.monotonic() + wait
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                while job['status'] not in FINISHED and (since_version is None or job['version'] <= since_version):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                return self._describe(job)
+        if self.store is None:
+            return None
+
+        # Another process of the server runs the job; follow its recorded changes
+        while True:
+            job = self.store.get(job_id)
+            remaining = deadline - time.monotonic()
+            if (job is None or job['status'] in FINISHED or remaining <= 0
+                    or (since_version is not None and job['version'] > since_version)):
+                return job
+            time.sleep(min(SHARED_POLL_INTERVAL, remaining))
+
+    def future(self, job_id: str) -> Optional[Future]:
+        """
+        Get a future that completes when a job finishes, e.g. to await it
+        with asyncio.wrap_future instead of holding a thread in get.
+
+        Args:
+            job_id: The job's ID
+
+        Returns:
+            The job's future, or None for an unknown or expired job or one
+            queued by another process
+        """
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return job['future'] if job is not None else None
+
+    def stream(self, job_id: str, timeout: float = 300.0, heartbeat: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Yield a job's description now and after every change, until it finishes.
+
+        Args:
+            job_id: The job's ID
+            timeout: Most seconds to stream for
+            heartbeat: Seconds without a change after which None is yielded,
+                       so the caller can keep its connection alive
+
+        Yields:
+            Dictionaries describing the job, or None as a heartbeat
+        """
+        deadline = time.monotonic() + timeout
+        version = -1
+        while True:
+            job = self.get(job_id, min(heartbeat, max(deadline - time.monotonic(), 0)), version)
+            if job is None:
+                return
+            if job['version'] == version:
+                yield None
+            else:
+                version = job['version']
+                yield job
+            if job['status'] in FINISHED or time.monotonic() >= deadline:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Count the jobs by status.
+
+        Only this process's jobs are counted, also when they are shared.
+
+        Returns:
+            Dictionary with the workers, the queue size and the jobs kept per status
+        """
+        with self._changed:
+            self._prune()
+            counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+            return {
+                'query_type': 'evaluation_jobs',
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'jobs': counts
+            }
+
+    def close(self):
+        """Stop the workers once the jobs already queued have run."""
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: Dict[str, Any], fn: Callable[..., Dict[str, Any]], args: tuple):
+        """Run a job on a worker thread, recording its outcome."""
+        self._update(job, status=RUNNING, started_at=time.time())
+        try:
+            result = fn(*args)
+        except Exception as e:
+            self._update(job, status=FAILED, error=str(e), finished_at=time.time())
+        else:
+            if 'error' in result:
+                self._update(job, status=FAILED, error=result['error'], result=result, finished_at=time.time())
+            else:
+                self._update(job, status=DONE, result=result, finished_at=time.time())
+
+    def _update(self, job: Dict[str, Any], **fields: Any):
+        """Change a job's fields and wake every caller waiting for a change."""
+        with self._changed:
+            job.update(fields)
+            job['version'] += 1
+            if job['status'] in FINISHED and self._pending.get(job['key']) == job['job_id']:
+                del self._pending[job['key']]
+            self._share(job)
+            self._changed.notify_all()
+
+    def _share(self, job: Dict[str, Any]):
+        """Record a job in the shared store, if any (lock held)."""
+        if self.store is not None:
+            self.store.put(self._describe(job), self.retention)
+
+    def _prune(self):
+        """Drop finished jobs past their retention, and the oldest beyond MAX_FINISHED_JOBS."""
+        cutoff = time.time() - self.retention
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in FINISHED]
+        excess = len(finished) - MAX_FINISHED_JOBS
+        for i, job_id in enumerate(finished):
+            if i < excess or self._jobs[job_id]['finished_at'] < cutoff:
+                del self._jobs[job_id]
+
+    def _describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Public view of a job; queued jobs include how many jobs are ahead of them."""
+        description = {name: value for name, value in job.items() if name not in ('key', 'sequence', 'future')}
+        description['query_type'] = 'evaluation_job'
+        if job['status'] == QUEUED:
+            description['queue_position'] = sum(
+                1 for other in self._jobs.values()
+                if other['status'] == QUEUED and other['sequence'] < job['sequence']
+            ) + 1
+        if job['status'] in (QUEUED, RUNNING):
+            description['elapsed'] = round(time.time() - job['submitted_at'], 3)
+        if job['error'] is None:
+            del description['error']
+        return description
@@ -0,0 +1,172 @@
+"""
+Typo-tolerant query term correction for the Solana Forum MCP server.
+
+Every term of the search vocabulary is indexed by its character trigrams
+(padded with '$' at both ends). A query word that is not in the vocabulary
+gets its candidates from the trigram postings: an edit destroys at most
+three trigrams (four for a transposition, which changes two adjacent
+characters), so a term within ``d`` edits shares at least
+``len(trigrams) - 4 * d`` of them and differs in length by at most ``d``.
+The few candidates left are verified with a bounded Damerau-Levenshtein
+distance. Distances are tried in increasing order, so the tight one-edit
+filter answers most typos, and corrections are cached per word.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Same tokens as the TF-IDF vectorizer's default token pattern
+WORD_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+# Distinct misspelt words whose corrections are cached
+CACHE_SIZE = 4096
+
+# Most trigrams a single edit (a transposition) can destroy
+TRIGRAMS_PER_EDIT = 4
+
+
+def trigrams(word: str) -> List[str]:
+    """Get the distinct character trigrams of a word padded with '$'."""
+    padded = f"${word}$"
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def max_edits(word: str) -> int:
+    """Number of typos tolerated in a word of this length."""
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """
+    Damerau-Levenshtein (optimal string alignment) distance, bounded.
+
+    Args:
+        a: First string
+        b: Second string
+        bound: Largest distance of interest
+
+    Returns:
+        The distance, or ``bound + 1`` once it is known to exceed ``bound``
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+
+    previous2: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > bound:
+            return bound + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= bound else bound + 1
+
+
+class FuzzyMatcher:
+    """
+    Character-trigram index over a vocabulary, for correcting misspelt query words.
+    """
+
+    def __init__(self, terms: Sequence[str], frequencies: Optional[Sequence[float]] = None,
+                 stop_words: Optional[Sequence[str]] = None):
+        """
+        Build the trigram index.
+
+        Args:
+            terms: Vocabulary the corrections are drawn from
+            frequencies: Document frequency of each term, used to prefer the
+                         more common of equally close terms
+            stop_words: Words that are never corrected
+        """
+        self.terms = [term for term in terms if ' ' not in term]
+        self.vocabulary = set(self.terms)
+        self.stop_words = frozenset(stop_words or ())
+        if frequencies is None:
+            self.frequencies = np.zeros(len(self.terms))
+        else:
+            by_term = dict(zip(terms, frequencies))
+            self.frequencies = np.array([by_term[term] for term in self.terms], dtype=np.float64)
+        self.lengths = np.array([len(term) for term in self.terms], dtype=np.int32)
+
+        postings: Dict[str, List[int]] = {}
+        for number, term in enumerate(self.terms):
+            for gram in trigrams(term):
+                postings.setdefault(gram, []).append(number)
+        self.postings = {gram: np.array(numbers, dtype=np.int32) for gram, numbers in postings.items()}
+
+        self.correct_word = lru_cache(maxsize=CACHE_SIZE)(self._correct_word)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _correct_word(self, word: str) -> Optional[str]:
+        """
+        Find the closest vocabulary term to a word that is not in the vocabulary.
+
+        Args:
+            word: Lowercase word
+
+        Returns:
+            The correction, or None when no term is close enough
+        """
+        bound = max_edits(word)
+        grams = trigrams(word)
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not bound or not lists:
+            return None
+
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.terms))
+        length_gap = np.abs(self.lengths - len(word))
+
+        # Every term within fewer edits passed the previous, tighter filter,
+        # so the matches found at each distance are exactly that far
+        for distance in range(1, bound + 1):
+            candidates = np.flatnonzero(
+                (shared >= max(1, len(grams) - TRIGRAMS_PER_EDIT * distance)) & (length_gap <= distance)
+            )
+            matches = [number for number in candidates
+                       if edit_distance(word, self.terms[number], distance) <= distance]
+            if matches:
+                # Prefer the more common term, then the alphabetically first
+                best = min(matches, key=lambda number: (-self.frequencies[number], self.terms[number]))
+                return self.terms[best]
+        return None
+
+    def correct(self, text: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Replace the misspelt words of a query with their closest vocabulary terms.
+
+        Words in the vocabulary, stop words and words containing digits are
+        kept as typed.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Tuple of (corrected text, {typed word: correction})
+        """
+        corrections: Dict[str, str] = {}
+
+        def replace(match: re.Match) -> str:
+            word = match.group()
+            lowered = word.lower()
+            if (lowered in self.vocabulary or lowered in self.stop_words
+                    or any(c.isdigit() for c in lowered)):
+                return word
+            correction = self.correct_word(lowered)
+            if correction is None:
+                return word
+            corrections[word] = correction
+            return correction
+
+        return WORD_PATTERN.sub(replace, text), corrections
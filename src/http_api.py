@@ -0,0 +1,363 @@
+"""
+Request handling shared by the Flask server (src.api_server) and the ASGI
+server (src.asgi_server): the API documentation, the translation of /query
+request parameters into calls on a dataset's engine, so both servers
+accept exactly the same queries, and batches of queries. Each query type
+becomes a zero-argument call; the servers decide where to run it.
+"""
+
+import functools
+from concurrent.futures import Executor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
+
+from src.mcp_server import SolanaForumMCPServer
+
+# Query types whose calls do enough work (vector products, clustering,
+# snapshot reads, scoring every stale post) to be run off an event loop;
+# the rest are lookups in precomputed indexes
+CPU_BOUND_QUERY_TYPES = frozenset({
+    'natural', 'search', 'comments', 'duplicates', 'topics', 'analytics', 'diff', 'top-scored'
+})
+
+# Served at / by both servers
+API_DOCS = {
+    'name': 'Solana Forum MCP API',
+    'description': 'API for querying Solana forum data using the Model Context Protocol',
+    'endpoints': {
+        '/query': {
+            'methods': ['GET', 'POST'],
+            'description': 'Universal endpoint for all types of queries',
+            'examples': {
+                'POST': {
+                    'body': {'query': 'What is the most viewed post on Solana?'}
+                },
+                'GET': {
+                    'natural_language': '/query?q=What is the most viewed post on Solana?',
+                    'latest_posts': '/query?type=latest&limit=10',
+                    'posts_between': '/query?type=between&start=2024-01-01&end=2024-03-31&category=Governance',
+                    'posts_since': '/query?type=since&days=30',
+                    'analytics': '/query?type=analytics&period=month&category=Governance',
+                    'author_posts': '/query?type=author&author=jacobcreech',
+                    'top_authors': '/query?type=top-authors&metric=comments&period=year',
+                    'duplicates': '/query?type=duplicates&threshold=0.8',
+                    'related': '/query?type=related&post_id=2059&limit=5',
+                    'comment_search': '/query?type=comments&q=inflation&category=Governance',
+                    'topics': '/query?type=topics&category=Research&period=quarter',
+                    'deduplicated_search': '/query?type=search&q=validator rewards&dedup=1',
+                    'fuzzy_search': '/query?type=search&q=valdator rewards&fuzzy=1',
+                    'category_posts': '/query?type=category&category=Governance&limit=20',
+                    'changes_since': '/query?type=diff&since=20250301-120000-3f2a9c1b7d4e',
+                    'other_dataset': '/query?type=latest&dataset=solana_forum_posts',
+                    'post_evaluation': '/query?type=evaluate&post_id=123',
+                    'fresh_evaluation': '/query?type=evaluate&post_id=123&refresh=1',
+                    'top_scored': '/query?type=top-scored&category=sRFC&limit=10'
+                }
+            }
+        },
+        '/suggest': {
+            'methods': ['GET'],
+            'description': 'Search-as-you-type suggestions from a title prefix, ranked by views',
+            'examples': {
+                'GET': {
+                    'suggest': '/suggest?q=valid&limit=8',
+                    'multi_word': '/suggest?q=priority fe'
+                }
+            }
+        },
+        '/evaluate': {
+            'methods': ['POST'],
+            'description': 'Queue a post for evaluation in the background; returns a job at once',
+            'examples': {
+                'POST': {
+                    'body': {'post_id': 123, 'refresh': False}
+                }
+            }
+        },
+        '/jobs/<job_id>': {
+            'methods': ['GET'],
+            'description': 'Evaluation job status and result; wait=<seconds> long-polls, stream=1 streams server-sent events',
+            'examples': {
+                'GET': {
+                    'poll': '/jobs/3f2a9c1b7d4e5a60',
+                    'long_poll': '/jobs/3f2a9c1b7d4e5a60?wait=30',
+                    'stream': '/jobs/3f2a9c1b7d4e5a60?stream=1'
+                }
+            }
+        },
+        '/jobs': {
+            'methods': ['GET'],
+            'description': 'Evaluation jobs by status, with the worker count and queue size'
+        },
+        '/evaluation-cache': {
+            'methods': ['GET', 'DELETE'],
+            'description': 'Cached post evaluations and hit rate; DELETE (optionally with post_id) invalidates them'
+        },
+        '/coalescing': {
+            'methods': ['GET'],
+            'description': 'Calls saved by sharing concurrent identical evaluations and searches, per method'
+        },
+        '/batch': {
+            'methods': ['POST'],
+            'description': 'Up to 50 queries against one dataset snapshot in one response, semantic searches scored '
+                           'together; stream=true sends one NDJSON line per query as soon as it is answered',
+            'examples': {
+                'POST': {
+                    'body': {'queries': ['latest posts in Governance', {'type': 'search', 'q': 'validator rewards'},
+                                         {'type': 'stats'}],
+                             'stream': False}
+                }
+            }
+        },
+        '/datasets': {
+            'methods': ['GET'],
+            'description': 'Datasets that can be queried (pass dataset=<name> to /query and /suggest) and those loaded'
+        }
+    },
+    'documentation': 'See /docs/query.md for more examples and details'
+}
+
+# Most queries in one POST /batch request
+MAX_BATCH_SIZE = 50
+
+HELP = ('Use either "q" parameter for natural language queries or "type" parameter '
+        'with appropriate additional parameters')
+
+
+class InvalidQuery(ValueError):
+    """
+    Query parameters that cannot be answered, with the error response to send.
+    """
+
+    def __init__(self, message: str, **details: Any):
+        super().__init__(message)
+        self.payload = {'error': message, **details}
+
+
+def _flag(params: Mapping[str, str], name: str) -> bool:
+    return params.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def _error(message: str) -> Callable[[], Dict[str, Any]]:
+    """Call answering with an error in the response body (status 200, as the API always has)."""
+    return lambda: {'error': message}
+
+
+def query_call(mcp_server: SolanaForumMCPServer,
+               params: Mapping[str, str]) -> Tuple[str, Callable[[], Dict[str, Any]]]:
+    """
+    Build the call answering a GET /query request.
+
+    Args:
+        mcp_server: Engine of the requested dataset
+        params: The request's query parameters (see src.api_server.query)
+
+    Returns:
+        Tuple of the query type ('natural' for natural language queries)
+        and a call returning the result
+
+    Raises:
+        InvalidQuery: If the parameters are invalid or incomplete
+    """
+    query_type = params.get('type', '').lower()
+    query_text = params.get('q', '')
+    category = params.get('category')
+    post_id = params.get('post_id')
+    dedup = _flag(params, 'dedup')
+    try:
+        limit = int(params.get('limit', 5))
+    except ValueError:
+        raise InvalidQuery(f"Invalid limit: {params.get('limit')}. Must be an integer.")
+    call = functools.partial
+
+    # If query text is provided but no type, use natural language processing
+    if query_text and not query_type:
+        return 'natural', call(mcp_server.query, query_text)
+
+    if query_type == 'latest':
+        return query_type, call(mcp_server.get_latest_posts, category, limit, dedup)
+
+    if query_type == 'most-viewed':
+        return query_type, call(mcp_server.get_most_viewed_posts, category, limit, dedup)
+
+    if query_type == 'most-commented':
+        return query_type, call(mcp_server.get_most_commented_posts, limit, category, dedup)
+
+    if query_type == 'author' and params.get('author'):
+        return query_type, call(mcp_server.get_posts_by_author, params['author'], limit)
+
+    if query_type == 'author-summary' and params.get('author'):
+        return query_type, call(mcp_server.get_author_summary, params['author'])
+
+    if query_type == 'top-authors':
+        return query_type, call(mcp_server.top_authors, params.get('metric', 'posts'), category,
+                                params.get('period'), limit)
+
+    if query_type == 'topics':
+        return query_type, call(mcp_server.get_topics, category, params.get('period'),
+                                limit if 'limit' in params else 10)
+
+    if query_type == 'between':
+        return query_type, call(mcp_server.posts_between, params.get('start'), params.get('end'),
+                                category, limit, dedup)
+
+    if query_type == 'since' and params.get('days'):
+        try:
+            days = float(params['days'])
+        except ValueError:
+            raise InvalidQuery(f"Invalid days: {params['days']}. Must be a number.")
+        return query_type, call(mcp_server.posts_since, days, category, limit, dedup)
+
+    if query_type == 'stats':
+        return query_type, mcp_server.get_forum_statistics
+
+    if query_type == 'analytics':
+        return query_type, call(mcp_server.get_forum_analytics, params.get('period', 'week'), category,
+                                params.get('metric'))
+
+    if query_type == 'search' and query_text:
+        return query_type, call(mcp_server.semantic_search, query_text, limit, category, dedup,
+                                _flag(params, 'fuzzy'))
+
+    if query_type == 'comments' and query_text:
+        return query_type, call(mcp_server.search_comments, query_text, limit, category)
+
+    if query_type == 'duplicates':
+        threshold = params.get('threshold')
+        try:
+            threshold = float(threshold) if threshold else None
+        except ValueError:
+            raise InvalidQuery(f"Invalid threshold: {threshold}. Must be a number.")
+        return query_type, call(mcp_server.find_duplicates, category, threshold, limit)
+
+    if query_type == 'categories':
+        def categories():
+            names = list(mcp_server.categories)
+            return {'categories': names, 'count': len(names)}
+        return query_type, categories
+
+    if query_type == 'category' and category:
+        return query_type, call(mcp_server.get_posts_by_category, category, limit, dedup)
+
+    if query_type == 'related' and post_id:
+        try:
+            return query_type, call(mcp_server.get_related_posts, int(post_id), limit)
+        except ValueError:
+            return query_type, _error(f"Invalid post ID: {post_id}. Must be an integer.")
+
+    if query_type == 'top-scored':
+        return query_type, call(mcp_server.get_top_scored_posts, category, limit if 'limit' in params else 10)
+
+    if query_type == 'diff' and params.get('since'):
+        return query_type, call(mcp_server.diff, params.get('since'), params.get('until'),
+                                limit if 'limit' in params else 20)
+
+    if query_type == 'evaluate' and post_id:
+        try:
+            return query_type, call(mcp_server.evaluate_post, int(post_id), _flag(params, 'refresh'))
+        except ValueError:
+            return query_type, _error(f"Invalid post ID: {post_id}. Must be an integer.")
+
+    raise InvalidQuery('Invalid or incomplete query parameters', help=HELP)
+
+
+def batch_queries(data: Any) -> List[Any]:
+    """
+    Get the queries of a POST /batch body.
+
+    Args:
+        data: The decoded JSON body
+
+    Returns:
+        The list of queries
+
+    Raises:
+        InvalidQuery: If the body holds no list of queries, or too many
+    """
+    queries = data.get('queries') if isinstance(data, dict) else None
+    if not isinstance(queries, list) or not queries:
+        raise InvalidQuery('Missing queries parameter',
+                           help='Send a JSON body with a "queries" list of natural language queries '
+                                'or objects of /query parameters')
+    if len(queries) > MAX_BATCH_SIZE:
+        raise InvalidQuery(f"Too many queries: {len(queries)}. A batch holds at most {MAX_BATCH_SIZE}.")
+    return queries
+
+
+def batch_call(mcp_server: SolanaForumMCPServer, item: Any) -> Tuple[str, Callable[[], Dict[str, Any]]]:
+    """
+    Build the call answering one query of a batch.
+
+    Args:
+        mcp_server: Engine of the batch's dataset
+        item: A natural language query, as a string or as {"query": ...}
+              like a POST /query body, or an object of /query parameters
+              such as {"type": "search", "q": "validator rewards"}
+
+    Returns:
+        Tuple of the query type ('natural' for natural language queries)
+        and a call returning the result
+
+    Raises:
+        InvalidQuery: If the query is invalid or incomplete
+    """
+    if isinstance(item, str):
+        item = {'query': item}
+    if not isinstance(item, dict):
+        raise InvalidQuery('Each query must be a string or an object', help=HELP)
+    if 'query' in item:
+        # Routed rather than passed to query(), so searches can be grouped
+        method, args = mcp_server.route(str(item['query']))
+        return 'natural', functools.partial(method, *args)
+
+    params = {name: ('1' if value else '0') if isinstance(value, bool) else str(value)
+              for name, value in item.items() if value is not None}
+    return query_call(mcp_server, params)
+
+
+def run_batch(mcp_server: SolanaForumMCPServer, items: List[Any], executor: Executor) -> Iterator[Dict[str, Any]]:
+    """
+    Answer a batch of queries, yielding each answer as soon as it is ready.
+
+    Every query is answered by the same engine, so from one snapshot of
+    the dataset even if a newer one is loaded meanwhile. Semantic searches,
+    including natural language queries routed to one, are scored together
+    in one matrix product; the other queries run concurrently on the
+    executor.
+
+    Args:
+        mcp_server: Engine of the batch's dataset
+        items: The batch's queries (see batch_call)
+        executor: Executor running the queries
+
+    Yields:
+        Dictionaries with the query's index in the batch, a status (200,
+        400 for an invalid query, 500 for a failed one) and its result
+    """
+    searches = []
+    futures = {}
+    for index, item in enumerate(items):
+        try:
+            _, call = batch_call(mcp_server, item)
+        except InvalidQuery as e:
+            yield {'index': index, 'status': 400, 'result': e.payload}
+            continue
+        if isinstance(call, functools.partial) and call.func == mcp_server.semantic_search and not call.keywords:
+            searches.append((index, call.args))
+        else:
+            futures[executor.submit(lambda call=call: [call()])] = [index]
+
+    if searches:
+        future = executor.submit(mcp_server.semantic_search_many, [args for _, args in searches])
+        futures[future] = [index for index, _ in searches]
+
+    for future in as_completed(futures):
+        try:
+            results = future.result()
+        except Exception as e:
+            results = None
+            error = {'error': str(e)}
+        for position, index in enumerate(futures[future]):
+            if results is None:
+                yield {'index': index, 'status': 500, 'result': error}
+            else:
+                yield {'index': index, 'status': 200, 'result': results[position]}
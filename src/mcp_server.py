@@ -6,13 +6,12 @@ using different approaches based on the query type.
 """
 
 import json
-import re
 import os
 import sys
 import datetime
-import requests
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple, Union
 from collections import Counter
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -24,7 +23,26 @@ from nltk.corpus import stopwords
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 # Import utility functions
-from src.utils import load_json, get_data_directory
+from src.utils import load_json, get_data_directory, SnapshotStore
+from src.query_router import QueryRouter, ParsedQuery, LISTING_INTENTS, STOP_WORDS as QUERY_STOP_WORDS
+from src.analytics import ForumAnalytics
+from src.author_index import AuthorIndex, Period
+from src.dedup import DuplicateIndex, MIN_THRESHOLD
+from src.evaluation import MISSING_API_KEY, PostEvaluator
+from src.evaluation_cache import EvaluationCache, post_content_hash
+from src.evaluation_jobs import EvaluationJobQueue
+from src.bulk_evaluation import BulkEvaluationStore
+from src.fuzzy import FuzzyMatcher
+from src.related_posts import RelatedPostsGraph
+from src.passage_index import PassageIndex
+from src.prefix_index import PrefixIndex
+from src.prompt_packer import PromptPacker, PackedContent, MAX_EXCERPTS
+from src.post_store import PostStore
+from src.sharded_search import ShardedSearch, top_k
+from src.single_flight import SingleFlight, coalesced
+from src.snippets import SnippetIndex
+from src.topics import TopicModel
+from src.time_index import TimeIndex, TimeBound, parse_timestamps, parse_time_bound, format_timestamp, days_ago
 
 # Download NLTK resources if not already downloaded
 try:
@@ -34,6 +52,34 @@ except LookupError:
     nltk.download('punkt')
     nltk.download('stopwords')
 
+# Numeric post fields, stored as strings in CSV-derived datasets
+NUMERIC_FIELDS = ('id', 'views', 'comment_count', 'reply_count', 'posts_count', 'category_id')
+
+# Field each listing intent orders its posts by
+LISTING_SORT_KEYS = {
+    'latest_posts': 'created_ts',
+    'most_viewed_posts': 'views',
+    'most_commented_posts': 'comment_count',
+    'category_posts': 'views',
+    'posts_between': 'created_ts'
+}
+
+# DataFrame columns kept in low-memory mode: those the sorted listings and
+# analytics read. Post text lives only in the compact post store.
+LOW_MEMORY_COLUMNS = [
+    'id', 'category_name', 'original_poster', 'views', 'comment_count',
+    'created_at', 'first_reply_at', 'last_posted_at'
+]
+
+# Terms must appear in at least this many posts to be indexed in low-memory mode
+LOW_MEMORY_MIN_DF = 2
+
+# Numeric fields posts are ranked by, read from the DataFrame
+SORT_FIELDS = ('views', 'comment_count')
+
+# Fields of the post summaries returned by category listings
+SUMMARY_FIELDS = ('id', 'title', 'url', 'views', 'comment_count', 'original_poster', 'created_at', 'category_name')
+
 class SolanaForumMCPServer:
     """
     MCP Server for handling different types of queries on Solana forum data.
@@ -44,20 +90,107 @@ class SolanaForumMCPServer:
     3. Vector-based search for semantic queries
     """
     
-    def __init__(self, data_file: str = "solana_forum_posts", openai_api_key: Optional[str] = None):
+    def __init__(self, data_file: str = "solana_forum_posts", openai_api_key: Optional[str] = None,
+                 low_memory: Optional[bool] = None, search_workers: Optional[int] = None,
+                 shard_by: Optional[str] = None, evaluation_jobs: Optional[EvaluationJobQueue] = None):
         """
         Initialize the MCP server with the Solana forum data.
         
         Args:
             data_file: Name of the JSON file containing the forum data
             openai_api_key: Optional OpenAI API key for post evaluation
+            low_memory: Keep one compact copy of the posts and a float32,
+                        pruned search index. Defaults to the LOW_MEMORY
+                        environment variable.
+            search_workers: Number of worker processes for sharded semantic
+                            search; 0 searches in-process. Defaults to the
+                            SEARCH_WORKERS environment variable.
+            shard_by: How posts are split into shards, 'category' or 'hash'.
+                      Defaults to the SEARCH_SHARD_BY environment variable.
+            evaluation_jobs: Queue running background evaluations, shared
+                             by every dataset of a server (one of its own
+                             when omitted)
         """
+        if low_memory is None:
+            low_memory = os.environ.get("LOW_MEMORY", "").lower() in ("1", "true", "yes")
+        self.low_memory = low_memory
+        self.dataset = data_file
+        # Concurrent identical expensive calls share one computation
+        self.single_flight = SingleFlight()
+        self.snapshots = SnapshotStore(data_file)
+        
         self.data = load_json(data_file)
+        self.categories = list(self.data.keys())
         self.posts = self._flatten_posts()
-        self.df = pd.DataFrame(self.posts)
+        self.df = pd.DataFrame(self.posts, columns=LOW_MEMORY_COLUMNS if low_memory else None)
+        self._build_time_index()
+        if low_memory:
+            # Keep a single column-wise copy of the posts; the nested JSON is
+            # only needed to flatten them
+            self.posts = PostStore(self.posts)
+            self.data = None
+        self.analytics = ForumAnalytics(self.df)
+        # Ranking reads these columns rather than assembling post records
+        self._sort_columns = {field: ForumAnalytics._numeric(self.df, field).to_numpy() for field in SORT_FIELDS}
+        self._ids = self.df['id'].to_numpy()
+        self.author_index = AuthorIndex(self.posts, self.df['created_ts'].to_numpy())
         self._prepare_vector_search()
+        # Words of the query grammar ("posts", "tell") are never corrected
+        # into topic terms
+        self.fuzzy_matcher = FuzzyMatcher(
+            self.vectorizer.get_feature_names_out(),
+            np.bincount(self.tfidf_matrix.indices, minlength=self.tfidf_matrix.shape[1]),
+            QUERY_STOP_WORDS | frozenset(self.vectorizer.get_stop_words() or ())
+        )
+        self.duplicate_index = DuplicateIndex(self.text_data)
+        self._position_by_id = {post.get('id'): i for i, post in enumerate(self.posts)}
+        self.related_graph = RelatedPostsGraph.load_or_build(
+            self.tfidf_matrix, self.text_data, get_data_directory('index'),
+            params=tuple(sorted(self.vectorizer.get_params().items()))
+        )
+        self.topic_model = TopicModel.load_or_build(
+            self.tfidf_matrix, self.vectorizer.get_feature_names_out(), self.text_data,
+            get_data_directory('index'), params=tuple(sorted(self.vectorizer.get_params().items()))
+        )
+        comments = (self.posts.text_column('comments') if low_memory
+                    else [post.get('comments') or '' for post in self.posts])
+        self.passage_index = PassageIndex(comments)
+        print(f"Created comment passage index with {len(self.passage_index)} passages")
+        self.snippet_index = SnippetIndex({
+            'description': (self.posts.text_column('description') if low_memory
+                            else [post.get('description') or '' for post in self.posts]),
+            'comments': comments
+        }, self.vectorizer.get_stop_words())
+        self.prefix_index = PrefixIndex(
+            self.posts.text_column('title') if low_memory else [post.get('title') or '' for post in self.posts],
+            self.df['category_name'].tolist(),
+            self.df['views'].tolist()
+        )
+        self.router = QueryRouter(self.categories)
+        
+        if search_workers is None:
+            search_workers = int(os.environ.get("SEARCH_WORKERS") or 0)
+        self.sharded_search = None
+        if search_workers > 0:
+            self.sharded_search = ShardedSearch(
+                self.tfidf_matrix,
+                self.df['category_name'].to_numpy(),
+                workers=search_workers,
+                strategy=shard_by or os.environ.get("SEARCH_SHARD_BY") or 'category'
+            )
+        
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
-        print(f"Loaded {len(self.posts)} posts from {len(self.data)} categories")
+        cache_enabled = os.environ.get("EVALUATION_CACHE", "1").lower() not in ("0", "false", "no")
+        self.evaluator = PostEvaluator(self.openai_api_key, cache=EvaluationCache() if cache_enabled else None)
+        self.score_store = BulkEvaluationStore()
+        self.prompt_packer = PromptPacker()
+        self.evaluation_jobs = evaluation_jobs if evaluation_jobs is not None else EvaluationJobQueue()
+        
+        if low_memory:
+            # The indexed text is only needed while the indexes are built
+            self.text_data = None
+        
+        print(f"Loaded {len(self.posts)} posts from {len(self.categories)} categories")
         
     def _flatten_posts(self) -> List[Dict[str, Any]]:
         """
@@ -73,9 +206,31 @@ class SolanaForumMCPServer:
                 # Ensure category is included in each post
                 if 'category_name' not in post_copy:
                     post_copy['category_name'] = category
+                # Numbers must compare as numbers when sorting and looking up IDs
+                for field in NUMERIC_FIELDS:
+                    value = post_copy.get(field)
+                    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+                        post_copy[field] = int(value)
                 flattened_posts.append(post_copy)
         return flattened_posts
     
+    def _build_time_index(self):
+        """
+        Parse creation times once and keep the posts in time order.
+        
+        Adds an int64 ``created_ts`` column (epoch seconds) to the DataFrame,
+        reorders ``self.posts`` and ``self.df`` oldest first, and builds the
+        TimeIndex that date-window queries bisect.
+        """
+        timestamps = parse_timestamps(self.df['created_at'] if 'created_at' in self.df else [None] * len(self.df))
+        order = timestamps.argsort(kind='stable')
+        
+        self.posts = [self.posts[i] for i in order]
+        self.df = self.df.iloc[order].reset_index(drop=True)
+        self.df['created_ts'] = timestamps[order]
+        
+        self.time_index = TimeIndex(self.df['created_ts'].to_numpy(), self.df['category_name'].to_numpy())
+    
     def _prepare_vector_search(self):
         """
         Prepare the vector search functionality by creating TF-IDF vectors
@@ -87,127 +242,351 @@ class SolanaForumMCPServer:
             for post in self.posts
         ]
         
-        # Create TF-IDF vectorizer
+        # Create TF-IDF vectorizer; low-memory mode stores float32 weights
+        # and drops terms that appear in a single post
         self.vectorizer = TfidfVectorizer(
             stop_words='english',
             max_features=5000,
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            min_df=LOW_MEMORY_MIN_DF if self.low_memory and len(self.text_data) > 1 else 1,
+            dtype=np.float32 if self.low_memory else np.float64
         )
         
         # Create the TF-IDF matrix
         self.tfidf_matrix = self.vectorizer.fit_transform(self.text_data)
+        if self.low_memory:
+            # The set of pruned terms is only kept for introspection, and the
+            # vocabulary is pruned in place, so copy it to release the slots
+            # of the dropped terms
+            self.vectorizer.stop_words_ = None
+            self.vectorizer.vocabulary_ = dict(self.vectorizer.vocabulary_)
+            self.tfidf_matrix.indices = self.tfidf_matrix.indices.astype(np.int32, copy=False)
+            self.tfidf_matrix.indptr = self.tfidf_matrix.indptr.astype(np.int32, copy=False)
         print(f"Created vector search index with {self.tfidf_matrix.shape[1]} features")
     
+    @coalesced
     def query(self, query_text: str) -> Dict[str, Any]:
         """
         Process a natural language query and route it to the appropriate handler.
         
+        The query is parsed in a single pass by the compiled router, so intent,
+        category, post ID, limit and topic terms can all be honoured together
+        (e.g. "latest validator posts in Governance").
+        
         Args:
             query_text: The natural language query from the user
             
         Returns:
             Dictionary containing the query results and metadata
         """
-        query_text = query_text.lower().strip()
+        method, args = self.route(query_text)
+        return method(*args)
+    
+    def route(self, query_text: str) -> Tuple[Callable[..., Dict[str, Any]], tuple]:
+        """
+        Choose the handler of a natural language query without running it.
         
-        # Check for category posts query
-        category_match = re.search(r'(give me all posts on|all posts in|posts from) (\w+)', query_text)
-        if category_match:
-            category = category_match.group(2).capitalize()
-            return self.get_posts_by_category(category)
-            
-        # Check for post evaluation query
-        evaluation_match = re.search(r'(for this post id|evaluate post|post id) (\d+)', query_text)
-        if evaluation_match:
-            post_id = int(evaluation_match.group(2))
-            return self.evaluate_post(post_id)
-        
-        # Determine query type and route to appropriate handler
-        if re.search(r'latest|recent|new', query_text):
-            if re.search(r'category|discussion|forum', query_text):
-                # Extract category if mentioned
-                category = self._extract_category_from_query(query_text)
-                return self.get_latest_posts(category)
-            else:
-                return self.get_latest_posts()
-                
-        elif re.search(r'most viewed|popular|top', query_text):
-            if re.search(r'category|discussion|forum', query_text):
-                category = self._extract_category_from_query(query_text)
-                return self.get_most_viewed_posts(category)
-            else:
-                return self.get_most_viewed_posts()
-                
-        elif re.search(r'comments|discussed|active', query_text):
-            return self.get_most_commented_posts()
+        Lets a batch of queries see which ones are semantic searches and
+        score them together; see semantic_search_many.
+        
+        Args:
+            query_text: The natural language query from the user
             
-        elif re.search(r'statistics|stats|summary', query_text):
-            return self.get_forum_statistics()
+        Returns:
+            Tuple of the handler method and its arguments
+        """
+        query_text = query_text.lower().strip()
+        parsed = self.router.parse(query_text)
+        
+        if parsed.intent == 'evaluate':
+            return self.evaluate_post, (parsed.post_id,)
+        
+        if parsed.intent == 'top_scored_posts':
+            return self.get_top_scored_posts, (parsed.category, parsed.limit_or(10))
+        
+        if parsed.intent == 'related_posts':
+            return self.get_related_posts, (parsed.post_id, parsed.limit_or(5))
+        
+        if parsed.intent == 'topics':
+            return self.get_topics, (parsed.category, parsed.days, parsed.limit_or(10))
+        
+        if parsed.intent == 'comment_search':
+            return self.search_comments, (' '.join(parsed.terms) or query_text, parsed.limit_or(5), parsed.category)
+        
+        if parsed.intent == 'top_authors':
+            return self.top_authors, (parsed.metric or 'posts', parsed.category, parsed.days, parsed.limit_or(10))
+        
+        if parsed.intent == 'author_posts':
+            return self.get_posts_by_author, (parsed.author, parsed.limit_or(20))
+        
+        # A listing that names an unknown author ("sorted by views") ignores it
+        author = self.author_index.resolve(parsed.author) if parsed.author else None
+        if parsed.intent in LISTING_INTENTS and (parsed.terms or parsed.has_window or author):
+            return self._get_filtered_listing, (parsed, author)
+        
+        if parsed.intent == 'category_posts':
+            return self.get_posts_by_category, (parsed.category, parsed.limit_or(20), parsed.dedup)
+        
+        if parsed.intent == 'latest_posts':
+            return self.get_latest_posts, (parsed.category, parsed.limit_or(5), parsed.dedup)
+        
+        if parsed.intent == 'most_viewed_posts':
+            return self.get_most_viewed_posts, (parsed.category, parsed.limit_or(5), parsed.dedup)
+        
+        if parsed.intent == 'most_commented_posts':
+            return self.get_most_commented_posts, (parsed.limit_or(5), parsed.category, parsed.dedup)
+        
+        if parsed.intent == 'find_duplicates':
+            return self.find_duplicates, (parsed.category, None, parsed.limit_or(20))
+        
+        if parsed.intent == 'forum_statistics':
+            return self.get_forum_statistics, ()
+        
+        if parsed.intent == 'forum_analytics':
+            return self.get_forum_analytics, (parsed.period or 'week', parsed.category)
+        
+        if parsed.intent == 'reply_latency':
+            return self.get_forum_analytics, (parsed.period or 'week', parsed.category, 'reply_latency')
+        
+        if parsed.intent == 'posts_between':
+            return self.posts_between, (parsed.start, parsed.end, parsed.category, parsed.limit_or(20), parsed.dedup)
+        
+        # Default to semantic search for other queries, correcting typos
+        return self.semantic_search, (query_text, parsed.limit_or(5), parsed.category, parsed.dedup, True)
+    
+    def _get_filtered_listing(self, parsed: ParsedQuery, author: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Answer a listing query narrowed by a date window, author and/or topic terms.
+        
+        Candidates come from the time index (bisected to the query's window
+        and category), are narrowed to the author's posts and to posts
+        matching the terms (positive TF-IDF similarity), and are then ordered
+        the way the listing intent orders posts.
+        
+        Args:
+            parsed: The parsed listing query
+            author: Optional canonical author name to restrict to
             
+        Returns:
+            Dictionary with query results in the listing's result format
+        """
+        start = days_ago(parsed.days) if parsed.days is not None else parse_time_bound(parsed.start)
+        end = parse_time_bound(parsed.end, is_end=True)
+        
+        if parsed.has_window:
+            candidates = self.time_index.window(start, end, parsed.category).tolist()
+        elif parsed.category:
+            candidates = self.time_index.by_category.get(parsed.category, np.empty(0, dtype=np.int64)).tolist()
         else:
-            # Default to semantic search for other queries
-            return self.semantic_search(query_text)
+            candidates = list(range(len(self.posts)))
+        
+        if author:
+            authored = set(self.author_index.authored(author).tolist())
+            candidates = [i for i in candidates if i in authored]
+        
+        terms_text = ' '.join(parsed.terms)
+        if parsed.terms:
+            similarities = self._similarities(terms_text)
+            candidates = [i for i in candidates if similarities[i] > 0]
+        
+        sort_key = LISTING_SORT_KEYS[parsed.intent]
+        if sort_key == 'created_ts':
+            # Time-ordered positions: newest first is simply reversed order
+            candidates.sort(reverse=True)
+        else:
+            candidates = self._ranked(candidates, sort_key)
+        
+        default_limit = 20 if parsed.intent in ('category_posts', 'posts_between') else 5
+        positions = self._select(candidates, parsed.limit_or(default_limit), parsed.dedup)
+        result_posts = self._posts_at(positions, parsed.dedup)
+        
+        result = {
+            'query_type': parsed.intent,
+            'category': parsed.category,
+            'count': len(result_posts),
+            'posts': result_posts
+        }
+        if author:
+            result['author'] = author
+        if parsed.terms:
+            result['query'] = terms_text
+        if parsed.has_window:
+            result['start'] = format_timestamp(start)
+            result['end'] = format_timestamp(end)
+        return result
     
-    def _extract_category_from_query(self, query_text: str) -> Optional[str]:
+    def _select(self, positions, limit: Optional[int], dedup: bool = False) -> List[int]:
         """
-        Extract category name from the query if present.
+        Take the first ``limit`` positions, optionally one per duplicate cluster.
         
         Args:
-            query_text: The query text to analyze
+            positions: Post positions in result order
+            limit: Maximum number of positions to keep (None for all)
+            dedup: Whether to drop near-duplicates of earlier results
             
         Returns:
-            Category name if found, None otherwise
+            Selected post positions
+        """
+        if dedup:
+            return self.duplicate_index.dedupe(positions, limit)
+        positions = list(positions)
+        return positions if limit is None else positions[:limit]
+    
+    def _ranked(self, positions, field: str) -> List[int]:
+        """
+        Order post positions by a numeric field, highest first.
+        
+        Ties keep their order, and missing values count as 0.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        order = np.argsort(-self._sort_columns[field][positions], kind='stable')
+        return positions[order].tolist()
+    
+    def _category_mask(self, category: str) -> np.ndarray:
+        """Boolean mask over post positions of the posts in a category."""
+        mask = np.zeros(len(self.posts), dtype=bool)
+        mask[self.time_index.by_category.get(category, np.empty(0, dtype=np.int64))] = True
+        return mask
+    
+    def _post_fields(self, position: int, fields: Sequence[str]) -> Dict[str, Any]:
+        """
+        Read some fields of a post.
+        
+        In low-memory mode only those columns are read, rather than
+        assembling the whole record with its description and comments.
         """
-        # List of all categories
-        categories = list(self.data.keys())
+        if self.low_memory:
+            return self.posts.record(position, fields)
+        post = self.posts[position]
+        return {field: post[field] for field in fields if field in post}
+    
+    def _with_duplicates(self, post: Dict[str, Any], position: int) -> Dict[str, Any]:
+        """Annotate a deduplicated result with the IDs of the posts it stands for."""
+        duplicates = self.duplicate_index.duplicates_of(position)
+        if not duplicates:
+            return post
+        post = dict(post)
+        post['duplicate_ids'] = [int(self._ids[i]) for i in duplicates]
+        return post
+    
+    def _posts_at(self, positions: List[int], dedup: bool = False) -> List[Dict[str, Any]]:
+        """Get the posts at the given positions, annotated when deduplicating."""
+        if dedup:
+            return [self._with_duplicates(self.posts[i], i) for i in positions]
+        return [self.posts[i] for i in positions]
+    
+    def _records(self, df: pd.DataFrame, limit: int, dedup: bool = False) -> List[Dict[str, Any]]:
+        """
+        Convert the top rows of a sorted DataFrame slice into post records.
         
-        # Check if any category is mentioned in the query
-        for category in categories:
-            if category.lower() in query_text.lower():
-                return category
-                
-        return None
+        The DataFrame index is the post position, so deduplication can look
+        rows up in the duplicate index directly.
+        """
+        if self.low_memory:
+            # The low-memory DataFrame holds no text; records come from the post store
+            return self._posts_at(self._select(df.index, limit, dedup), dedup)
+        if not dedup:
+            return df.head(limit).to_dict('records')
+        positions = self._select(df.index, limit, dedup)
+        records = df.loc[positions].to_dict('records')
+        return [self._with_duplicates(record, i) for record, i in zip(records, positions)]
     
-    def get_latest_posts(self, category: Optional[str] = None, limit: int = 5) -> Dict[str, Any]:
+    def get_latest_posts(self, category: Optional[str] = None, limit: int = 5, dedup: bool = False) -> Dict[str, Any]:
         """
         Get the latest posts, optionally filtered by category.
         
         Args:
             category: Optional category to filter by
             limit: Maximum number of posts to return
+            dedup: Whether to collapse near-duplicate posts into one result
             
         Returns:
             Dictionary with query results
         """
-        # Function-based approach
-        if category:
-            filtered_posts = [p for p in self.posts if p.get('category_name') == category]
+        # Posts are kept in time order, so the newest are simply the tail
+        if dedup:
+            positions = self._select(self.time_index.latest(len(self.posts), category), limit, dedup)
         else:
-            filtered_posts = self.posts
+            positions = self.time_index.latest(limit, category)
+        result_posts = self._posts_at(positions, dedup)
+        
+        return {
+            'query_type': 'latest_posts',
+            'category': category,
+            'count': len(result_posts),
+            'posts': result_posts
+        }
+    
+    def posts_between(self, start: TimeBound = None, end: TimeBound = None,
+                      category: Optional[str] = None, limit: Optional[int] = None,
+                      dedup: bool = False) -> Dict[str, Any]:
+        """
+        Get the posts created within a date window, newest first.
+        
+        The window is resolved by bisecting the sorted creation-time column.
+        Date-only end bounds include the whole day.
+        
+        Args:
+            start: Start of the window (ISO date/datetime or epoch seconds), None for open
+            end: End of the window (ISO date/datetime or epoch seconds), None for open
+            category: Optional category to filter by
+            limit: Optional maximum number of posts to return
+            dedup: Whether to collapse near-duplicate posts into one result
             
-        # Sort by created_at date (most recent first)
-        sorted_posts = sorted(
-            filtered_posts,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
+        Returns:
+            Dictionary with query results
+        """
+        try:
+            start_ts = parse_time_bound(start)
+            end_ts = parse_time_bound(end, is_end=True)
+        except ValueError as e:
+            return {
+                'query_type': 'posts_between',
+                'category': category,
+                'count': 0,
+                'error': str(e),
+                'posts': []
+            }
         
-        result_posts = sorted_posts[:limit]
+        positions = self._select(self.time_index.window(start_ts, end_ts, category)[::-1], limit, dedup)
+        result_posts = self._posts_at(positions, dedup)
         
         return {
-            'query_type': 'latest_posts',
+            'query_type': 'posts_between',
             'category': category,
+            'start': format_timestamp(start_ts),
+            'end': format_timestamp(end_ts),
             'count': len(result_posts),
             'posts': result_posts
         }
     
-    def get_most_viewed_posts(self, category: Optional[str] = None, limit: int = 5) -> Dict[str, Any]:
+    def posts_since(self, days: float, category: Optional[str] = None,
+                    limit: Optional[int] = None, dedup: bool = False) -> Dict[str, Any]:
+        """
+        Get the posts created in the last ``days`` days, newest first.
+        
+        Args:
+            days: Size of the trailing window in days
+            category: Optional category to filter by
+            limit: Optional maximum number of posts to return
+            dedup: Whether to collapse near-duplicate posts into one result
+            
+        Returns:
+            Dictionary with query results
+        """
+        result = self.posts_between(days_ago(days), None, category, limit, dedup)
+        result['query_type'] = 'posts_since'
+        result['days'] = days
+        return result
+    
+    def get_most_viewed_posts(self, category: Optional[str] = None, limit: int = 5, dedup: bool = False) -> Dict[str, Any]:
         """
         Get the most viewed posts, optionally filtered by category.
         
         Args:
             category: Optional category to filter by
             limit: Maximum number of posts to return
+            dedup: Whether to collapse near-duplicate posts into one result
             
         Returns:
             Dictionary with query results
@@ -221,7 +600,7 @@ class SolanaForumMCPServer:
         # Sort by views (highest first)
         df = df.sort_values(by='views', ascending=False)
         
-        result_posts = df.head(limit).to_dict('records')
+        result_posts = self._records(df, limit, dedup)
         
         return {
             'query_type': 'most_viewed_posts',
@@ -230,22 +609,30 @@ class SolanaForumMCPServer:
             'posts': result_posts
         }
     
-    def get_most_commented_posts(self, limit: int = 5) -> Dict[str, Any]:
+    def get_most_commented_posts(self, limit: int = 5, category: Optional[str] = None, dedup: bool = False) -> Dict[str, Any]:
         """
         Get posts with the most comments.
         
         Args:
             limit: Maximum number of posts to return
+            category: Optional category to filter by
+            dedup: Whether to collapse near-duplicate posts into one result
             
         Returns:
             Dictionary with query results
         """
         # SQL-like approach using pandas
-        df = self.df.sort_values(by='comment_count', ascending=False)
-        result_posts = df.head(limit).to_dict('records')
+        df = self.df
+        
+        if category:
+            df = df[df['category_name'] == category]
+            
+        df = df.sort_values(by='comment_count', ascending=False)
+        result_posts = self._records(df, limit, dedup)
         
         return {
             'query_type': 'most_commented_posts',
+            'category': category,
             'count': len(result_posts),
             'posts': result_posts
         }
@@ -257,76 +644,563 @@ class SolanaForumMCPServer:
         Returns:
             Dictionary with forum statistics
         """
-        # Calculate statistics
-        total_posts = len(self.posts)
-        total_views = sum(post.get('views', 0) for post in self.posts)
-        total_comments = sum(post.get('comment_count', 0) for post in self.posts)
+        # Totals are aggregated over the DataFrame once at load
+        totals = self.analytics.totals
         
-        # Posts per category
-        category_counts = Counter(post.get('category_name') for post in self.posts)
+        return {
+            'query_type': 'forum_statistics',
+            'total_posts': totals['total_posts'],
+            'total_views': totals['total_views'],
+            'total_comments': totals['total_comments'],
+            'posts_per_category': dict(totals['posts_per_category']),
+            'most_active_users': self.author_index.top('posts', limit=5)
+        }
+    
+    @coalesced
+    def get_forum_analytics(self, period: str = 'week', category: Optional[str] = None,
+                            metric: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get time-bucketed forum analytics.
         
-        # Find most active users
-        user_post_counts = Counter(post.get('original_poster') for post in self.posts)
-        most_active_users = user_post_counts.most_common(5)
+        Returns posts, views and comments per category per period, author
+        activity per period and the reply-latency distribution. Everything is
+        precomputed at load, so this is a cached lookup.
+        
+        Args:
+            period: Bucket size, 'week' or 'month'
+            category: Optional category to restrict to
+            metric: Optional single section ('activity', 'authors' or 'reply_latency')
+            
+        Returns:
+            Dictionary with analytics results
+        """
+        try:
+            return self.analytics.get(period, category, metric)
+        except ValueError as e:
+            return {
+                'query_type': 'forum_analytics',
+                'period': period,
+                'category': category,
+                'error': str(e)
+            }
+    
+    @coalesced
+    def find_duplicates(self, category: Optional[str] = None, threshold: Optional[float] = None,
+                        limit: int = 20) -> Dict[str, Any]:
+        """
+        Find clusters of near-duplicate posts, such as cross-posted proposals.
+        
+        Clusters come from the MinHash LSH index built at load, so no pairwise
+        comparison happens at query time.
+        
+        Args:
+            category: Optional category; clusters must have a member in it
+            threshold: Optional minimum estimated Jaccard similarity of titles
+                       and descriptions (default 0.8, lowest 0.5)
+            limit: Maximum number of clusters to return
+            
+        Returns:
+            Dictionary with the duplicate clusters, largest first
+        """
+        if threshold is None:
+            threshold = self.duplicate_index.threshold
+            clusters = self.duplicate_index.clusters
+        elif threshold < MIN_THRESHOLD or threshold > 1:
+            return {
+                'query_type': 'find_duplicates',
+                'category': category,
+                'threshold': threshold,
+                'count': 0,
+                'error': f"Threshold must be between {MIN_THRESHOLD} and 1.0",
+                'clusters': []
+            }
+        else:
+            clusters = self.duplicate_index.lsh.clusters(threshold)
+        
+        if category:
+            in_category = self._category_mask(category)
+            clusters = [c for c in clusters if in_category[c].any()]
+        
+        result_clusters = []
+        for cluster in clusters[:limit]:
+            posts = [self._post_fields(i, ('id', 'title', 'url', 'category_name', 'created_at', 'views'))
+                     for i in cluster]
+            result_clusters.append({
+                'similarity': round(min(
+                    self.duplicate_index.lsh.similarity(cluster[0], i) for i in cluster[1:]
+                ), 3),
+                'posts': [
+                    {
+                        'id': post.get('id'),
+                        'title': post.get('title'),
+                        'url': post.get('url'),
+                        'category_name': post.get('category_name'),
+                        'created_at': post.get('created_at'),
+                        'views': post.get('views', 0)
+                    }
+                    for post in posts
+                ]
+            })
         
         return {
-            'query_type': 'forum_statistics',
-            'total_posts': total_posts,
-            'total_views': total_views,
-            'total_comments': total_comments,
-            'posts_per_category': dict(category_counts),
-            'most_active_users': most_active_users
+            'query_type': 'find_duplicates',
+            'category': category,
+            'threshold': threshold,
+            'count': len(result_clusters),
+            'clusters': result_clusters
+        }
+    
+    def _unknown_author(self, query_type: str, author: str) -> Dict[str, Any]:
+        """Build the error result for an author missing from the index."""
+        return {
+            'query_type': query_type,
+            'author': author,
+            'count': 0,
+            'error': f"Author '{author}' not found",
+            'posts': []
+        }
+    
+    def get_posts_by_author(self, author: str, limit: int = 20, include_comments: bool = True) -> Dict[str, Any]:
+        """
+        Get the posts a user started and, optionally, the posts they replied to.
+        
+        Args:
+            author: Username, matched case-insensitively
+            limit: Maximum number of posts to return in each list
+            include_comments: Whether to include the posts the user commented on
+            
+        Returns:
+            Dictionary with the user's posts, newest first
+        """
+        name = self.author_index.resolve(author)
+        if name is None:
+            return self._unknown_author('author_posts', author)
+        
+        result_posts = [self.posts[i] for i in self.author_index.authored(name)[::-1][:limit]]
+        
+        result = {
+            'query_type': 'author_posts',
+            'author': name,
+            'count': len(result_posts),
+            'posts': result_posts
+        }
+        
+        if include_comments:
+            # Positions repeat once per reply; keep thread order, newest first
+            reply_counts = Counter(self.author_index.commented(name).tolist())
+            commented_posts = []
+            for i in sorted(reply_counts, reverse=True)[:limit]:
+                post = dict(self.posts[i])
+                post['author_comment_count'] = reply_counts[i]
+                commented_posts.append(post)
+            result['commented_posts'] = commented_posts
+        
+        return result
+    
+    def get_author_summary(self, author: str) -> Dict[str, Any]:
+        """
+        Summarize a user's posting and commenting activity.
+        
+        Args:
+            author: Username, matched case-insensitively
+            
+        Returns:
+            Dictionary with the user's totals per category and activity dates
+        """
+        name = self.author_index.resolve(author)
+        if name is None:
+            return self._unknown_author('author_summary', author)
+        
+        result = {'query_type': 'author_summary'}
+        result.update(self.author_index.summary(name))
+        return result
+    
+    def top_authors(self, metric: str = 'posts', category: Optional[str] = None,
+                    period: Period = None, limit: int = 10) -> Dict[str, Any]:
+        """
+        Rank users by activity.
+        
+        Args:
+            metric: 'posts' (topics started), 'comments' (replies written) or
+                    'views' (views of the topics they started)
+            category: Optional category to restrict to
+            period: 'day', 'week', 'month', 'quarter', 'year', a number of days,
+                    or None for all time
+            limit: Maximum number of users to return
+            
+        Returns:
+            Dictionary with the ranked users
+        """
+        try:
+            start = self.author_index.period_start(period)
+            ranking = self.author_index.top(metric, category, start, limit)
+        except ValueError as e:
+            return {
+                'query_type': 'top_authors',
+                'metric': metric,
+                'category': category,
+                'period': period,
+                'error': str(e),
+                'authors': []
+            }
+        
+        return {
+            'query_type': 'top_authors',
+            'metric': metric,
+            'category': category,
+            'period': period,
+            'count': len(ranking),
+            'authors': [{'author': name, metric: value} for name, value in ranking]
         }
     
-    def semantic_search(self, query_text: str, limit: int = 5) -> Dict[str, Any]:
+    @coalesced
+    def get_topics(self, category: Optional[str] = None, period: Period = None,
+                   limit: int = 10) -> Dict[str, Any]:
+        """
+        Get the main themes among posts, from the precomputed topic clusters.
+        
+        Args:
+            category: Optional category to restrict to
+            period: 'day', 'week', 'month', 'quarter', 'year', a number of days,
+                    or None for all time
+            limit: Maximum number of topics to return
+            
+        Returns:
+            Dictionary with the topics, their keywords and their top posts
+        """
+        try:
+            start = self.author_index.period_start(period)
+        except ValueError as e:
+            return {
+                'query_type': 'topics',
+                'category': category,
+                'period': period,
+                'error': str(e),
+                'topics': []
+            }
+        
+        if start is not None:
+            positions = self.time_index.window(start, None, category)
+        elif category:
+            positions = self.time_index.by_category.get(category, np.empty(0, dtype=np.int64))
+        else:
+            positions = np.arange(len(self.posts))
+        
+        topics = []
+        for entry in self.topic_model.summarize(positions)[:limit]:
+            labels = self.topic_model.topics[entry['topic']]
+            top_positions = self._ranked(entry['positions'], 'views')
+            topics.append({
+                'topic': entry['topic'],
+                'keywords': labels['terms'],
+                'post_count': entry['count'],
+                'share': round(entry['count'] / len(positions), 3),
+                'top_posts': [
+                    {
+                        'id': post.get('id'),
+                        'title': post.get('title'),
+                        'url': post.get('url'),
+                        'views': post.get('views', 0)
+                    }
+                    for post in (self._post_fields(i, ('id', 'title', 'url', 'views')) for i in top_positions[:3])
+                ]
+            })
+        
+        return {
+            'query_type': 'topics',
+            'category': category,
+            'period': period,
+            'start': format_timestamp(start),
+            'posts_considered': int(len(positions)),
+            'count': len(topics),
+            'topics': topics
+        }
+    
+    def _similarities(self, query_text: str):
+        """
+        Score every post against a query.
+        
+        Args:
+            query_text: The query text to score
+            
+        Returns:
+            Array of cosine similarities, one per post
+        """
+        # Transform query to TF-IDF vector
+        query_vector = self.vectorizer.transform([query_text])
+        
+        # Calculate cosine similarity between query and all posts
+        return cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+    
+    @coalesced
+    def semantic_search(self, query_text: str, limit: int = 5, category: Optional[str] = None,
+                        dedup: bool = False, fuzzy: bool = False) -> Dict[str, Any]:
         """
         Perform semantic search on the forum data.
         
         Args:
             query_text: The query text to search for
             limit: Maximum number of posts to return
+            category: Optional category to restrict the search to
+            dedup: Whether to collapse near-duplicate posts into one result
+            fuzzy: Whether to correct misspelt query words before scoring
             
         Returns:
             Dictionary with search results
         """
-        # Transform query to TF-IDF vector
-        query_vector = self.vectorizer.transform([query_text])
+        search_text, corrections = self.fuzzy_matcher.correct(query_text) if fuzzy else (query_text, {})
         
-        # Calculate cosine similarity between query and all posts
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+        if self.sharded_search is not None:
+            k = self._candidates_needed(limit, dedup)
+            positions, scores = self.sharded_search.search(self.vectorizer.transform([search_text]), k, category)
+            similarities = dict(zip(positions.tolist(), scores.tolist()))
+            top_indices = self._select(positions.tolist(), limit, dedup)
+        else:
+            similarities = self._similarities(search_text)
+            top_indices = self._top_matches(similarities, limit, category, dedup)
+        
+        return self._search_result(query_text, search_text, corrections, similarities, top_indices, category, dedup)
+    
+    def semantic_search_many(self, searches: Sequence[Tuple]) -> List[Dict[str, Any]]:
+        """
+        Perform several semantic searches, scoring every query in one matrix product.
+        
+        Args:
+            searches: Argument tuples of semantic_search (query_text, and
+                      optionally limit, category, dedup and fuzzy)
+            
+        Returns:
+            The result of each search, in order, as semantic_search returns it
+        """
+        if self.sharded_search is not None or len(searches) < 2:
+            return [self.semantic_search(*search) for search in searches]
         
-        # Get indices of top results
-        top_indices = similarities.argsort()[-limit:][::-1]
+        defaults = (None, 5, None, False, False)
+        searches = [tuple(search) + defaults[len(search):] for search in searches]
+        corrected = [self.fuzzy_matcher.correct(text) if fuzzy else (text, {})
+                     for text, _, _, _, fuzzy in searches]
+        scores = cosine_similarity(self.vectorizer.transform([text for text, _ in corrected]), self.tfidf_matrix)
         
-        # Get the top posts
-        result_posts = [self.posts[i] for i in top_indices]
+        results = []
+        for (query_text, limit, category, dedup, _), (search_text, corrections), similarities in zip(
+                searches, corrected, scores):
+            top_indices = self._top_matches(similarities, limit, category, dedup)
+            results.append(self._search_result(query_text, search_text, corrections, similarities, top_indices,
+                                               category, dedup))
+        return results
+    
+    def _candidates_needed(self, limit: int, dedup: bool) -> int:
+        """Number of top matches to rank so that ``limit`` survive deduplication."""
+        if not dedup:
+            return limit
+        return limit + sum(len(cluster) - 1 for cluster in self.duplicate_index.clusters)
+    
+    def _top_matches(self, similarities: np.ndarray, limit: int, category: Optional[str], dedup: bool) -> List[int]:
+        """Positions of the best-scoring posts, optionally in one category and one per duplicate cluster."""
+        if category:
+            positions = self.time_index.by_category.get(category, np.empty(0, dtype=np.int64))
+        else:
+            positions = self.time_index.positions
         
-        # Include similarity scores
-        for i, post in enumerate(result_posts):
-            post['similarity_score'] = float(similarities[top_indices[i]])
+        # Partial selection instead of sorting every post; ties keep position order
+        positions, _ = top_k(similarities[positions], positions, self._candidates_needed(limit, dedup))
+        return self._select(positions.tolist(), limit, dedup)
+    
+    def _search_result(self, query_text: str, search_text: str, corrections: Dict[str, str], similarities,
+                       top_indices: List[int], category: Optional[str], dedup: bool) -> Dict[str, Any]:
+        """Build a semantic search result from the positions of its top posts."""
+        # Get the top posts, with similarity scores on a copy so the shared
+        # post records are never mutated by a search
+        result_posts = []
+        for i, post in zip(top_indices, self._posts_at(top_indices, dedup)):
+            post = dict(post)
+            post['similarity_score'] = float(similarities[i])
+            snippet = self.snippet_index.snippet(i, search_text)
+            if snippet:
+                post['snippet'] = snippet['text']
+                post['snippet_field'] = snippet['field']
+            result_posts.append(post)
         
-        return {
+        result = {
             'query_type': 'semantic_search',
             'query': query_text,
+            'category': category,
             'count': len(result_posts),
             'posts': result_posts
         }
+        if corrections:
+            result['corrected_query'] = search_text
+            result['corrections'] = corrections
+        return result
         
-    def get_posts_by_category(self, category: str, limit: int = 20) -> Dict[str, Any]:
+    @coalesced
+    def search_comments(self, query_text: str, limit: int = 5, category: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search comment threads for the passages that best match a query.
+        
+        Args:
+            query_text: The query text to search for
+            limit: Maximum number of passages to return
+            category: Optional category to restrict the search to
+            
+        Returns:
+            Dictionary with the matching passages and the topic each belongs to
+        """
+        allowed_posts = self._category_mask(category) if category else None
+        
+        passages = []
+        for match in self.passage_index.search(query_text, limit, allowed_posts):
+            post = self._post_fields(match['post_position'], ('id', 'title', 'url', 'category_name'))
+            passages.append({
+                'post_id': post.get('id'),
+                'title': post.get('title'),
+                'url': post.get('url'),
+                'category_name': post.get('category_name'),
+                'author': self.passage_index.author(match['passage']),
+                'comment_number': match['comment'] + 1,
+                'text': self.passage_index.text(match['passage']),
+                'similarity_score': match['score']
+            })
+        
+        return {
+            'query_type': 'comment_search',
+            'query': query_text,
+            'category': category,
+            'count': len(passages),
+            'passages': passages
+        }
+    
+    @coalesced
+    def diff(self, since_version: str, until_version: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """
+        Report what changed in the dataset between two snapshot versions.
+        
+        Versions are recorded by the downloader; the comparison reads only
+        the two version manifests, not the topic records.
+        
+        Args:
+            since_version: The older snapshot version
+            until_version: The newer snapshot version (defaults to the latest)
+            limit: Maximum number of entries per kind of change
+            
+        Returns:
+            Dictionary with new, removed and edited topics, and the largest
+            view and comment count changes
+        """
+        versions = [entry['version'] for entry in self.snapshots.versions()]
+        unknown = [v for v in (since_version, until_version) if v and v not in versions]
+        if not versions or unknown:
+            return {
+                'query_type': 'dataset_diff',
+                'error': (f"Unknown snapshot version '{unknown[0]}'" if versions
+                          else f"No snapshots recorded for dataset '{self.dataset}'"),
+                'available_versions': versions
+            }
+        
+        changes = self.snapshots.diff(since_version, until_version)
+        kinds = ('new_topics', 'removed_topics', 'edited_topics', 'view_changes', 'comment_changes')
+        result = {
+            'query_type': 'dataset_diff',
+            'since': changes['since'],
+            'until': changes['until'],
+            'totals': {kind: len(changes[kind]) for kind in kinds},
+            'count': sum(len(changes[kind]) for kind in kinds)
+        }
+        for kind in kinds:
+            entries = []
+            for entry in changes[kind][:limit]:
+                # Link topics that are still in the loaded dataset
+                position = self._position_by_id.get(entry['id'])
+                if position is not None:
+                    entry = {**entry, 'url': self._post_fields(position, ('url',)).get('url')}
+                entries.append(entry)
+            result[kind] = entries
+        return result
+    
+    def get_related_posts(self, post_id: int, k: int = 5) -> Dict[str, Any]:
+        """
+        Get the posts most similar to a post, from the precomputed neighbour graph.
+        
+        Args:
+            post_id: The ID of the post to find related posts for
+            k: Maximum number of related posts to return
+            
+        Returns:
+            Dictionary with the related posts and their similarity scores
+        """
+        position = self._position_by_id.get(post_id)
+        if position is None:
+            return {
+                'query_type': 'related_posts',
+                'post_id': post_id,
+                'count': 0,
+                'error': f"Post with ID {post_id} not found",
+                'posts': []
+            }
+        
+        related_posts = []
+        for neighbour, score in self.related_graph.neighbours(position, k):
+            post = dict(self.posts[neighbour])
+            post['similarity_score'] = score
+            related_posts.append(post)
+        
+        return {
+            'query_type': 'related_posts',
+            'post_id': post_id,
+            'post_title': self._post_fields(position, ('title',)).get('title'),
+            'count': len(related_posts),
+            'posts': related_posts
+        }
+    
+    def suggest(self, prefix: str, limit: int = 8) -> Dict[str, Any]:
+        """
+        Suggest posts for search-as-you-type from a title prefix.
+        
+        Every word typed must start a word of the post's title or category;
+        matches are ranked by views.
+        
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of posts to return
+            
+        Returns:
+            Dictionary with the matching categories and posts
+        """
+        posts = []
+        for position in self.prefix_index.suggest(prefix, limit):
+            post = self._post_fields(position, ('id', 'title', 'url', 'category_name', 'views'))
+            posts.append({
+                'id': post.get('id'),
+                'title': post.get('title'),
+                'url': post.get('url'),
+                'category_name': post.get('category_name'),
+                'views': post.get('views')
+            })
+        
+        return {
+            'query_type': 'suggest',
+            'prefix': prefix,
+            'categories': self.prefix_index.suggest_categories(prefix),
+            'count': len(posts),
+            'posts': posts
+        }
+    
+    def get_posts_by_category(self, category: str, limit: int = 20, dedup: bool = False) -> Dict[str, Any]:
         """
         Get all posts from a specific category with summarized information.
         
         Args:
             category: The category to get posts from
             limit: Maximum number of posts to return
+            dedup: Whether to collapse near-duplicate posts into one result
             
         Returns:
             Dictionary with posts from the specified category
         """
         # Check if category exists
-        if category not in self.data and category.lower() not in [c.lower() for c in self.data.keys()]:
+        if category not in self.categories and category.lower() not in [c.lower() for c in self.categories]:
             # Try to find a close match
-            for c in self.data.keys():
+            for c in self.categories:
                 if category.lower() in c.lower() or c.lower() in category.lower():
                     category = c
                     break
@@ -336,32 +1210,27 @@ class SolanaForumMCPServer:
                     'category': category,
                     'count': 0,
                     'error': f"Category '{category}' not found",
-                    'available_categories': list(self.data.keys()),
+                    'available_categories': list(self.categories),
                     'posts': []
                 }
         
-        # Get posts from the category
-        if category in self.data:
-            posts = self.data[category]
-        else:
-            # Find the category with case-insensitive matching
-            for c in self.data.keys():
+        # Find the category with case-insensitive matching
+        if category not in self.categories:
+            for c in self.categories:
                 if c.lower() == category.lower():
-                    posts = self.data[c]
                     category = c
                     break
-            else:
-                posts = []
         
-        # Sort by views (highest first)
-        sorted_posts = sorted(posts, key=lambda x: x.get('views', 0), reverse=True)
+        # Get posts from the category, sorted by views (highest first)
+        positions = self._ranked(self.time_index.by_category.get(category, []), 'views')
         
         # Limit the number of posts
-        result_posts = sorted_posts[:limit]
+        positions = self._select(positions, limit, dedup)
         
         # Create summarized posts with only essential information
         summarized_posts = []
-        for post in result_posts:
+        for i in positions:
+            post = self._post_fields(i, SUMMARY_FIELDS)
             summarized_post = {
                 'id': post.get('id'),
                 'title': post.get('title'),
@@ -372,6 +1241,8 @@ class SolanaForumMCPServer:
                 'created_at': post.get('created_at'),
                 'category_name': post.get('category_name', category)
             }
+            if dedup:
+                summarized_post = self._with_duplicates(summarized_post, i)
             summarized_posts.append(summarized_post)
         
         return {
@@ -381,22 +1252,30 @@ class SolanaForumMCPServer:
             'posts': summarized_posts
         }
     
-    def evaluate_post(self, post_id: int) -> Dict[str, Any]:
+    @coalesced
+    def evaluate_post(self, post_id: int, refresh: bool = False) -> Dict[str, Any]:
         """
         Evaluate a post from five different perspectives.
         
+        The title, description and the comments most relevant to the post
+        are packed into the EVALUATION_TOKEN_BUDGET; see src.prompt_packer.
+        Evaluations of unchanged posts are served from the evaluation cache
+        without calling the model.
+        
+        By default one structured completion scores every perspective, and
+        perspectives it fails to score are requested separately and
+        concurrently; see src.evaluation.
+        
         Args:
             post_id: The ID of the post to evaluate
+            refresh: Drop the post's cached evaluations and evaluate it afresh
             
         Returns:
             Dictionary with evaluation results
         """
         # Find the post by ID
-        post = None
-        for p in self.posts:
-            if p.get('id') == post_id:
-                post = p
-                break
+        position = self._position_by_id.get(post_id)
+        post = self.posts[position] if position is not None else None
         
         if not post:
             return {
@@ -410,33 +1289,22 @@ class SolanaForumMCPServer:
             return {
                 'query_type': 'post_evaluation',
                 'post_id': post_id,
-                'error': "OpenAI API key not provided. Set the OPENAI_API_KEY environment variable or pass it to the constructor."
+                'error': MISSING_API_KEY
             }
         
-        # Prepare the post content for evaluation
-        post_content = f"Title: {post.get('title', '')}\n\nDescription: {post.get('description', '')}"
-        
-        # Define the perspectives
-        perspectives = [
-            "technical innovation",
-            "ecosystem growth",
-            "community benefit",
-            "economic sustainability",
-            "decentralization"
-        ]
-        
-        # Evaluate the post from each perspective
-        evaluations = {}
+        packed = self._pack_for_evaluation(post)
+        post_content = packed.text
+        if refresh and self.evaluator.cache is not None:
+            self.evaluator.cache.invalidate(post_content_hash(post_content))
         
-        for perspective in perspectives:
-            score, explanation = self._evaluate_from_perspective(post_content, perspective)
-            evaluations[perspective] = {
-                'score': score,
-                'explanation': explanation
-            }
+        # Evaluate the post from every perspective concurrently
+        evaluations = self.evaluator.evaluate(post_content)
         
         # Calculate overall score (average of all perspectives)
-        overall_score = sum(eval_data['score'] for eval_data in evaluations.values()) / len(perspectives)
+        overall_score = sum(eval_data['score'] for eval_data in evaluations.values()) / len(evaluations)
+        if not any(eval_data['failed'] for eval_data in evaluations.values()):
+            self.score_store.save_score(self.dataset, post, post_content_hash(post_content), self.evaluator.model,
+                                        overall_score, evaluations)
         
         return {
             'query_type': 'post_evaluation',
@@ -445,83 +1313,153 @@ class SolanaForumMCPServer:
             'post_url': post.get('url'),
             'category': post.get('category_name'),
             'overall_score': overall_score,
+            'evaluation_mode': self.evaluator.mode,
+            'cached': all(eval_data['cached'] for eval_data in evaluations.values()),
+            'packed_tokens': packed.report(),
             'evaluations': evaluations
         }
     
-    def _evaluate_from_perspective(self, post_content: str, perspective: str) -> Tuple[float, str]:
+    def submit_evaluation(self, post_id: int, refresh: bool = False) -> Dict[str, Any]:
         """
-        Evaluate a post from a specific perspective using OpenAI API.
+        Queue a post for evaluation in the background and return at once.
+        
+        A worker of the evaluation job queue runs evaluate_post; poll the
+        job with self.evaluation_jobs.get. Submitting a post whose
+        evaluation is already queued or running returns that job.
         
         Args:
-            post_content: The content of the post to evaluate
-            perspective: The perspective to evaluate from
+            post_id: The ID of the post to evaluate
+            refresh: Drop the post's cached evaluations and evaluate it afresh
             
         Returns:
-            Tuple of (score, explanation)
+            Dictionary describing the job, or an error if the post does not
+            exist, no API key is set or the queue is full
         """
-        prompt = f"""
-        Please evaluate the following Solana forum post from the perspective of {perspective}.
-        
-        {post_content}
-        
-        Evaluate on a scale of 0.0 to 1.0, where:
-        - 0.0 means the post has no value or is harmful from this perspective
-        - 0.5 means the post has moderate value from this perspective
-        - 1.0 means the post has exceptional value from this perspective
+        position = self._position_by_id.get(post_id)
+        if position is None:
+            return {
+                'query_type': 'evaluation_job',
+                'post_id': post_id,
+                'error': f"Post with ID {post_id} not found"
+            }
+        if not self.openai_api_key:
+            return {
+                'query_type': 'evaluation_job',
+                'post_id': post_id,
+                'error': MISSING_API_KEY
+            }
         
-        Provide your evaluation in the following format:
-        Score: [numerical score between 0.0 and 1.0]
-        Explanation: [your explanation for the score]
+        return self.evaluation_jobs.submit(
+            (self.dataset, post_id, refresh), self.evaluate_post, post_id, refresh,
+            dataset=self.dataset, post_id=post_id, post_title=self._post_fields(position, ('title',)).get('title'),
+            refresh=refresh
+        )
+    
+    def get_top_scored_posts(self, category: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
         """
+        Get the highest-scoring posts from stored evaluations.
         
-        try:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.openai_api_key}"
-            }
+        Scores are stored by every evaluation, including bulk evaluation
+        jobs, so this never calls the model. Posts edited since they were
+        scored are flagged as stale.
+        
+        Args:
+            category: Optional category to filter by
+            limit: Maximum number of posts to return
             
-            data = {
-                "model": "gpt-3.5-turbo",
-                "messages": [
-                    {"role": "system", "content": "You are an expert evaluator of Solana blockchain forum posts."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.3,
-                "max_tokens": 300
+        Returns:
+            Dictionary with the highest-scoring posts, best first
+        """
+        if category and category not in self.categories:
+            return {
+                'query_type': 'top_scored_posts',
+                'error': f"Category '{category}' not found",
+                'available_categories': self.categories
             }
+        
+        posts = []
+        for entry in self.score_store.top_scores(self.dataset, [category] if category else None, limit):
+            position = self._position_by_id.get(entry['id'])
+            post = self.posts[position] if position is not None else {}
+            posts.append({
+                'id': entry['id'],
+                'title': post.get('title') or entry['title'],
+                'url': post.get('url'),
+                'category_name': entry['category_name'],
+                'views': post.get('views'),
+                'overall_score': round(entry['overall_score'], 3),
+                'scores': entry['scores'],
+                'evaluated_at': datetime.datetime.fromtimestamp(entry['evaluated_at']).isoformat(timespec='seconds'),
+                'stale': position is None or post_content_hash(self._evaluation_content(post)) != entry['content_hash']
+            })
+        
+        return {
+            'query_type': 'top_scored_posts',
+            'category': category,
+            'scored_posts': self.score_store.scored_posts(self.dataset),
+            'count': len(posts),
+            'posts': posts
+        }
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Count the expensive calls that joined an identical call in flight.
+        
+        Returns:
+            Dictionary with per-method calls, executions and coalesced
+            (saved) calls, and their totals
+        """
+        methods = self.single_flight.stats()
+        in_flight = methods.pop('in_flight')
+        return {
+            'query_type': 'coalescing',
+            'calls': sum(counts['calls'] for counts in methods.values()),
+            'saved': sum(counts['coalesced'] for counts in methods.values()),
+            'in_flight': in_flight,
+            'methods': methods
+        }
+    
+    def _evaluation_content(self, post: Dict[str, Any]) -> str:
+        """Text of a post sent for evaluation, which is also its evaluation cache key."""
+        return self._pack_for_evaluation(post).text
+    
+    def _pack_for_evaluation(self, post: Dict[str, Any]) -> PackedContent:
+        """Pack a post's title, description and most relevant comment passages into the evaluation token budget."""
+        title, description = post.get('title') or '', post.get('description') or ''
+        excerpts = []
+        position = self._position_by_id.get(post.get('id'))
+        if self.prompt_packer.budget and position is not None:
+            for match in self.passage_index.search_post(position, f"{title} {description}", MAX_EXCERPTS):
+                excerpts.append((self.passage_index.author(match['passage']),
+                                 self.passage_index.text(match['passage'])))
+        return self.prompt_packer.pack(title, description, excerpts)
+    
+    def evaluation_cache(self, clear: bool = False, post_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Describe the evaluation cache, optionally invalidating entries first.
+        
+        Args:
+            clear: Delete cached evaluations, of post_id only when given
+            post_id: Post whose cached evaluations are deleted
             
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data
-            )
-            
-            if response.status_code != 200:
-                return 0.5, f"Error calling OpenAI API: {response.text}"
-            
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
-            
-            # Extract score and explanation
-            score_match = re.search(r'Score:\s*([\d.]+)', content)
-            explanation_match = re.search(r'Explanation:\s*(.*)', content, re.DOTALL)
-            
-            if score_match:
-                score = float(score_match.group(1))
-                # Ensure score is within bounds
-                score = max(0.0, min(1.0, score))
-            else:
-                score = 0.5
-                
-            if explanation_match:
-                explanation = explanation_match.group(1).strip()
-            else:
-                explanation = content
-                
-            return score, explanation
-            
-        except Exception as e:
-            return 0.5, f"Error evaluating post: {str(e)}"
+        Returns:
+            Dictionary with the cache's entries, hits, misses and hit rate,
+            and the number of evaluations deleted
+        """
+        cache = self.evaluator.cache
+        if cache is None:
+            return {'query_type': 'evaluation_cache', 'error': "The evaluation cache is disabled (EVALUATION_CACHE=0)"}
+        
+        deleted = 0
+        if clear and post_id is not None:
+            position = self._position_by_id.get(post_id)
+            if position is None:
+                return {'query_type': 'evaluation_cache', 'error': f"Post with ID {post_id} not found"}
+            deleted = cache.invalidate(post_content_hash(self._evaluation_content(self.posts[position])))
+        elif clear:
+            deleted = cache.invalidate()
+        
+        return {'query_type': 'evaluation_cache', **cache.stats(), 'deleted': deleted}
 
 # Example usage
 if __name__ == "__main__":
@@ -533,8 +1471,14 @@ if __name__ == "__main__":
         "What is the most viewed post on Solana?",
         "Which posts have the most comments?",
         "Show me forum statistics",
+        "Monthly activity trends in Governance",
+        "Who are the most active users this year?",
+        "Posts by jacobcreech",
+        "Find duplicate posts",
         "Tell me about Solana validators",
         "Give me all posts on Governance",
+        "Latest validator posts in Governance",
+        "Posts between 2024-01-01 and 2024-06-30",
         "For this post id 123, give me its evaluation"
     ]
     
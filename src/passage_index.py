@@ -0,0 +1,205 @@
+"""
+Passage index over comment threads for the Solana Forum MCP server.
+
+Each comment is cut into overlapping fixed-size word windows. A passage is
+stored only as offsets into its post's comment string (post position,
+comment number, start, end), and the windows are vectorized with a hashing
+vectorizer, so the index holds no vocabulary and no copies of the text.
+Searches multiply the query against the sparse float32 matrix and only
+touch passages that share a term with the query.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+from src.utils import split_comments
+
+# Words per passage, and words between the starts of consecutive passages;
+# the overlap keeps an answer that straddles a boundary whole in one window
+WINDOW_WORDS = 64
+STRIDE_WORDS = 48
+
+# Hashed feature space; collisions are rare at forum vocabulary sizes
+N_FEATURES = 2 ** 18
+
+WORD_PATTERN = re.compile(r'\S+')
+
+
+class PassageIndex:
+    """
+    Sparse TF-IDF index of comment passages.
+    """
+
+    def __init__(self, threads: Sequence[str], window: int = WINDOW_WORDS,
+                 stride: int = STRIDE_WORDS, n_features: int = N_FEATURES):
+        """
+        Chunk and vectorize every comment thread.
+
+        Args:
+            threads: Flattened comment thread of each post, by position
+            window: Words per passage
+            stride: Words between the starts of consecutive passages
+            n_features: Size of the hashed feature space
+        """
+        self.threads = threads
+        self.window = window
+        self.stride = stride
+
+        post, comment, start, end = [], [], [], []
+        for position, thread in enumerate(threads):
+            for number, (_, comment_start, comment_end) in enumerate(split_comments(thread or '')):
+                for passage_start, passage_end in self._windows(thread, comment_start, comment_end):
+                    post.append(position)
+                    comment.append(number)
+                    start.append(passage_start)
+                    end.append(passage_end)
+
+        self.post = np.asarray(post, dtype=np.int32)
+        self.comment = np.asarray(comment, dtype=np.int32)
+        self.start = np.asarray(start, dtype=np.int32)
+        self.end = np.asarray(end, dtype=np.int32)
+
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            stop_words='english',
+            dtype=np.float32
+        )
+        self.transformer = TfidfTransformer(sublinear_tf=True)
+        if len(self):
+            self.matrix = self.transformer.fit_transform(self.hasher.transform(self._passage_texts()))
+        else:
+            self.matrix = None
+
+    def __len__(self) -> int:
+        return len(self.post)
+
+    def _windows(self, thread: str, start: int, end: int) -> Iterator[tuple]:
+        """Yield (start, end) character offsets of the word windows of one comment."""
+        words = [match.span() for match in WORD_PATTERN.finditer(thread, start, end)]
+        if not words:
+            return
+
+        starts = list(range(0, max(len(words) - self.window, 0) + 1, self.stride))
+        # Always cover the tail of the comment
+        if starts[-1] + self.window < len(words):
+            starts.append(len(words) - self.window)
+
+        for first in starts:
+            last = min(first + self.window, len(words)) - 1
+            yield words[first][0], words[last][1]
+
+    def _passage_texts(self) -> Iterator[str]:
+        """Yield each passage's text, sliced on demand from its thread."""
+        for position, start, end in zip(self.post, self.start, self.end):
+            yield self.threads[position][start:end]
+
+    def text(self, passage: int) -> str:
+        """Get the text of a passage."""
+        return self.threads[self.post[passage]][self.start[passage]:self.end[passage]]
+
+    def author(self, passage: int) -> Optional[str]:
+        """Get the username of the comment a passage was cut from."""
+        comments = split_comments(self.threads[self.post[passage]] or '')
+        number = self.comment[passage]
+        return comments[number][0] if number < len(comments) else None
+
+    def search(self, query_text: str, limit: int = 5,
+               allowed_posts: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Find the passages that best match a query.
+
+        At most one passage is returned per comment, since overlapping
+        windows of the same comment would otherwise repeat each other.
+
+        Args:
+            query_text: The query text to search for
+            limit: Maximum number of passages to return
+            allowed_posts: Optional boolean mask over post positions to restrict to
+
+        Returns:
+            List of passage dictionaries (passage, post_position, comment,
+            score), best first
+        """
+        if self.matrix is None or limit <= 0:
+            return []
+
+        query_vector = self.transformer.transform(self.hasher.transform([query_text]))
+        if not query_vector.nnz:
+            return []
+
+        # Sparse product: only passages sharing a term with the query appear
+        matches = (self.matrix @ query_vector.T).tocoo()
+        passages, scores = matches.row, matches.data
+        if allowed_posts is not None:
+            keep = allowed_posts[self.post[passages]]
+            passages, scores = passages[keep], scores[keep]
+
+        results = []
+        seen = set()
+        for i in np.argsort(-scores, kind='stable'):
+            passage = int(passages[i])
+            key = (int(self.post[passage]), int(self.comment[passage]))
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append({
+                'passage': passage,
+                'post_position': key[0],
+                'comment': key[1],
+                'score': float(scores[i])
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    def search_post(self, position: int, query_text: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank one post's comment passages against a text, e.g. the post itself.
+
+        A post's passages are stored contiguously, so only its rows of the
+        matrix are multiplied. At most one passage is returned per comment;
+        when no passage shares a term with the text, the opening passages of
+        the earliest comments are returned instead.
+
+        Args:
+            position: Position of the post
+            query_text: Text to rank the passages against
+            limit: Maximum number of passages to return
+
+        Returns:
+            List of passage dictionaries (passage, post_position, comment,
+            score), best first
+        """
+        if self.matrix is None or limit <= 0:
+            return []
+        first, last = np.searchsorted(self.post, [position, position + 1])
+        if first == last:
+            return []
+
+        query_vector = self.transformer.transform(self.hasher.transform([query_text]))
+        scores = (self.matrix[first:last] @ query_vector.T).toarray().ravel()
+        # Stable order keeps earlier comments first among equal scores
+        order = np.argsort(-scores, kind='stable')
+
+        results = []
+        seen = set()
+        for i in order:
+            passage = first + int(i)
+            comment = int(self.comment[passage])
+            if comment in seen:
+                continue
+            seen.add(comment)
+            results.append({
+                'passage': passage,
+                'post_position': position,
+                'comment': comment,
+                'score': float(scores[i])
+            })
+            if len(results) >= limit:
+                break
+        return results
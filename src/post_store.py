@@ -0,0 +1,155 @@
+"""
+Compact column store for posts, used by the server's low-memory mode.
+
+Instead of one dictionary per post (plus the nested category JSON and a
+DataFrame holding the same text), fields are kept as shared columns: whole
+number fields in typed arrays, repeated values such as category and author
+names interned, long text as UTF-8 bytes, and every other field in one list
+per column. Records are assembled on access, so callers still see plain
+post dictionaries.
+"""
+
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Fields with few distinct values, interned so each value is stored once
+INTERNED_FIELDS = frozenset(['category_name', 'original_poster', 'activity'])
+
+# Long text fields stored UTF-8 encoded. Python keeps a string containing any
+# non-Latin-1 character (such as a typographic quote) at 2-4 bytes per
+# character; forum text is almost all ASCII, so UTF-8 is about half the size.
+ENCODED_FIELDS = frozenset(['description', 'comments'])
+
+
+class _Missing:
+    """Marker for a field a post does not have."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class PostStore:
+    """
+    Read-only sequence of posts stored column by column.
+    """
+
+    __slots__ = ('fields', 'columns', '_length')
+
+    def __init__(self, posts: Sequence[Dict[str, Any]]):
+        """
+        Build the columns from a list of post dictionaries.
+
+        Args:
+            posts: Posts in the order they should be stored
+        """
+        fields: List[str] = []
+        for post in posts:
+            for field in post:
+                if field not in fields:
+                    fields.append(field)
+
+        self.fields = tuple(fields)
+        self.columns: Dict[str, Any] = {}
+        self._length = len(posts)
+
+        for field in self.fields:
+            values = [post.get(field, MISSING) for post in posts]
+            if all(type(value) is int for value in values):
+                self.columns[field] = array('q', values)
+            elif field in ENCODED_FIELDS:
+                self.columns[field] = [v.encode('utf-8') if isinstance(v, str) else v for v in values]
+            elif field in INTERNED_FIELDS:
+                self.columns[field] = [sys.intern(v) if isinstance(v, str) else v for v in values]
+            else:
+                self.columns[field] = values
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        """
+        Assemble the post at a position.
+
+        Args:
+            position: Position of the post
+
+        Returns:
+            New dictionary with the post's fields
+        """
+        return self.record(position)
+
+    def record(self, position: int, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Assemble some fields of the post at a position.
+
+        Reading a few short fields this way skips decoding the post's
+        description and comments.
+
+        Args:
+            position: Position of the post
+            fields: Fields to include (all when None); fields the post does
+                    not have are left out, as in a full record
+
+        Returns:
+            New dictionary with the post's requested fields
+        """
+        position = int(position)
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("post position out of range")
+
+        columns = self.columns.items() if fields is None else (
+            (field, self.columns[field]) for field in fields if field in self.columns
+        )
+        record = {}
+        for field, column in columns:
+            value = column[position]
+            if value is MISSING:
+                continue
+            if field in ENCODED_FIELDS and isinstance(value, bytes):
+                value = value.decode('utf-8')
+            record[field] = value
+        return record
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self._length):
+            yield self[position]
+
+    def text_column(self, field: str) -> '_TextColumn':
+        """
+        Get one text field of every post without assembling records.
+
+        Args:
+            field: Field name
+
+        Returns:
+            Sequence of the field's values as strings ('' when missing),
+            decoded on access
+        """
+        return _TextColumn(self.columns.get(field, [MISSING] * self._length))
+
+
+class _TextColumn(Sequence):
+    """Read-only view of a text column that decodes values on access."""
+
+    __slots__ = ('values',)
+
+    def __init__(self, values: List[Any]):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, position: int) -> str:
+        value = self.values[position]
+        if isinstance(value, bytes):
+            return value.decode('utf-8')
+        return value if isinstance(value, str) else ''
@@ -0,0 +1,176 @@
+"""
+Prefix index for search-as-you-type over post titles.
+
+Normalized title and category tokens are kept in one sorted array, so the
+tokens starting with a prefix form a contiguous range found by two binary
+searches. Short prefixes match long ranges, so the best posts for every
+prefix whose range is large are ranked once at build time; other single
+words rank at most RANGE_LIMIT entries per keystroke. Several words
+intersect their ranges starting from the most selective one.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Largest range ranked per keystroke; prefixes matching more entries are precomputed
+RANGE_LIMIT = 64
+
+# Most suggestions a query may ask for (and the length of precomputed lists)
+MAX_SUGGESTIONS = 20
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+
+# Sorts after every character a normalized token can contain
+PREFIX_END = '\uffff'
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and strip accents so "Gouvernance" matches "gouv"."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str, parts: bool = True) -> List[str]:
+    """
+    Split text into normalized prefix-searchable tokens.
+
+    Hyphenated words are indexed whole and by part, so "simd-0096" is found
+    by both "simd-00" and "0096".
+
+    Args:
+        text: Text to split
+        parts: Whether to add the parts of hyphenated words
+
+    Returns:
+        List of tokens
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(normalize(text)):
+        word = match.group()
+        tokens.append(word)
+        if parts and '-' in word:
+            tokens.extend(word.split('-'))
+    return tokens
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index over post titles and categories, ranked by views.
+    """
+
+    def __init__(self, titles: Sequence[str], categories: Sequence[str], views: Sequence[int]):
+        """
+        Build the index.
+
+        Args:
+            titles: Title of each post, by position
+            categories: Category of each post, by position
+            views: View count of each post, by position
+        """
+        # Posts are listed by view rank, so ranking a set of posts is sorting
+        # their ranks; by_rank maps a rank back to the post position
+        views = np.array([int(v or 0) for v in views], dtype=np.int64)
+        self.by_rank = np.lexsort((np.arange(len(views)), -views)).astype(np.int32)
+        rank_of = np.empty(len(views), dtype=np.int64)
+        rank_of[self.by_rank] = np.arange(len(views))
+
+        entries = set()
+        for position, (title, category) in enumerate(zip(titles, categories)):
+            rank = int(rank_of[position])
+            entries.update((token, rank) for token in tokenize(title or '') + tokenize(category or ''))
+
+        # Distinct tokens in order; the post ranks of token i are
+        # ranks[starts[i]:starts[i + 1]]
+        ordered = sorted(entries)
+        self.tokens: List[str] = []
+        starts = []
+        for offset, (token, _) in enumerate(ordered):
+            if not self.tokens or self.tokens[-1] != token:
+                self.tokens.append(token)
+                starts.append(offset)
+        starts.append(len(ordered))
+        self.starts = starts
+        self.ranks = np.array([rank for _, rank in ordered], dtype=np.int32)
+
+        self.category_names = {normalize(c): c for c in dict.fromkeys(categories) if c}
+        self.category_keys = sorted(self.category_names)
+
+        # Rank once every prefix whose range is too long to rank per keystroke
+        self.ranked: Dict[str, List[int]] = {}
+        for token in self.tokens:
+            for length in range(1, len(token) + 1):
+                prefix = token[:length]
+                if prefix in self.ranked:
+                    continue
+                candidates = self._candidates(prefix)
+                if len(candidates) <= RANGE_LIMIT:
+                    break
+                self.ranked[prefix] = self._rank(candidates, MAX_SUGGESTIONS)
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def _candidates(self, prefix: str) -> np.ndarray:
+        """Get the post ranks listed under every token starting with ``prefix``."""
+        first = bisect_left(self.tokens, prefix)
+        last = bisect_left(self.tokens, prefix + PREFIX_END, first)
+        return self.ranks[self.starts[first]:self.starts[last]]
+
+    def _rank(self, ranks: np.ndarray, limit: int) -> List[int]:
+        """Get the positions of the best ``limit`` distinct post ranks."""
+        return self.by_rank[np.unique(ranks)[:limit]].tolist()
+
+    def suggest(self, text: str, limit: int = 8) -> List[int]:
+        """
+        Get the most viewed posts whose title matches what has been typed.
+
+        Every typed word must prefix a word of the title (or category); the
+        last word is usually still being typed.
+
+        Args:
+            text: Text typed so far
+            limit: Maximum number of posts to return (at most MAX_SUGGESTIONS)
+
+        Returns:
+            Post positions, most viewed first
+        """
+        words = list(dict.fromkeys(tokenize(text, parts=False)))
+        limit = min(limit, MAX_SUGGESTIONS)
+        if not words or limit <= 0:
+            return []
+
+        if len(words) == 1:
+            if words[0] in self.ranked:
+                return self.ranked[words[0]][:limit]
+            return self._rank(self._candidates(words[0]), limit)
+
+        # Intersect the words' posts as masks over the ranks, which avoids
+        # sorting long ranges
+        matches = np.ones(len(self.by_rank), dtype=bool)
+        for word in words:
+            mask = np.zeros(len(self.by_rank), dtype=bool)
+            mask[self._candidates(word)] = True
+            matches &= mask
+        return self.by_rank[np.flatnonzero(matches)[:limit]].tolist()
+
+    def suggest_categories(self, text: str, limit: int = 3) -> List[str]:
+        """
+        Get the categories whose name starts with what has been typed.
+
+        Args:
+            text: Text typed so far
+            limit: Maximum number of categories to return
+
+        Returns:
+            Category names
+        """
+        prefix = normalize(text.strip())
+        if not prefix:
+            return []
+        lo = bisect_left(self.category_keys, prefix)
+        hi = bisect_left(self.category_keys, prefix + PREFIX_END)
+        return [self.category_names[key] for key in self.category_keys[lo:hi][:limit]]
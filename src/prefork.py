@@ -0,0 +1,279 @@
+"""
+Multi-worker production server for the Solana Forum HTTP API.
+
+The parent process binds the listening socket and builds the dataset
+engines once (importing the server module preloads them), then forks
+workers that accept connections on the shared socket. Workers share the
+engines copy-on-write instead of each building its own copy of the posts,
+DataFrame and search indexes.
+
+Forked pages stay shared only while no process writes to them, and CPython
+writes to an object whenever its reference count or garbage collector
+header changes. So garbage collection is disabled while the engines are
+built, and every surviving object is then frozen into the permanent
+generation (gc.freeze), which the collector never scans; the bulk of the
+indexes lives in numpy and scipy buffers, whose pages reference counting
+never touches. Pages are copied only for the Python objects a worker
+actually uses, such as the posts it serializes; LOW_MEMORY=1 keeps posts
+column-wise, so even fewer pages are touched.
+
+Every worker runs the evaluation jobs its requests queue, and a job may be
+polled through any worker, so job changes are shared through SQLite in the
+cache directory (SHARED_EVALUATION_JOBS). Sharded search pools cannot cross
+a fork, so each worker starts its own search worker processes on its first
+search: --workers times SEARCH_WORKERS processes in all.
+
+The parent restarts workers that exit, stops them on SIGTERM or SIGINT,
+and reports each worker's unique (USS) and proportional (PSS) memory on
+SIGUSR1 and every --report-interval seconds.
+"""
+
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from src.utils import process_memory
+
+SERVERS = ('flask', 'asgi')
+
+# Seconds between checks for exited workers, and the least time a worker
+# must live before it is restarted without delay
+POLL_INTERVAL = 0.5
+MIN_WORKER_LIFETIME = 1.0
+
+
+def load_app(server: str) -> Any:
+    """Import a server module, building and preloading its dataset engines, and return its app."""
+    if server == 'flask':
+        from src.api_server import app
+    elif server == 'asgi':
+        from src.asgi_server import app
+    else:
+        raise ValueError(f"Unknown server '{server}'. Choose one of: {', '.join(SERVERS)}")
+    return app
+
+
+def worker_pids(parent_pid: int) -> List[int]:
+    """
+    Find the worker processes of a launcher, e.g. to measure them from outside.
+
+    Args:
+        parent_pid: Process ID of the launcher
+
+    Returns:
+        Process IDs of its child processes (empty where /proc is unavailable)
+    """
+    pids = []
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; the fields after it are fixed
+                fields = f.read().rpartition(')')[2].split()
+        except OSError:
+            continue
+        if int(fields[1]) == parent_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+class PreforkServer:
+    """
+    Parent process that builds the engines once and supervises forked workers.
+    """
+
+    def __init__(self, server: str = 'flask', workers: Optional[int] = None, host: str = '0.0.0.0',
+                 port: int = 5001, freeze: bool = True, report_interval: float = 0.0):
+        """
+        Args:
+            server: 'flask' (threaded WSGI workers) or 'asgi' (uvicorn event loop workers)
+            workers: Worker processes (defaults to API_WORKERS, or the CPU count)
+            host: Interface to listen on
+            port: Port to listen on
+            freeze: Freeze the objects built before forking out of the
+                    garbage collector's reach
+            report_interval: Seconds between memory reports (0 reports
+                             only on SIGUSR1)
+        """
+        if server not in SERVERS:
+            raise ValueError(f"Unknown server '{server}'. Choose one of: {', '.join(SERVERS)}")
+        if workers is None:
+            workers = int(os.environ.get("API_WORKERS") or os.cpu_count() or 1)
+        self.server = server
+        self.workers = max(workers, 1)
+        self.host = host
+        self.port = port
+        self.freeze = freeze
+        self.report_interval = report_interval
+
+        self.app = None
+        self.socket: Optional[socket.socket] = None
+        self._children: Dict[int, float] = {}
+        self._stopping = False
+        self._report_requested = False
+
+    def run(self):
+        """Build the engines, fork the workers and supervise them until stopped."""
+        self.socket = socket.create_server((self.host, self.port), backlog=2048)
+        # Requests for a job may reach any worker, not just the one running it
+        os.environ.setdefault("SHARED_EVALUATION_JOBS", "1")
+        if self.freeze:
+            # Objects built from here on stay where they are allocated, and
+            # the collector does not run until they are frozen
+            gc.disable()
+        self.app = load_app(self.server)
+        if self.freeze:
+            gc.collect()
+            gc.freeze()
+            print(f"Froze {gc.get_freeze_count()} objects before forking")
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGUSR1, self._request_report)
+
+        for _ in range(self.workers):
+            self._spawn()
+        print(f"Serving the {self.server} API on http://{self.host}:{self.port} "
+              f"with {self.workers} workers (parent {os.getpid()})")
+
+        next_report = time.monotonic() + self.report_interval
+        while self._children:
+            self._reap()
+            if self._report_requested or (self.report_interval and time.monotonic() >= next_report):
+                self._report_requested = False
+                next_report = time.monotonic() + self.report_interval
+                self.print_memory_report()
+            time.sleep(POLL_INTERVAL)
+        self.socket.close()
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Measure the parent's and every worker's memory.
+
+        Returns:
+            Dictionary with the parent's and each worker's rss, pss, uss and
+            shared bytes, the total PSS of all processes (the memory they
+            use together), and the memory the same number of independent
+            servers would use (one parent's RSS per worker)
+        """
+        parent = process_memory()
+        workers = {pid: process_memory(pid) for pid in sorted(self._children)}
+        workers = {pid: memory for pid, memory in workers.items() if memory is not None}
+        if parent is None:
+            return {'error': "Per-process memory is only available on Linux (/proc/<pid>/smaps_rollup)"}
+        return {
+            'parent': parent,
+            'workers': workers,
+            'total_pss': parent['pss'] + sum(memory['pss'] for memory in workers.values()),
+            'independent_estimate': parent['rss'] * len(workers)
+        }
+
+    def print_memory_report(self):
+        """Print the memory report, in MB."""
+        report = self.memory_report()
+        if 'error' in report:
+            print(report['error'])
+            return
+        mb = 1024 * 1024
+        lines = [f"{'process':>14} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8} {'shared MB':>9}"]
+        for name, memory in [('parent', report['parent'])] + [(f"worker {pid}", memory)
+                                                              for pid, memory in report['workers'].items()]:
+            lines.append(f"{name:>14} {memory['rss'] / mb:8.1f} {memory['pss'] / mb:8.1f} "
+                         f"{memory['uss'] / mb:8.1f} {memory['shared'] / mb:9.1f}")
+        lines.append(f"Total PSS {report['total_pss'] / mb:.1f} MB; {len(report['workers'])} independent "
+                     f"servers would use about {report['independent_estimate'] / mb:.1f} MB")
+        print("\n".join(lines), flush=True)
+
+    def _spawn(self):
+        """Fork one worker."""
+        pid = os.fork()
+        if pid:
+            self._children[pid] = time.monotonic()
+            return
+
+        # In the worker
+        exit_code = 0
+        try:
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGUSR1):
+                signal.signal(signum, signal.SIG_DFL)
+            random.seed()
+            gc.enable()
+            self._serve()
+        except BaseException as e:
+            print(f"Worker {os.getpid()} stopped: {e!r}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+
+    def _serve(self):
+        """Serve requests from the shared socket until the worker is stopped."""
+        if self.server == 'flask':
+            from werkzeug.serving import make_server
+            host, port = self.socket.getsockname()[:2]
+            make_server(host, port, self.app, threaded=True, fd=self.socket.fileno()).serve_forever()
+        else:
+            import uvicorn
+            uvicorn.Server(uvicorn.Config(self.app, log_level='warning')).run(sockets=[self.socket])
+
+    def _reap(self):
+        """Collect exited workers, restarting them unless the server is stopping."""
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if not pid:
+                return
+            started = self._children.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting it")
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                # Don't spin when workers die at startup
+                time.sleep(MIN_WORKER_LIFETIME)
+            self._spawn()
+
+    def _stop(self, signum, frame):
+        """Stop every worker, then exit once they have."""
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _request_report(self, signum, frame):
+        self._report_requested = True
+
+
+def main():
+    """Run the multi-worker API server."""
+    parser = argparse.ArgumentParser(description="Solana Forum MCP API with preforked workers")
+    parser.add_argument("--server", choices=SERVERS, default="flask", help="Flask (WSGI) or ASGI workers")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: API_WORKERS or the CPU count)")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=5001, help="Port to listen on")
+    parser.add_argument("--no-freeze", action="store_true",
+                        help="Don't freeze the preloaded objects out of the garbage collector's reach")
+    parser.add_argument("--report-interval", type=float, default=0.0,
+                        help="Seconds between per-worker memory reports (default: only on SIGUSR1)")
+    args = parser.parse_args()
+
+    PreforkServer(args.server, args.workers, args.host, args.port, freeze=not args.no_freeze,
+                  report_interval=args.report_interval).run()
+
+
+if __name__ == '__main__':
+    main()
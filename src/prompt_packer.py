@@ -0,0 +1,218 @@
+"""
+Token-budgeted packing of post content for evaluation prompts.
+
+A post is packed into a fixed token budget: the title (capped), then the
+description, then excerpts of the comments most relevant to the post, best
+first. The description is trimmed only as far as needed to leave the
+comments their share of the budget, and any budget the description leaves
+unused goes to the comments. Long proposals therefore cost a bounded number
+of prompt tokens, and discussion that would otherwise be ignored is seen by
+the model.
+
+Tokens are counted with tiktoken's cl100k_base encoding when tiktoken is
+installed, and otherwise approximated from word lengths; the approximation
+errs high, so packed content stays within the budget either way.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # tiktoken is optional; a missing package or encoding file falls back
+    # to the approximation
+    _ENCODING = None
+
+TOKENIZER = "cl100k_base" if _ENCODING is not None else "approximate"
+
+# Default token budget for a post's packed content (0 disables packing)
+DEFAULT_BUDGET = 1500
+
+# Most tokens a title may take, the share of the budget left after the
+# title that is reserved for comment excerpts, and the fewest tokens worth
+# sending of an excerpt that has to be cut short
+TITLE_TOKENS = 64
+COMMENT_SHARE = 0.3
+MIN_EXCERPT_TOKENS = 24
+
+# Comment excerpts considered per post
+MAX_EXCERPTS = 8
+
+# Approximate tokens are counted per word or punctuation mark, one token
+# per APPROXIMATE_WORD_CHARS characters of a word
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+APPROXIMATE_WORD_CHARS = 6
+
+ELLIPSIS = " ..."
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Number of tokens, exact with tiktoken and approximate otherwise
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return sum(1 + (len(piece) - 1) // APPROXIMATE_WORD_CHARS for piece in TOKEN_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> Tuple[str, int]:
+    """
+    Cut a text down to at most a number of tokens, marking the cut with an ellipsis.
+
+    Args:
+        text: Text to cut
+        max_tokens: Most tokens the result may have, ellipsis included
+
+    Returns:
+        Tuple of the (possibly cut) text and its token count
+    """
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text, tokens
+
+    keep = max_tokens - count_tokens(ELLIPSIS)
+    if keep <= 0:
+        return "", 0
+
+    if _ENCODING is not None:
+        head = _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:keep])
+    else:
+        used, end = 0, 0
+        for match in TOKEN_PATTERN.finditer(text):
+            used += 1 + (len(match.group()) - 1) // APPROXIMATE_WORD_CHARS
+            if used > keep:
+                break
+            end = match.end()
+        head = text[:end]
+
+    head = head.rstrip() + ELLIPSIS
+    return head, count_tokens(head)
+
+
+def excerpt_lines(excerpts: Sequence[Tuple[Optional[str], str]]) -> List[str]:
+    """Format (author, text) excerpts as they appear in a packed prompt."""
+    return [f"- [{author or 'unknown'}]: {' '.join(text.split())}" for author, text in excerpts]
+
+
+@dataclass
+class PackedContent:
+    """
+    A post's content packed into a token budget, with its token counts.
+    """
+    text: str
+    budget: int
+    title_tokens: int
+    description_tokens: int
+    comment_tokens: int
+    excerpts: int
+    original_tokens: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        """Tokens of the packed text."""
+        return count_tokens(self.text)
+
+    def report(self) -> Dict[str, object]:
+        """Token counts for evaluation results."""
+        return {
+            'tokenizer': TOKENIZER,
+            'budget': self.budget,
+            'total': self.total_tokens,
+            'title': self.title_tokens,
+            'description': self.description_tokens,
+            'comments': self.comment_tokens,
+            'excerpts': self.excerpts,
+            'original': self.original_tokens
+        }
+
+
+class PromptPacker:
+    """
+    Packs a post's title, description and comment excerpts into a token budget.
+    """
+
+    def __init__(self, budget: Optional[int] = None, comment_share: float = COMMENT_SHARE):
+        """
+        Args:
+            budget: Token budget of the packed content (defaults to
+                    EVALUATION_TOKEN_BUDGET, or DEFAULT_BUDGET; 0 sends the
+                    title and full description without comments)
+            comment_share: Share of the budget after the title reserved for
+                           comment excerpts
+        """
+        if budget is None:
+            budget = int(os.environ.get("EVALUATION_TOKEN_BUDGET") or DEFAULT_BUDGET)
+        self.budget = max(budget, 0)
+        self.comment_share = comment_share
+
+    def pack(self, title: str, description: str,
+             excerpts: Sequence[Tuple[Optional[str], str]] = ()) -> PackedContent:
+        """
+        Pack a post into the budget.
+
+        Args:
+            title: Post title
+            description: Post description
+            excerpts: (author, text) comment excerpts, most relevant first
+
+        Returns:
+            PackedContent with the text to evaluate and its token counts
+        """
+        title = title or ''
+        description = description or ''
+        original = {
+            'title': count_tokens(title),
+            'description': count_tokens(description),
+            'comments': sum(count_tokens(text) for _, text in excerpts)
+        }
+
+        if not self.budget:
+            text = f"Title: {title}\n\nDescription: {description}"
+            return PackedContent(text, 0, original['title'], original['description'], 0, 0, original)
+
+        title, title_tokens = truncate_to_tokens(title, min(TITLE_TOKENS, self.budget))
+        header = f"Title: {title}\n\nDescription: "
+        remaining = max(self.budget - count_tokens(header), 0)
+
+        lines = excerpt_lines(excerpts)
+        comments_heading = "\n\nRelevant comments:\n"
+        wanted = count_tokens(comments_heading) + sum(count_tokens(line) + 1 for line in lines) if lines else 0
+        reserved = min(wanted, int(remaining * self.comment_share))
+
+        description, description_tokens = truncate_to_tokens(description, remaining - reserved)
+        remaining -= description_tokens
+
+        # Whatever the description left unused goes to the comments
+        packed_lines = []
+        comment_tokens = 0
+        if lines and remaining - count_tokens(comments_heading) >= MIN_EXCERPT_TOKENS:
+            remaining -= count_tokens(comments_heading)
+            for line in lines:
+                line_tokens = count_tokens(line) + 1
+                if line_tokens > remaining:
+                    if remaining < MIN_EXCERPT_TOKENS:
+                        break
+                    line, line_tokens = truncate_to_tokens(line, remaining - 1)
+                    line_tokens += 1
+                packed_lines.append(line)
+                comment_tokens += line_tokens
+                remaining -= line_tokens
+
+        text = header + description
+        if packed_lines:
+            text += comments_heading + "\n".join(packed_lines)
+        return PackedContent(text, self.budget, title_tokens, description_tokens, comment_tokens,
+                             len(packed_lines), original)
+
@@ -0,0 +1,333 @@
+"""
+Compiled query router for the Solana Forum MCP server.
+
+Natural language queries are scanned once by a single precompiled pattern
+that recognises intent phrases, category names, post references, limits and
+plain words. The scan produces a ParsedQuery that the server dispatches on,
+and parsed queries are memoized so repeated questions skip the scan entirely.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Intent phrases in priority order. When a query matches several intents the
+# one listed first wins; within the scan, earlier phrases are also tried first.
+INTENT_PATTERNS: List[Tuple[str, str]] = [
+    ('evaluate', r'evaluat\w*|assess\w*|analy[sz]e'),
+    ('related_posts', r'related(?:\s+(?:posts|topics|threads))?|similar\s+(?:posts|topics|threads|to)|more like'),
+    ('top_authors', r'(?:top|most active|most prolific|leading)\s+(?:users|authors|posters|contributors|commenters)'
+                    r'|who (?:posts|comments|writes) the most'),
+    ('comment_search', r'(?:search(?:ing)?|in|within)\s+(?:the\s+)?(?:comments|replies)'
+                       r'|(?:comments|replies)\s+(?:about|mentioning|on|that mention)'
+                       r'|(?:people|users|commenters|the community)\s+(?:say|said|saying|mention\w*)'),
+    ('topics', r'(?:main|key|top|common|recurring|hot|major|biggest)\s+(?:themes?|topics|subjects)|themes?'
+               r'|(?:what|which) (?:topics|subjects) (?:are|were|have been)'
+               r'|what (?:are|were|is|was) (?:people|everyone|the community) (?:talking|discussing) about'),
+    ('top_scored_posts', r'(?:highest|best|top)[\s-]+(?:scor\w*|rated|evaluated)|(?:scored|rated) (?:highest|best)'),
+    ('latest_posts', r'latest|recent\w*|newest|new'),
+    ('most_viewed_posts', r'most viewed|popular|top'),
+    ('most_commented_posts', r'most commented|comments|discussed|active'),
+    ('find_duplicates', r'(?:near[\s-]?)?duplicates?|duplicated|cross[\s-]?posted|cross[\s-]?posts|reposted'),
+    ('reply_latency', r'reply latency|latency|response times?|time to (?:first )?reply'),
+    ('forum_analytics', r'analytics|trends?|weekly|monthly|per (?:week|month)|over time'),
+    ('forum_statistics', r'statistics|stats|summary'),
+    ('category_posts', r'(?:all posts (?:on|in|from)|posts from)(?!\s+(?:the\s+)?(?:last|past|\d))'),
+]
+
+# Intents that list posts and can therefore be narrowed by terms or dates
+LISTING_INTENTS = ('latest_posts', 'most_viewed_posts', 'most_commented_posts', 'category_posts', 'posts_between')
+
+# Length in days of the units accepted in "in the last N <unit>" windows
+WINDOW_UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30, 'quarter': 91, 'year': 365}
+
+# Words naming the metric of an author leaderboard ("top authors by views");
+# leaderboards rank by posts when none is named
+AUTHOR_METRIC_PATTERN = re.compile(
+    r'\b(?:(?P<views>views|viewed)|(?P<comments>comments?|commenters|commented|replies))\b'
+)
+
+# Words that a following number turns into a result limit ("10 posts")
+LIMIT_NOUNS = frozenset(['posts', 'topics', 'results', 'threads', 'proposals', 'items'])
+
+# Largest result limit a query may ask for
+MAX_LIMIT = 100
+
+# Words that carry no topic on this forum and are dropped from free-text terms
+FILLER_WORDS = frozenset([
+    'post', 'posts', 'topic', 'topics', 'thread', 'threads', 'result', 'results',
+    'category', 'categories', 'forum', 'forums', 'discussion', 'discussions',
+    'solana', 'show', 'tell', 'give', 'find', 'list', 'want', 'know', 'people',
+    'saying', 'say', 'id', 'limit', 'items', 'proposals', 'viewed', 'commented',
+    'what', 's', 'whats', "what's", 'happened', 'happening', 'sorted', 'sort', 'ordered', 'views',
+    'details', 'discussing', 'talking', 'regarding'
+])
+
+STOP_WORDS = frozenset(ENGLISH_STOP_WORDS) | FILLER_WORDS
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """
+    Structured form of a natural language query.
+
+    Attributes:
+        intent: Name of the handler the query routes to
+        intents: Every intent phrase found, in priority order
+        category: Canonical category name, or the raw word after "posts from"
+        post_id: Post ID referenced by the query, if any
+        limit: Result limit requested by the query, if any
+        terms: Free-text topic terms left after removing routing phrases
+        days: Length of a trailing "since N days" window, if any
+        start: ISO date opening an explicit date window, if any
+        end: ISO date closing an explicit date window, if any
+        period: Bucket size ('week' or 'month') named by the query, if any
+        author: Username the query asks about, as typed, if any
+        metric: Activity metric named by an author leaderboard query, if any
+        dedup: Whether the query asks for near-duplicates to be collapsed
+    """
+    intent: str
+    intents: Tuple[str, ...] = ()
+    category: Optional[str] = None
+    post_id: Optional[int] = None
+    limit: Optional[int] = None
+    terms: Tuple[str, ...] = ()
+    days: Optional[int] = None
+    start: Optional[str] = None
+    end: Optional[str] = None
+    period: Optional[str] = None
+    author: Optional[str] = None
+    metric: Optional[str] = None
+    dedup: bool = False
+
+    def limit_or(self, default: int) -> int:
+        """The requested limit, or ``default`` when none was named; an explicit 0 is kept."""
+        return default if self.limit is None else self.limit
+
+    @property
+    def has_window(self) -> bool:
+        """Whether the query restricts posts to a date window."""
+        return self.days is not None or self.start is not None or self.end is not None
+
+
+class QueryRouter:
+    """
+    Single-pass intent router built from one compiled pattern.
+
+    The pattern is an alternation of named groups (one per intent, plus
+    categories, post references, limits, numbers and words), so one
+    ``finditer`` over the query tokenizes and classifies it at once.
+    """
+
+    def __init__(self, categories: Iterable[str], cache_size: int = 4096):
+        """
+        Compile the routing pattern for a set of categories.
+
+        Args:
+            categories: Category names available in the dataset
+            cache_size: Number of parsed queries to memoize
+        """
+        self.categories = {c.lower(): c for c in categories}
+        self.pattern = self._compile(self.categories.keys())
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    @staticmethod
+    def _compile(category_keys: Iterable[str]) -> 're.Pattern[str]':
+        """
+        Build the combined routing pattern.
+
+        Args:
+            category_keys: Lowercase category names
+
+        Returns:
+            Compiled pattern with one named group per token kind
+        """
+        groups = [
+            # "related posts 3294" and "similar to topic 12" name the post they start from
+            r'\b(?:related|similar)(?:\s+(?:posts?|topics?|threads?))?(?:\s+to)?(?:\s+(?:posts?|topics?|threads?))?'
+            r'(?:\s+id)?\s*(?:[:#]\s*)?(?P<related_id>\d+)\b',
+            r'(?:(?:post|topic)(?:\s+id)?|\bid)\s*(?:[:#]\s*)?(?P<post_id>\d+)\b',
+            r'\#(?P<hash_id>\d+)\b',
+            r'\blimit\s*(?:to\s+|of\s+)?(?P<limit>\d+)\b',
+            r'\b(?:since|(?:in|over|within|during|from)\s+the\s+(?:last|past)|last|past|this)\s+'
+            r'(?:(?P<window_n>\d+)\s+)?(?P<window_unit>day|week|month|quarter|year)s?\b',
+            r'\bbetween\s+(?P<range_start>\d{4}-\d{2}-\d{2})\s+and\s+(?P<range_end>\d{4}-\d{2}-\d{2})\b',
+            r'\b(?:since|after|from)\s+(?P<since_date>\d{4}-\d{2}-\d{2})\b',
+            r'\b(?:before|until)\s+(?P<until_date>\d{4}-\d{2}-\d{2})\b',
+            r'\b(?:(?:posts?|topics?|threads?|proposals?|comments?|replies|written|authored)\s+by|from\s+user'
+            r'|user|author)\s+@?(?P<author>[^\W_][\w\-\.]*)',
+            r'\bwhat\s+(?:did|has)\s+@?(?P<did_author>[^\W_][\w\-\.]*)\s+(?:post|comment|write|say)',
+            r'(?<![\w@])@(?P<at_author>[^\W_][\w\-\.]*)',
+            r'\b(?P<dedup>(?:without|no|excluding|skip|minus)\s+(?:near[\s-]?)?(?:duplicates|dupes|cross[\s-]?posts)'
+            r'|deduplicated|deduped|unique)\b',
+        ]
+        groups.extend(rf'\b(?P<{name}>{phrase})\b' for name, phrase in INTENT_PATTERNS)
+
+        # Longest names first so "sRFC" is never shadowed by a shorter prefix;
+        # a category followed by a number ("SIMD-0096") is a topic, not a filter
+        names = sorted(category_keys, key=len, reverse=True)
+        if names:
+            alternation = '|'.join(re.escape(name) for name in names)
+            groups.append(rf'\b(?P<category>{alternation})\b(?!-?\d)')
+
+        groups.append(r'\b(?P<number>\d+)\b')
+        groups.append(r"(?P<word>[^\W_][\w\-']*)")
+        return re.compile('|'.join(groups))
+
+    def _parse(self, query_text: str) -> ParsedQuery:
+        """
+        Scan a query once and extract its routing information.
+
+        Args:
+            query_text: The natural language query
+
+        Returns:
+            ParsedQuery describing the query
+        """
+        text = query_text.lower().strip()
+
+        found = set()
+        category = None
+        category_word = None
+        awaiting_category_word = False
+        post_id = None
+        limit = None
+        days = None
+        start = None
+        end = None
+        period = None
+        author = None
+        metric = None
+        dedup = False
+        terms: List[str] = []
+        previous_kind = None
+        pending_number = None
+
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            value = match.group(kind)
+
+            if pending_number is not None:
+                # A bare number becomes a limit when it follows an intent
+                # phrase ("top 10") or precedes a result noun ("10 posts",
+                # "5 related posts to 3294")
+                if (kind == 'related_id' or kind == 'word' and value in LIMIT_NOUNS) and limit is None:
+                    limit = pending_number
+                else:
+                    terms.append(str(pending_number))
+                pending_number = None
+
+            if kind in ('post_id', 'hash_id'):
+                post_id = int(value)
+            elif kind == 'related_id':
+                post_id = int(value)
+                found.add('related_posts')
+            elif kind == 'limit':
+                limit = int(value)
+            elif kind == 'dedup':
+                dedup = True
+            elif kind in ('author', 'did_author', 'at_author'):
+                author = value.rstrip('.')
+            elif kind == 'window_unit':
+                days = int(match.group('window_n') or 1) * WINDOW_UNIT_DAYS[value]
+                if value in ('week', 'month'):
+                    period = value
+            elif kind == 'range_end':
+                start, end = match.group('range_start'), value
+            elif kind == 'since_date':
+                start = value
+            elif kind == 'until_date':
+                end = value
+            elif kind == 'category':
+                category = self.categories[value]
+                awaiting_category_word = False
+            elif kind == 'number':
+                if previous_kind in found and limit is None:
+                    limit = int(value)
+                else:
+                    pending_number = int(value)
+            elif kind == 'word':
+                if value in STOP_WORDS:
+                    pass
+                elif awaiting_category_word:
+                    category_word = value.capitalize()
+                    awaiting_category_word = False
+                elif value not in terms:
+                    terms.append(value)
+            else:
+                found.add(kind)
+                if 'week' in value or 'month' in value:
+                    period = 'month' if 'month' in value else 'week'
+                if kind == 'category_posts':
+                    awaiting_category_word = True
+
+            previous_kind = kind
+
+        if pending_number is not None:
+            terms.append(str(pending_number))
+        if limit is not None:
+            limit = min(limit, MAX_LIMIT)
+
+        if 'top_authors' in found:
+            named = AUTHOR_METRIC_PATTERN.search(text)
+            metric = named.lastgroup if named else 'posts'
+
+        intents = tuple(name for name, _ in INTENT_PATTERNS if name in found)
+        has_window = days is not None or start is not None or end is not None
+        intent = self._resolve_intent(intents, post_id, has_window)
+        if intent == 'semantic_search' and author is not None:
+            intent = 'author_posts'
+
+        return ParsedQuery(
+            intent=intent,
+            intents=intents,
+            category=category or category_word,
+            post_id=post_id,
+            limit=limit,
+            terms=tuple(terms),
+            days=days,
+            start=start,
+            end=end,
+            period=period,
+            author=author,
+            metric=metric,
+            dedup=dedup
+        )
+
+    @staticmethod
+    def _resolve_intent(intents: Tuple[str, ...], post_id: Optional[int], has_window: bool = False) -> str:
+        """
+        Pick the handler for a query from the intents it matched.
+
+        Args:
+            intents: Matched intents in priority order
+            post_id: Post ID referenced by the query, if any
+            has_window: Whether the query names a date window
+
+        Returns:
+            Name of the winning intent, or 'semantic_search'
+        """
+        # Evaluations call the model, so a post is only evaluated when asked
+        # to be; "details about post 3456" is a search
+        if post_id is not None and intents and intents[0] == 'evaluate':
+            return 'evaluate'
+
+        for intent in intents:
+            # "posts related to staking" names a topic, not a post
+            if intent == 'related_posts' and post_id is None:
+                continue
+            if intent != 'evaluate':
+                return intent
+
+        # A bare date window ("posts from the last 30 days") lists that window
+        if has_window:
+            return 'posts_between'
+
+        return 'semantic_search'
+
+    def cache_info(self):
+        """Return hit/miss statistics of the parse cache."""
+        return self.parse.cache_info()
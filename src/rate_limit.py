@@ -0,0 +1,107 @@
+"""
+Token-bucket rate limiting for calls to the completions API.
+
+A bucket holds up to a minute's allowance and refills continuously, so
+bursts up to the allowance go through at once and sustained use settles at
+the per-minute rate. A RateLimiter pairs a requests bucket with a tokens
+bucket, and lets a rate-limited response pause every caller until the
+server's retry delay has passed.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe bucket refilled at a fixed rate per minute.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: Units added per minute
+            capacity: Most units held at once (defaults to per_minute)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take units from the bucket, going into debt if it holds too few.
+
+        Args:
+            amount: Units to take (capped at the capacity, so a request larger
+                    than the bucket still goes through once it is full)
+
+        Returns:
+            Seconds to wait before the units may be used
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level -= min(amount, self.capacity)
+            return max(0.0, -self.level / self.rate)
+
+    def adjust(self, amount: float):
+        """Return units taken in excess (positive) or take units used beyond the reservation (negative)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget shared by concurrent callers.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Args:
+            requests_per_minute: Request budget (None for no limit)
+            tokens_per_minute: Prompt plus completion token budget (None for no limit)
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int):
+        """
+        Wait until a request of about this many tokens fits the budget.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens of the request
+        """
+        with self._lock:
+            pause = self._paused_until - time.monotonic()
+        wait = max(
+            pause,
+            self.requests.reserve(1) if self.requests else 0.0,
+            self.tokens.reserve(tokens) if self.tokens else 0.0
+        )
+        if wait > 0:
+            time.sleep(wait)
+
+    def settle(self, estimated: int, used: int):
+        """
+        Correct the token budget once a request reports its actual usage.
+
+        Args:
+            estimated: Tokens reserved by acquire
+            used: Tokens the request used
+        """
+        if self.tokens and used:
+            self.tokens.adjust(estimated - used)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for a while, e.g. after a rate-limited response."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
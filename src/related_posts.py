@@ -0,0 +1,174 @@
+"""
+Related-posts graph for the Solana Forum MCP server.
+
+Every post's top-k most similar posts are computed once with blocked sparse
+matrix products over the TF-IDF matrix, whose results are kept sparse, and
+stored as a CSR graph. The graph
+is persisted in the index directory under a fingerprint of the indexed text,
+so restarts load it instead of recomputing, and a related-posts lookup is a
+slice of one row instead of a scan of the whole corpus.
+"""
+
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.sharded_search import top_k
+from src.utils import fingerprint
+
+# Neighbours kept per post; lookups can ask for fewer
+DEFAULT_NEIGHBOURS = 20
+
+# Rows multiplied against the whole matrix at a time
+BLOCK_SIZE = 512
+
+# Most similarity entries one block's product may hold; large corpora use
+# fewer rows per block, so even a fully dense product stays bounded
+MAX_BLOCK_ENTRIES = 1 << 24
+
+# Bumped whenever the stored layout or similarity definition changes
+GRAPH_VERSION = 1
+
+
+class RelatedPostsGraph:
+    """
+    Sparse top-k nearest-neighbour graph over posts.
+
+    Row ``i`` of the CSR arrays holds post ``i``'s neighbours, most similar
+    first, with their cosine similarities.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, scores: np.ndarray, k: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.scores = scores
+        self.k = k
+
+    @classmethod
+    def build(cls, matrix: sp.spmatrix, k: int = DEFAULT_NEIGHBOURS,
+              block_size: int = BLOCK_SIZE) -> 'RelatedPostsGraph':
+        """
+        Compute the top-k neighbours of every row of an L2-normalised matrix.
+
+        The similarity products stay sparse: only pairs of posts sharing a
+        term are stored, and each row's top k are picked from those entries.
+        Ties are broken by lower position.
+
+        Args:
+            matrix: Sparse document-term matrix with L2-normalised rows
+            k: Number of neighbours to keep per post
+            block_size: Most rows per sparse product (fewer for large
+                        corpora; see MAX_BLOCK_ENTRIES)
+
+        Returns:
+            RelatedPostsGraph over the rows of ``matrix``
+        """
+        matrix = sp.csr_matrix(matrix, dtype=np.float32)
+        transposed = matrix.T.tocsc()
+        n_posts = matrix.shape[0]
+        block_size = max(1, min(block_size, MAX_BLOCK_ENTRIES // max(n_posts, 1)))
+
+        indptr = np.zeros(n_posts + 1, dtype=np.int64)
+        indices: List[np.ndarray] = []
+        scores: List[np.ndarray] = []
+
+        for block_start in range(0, n_posts, block_size):
+            block_end = min(block_start + block_size, n_posts)
+            product = sp.csr_matrix(matrix[block_start:block_end] @ transposed)
+            product.sort_indices()
+
+            for row in range(block_end - block_start):
+                start, end = product.indptr[row], product.indptr[row + 1]
+                columns, values = product.indices[start:end], product.data[start:end]
+                position = block_start + row
+
+                # Posts are not their own neighbours, and posts sharing no
+                # terms are not related, however few there are
+                related = (columns != position) & (values > 0)
+                neighbours, row_scores = top_k(values[related], columns[related], k)
+                indices.append(neighbours.astype(np.int32))
+                scores.append(row_scores.astype(np.float32))
+                indptr[position + 1] = indptr[position] + len(neighbours)
+
+        return cls(
+            indptr,
+            np.concatenate(indices) if indices else np.empty(0, dtype=np.int32),
+            np.concatenate(scores) if scores else np.empty(0, dtype=np.float32),
+            k
+        )
+
+    @classmethod
+    def load_or_build(cls, matrix: sp.spmatrix, texts: Sequence[str], directory: Optional[str] = None,
+                      k: int = DEFAULT_NEIGHBOURS, params: Tuple = ()) -> 'RelatedPostsGraph':
+        """
+        Load the graph for this input from disk, building and saving it if absent.
+
+        Args:
+            matrix: Sparse document-term matrix with L2-normalised rows
+            texts: Indexed text of each post, used to fingerprint the input
+            directory: Index directory; the graph is not persisted when None
+            k: Number of neighbours to keep per post
+            params: Vectorizer settings the matrix depends on
+
+        Returns:
+            RelatedPostsGraph over the rows of ``matrix``
+        """
+        if directory is None:
+            return cls.build(matrix, k)
+
+        path = Path(directory) / f"related_{fingerprint(texts, GRAPH_VERSION, k, *params)}.npz"
+        if path.exists():
+            try:
+                return cls.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading related-posts graph from {path}: {e}")
+
+        graph = cls.build(matrix, k)
+        graph.save(path)
+        return graph
+
+    @classmethod
+    def load(cls, path: Path) -> 'RelatedPostsGraph':
+        """Load a graph saved with ``save``."""
+        with np.load(path) as stored:
+            return cls(stored['indptr'], stored['indices'], stored['scores'], int(stored['k']))
+
+    def save(self, path: Path) -> bool:
+        """
+        Save the graph atomically, so concurrent loaders never see a partial file.
+
+        Args:
+            path: Destination ``.npz`` path
+
+        Returns:
+            True if the graph was saved successfully, False otherwise
+        """
+        try:
+            os.makedirs(path.parent, exist_ok=True)
+            temporary = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+            np.savez(temporary, indptr=self.indptr, indices=self.indices, scores=self.scores, k=self.k)
+            os.replace(temporary, path)
+            print(f"Saved related-posts graph to {path}")
+            return True
+        except OSError as e:
+            print(f"Error saving related-posts graph to {path}: {e}")
+            return False
+
+    def neighbours(self, position: int, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Get a post's most similar posts.
+
+        Args:
+            position: Position of the post
+            k: Maximum number of neighbours (at most the number stored)
+
+        Returns:
+            List of (position, similarity) pairs, most similar first
+        """
+        start, end = self.indptr[position], self.indptr[position + 1]
+        if k is not None:
+            end = min(end, start + max(k, 0))
+        return [(int(i), float(s)) for i, s in zip(self.indices[start:end], self.scores[start:end])]
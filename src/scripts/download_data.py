@@ -5,7 +5,7 @@ import csv
 import os
 from datetime import datetime
 import re
-from src.utils import save_json, get_data_directory
+from src.utils import save_json, get_data_directory, SnapshotStore
 
 class SolanaForumAPIClient:
     def __init__(self, base_url="https://forum.solana.com"):
@@ -183,6 +183,7 @@ class SolanaForumAPIClient:
                 'comments': comments_text,
                 'comment_count': len(comments),
                 'original_poster': original_poster,
+                'first_reply_at': comments[0]['created_at'] if comments else '',
                 'activity': data.get('last_posted_at', '')
             }
             
@@ -244,6 +245,10 @@ class SolanaForumAPIClient:
         processed_dir = get_data_directory("processed")
         return save_json(self.posts_by_category, filename, processed_dir)
 
+    def save_snapshot(self, dataset="solana_forum_posts"):
+        """Record scraped data as a new version in the dataset's snapshot history"""
+        return SnapshotStore(dataset).write(self.posts_by_category)
+
     def save_to_csv(self):
         """Save scraped data to CSV files, one per category"""
         # Get the raw data directory from environment variables
@@ -265,7 +270,8 @@ class SolanaForumAPIClient:
             fieldnames = [
                 'id', 'title', 'url', 'description', 'comments', 'original_poster',
                 'views', 'reply_count', 'comment_count', 'posts_count', 
-                'created_at', 'activity', 'category_name', 'category_id', 'last_posted_at'
+                'created_at', 'activity', 'category_name', 'category_id', 'last_posted_at',
+                'first_reply_at'
             ]
             
             with open(filename, 'w', newline='', encoding='utf-8') as f:
@@ -295,6 +301,9 @@ def main():
         # Save data in CSV format, one file per category
         client.save_to_csv()
         
+        # Record a versioned snapshot, sharing unchanged topics with earlier ones
+        client.save_snapshot()
+        
         print("Data scraping completed successfully!")
     else:
         print("Failed to scrape data.")
@@ -0,0 +1,260 @@
+"""
+Local mock of the OpenAI chat completions endpoint for exercising post
+evaluation without an API key or network access.
+
+Replies take a configurable latency plus a delay per completion token, and
+chosen perspectives can fail with an HTTP error, stall past the client's
+timeout, or come back invalid from a combined JSON evaluation. Replies
+report token usage estimated at four characters per token. Point the server
+at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+
+# Characters per token for the usage estimate
+CHARS_PER_TOKEN = 4
+
+
+class MockCompletionsServer:
+    """
+    Chat completions server answering evaluation prompts from a background thread.
+    """
+
+    def __init__(self, latency: float = 0.2, fail: Iterable[str] = (), stall: Iterable[str] = (),
+                 stall_seconds: float = 5.0, malformed: Iterable[str] = (), unscored: Iterable[str] = (),
+                 fail_combined: bool = False,
+                 token_latency: float = 0.0, prompt_latency: float = 0.0, throttle: int = 0, retry_after: float = 0.1,
+                 port: int = 0):
+        """
+        Args:
+            latency: Seconds every reply takes
+            fail: Perspectives answered with HTTP 500
+            stall: Perspectives answered only after stall_seconds
+            stall_seconds: Delay of stalled replies
+            malformed: Perspectives given an invalid entry in combined evaluations
+            unscored: Perspectives answered without a score in separate evaluations
+            fail_combined: Answer every combined evaluation with HTTP 500
+            token_latency: Extra seconds per completion token
+            prompt_latency: Extra seconds per prompt token
+            throttle: Answer this many of the first requests with 429
+            retry_after: Retry-After seconds sent with 429 responses
+            port: Port to listen on (0 picks a free one)
+        """
+        self.latency = latency
+        self.fail = set(fail)
+        self.stall = set(stall)
+        self.stall_seconds = stall_seconds
+        self.malformed = set(malformed)
+        self.unscored = set(unscored)
+        self.fail_combined = fail_combined
+        self.token_latency = token_latency
+        self.prompt_latency = prompt_latency
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.throttled = 0
+        self.requests = 0
+        self.combined_requests = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass as OPENAI_BASE_URL."""
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+
+    def start(self) -> 'MockCompletionsServer':
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'MockCompletionsServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @staticmethod
+    def score(perspective: str) -> float:
+        """Deterministic score of a perspective, so tests can check the parsing."""
+        return round(0.1 + (sum(map(ord, perspective)) % 9) / 10, 1)
+
+    def reply(self, prompt: str) -> Optional[str]:
+        """
+        Build the completion for a one-perspective prompt, waiting out the configured latency.
+
+        Returns:
+            The completion text, or None when the perspective should fail
+        """
+        match = re.search(r'from the perspective of ([^.\n]+)', prompt)
+        perspective = match.group(1).strip() if match else 'unknown'
+
+        content = f"Score: {self.score(perspective):.1f}\nExplanation: Mock evaluation from the perspective of {perspective}."
+        if perspective in self.unscored:
+            content = f"I would rather not rate this post from the perspective of {perspective}."
+        self._wait(self.stall_seconds if perspective in self.stall else self.latency, content)
+        return None if perspective in self.fail else content
+
+    def reply_combined(self, prompt: str) -> Optional[str]:
+        """
+        Build the JSON completion for a prompt listing several perspectives.
+
+        Returns:
+            The completion text, with invalid entries for malformed
+            perspectives, or None when combined evaluations should fail
+        """
+        match = re.search(r'Perspectives:\s*([^\n]+)', prompt)
+        perspectives = [name.strip() for name in match.group(1).split(';')] if match else []
+
+        entries: Dict[str, Dict[str, object]] = {}
+        for perspective in perspectives:
+            key = re.sub(r'\W+', '_', perspective.lower())
+            if perspective in self.malformed:
+                entries[key] = {'score': 'high', 'explanation': ''}
+            else:
+                entries[key] = {'score': self.score(perspective),
+                                'explanation': f"Mock evaluation from the perspective of {perspective}."}
+        content = json.dumps(entries)
+        self._wait(self.latency, content)
+        return None if self.fail_combined else content
+
+    def _wait(self, seconds: float, content: str):
+        """Sleep for a reply's base delay plus its generation time."""
+        time.sleep(seconds + self.token_latency * self.tokens(content))
+
+    @staticmethod
+    def tokens(text: str) -> int:
+        """Estimate the tokens in a text."""
+        return max(1, len(text) // CHARS_PER_TOKEN)
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                if not self.path.endswith('/chat/completions'):
+                    self._send(404, {'error': {'message': f"Unknown path {self.path}"}})
+                    return
+
+                with mock._lock:
+                    throttled = mock.throttled < mock.throttle
+                    mock.throttled += throttled
+                if throttled:
+                    self._send(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_error'}},
+                               {'Retry-After': str(mock.retry_after)})
+                    return
+
+                combined = 'response_format' in body
+                with mock._lock:
+                    mock.requests += 1
+                    mock.combined_requests += combined
+                    mock._in_flight += 1
+                    mock.max_in_flight = max(mock.max_in_flight, mock._in_flight)
+                try:
+                    prompt = ' '.join(message.get('content', '') for message in body.get('messages', []))
+                    if mock.prompt_latency:
+                        time.sleep(mock.prompt_latency * mock.tokens(prompt))
+                    content = mock.reply_combined(prompt) if combined else mock.reply(prompt)
+                finally:
+                    with mock._lock:
+                        mock._in_flight -= 1
+
+                if content is None:
+                    self._send(500, {'error': {'message': 'Mock failure', 'type': 'server_error'}})
+                    return
+                self._send(200, {
+                    'id': f"chatcmpl-mock-{mock.requests}",
+                    'object': 'chat.completion',
+                    'model': body.get('model'),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': content},
+                        'finish_reason': 'stop'
+                    }],
+                    'usage': {
+                        'prompt_tokens': mock.tokens(prompt),
+                        'completion_tokens': mock.tokens(content),
+                        'total_tokens': mock.tokens(prompt) + mock.tokens(content)
+                    }
+                })
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    for name, value in (headers or {}).items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat completions server")
+    parser.add_argument("--port", type=int, default=8089, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds every reply takes")
+    parser.add_argument("--fail", default="", help="Comma-separated perspectives answered with HTTP 500")
+    parser.add_argument("--stall", default="", help="Comma-separated perspectives answered after --stall-seconds")
+    parser.add_argument("--stall-seconds", type=float, default=60.0, help="Delay of stalled replies")
+    parser.add_argument("--malformed", default="",
+                        help="Comma-separated perspectives given invalid entries in combined evaluations")
+    parser.add_argument("--unscored", default="",
+                        help="Comma-separated perspectives answered without a score in separate evaluations")
+    parser.add_argument("--fail-combined", action="store_true", help="Answer combined evaluations with HTTP 500")
+    parser.add_argument("--throttle", type=int, default=0, help="Answer this many of the first requests with 429")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Extra seconds per completion token")
+    parser.add_argument("--prompt-latency", type=float, default=0.0, help="Extra seconds per prompt token")
+    args = parser.parse_args()
+
+    server = MockCompletionsServer(
+        latency=args.latency,
+        fail=[name.strip() for name in args.fail.split(',') if name.strip()],
+        stall=[name.strip() for name in args.stall.split(',') if name.strip()],
+        stall_seconds=args.stall_seconds,
+        malformed=[name.strip() for name in args.malformed.split(',') if name.strip()],
+        unscored=[name.strip() for name in args.unscored.split(',') if name.strip()],
+        fail_combined=args.fail_combined,
+        token_latency=args.token_latency,
+        prompt_latency=args.prompt_latency,
+        throttle=args.throttle,
+        port=args.port
+    )
+    print(f"Mock completions server listening on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Multi-process sharded search for the Solana Forum MCP server.
+
+The TF-IDF matrix is partitioned into shards (one per category, or by
+position hash), and each shard's CSR arrays are copied once into shared
+memory. A pool of worker processes attaches to every shard without copying
+it. A query is vectorized once by the coordinator, scattered to the shards
+as a few sparse (term, weight) pairs, scored by the workers in parallel,
+and the per-shard top-k lists are merged into the global top-k.
+
+A process pool does not survive a fork: its manager thread and result
+pipes stay with the parent, so a forked server worker (src.prefork) that
+submitted to the inherited pool would wait forever. Each process that
+searches therefore starts its own pool on first use, attached to the same
+shared-memory shards, and only the process that created the shards frees
+them. Workers exit once the process that started them is gone, even when
+it was killed without shutting its pool down.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+# Ways of assigning posts to shards
+SHARD_STRATEGIES = ('category', 'hash')
+
+# Seconds between a worker's checks that the process that started it is alive
+PARENT_CHECK_INTERVAL = 1.0
+
+# Shards attached in a worker process, by shard number, as
+# (matrix, post positions, category codes)
+_SHARDS: Dict[int, Tuple[sp.csr_matrix, np.ndarray, np.ndarray]] = {}
+_ATTACHED: List[shared_memory.SharedMemory] = []
+
+
+def top_k(scores: np.ndarray, positions: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the ``k`` highest scores, ties broken by lower position.
+
+    Matches the order of a stable descending sort over ascending positions,
+    without sorting every score.
+
+    Args:
+        scores: Score of each candidate
+        positions: Post position of each candidate, ascending
+        k: Number of candidates to keep
+
+    Returns:
+        Tuple of (positions, scores), best first
+    """
+    if k <= 0 or not len(scores):
+        return positions[:0], scores[:0]
+
+    if len(scores) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        selected = np.concatenate([above, ties])
+    else:
+        selected = np.arange(len(scores))
+
+    order = np.lexsort((positions[selected], -scores[selected]))
+    selected = selected[order]
+    return positions[selected], scores[selected]
+
+
+def _share(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple[str, Tuple[int, ...], str]]:
+    """Copy an array into a new shared memory block and describe it for workers."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _view(spec: Tuple[str, Tuple[int, ...], str]) -> np.ndarray:
+    """Attach to a shared array described by ``_share`` (worker side)."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    _ATTACHED.append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _exit_with_parent(parent: int):
+    """Exit the worker once its parent has exited (worker side)."""
+    while os.getppid() == parent:
+        time.sleep(PARENT_CHECK_INTERVAL)
+    os._exit(0)
+
+
+def _attach(shard_specs: List[Dict], n_features: int):
+    """Pool initializer: map every shard's arrays from shared memory."""
+    # A parent that dies without shutting the pool down (e.g. a server worker
+    # stopped by a signal) would leave the worker blocked on its task queue
+    threading.Thread(target=_exit_with_parent, args=(os.getppid(),), daemon=True).start()
+    for number, spec in enumerate(shard_specs):
+        positions = _view(spec['positions'])
+        matrix = sp.csr_matrix(
+            (_view(spec['data']), _view(spec['indices']), _view(spec['indptr'])),
+            shape=(len(positions), n_features),
+            copy=False
+        )
+        _SHARDS[number] = (matrix, positions, _view(spec['codes']))
+
+
+def _ready(_: int) -> int:
+    """No-op task used to start the workers up front."""
+    return os.getpid()
+
+
+def _search_shard(number: int, query_indices: np.ndarray, query_data: np.ndarray,
+                  n_features: int, k: int, code: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score one shard against a query (worker side).
+
+    Args:
+        number: Shard number
+        query_indices: Term indices of the query's nonzero weights
+        query_data: The query's nonzero weights
+        n_features: Size of the term space
+        k: Number of results to return
+        code: Category code to restrict to, or -1 for every category
+
+    Returns:
+        Tuple of (post positions, scores) for the shard's top ``k``
+    """
+    matrix, positions, codes = _SHARDS[number]
+    if code >= 0:
+        rows = np.flatnonzero(codes == code)
+        matrix, positions = matrix[rows], positions[rows]
+    query = sp.csr_matrix((query_data, query_indices, [0, len(query_indices)]), shape=(1, n_features))
+    scores = (matrix @ query.T).toarray().ravel()
+    return top_k(scores, positions, k)
+
+
+class ShardedSearch:
+    """
+    Pool of worker processes scoring shards of a document-term matrix.
+    """
+
+    def __init__(self, matrix: sp.spmatrix, categories: Optional[Sequence[str]] = None,
+                 workers: Optional[int] = None, strategy: str = 'category'):
+        """
+        Partition the matrix into shared-memory shards and start the workers.
+
+        Args:
+            matrix: Document-term matrix with L2-normalised rows, one row per post
+            categories: Category of each post; required by the 'category'
+                        strategy and for category-restricted searches
+            workers: Number of worker processes (defaults to the CPU count)
+            strategy: 'category' for one shard per category, or 'hash' for
+                      one shard per worker by position
+        """
+        if strategy not in SHARD_STRATEGIES:
+            raise ValueError(f"Unsupported shard strategy '{strategy}'. Use one of: {', '.join(SHARD_STRATEGIES)}")
+        if strategy == 'category' and categories is None:
+            raise ValueError("The 'category' shard strategy needs the category of each post")
+
+        matrix = sp.csr_matrix(matrix)
+        self.workers = workers or os.cpu_count() or 1
+        self.n_features = matrix.shape[1]
+        self.strategy = strategy
+
+        category_array = np.asarray(categories if categories is not None else [None] * matrix.shape[0], dtype=object)
+        self.category_codes = {name: code for code, name in enumerate(dict.fromkeys(category_array))}
+        codes = np.array([self.category_codes[name] for name in category_array], dtype=np.int32)
+
+        if strategy == 'category':
+            shard_rows = [np.flatnonzero(codes == code) for code in self.category_codes.values()]
+            self.shard_names: List[Optional[str]] = list(self.category_codes)
+        else:
+            rows = np.arange(matrix.shape[0])
+            shard_rows = [rows[rows % self.workers == shard] for shard in range(self.workers)]
+            self.shard_names = [None] * self.workers
+
+        self._blocks: List[shared_memory.SharedMemory] = []
+        specs = []
+        for rows in shard_rows:
+            shard = matrix[rows]
+            spec = {}
+            for key, array in (('data', shard.data), ('indices', shard.indices),
+                               ('indptr', shard.indptr), ('positions', rows.astype(np.int64)),
+                               ('codes', codes[rows])):
+                block, spec[key] = _share(np.ascontiguousarray(array))
+                self._blocks.append(block)
+            specs.append(spec)
+        self.shard_sizes = [len(rows) for rows in shard_rows]
+
+        self._specs = specs
+        self._owner = os.getpid()
+        # Worker pools by the process that started them; see pool()
+        self._pools: Dict[int, ProcessPoolExecutor] = {}
+        self._pool_lock = threading.Lock()
+        self.pool()
+
+        self._finalizer = weakref.finalize(self, ShardedSearch._release, self._owner, self._pools, self._blocks)
+        print(f"Started sharded search: {len(specs)} shards over {self.workers} worker processes")
+
+    def pool(self) -> ProcessPoolExecutor:
+        """Get this process's worker pool, starting it on first use (e.g. in a forked server worker)."""
+        pid = os.getpid()
+        pool = self._pools.get(pid)
+        if pool is not None:
+            return pool
+        with self._pool_lock:
+            if pid not in self._pools:
+                # Fork where available so workers never re-import the caller's
+                # main module; the shards are shared memory either way, never pickled
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+                pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_attach,
+                    initargs=(self._specs, self.n_features)
+                )
+                # Start every worker now rather than from whichever thread searches first
+                list(pool.map(_ready, range(self.workers)))
+                if pid != self._owner:
+                    print(f"Started {self.workers} sharded search workers in process {pid}")
+                self._pools[pid] = pool
+            return self._pools[pid]
+
+    @staticmethod
+    def _release(owner: int, pools: Dict[int, ProcessPoolExecutor], blocks: List[shared_memory.SharedMemory]):
+        """Stop this process's workers, and free the shared memory in the process that created it."""
+        # Pools inherited through a fork belong to another process and are left alone
+        pool = pools.pop(os.getpid(), None)
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        for block in blocks:
+            block.close()
+            if os.getpid() == owner:
+                block.unlink()
+
+    def close(self):
+        """Stop this process's workers and, in the process that created them, free the shared memory."""
+        self._finalizer()
+
+    def search(self, query_vector: sp.spmatrix, k: int,
+               category: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the posts scoring highest against a query vector.
+
+        Args:
+            query_vector: 1 x n_features sparse query vector
+            k: Number of results to return
+            category: Optional category to restrict to
+
+        Returns:
+            Tuple of (post positions, scores), best first
+        """
+        query_vector = sp.csr_matrix(query_vector)
+        query_indices = query_vector.indices.astype(np.int32)
+        query_data = query_vector.data
+
+        shards = range(len(self.shard_sizes))
+        code = -1
+        if category:
+            if category not in self.category_codes:
+                return np.empty(0, dtype=np.int64), np.empty(0)
+            if self.strategy == 'category':
+                # Category shards hold exactly one category, so only one is asked
+                shards = [number for number in shards if self.shard_names[number] == category]
+            else:
+                code = self.category_codes[category]
+
+        pool = self.pool()
+        futures = [
+            pool.submit(_search_shard, number, query_indices, query_data, self.n_features, k, code)
+            for number in shards
+        ]
+        results = [future.result() for future in futures]
+        if not results:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        positions = np.concatenate([positions for positions, _ in results])
+        scores = np.concatenate([scores for _, scores in results])
+        order = np.argsort(positions, kind='stable')
+        return top_k(scores[order], positions[order], k)
@@ -0,0 +1,105 @@
+"""
+Single-flight coalescing of concurrent identical calls.
+
+When several threads make the same call at the same time, only the first
+runs it; the others wait for and share its result (or its exception). Calls
+that arrive after it finished run again, so nothing is cached beyond the
+call's own lifetime. Coalesced results are shared objects, so callers must
+not modify them.
+"""
+
+import functools
+import inspect
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Registry of in-flight calls with per-name counts of calls saved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+
+    def do(self, name: str, key: Hashable, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a call, or join an identical call already in flight.
+
+        Args:
+            name: Name the call is counted under
+            key: Identity of the call; calls with equal keys are coalesced
+            fn: Function to call
+            *args, **kwargs: Its arguments
+
+        Returns:
+            The call's result, shared with every coalesced caller
+        """
+        with self._lock:
+            future = self._calls.get((name, key))
+            leader = future is None
+            if leader:
+                future = self._calls[(name, key)] = Future()
+            counts = self._counts[name]
+            counts['calls'] += 1
+            counts['executed' if leader else 'coalesced'] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[(name, key)]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count calls by name.
+
+        Returns:
+            Dictionary mapping each name to its calls, the calls that ran and
+            the calls coalesced into them (the calls saved), plus in-flight
+            calls under 'in_flight'
+        """
+        with self._lock:
+            stats = {name: {'calls': counts['calls'], 'executed': counts['executed'],
+                            'coalesced': counts['coalesced']}
+                     for name, counts in sorted(self._counts.items())}
+            stats['in_flight'] = len(self._calls)
+            return stats
+
+
+def coalesced(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Coalesce concurrent identical calls of a method through the instance's single_flight.
+
+    Calls are identical when their arguments bind to the same values,
+    whether passed by position or keyword; calls with unhashable arguments
+    are not coalesced.
+    """
+    signature = inspect.signature(method)
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())[1:]
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        return self.single_flight.do(name, key, method, self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,178 @@
+"""
+Query-aware snippets for search results.
+
+Every post's description and comment thread is tokenized once into a
+positional index: a 32-bit hash, character offset and length of each
+content word (stop words are never matched, so they are not stored, and
+hashing the words means no vocabulary is kept). A
+snippet is the window of consecutive indexed words that covers the most
+distinct query terms, cut from the text by those offsets with the matched
+words highlighted, so building one never rescans the raw text.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Same tokens as the TF-IDF vectorizer's default token pattern
+WORD_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+# Indexed (non stop) words per snippet, about 40 words of text
+WINDOW_TERMS = 20
+
+# Indexed words shown before the first match of a window
+LEAD_TERMS = 4
+
+HIGHLIGHT = '**{}**'
+
+
+def term_hash(word: str) -> int:
+    """Hash a lowercase word to 32 bits; collisions are negligible within a post."""
+    return zlib.crc32(word.encode('utf-8'))
+
+
+class SnippetIndex:
+    """
+    Positional index of the content words of each post's text fields.
+    """
+
+    def __init__(self, fields: Dict[str, Sequence[str]], stop_words: Sequence[str] = ENGLISH_STOP_WORDS):
+        """
+        Tokenize every field of every post.
+
+        Args:
+            fields: Text of each post by position, per field name, in order
+                    of preference for snippets (e.g. description, comments)
+            stop_words: Words that are neither indexed nor matched
+        """
+        self.fields = fields
+        self.stop_words = frozenset(stop_words)
+
+        # Words of field f of post p are the entries bounds[f][p]:bounds[f][p + 1]
+        term, start, length = [], [], []
+        self.bounds: Dict[str, np.ndarray] = {}
+        for name, texts in fields.items():
+            bounds = [len(term)]
+            for text in texts:
+                for match in WORD_PATTERN.finditer(text or ''):
+                    word = match.group().lower()
+                    if word in self.stop_words:
+                        continue
+                    term.append(term_hash(word))
+                    start.append(match.start())
+                    length.append(min(match.end() - match.start(), np.iinfo(np.uint16).max))
+                bounds.append(len(term))
+            self.bounds[name] = np.asarray(bounds, dtype=np.int64)
+
+        self.term = np.asarray(term, dtype=np.uint32)
+        self.start = np.asarray(start, dtype=np.int32)
+        self.length = np.asarray(length, dtype=np.uint16)
+
+    def __len__(self) -> int:
+        return len(self.term)
+
+    def query_terms(self, query_text: str) -> np.ndarray:
+        """Get the hashes of a query's distinct content words."""
+        words = {match.group().lower() for match in WORD_PATTERN.finditer(query_text)} - self.stop_words
+        return np.array(sorted(term_hash(word) for word in words), dtype=np.uint32)
+
+    def _best_window(self, first: int, last: int, query_terms: np.ndarray, window: int) -> Optional[tuple]:
+        """
+        Find the window of indexed words covering the most distinct query terms.
+
+        Returns:
+            Tuple of ((distinct terms, matches), window start, matched entries),
+            or None when the range has no match
+        """
+        # Queries have a handful of terms, so comparing against each is cheap
+        is_match = self.term[first:last, None] == query_terms[None, :]
+        matched = first + np.flatnonzero(is_match.any(axis=1))
+        if not len(matched):
+            return None
+
+        # Windows start at a match and hold the matches up to ``window`` words
+        # later; running per-term match counts give each window's distinct terms
+        ends = np.searchsorted(matched, matched + window)
+        counts = np.zeros((len(matched) + 1, len(query_terms)), dtype=np.int32)
+        np.cumsum(is_match[matched - first], axis=0, out=counts[1:])
+        distinct = ((counts[ends] - counts[:-1]) > 0).sum(axis=1)
+        sizes = ends - np.arange(len(matched))
+
+        # Most distinct terms, then most matches, then earliest
+        best = np.lexsort((-sizes, -distinct))[0]
+        return (int(distinct[best]), int(sizes[best])), int(matched[best]), matched[best:ends[best]]
+
+    def snippet(self, position: int, query_text: str, window: int = WINDOW_TERMS) -> Optional[Dict[str, str]]:
+        """
+        Build the snippet of a post that best matches a query.
+
+        Fields are tried in preference order and the one with the window
+        covering the most distinct query terms wins; without any match the
+        snippet is the opening of the first non-empty field.
+
+        Args:
+            position: Post position
+            query_text: The query text
+            window: Indexed words per snippet
+
+        Returns:
+            Dictionary with the field the snippet comes from and its text,
+            matched words wrapped in ``**``, or None when the post has no text
+        """
+        query_terms = self.query_terms(query_text)
+
+        best = None
+        if len(query_terms):
+            for name, bounds in self.bounds.items():
+                first, last = int(bounds[position]), int(bounds[position + 1])
+                found = self._best_window(first, last, query_terms, window)
+                if found and (best is None or found[0] > best[1][0]):
+                    best = (name, found)
+
+        if best is not None:
+            name, (_, start, matched) = best
+            first, last = int(self.bounds[name][position]), int(self.bounds[name][position + 1])
+            text = self._render(name, position, max(first, start - LEAD_TERMS), min(last, start + window), last, matched)
+            return {'field': name, 'text': text}
+
+        for name, bounds in self.bounds.items():
+            first, last = int(bounds[position]), int(bounds[position + 1])
+            if last > first:
+                return {'field': name, 'text': self._render(name, position, first, min(last, first + window), last, [])}
+        return None
+
+    def _render(self, name: str, position: int, start: int, end: int, last: int, matched: Sequence[int]) -> str:
+        """
+        Cut indexed words ``start:end`` of a field from its text and highlight matches.
+
+        Args:
+            name: Field name
+            position: Post position
+            start: First indexed word of the snippet
+            end: Indexed word after the snippet
+            last: Indexed word after the end of the field
+            matched: Indexed words to highlight
+
+        Returns:
+            The snippet text with whitespace collapsed
+        """
+        text = self.fields[name][position] or ''
+        first = int(self.bounds[name][position])
+
+        pieces: List[str] = ['...' if start > first else '']
+        cursor = int(self.start[start])
+        for entry in matched:
+            entry = int(entry)
+            if not start <= entry < end:
+                continue
+            word_start = int(self.start[entry])
+            word_end = word_start + int(self.length[entry])
+            pieces.append(text[cursor:word_start])
+            pieces.append(HIGHLIGHT.format(text[word_start:word_end]))
+            cursor = word_end
+        pieces.append(text[cursor:int(self.start[end - 1]) + int(self.length[end - 1])])
+        pieces.append('...' if end < last else '')
+        return ' '.join(''.join(pieces).split())
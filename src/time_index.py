@@ -0,0 +1,183 @@
+"""
+Time index for the Solana Forum MCP server.
+
+Post creation times are parsed once at load into an int64 column of epoch
+seconds. Posts are kept in time order, so date-window queries resolve with
+two binary searches over the sorted column instead of scanning every post.
+"""
+
+import datetime
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Sentinel for posts without a parseable creation time; sorts before any date
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+
+SECONDS_PER_DAY = 86400
+
+TimeBound = Union[str, int, float, datetime.datetime, datetime.date, None]
+
+
+def parse_timestamps(values: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Parse ISO 8601 timestamps into epoch seconds.
+
+    Args:
+        values: Timestamp strings; missing or invalid values are allowed
+
+    Returns:
+        int64 array of epoch seconds, with MISSING_TIMESTAMP for bad values
+    """
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors='coerce', format='ISO8601')
+    seconds = (parsed - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+    return seconds.fillna(MISSING_TIMESTAMP).astype('int64').to_numpy()
+
+
+def parse_time_bound(value: TimeBound, is_end: bool = False) -> Optional[int]:
+    """
+    Convert a user-supplied window bound into epoch seconds.
+
+    Date-only end bounds ("2024-03-31") include the whole day. Naive times
+    are taken as UTC.
+
+    Args:
+        value: ISO date or datetime string, epoch seconds, or datetime
+        is_end: Whether the value closes the window
+
+    Returns:
+        Epoch seconds, or None for an open bound
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    if value is None or value == '':
+        return None
+
+    if isinstance(value, (int, float, np.integer)) and not isinstance(value, bool):
+        return int(value)
+
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        return int(value.strip())
+
+    date_only = isinstance(value, datetime.date) and not isinstance(value, datetime.datetime)
+    if isinstance(value, str):
+        date_only = len(value.strip()) == 10
+
+    timestamp = pd.Timestamp(value)
+    if timestamp is pd.NaT:
+        raise ValueError(f"Invalid time bound: {value!r}")
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+
+    seconds = int(timestamp.timestamp())
+    if is_end and date_only:
+        seconds += SECONDS_PER_DAY
+    return seconds
+
+
+def format_timestamp(seconds: Optional[int]) -> Optional[str]:
+    """
+    Format epoch seconds as an ISO 8601 UTC string.
+
+    Args:
+        seconds: Epoch seconds, or None
+
+    Returns:
+        ISO 8601 string, or None
+    """
+    if seconds is None:
+        return None
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc).isoformat()
+
+
+def days_ago(days: float, now: Optional[float] = None) -> int:
+    """
+    Get the epoch seconds of a moment ``days`` before now.
+
+    Args:
+        days: Number of days to go back
+        now: Optional reference time in epoch seconds (defaults to the clock)
+
+    Returns:
+        Epoch seconds
+    """
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+    return int(now - days * SECONDS_PER_DAY)
+
+
+class TimeIndex:
+    """
+    Sorted creation-time column with per-category position lists.
+
+    Positions refer to rows of the time-ordered post list, so every window
+    lookup is a pair of ``np.searchsorted`` calls.
+    """
+
+    def __init__(self, timestamps: np.ndarray, categories: Sequence[str]):
+        """
+        Build the index from a time-ordered timestamp column.
+
+        Args:
+            timestamps: int64 epoch seconds, sorted ascending
+            categories: Category name of each row
+        """
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.positions = np.arange(len(self.timestamps), dtype=np.int64)
+
+        # Each category's timestamps are gathered once, so a category lookup
+        # stays two binary searches
+        self.by_category: Dict[str, np.ndarray] = {}
+        self.timestamps_by_category: Dict[str, np.ndarray] = {}
+        category_array = np.asarray(categories, dtype=object)
+        for category in pd.unique(category_array):
+            self.by_category[category] = np.flatnonzero(category_array == category)
+            self.timestamps_by_category[category] = self.timestamps[self.by_category[category]]
+
+    def _column(self, category: Optional[str]):
+        """Get the (positions, timestamps) pair to search for a category."""
+        if not category:
+            return self.positions, self.timestamps
+        if category not in self.by_category:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return self.by_category[category], self.timestamps_by_category[category]
+
+    def window(self, start: Optional[int] = None, end: Optional[int] = None,
+               category: Optional[str] = None) -> np.ndarray:
+        """
+        Get the rows created within ``[start, end)``.
+
+        Args:
+            start: Inclusive lower bound in epoch seconds (None for open)
+            end: Exclusive upper bound in epoch seconds (None for open)
+            category: Optional category to restrict to
+
+        Returns:
+            Row positions in ascending time order
+        """
+        positions, timestamps = self._column(category)
+
+        # Posts without a timestamp sit at the front and never match a window
+        first_dated = np.searchsorted(timestamps, MISSING_TIMESTAMP, side='right')
+        lo = first_dated if start is None else max(first_dated, np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else np.searchsorted(timestamps, end, side='left')
+
+        return positions[lo:hi]
+
+    def latest(self, limit: int, category: Optional[str] = None) -> np.ndarray:
+        """
+        Get the most recently created rows.
+
+        Args:
+            limit: Maximum number of rows to return
+            category: Optional category to restrict to
+
+        Returns:
+            Row positions, newest first
+        """
+        positions, _ = self._column(category)
+        if limit <= 0:
+            return positions[:0]
+        return positions[::-1][:limit]
@@ -0,0 +1,171 @@
+"""
+Topic clustering for the Solana Forum MCP server.
+
+Posts are projected onto LSA components of the TF-IDF matrix and grouped
+with MiniBatchKMeans, and every cluster is labelled with the terms that
+weigh most in its posts. The assignment is computed once per dataset
+snapshot and persisted in the index directory, so theme questions are
+answered by counting precomputed cluster labels over the posts in a
+category and time window.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+from src.utils import fingerprint, load_json, save_json
+
+# Bumped whenever the clustering or the stored layout changes
+TOPICS_VERSION = 1
+
+# LSA dimensions the posts are clustered in
+LSA_COMPONENTS = 100
+
+# Upper bound on the number of topics
+MAX_TOPICS = 20
+
+# Terms used to label each topic
+LABEL_TERMS = 5
+
+
+def default_topic_count(n_posts: int) -> int:
+    """Pick a topic count that grows with the square root of the corpus."""
+    return int(min(MAX_TOPICS, max(2, round(np.sqrt(n_posts / 2)))))
+
+
+class TopicModel:
+    """
+    Cluster assignment and keyword labels of every post.
+    """
+
+    def __init__(self, assignments: Sequence[int], topics: List[Dict[str, Any]]):
+        """
+        Args:
+            assignments: Topic number of each post, by position
+            topics: Per-topic dictionaries with ``terms`` and ``size``
+        """
+        self.assignments = np.asarray(assignments, dtype=np.int32)
+        self.topics = topics
+
+    @classmethod
+    def build(cls, matrix: sp.spmatrix, feature_names: Sequence[str],
+              n_topics: Optional[int] = None, seed: int = 0) -> 'TopicModel':
+        """
+        Cluster posts and label each cluster.
+
+        Args:
+            matrix: TF-IDF matrix, one row per post
+            feature_names: Term of each matrix column
+            n_topics: Number of topics (chosen from the corpus size when omitted)
+            seed: Random seed for the projection and the clustering
+
+        Returns:
+            TopicModel over the rows of ``matrix``
+        """
+        n_posts, n_features = matrix.shape
+        n_topics = min(n_topics or default_topic_count(n_posts), n_posts)
+        labelable = np.array([not str(name).replace(' ', '').isdigit() for name in feature_names], dtype=bool)
+        corpus_weights = np.asarray(matrix.mean(axis=0)).ravel()
+        if n_topics < 2 or n_features < 2:
+            return cls(np.zeros(n_posts, dtype=np.int32), [cls._label(matrix, feature_names, labelable, None)])
+
+        components = min(LSA_COMPONENTS, n_features - 1, n_posts - 1)
+        vectors = TruncatedSVD(components, random_state=seed).fit_transform(matrix)
+        vectors = normalize(vectors)
+
+        kmeans = MiniBatchKMeans(n_clusters=n_topics, random_state=seed, n_init=3, batch_size=1024)
+        assignments = kmeans.fit_predict(vectors)
+
+        # Number topics by size so topic 0 is the largest
+        sizes = np.bincount(assignments, minlength=n_topics)
+        order = np.argsort(-sizes, kind='stable')
+        renumber = np.empty(n_topics, dtype=np.int32)
+        renumber[order] = np.arange(n_topics)
+        assignments = renumber[assignments]
+
+        topics = [
+            cls._label(matrix[np.flatnonzero(assignments == topic)], feature_names, labelable, corpus_weights)
+            for topic in range(n_topics)
+        ]
+        return cls(assignments, topics)
+
+    @staticmethod
+    def _label(rows: sp.spmatrix, feature_names: Sequence[str], labelable: np.ndarray,
+               corpus_weights: Optional[np.ndarray]) -> Dict[str, Any]:
+        """
+        Describe a cluster by its most distinctive terms.
+
+        Terms are ranked by how much more they weigh in the cluster than in
+        the corpus, so words common to every post ("solana") are not labels.
+        """
+        weights = np.asarray(rows.mean(axis=0)).ravel() if rows.shape[0] else np.zeros(rows.shape[1])
+        lift = weights - corpus_weights if corpus_weights is not None else weights.copy()
+        lift[~labelable | (weights <= 0)] = -np.inf
+        top = np.argsort(-lift, kind='stable')[:LABEL_TERMS]
+        return {
+            'terms': [str(feature_names[i]) for i in top if np.isfinite(lift[i])],
+            'size': int(rows.shape[0])
+        }
+
+    @classmethod
+    def load_or_build(cls, matrix: sp.spmatrix, feature_names: Sequence[str], texts: Sequence[str],
+                      directory: Optional[str] = None, params: tuple = ()) -> 'TopicModel':
+        """
+        Load the topics for this snapshot from disk, building and saving them if absent.
+
+        Args:
+            matrix: TF-IDF matrix, one row per post
+            feature_names: Term of each matrix column
+            texts: Indexed text of each post, used to fingerprint the snapshot
+            directory: Index directory; topics are not persisted when None
+            params: Vectorizer settings the matrix depends on
+
+        Returns:
+            TopicModel over the rows of ``matrix``
+        """
+        if directory is None:
+            return cls.build(matrix, feature_names)
+
+        filename = f"topics_{fingerprint(texts, TOPICS_VERSION, *params)}.json"
+        if (Path(directory) / filename).exists():
+            try:
+                stored = load_json(filename, directory)
+                if len(stored['assignments']) == matrix.shape[0]:
+                    return cls(stored['assignments'], stored['topics'])
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading topics from {filename}: {e}")
+
+        model = cls.build(matrix, feature_names)
+        save_json({'assignments': model.assignments.tolist(), 'topics': model.topics}, filename, directory, indent=None)
+        return model
+
+    def summarize(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Count the topics among a set of posts.
+
+        Args:
+            positions: Post positions to count
+
+        Returns:
+            List of dictionaries with the topic number, its post count and
+            its positions, most common first
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        labels = self.assignments[positions]
+        counts = np.bincount(labels, minlength=len(self.topics))
+
+        summary = []
+        for topic in np.argsort(-counts, kind='stable'):
+            if not counts[topic]:
+                break
+            summary.append({
+                'topic': int(topic),
+                'count': int(counts[topic]),
+                'positions': positions[labels == topic]
+            })
+        return summary
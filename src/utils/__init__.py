@@ -8,8 +8,15 @@ from .utils import (
     get_data_directory,
     DATA_DIR,
     RAW_DATA_DIR,
-    PROCESSED_DATA_DIR
+    PROCESSED_DATA_DIR,
+    INDEX_DIR,
+    SNAPSHOT_DIR,
+    CACHE_DIR
 )
+from .comments import split_comments
+from .fingerprint import fingerprint
+from .memory import deep_size, process_memory
+from .snapshots import SnapshotStore
 
 __all__ = [
     'load_json',
@@ -17,5 +24,13 @@ __all__ = [
     'get_data_directory',
     'DATA_DIR',
     'RAW_DATA_DIR',
-    'PROCESSED_DATA_DIR'
+    'PROCESSED_DATA_DIR',
+    'INDEX_DIR',
+    'SNAPSHOT_DIR',
+    'CACHE_DIR',
+    'split_comments',
+    'fingerprint',
+    'deep_size',
+    'process_memory',
+    'SnapshotStore'
 ]
@@ -0,0 +1,39 @@
+"""
+Helpers for the flattened comment threads stored with each post.
+
+The downloader joins a topic's replies into one string of the form
+``[username]: text\n\n[username]: text\n\n``. These helpers recover the
+individual comments from that string without copying their text.
+"""
+
+import re
+from typing import List, Tuple
+
+# Start of a comment: "[username]: " at the start of the string or after a blank line
+COMMENT_MARKER = re.compile(r'(?:^|\n\n)\[([^\]\n]+)\]: ')
+
+
+def split_comments(comments: str) -> List[Tuple[str, int, int]]:
+    """
+    Split a flattened comment thread into its individual comments.
+    
+    Args:
+        comments: The comment thread as written by the downloader
+    
+    Returns:
+        List of (username, text start offset, text end offset) tuples; the
+        comment text is ``comments[start:end]``
+    """
+    if not comments:
+        return []
+    
+    markers = list(COMMENT_MARKER.finditer(comments))
+    result = []
+    for i, marker in enumerate(markers):
+        start = marker.end()
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(comments)
+        # Drop the blank-line separator the downloader appends to each comment
+        while end > start and comments[end - 1] == '\n':
+            end -= 1
+        result.append((marker.group(1), start, end))
+    return result
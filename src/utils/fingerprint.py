@@ -0,0 +1,28 @@
+"""
+Cache keys for indexes persisted in the index directory.
+"""
+
+import hashlib
+from typing import Sequence
+
+
+def fingerprint(texts: Sequence[str], *params) -> str:
+    """
+    Hash the indexed texts and build parameters into a cache key.
+    
+    Args:
+        texts: Indexed text of each post, by position
+        *params: Any further values the index depends on (format versions,
+                 vectorizer settings, sizes)
+    
+    Returns:
+        Hex digest identifying this exact input
+    """
+    digest = hashlib.sha1()
+    for value in params:
+        digest.update(repr(value).encode('utf-8'))
+        digest.update(b'\0')
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
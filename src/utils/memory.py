@@ -0,0 +1,99 @@
+"""
+Approximate memory footprint of in-memory indexes, and the memory a
+process actually uses.
+"""
+
+import sys
+import types
+from array import array
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Objects from these packages hold processes, threads or locks, not data
+_OPAQUE_MODULES = ('concurrent', 'threading', 'multiprocessing', 'weakref', '_thread', 'queue')
+
+_OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_size(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    Approximate bytes held by an object and everything it references.
+
+    Arrays, sparse matrices and DataFrames count their buffers; containers
+    and plain objects (attributes and slots) are followed recursively, and
+    shared objects are counted once.
+
+    Args:
+        obj: Object to measure
+        seen: IDs of objects already counted
+
+    Returns:
+        Approximate size in bytes
+    """
+    if seen is None:
+        seen = set()
+    if obj is None or id(obj) in seen or isinstance(obj, _OPAQUE_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, np.ndarray):
+        # Views are counted with the array that owns the buffer
+        return obj.nbytes if obj.base is None else deep_size(obj.base, seen)
+    if sp.issparse(obj):
+        return sum(deep_size(getattr(obj, name), seen)
+                   for name in ('data', 'indices', 'indptr', 'row', 'col') if hasattr(obj, name))
+    if isinstance(obj, (array, str, bytes, bytearray, int, float, bool)):
+        return sys.getsizeof(obj)
+    if type(obj).__module__.split('.')[0] in _OPAQUE_MODULES:
+        return 0
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    else:
+        if hasattr(obj, '__dict__'):
+            size += deep_size(vars(obj), seen)
+        for name in getattr(type(obj), '__slots__', ()):
+            size += deep_size(getattr(obj, name, None), seen)
+    return size
+
+
+def process_memory(pid: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """
+    Measure the memory a process uses, from Linux's /proc/<pid>/smaps_rollup.
+
+    USS (unique set size) is the memory only this process uses, which is
+    what another forked worker costs; PSS divides each shared page between
+    the processes sharing it, so the PSS of every process sums to the
+    memory they use together.
+
+    Args:
+        pid: Process ID (the current process when None)
+
+    Returns:
+        Dictionary with rss, pss, uss and shared in bytes, or None where
+        smaps_rollup is unavailable (not Linux, or the process has exited)
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                parts = value.split()
+                if len(parts) == 2 and parts[1] == 'kB':
+                    fields[name] = int(parts[0]) * 1024
+    except OSError:
+        return None
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)
+    }
@@ -0,0 +1,214 @@
+"""
+Versioned, content-addressed snapshots of downloaded forum datasets.
+
+Each topic record is stored once, gzip-compressed, under the hash of its
+canonical JSON, so versions share every record that did not change between
+downloads. A version is a small manifest listing, for each topic, its
+record hash and the fields diffs need (content hash, views, comment count,
+category, title); diffs compare two manifests and never open the records.
+
+Layout under ``<snapshot directory>/<dataset>/``::
+
+    objects/ab/abcdef....json.gz    one topic record
+    versions/<version>.json         manifest of one version
+    versions.json                   versions, oldest first
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils import get_data_directory, load_json, save_json
+
+# Fields whose change marks a topic as edited
+CONTENT_FIELDS = ('title', 'description')
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """Hash the canonical JSON of a record."""
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Hash the fields of a record that an author edits."""
+    content = '\0'.join(str(record.get(field) or '') for field in CONTENT_FIELDS)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+
+def _int(value: Any) -> int:
+    """Read a count stored as an int or a numeric string."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class SnapshotStore:
+    """
+    Content-addressed version history of one dataset.
+    """
+
+    def __init__(self, dataset: str = "solana_forum_posts", directory: Optional[str] = None):
+        """
+        Args:
+            dataset: Dataset name (the processed JSON file name without .json)
+            directory: Snapshot root directory (defaults to SNAPSHOT_DIRECTORY)
+        """
+        self.dataset = dataset
+        self.root = Path(directory or get_data_directory('snapshots')) / dataset
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / 'objects' / digest[:2] / f"{digest}.json.gz"
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Get the recorded versions, oldest first, as dictionaries with version, created_at and topics."""
+        if not (self.root / 'versions.json').exists():
+            return []
+        return load_json('versions.json', str(self.root))['versions']
+
+    def latest(self) -> Optional[str]:
+        """Get the newest version, or None when nothing was recorded."""
+        versions = self.versions()
+        return versions[-1]['version'] if versions else None
+
+    def manifest(self, version: str) -> Dict[str, Any]:
+        """
+        Load the manifest of a version.
+
+        Raises:
+            KeyError: If the version does not exist
+        """
+        if version not in self._manifests:
+            if version not in {entry['version'] for entry in self.versions()}:
+                raise KeyError(version)
+            self._manifests[version] = load_json(version, str(self.root / 'versions'))
+        return self._manifests[version]
+
+    def write(self, posts_by_category: Dict[str, List[Dict[str, Any]]]) -> str:
+        """
+        Record a downloaded dataset as a new version.
+
+        Only records not already stored are written. A download identical to
+        the latest version records nothing and returns that version.
+
+        Args:
+            posts_by_category: Topic records by category, as downloaded
+
+        Returns:
+            The version the dataset is stored as
+        """
+        topics: Dict[str, List[Any]] = {}
+        categories: Dict[str, List[str]] = {}
+        written = 0
+        for category, posts in posts_by_category.items():
+            categories[category] = []
+            for post in posts:
+                digest = record_hash(post)
+                categories[category].append(digest)
+                path = self._object_path(digest)
+                if not path.exists():
+                    self._write_object(path, post)
+                    written += 1
+                topics[str(post.get('id'))] = [
+                    digest, content_hash(post), _int(post.get('views')), _int(post.get('comment_count')),
+                    category, post.get('title')
+                ]
+
+        tree = hashlib.sha256(json.dumps(categories, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        versions = self.versions()
+        if versions and versions[-1]['version'].endswith(tree):
+            print(f"Snapshot unchanged since version {versions[-1]['version']}")
+            return versions[-1]['version']
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        version = f"{now.strftime('%Y%m%d-%H%M%S')}-{tree}"
+        manifest = {
+            'version': version,
+            'created_at': now.isoformat(),
+            'parent': versions[-1]['version'] if versions else None,
+            'categories': categories,
+            'topics': topics
+        }
+        save_json(manifest, version, str(self.root / 'versions'), indent=None)
+        versions.append({'version': version, 'created_at': manifest['created_at'], 'topics': len(topics)})
+        save_json({'versions': versions}, 'versions.json', str(self.root), indent=None)
+        print(f"Recorded snapshot {version}: {len(topics)} topics, {written} new or changed records")
+        return version
+
+    def _write_object(self, path: Path, record: Dict[str, Any]):
+        """Write one compressed record atomically."""
+        os.makedirs(path.parent, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(temporary, 'wt', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporary, path)
+
+    def load(self, version: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Rebuild the dataset of a version.
+
+        Args:
+            version: Version to load
+
+        Returns:
+            Topic records by category, as downloaded
+        """
+        result = {}
+        for category, digests in self.manifest(version)['categories'].items():
+            result[category] = []
+            for digest in digests:
+                with gzip.open(self._object_path(digest), 'rt', encoding='utf-8') as f:
+                    result[category].append(json.load(f))
+        return result
+
+    def diff(self, since: str, until: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Compare two versions from their manifests.
+
+        Args:
+            since: Older version
+            until: Newer version (defaults to the latest)
+
+        Returns:
+            Dictionary with the versions compared and lists of new, removed
+            and edited topics plus view and comment deltas; topics are
+            [id, category, title] entries, deltas add before and after
+            counts
+
+        Raises:
+            KeyError: If either version does not exist
+        """
+        until = until or self.latest()
+        old = self.manifest(since)['topics']
+        new = self.manifest(until)['topics']
+
+        changes: Dict[str, List[Dict[str, Any]]] = {
+            'new_topics': [], 'removed_topics': [], 'edited_topics': [], 'view_changes': [], 'comment_changes': []
+        }
+        for topic_id, (digest, content, views, comments, category, title) in new.items():
+            summary = {'id': _int(topic_id), 'category_name': category, 'title': title}
+            previous = old.get(topic_id)
+            if previous is None:
+                changes['new_topics'].append(summary)
+                continue
+            if previous[0] == digest:
+                continue
+            if previous[1] != content:
+                changes['edited_topics'].append(summary)
+            if previous[2] != views:
+                changes['view_changes'].append({**summary, 'before': previous[2], 'after': views, 'delta': views - previous[2]})
+            if previous[3] != comments:
+                changes['comment_changes'].append({**summary, 'before': previous[3], 'after': comments, 'delta': comments - previous[3]})
+        for topic_id, (_, _, _, _, category, title) in old.items():
+            if topic_id not in new:
+                changes['removed_topics'].append({'id': _int(topic_id), 'category_name': category, 'title': title})
+
+        for key in ('view_changes', 'comment_changes'):
+            changes[key].sort(key=lambda change: (-abs(change['delta']), change['id']))
+        return {'since': since, 'until': until, **changes}
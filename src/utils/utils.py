@@ -11,6 +11,9 @@ load_dotenv()
 DATA_DIR = os.getenv("DATA_DIRECTORY", "data")
 RAW_DATA_DIR = os.getenv("RAW_DATA_DIRECTORY", "data/raw")
 PROCESSED_DATA_DIR = os.getenv("PROCESSED_DATA_DIRECTORY", "data/processed")
+INDEX_DIR = os.getenv("INDEX_DIRECTORY", "data/index")
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIRECTORY", "data/snapshots")
+CACHE_DIR = os.getenv("CACHE_DIRECTORY", "data/cache")
 
 
 def load_json(filename: str, directory: Optional[str] = None) -> Dict[str, Any]:
@@ -93,15 +96,24 @@ def get_data_directory(data_type: str = "processed") -> str:
     """
     Get the appropriate data directory based on data type.
     
+    The *_DIRECTORY environment variables are read on every call, so a
+    directory can be changed after import (e.g. by tests).
+    
     Args:
-        data_type (str): Type of data directory to get ('raw' or 'processed')
+        data_type (str): Type of data directory to get ('raw', 'processed', 'index', 'snapshots' or 'cache')
     
     Returns:
         str: Path to the requested data directory
     """
     if data_type.lower() == "raw":
-        return RAW_DATA_DIR
+        return os.getenv("RAW_DATA_DIRECTORY", RAW_DATA_DIR)
     elif data_type.lower() == "processed":
-        return PROCESSED_DATA_DIR
+        return os.getenv("PROCESSED_DATA_DIRECTORY", PROCESSED_DATA_DIR)
+    elif data_type.lower() == "index":
+        return os.getenv("INDEX_DIRECTORY", INDEX_DIR)
+    elif data_type.lower() == "snapshots":
+        return os.getenv("SNAPSHOT_DIRECTORY", SNAPSHOT_DIR)
+    elif data_type.lower() == "cache":
+        return os.getenv("CACHE_DIRECTORY", CACHE_DIR)
     else:
-        return DATA_DIR
+        return os.getenv("DATA_DIRECTORY", DATA_DIR)
@@ -0,0 +1,51 @@
+"""
+Tests for the precomputed forum analytics.
+"""
+
+import gc
+import weakref
+
+import pandas as pd
+import pytest
+
+from src.analytics import RESULT_CACHE_SIZE, ForumAnalytics
+from src.time_index import parse_timestamps
+
+
+def frame():
+    df = pd.DataFrame({
+        'category_name': ['Governance', 'Governance', 'Research'],
+        'original_poster': ['alice', 'bob', 'alice'],
+        'views': [10, 20, 30],
+        'comment_count': [1, 0, 2],
+        'created_at': ['2024-01-01T10:00:00Z', '2024-01-02T10:00:00Z', '2024-02-01T10:00:00Z'],
+        'last_posted_at': ['2024-01-01T12:00:00Z', '', '2024-02-02T10:00:00Z'],
+    })
+    df['created_ts'] = parse_timestamps(df['created_at'])
+    return df
+
+
+def test_results_are_memoized_per_instance():
+    analytics = ForumAnalytics(frame())
+    result = analytics.get('month', 'Governance')
+    assert analytics.get('month', 'Governance') is result
+    assert result['activity'] == [{'period': '2024-01-01', 'category': 'Governance', 'posts': 2, 'views': 30,
+                                   'comments': 1}]
+    assert result['reply_latency']['posts_with_replies'] == 1
+    assert ForumAnalytics(frame()).get('month', 'Governance') is not result
+
+    with pytest.raises(ValueError):
+        analytics.get('decade')
+
+    for number in range(RESULT_CACHE_SIZE + 1):
+        analytics.get('week', f"category {number}")
+    assert len(analytics._results) == RESULT_CACHE_SIZE
+
+
+def test_memoized_results_do_not_keep_instances_alive():
+    analytics = ForumAnalytics(frame())
+    analytics.get('week')
+    reference = weakref.ref(analytics)
+    del analytics
+    gc.collect()
+    assert reference() is None
@@ -0,0 +1,104 @@
+"""
+Tests for the ASGI server, which must answer /query like the Flask server.
+"""
+
+import json
+import os
+
+import pytest
+from starlette.testclient import TestClient
+
+from src.scripts.mock_completions import MockCompletionsServer
+
+
+@pytest.fixture(scope="module")
+def mock():
+    with MockCompletionsServer(latency=0.2) as mock:
+        yield mock
+
+
+@pytest.fixture(scope="module")
+def client(mock, tmp_path_factory):
+    environment = {'OPENAI_API_KEY': "test-key", 'OPENAI_BASE_URL': mock.base_url, 'EVALUATION_CACHE': "0",
+                   'ASGI_EVALUATION_WORKERS': "3", 'CACHE_DIRECTORY': str(tmp_path_factory.mktemp("cache"))}
+    saved = {name: os.environ.get(name) for name in environment}
+    os.environ.update(environment)
+    try:
+        from src import asgi_server
+        yield TestClient(asgi_server.app)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def test_lookups_and_searches(client):
+    latest = client.get("/query", params={'type': 'latest', 'limit': 3}).json()
+    assert latest['query_type'] == 'latest_posts' and len(latest['posts']) == 3
+
+    search = client.get("/query", params={'type': 'search', 'q': 'validator rewards'}).json()
+    assert search['count'] > 0
+
+    natural = client.post("/query", json={'query': 'What are the most viewed posts?'}).json()
+    assert natural['query_type'] == 'most_viewed_posts'
+
+
+def test_invalid_queries(client):
+    assert client.get("/query", params={'type': 'nope'}).status_code == 400
+    assert client.get("/query", params={'type': 'latest', 'limit': 'x'}).status_code == 400
+    assert client.get("/query", params={'type': 'latest', 'dataset': 'nope'}).status_code == 404
+    assert client.post("/query", json={}).status_code == 400
+
+
+def test_evaluations_are_awaited_on_the_job_workers(client, mock):
+    from src import asgi_server
+    post_id = asgi_server.registry.get().posts[0]['id']
+
+    result = client.get("/query", params={'type': 'evaluate', 'post_id': post_id}).json()
+    assert result['post_id'] == post_id and 'overall_score' in result
+    assert asgi_server.evaluation_jobs.stats()['jobs']['done'] == 1
+
+    missing = client.get("/query", params={'type': 'evaluate', 'post_id': -1}).json()
+    assert 'not found' in missing['error']
+
+
+def test_natural_language_evaluations_are_awaited_on_the_job_workers(client, monkeypatch):
+    from src import asgi_server
+    posts = asgi_server.registry.get().posts
+    done = asgi_server.evaluation_jobs.stats()['jobs']['done']
+
+    async def no_search_thread(call, *args):
+        raise AssertionError(f"{call.__name__} ran on a search thread")
+
+    monkeypatch.setattr(asgi_server, 'run_cpu_bound', no_search_thread)
+    posted = client.post("/query", json={'query': f"evaluate post {posts[1]['id']}"}).json()
+    assert posted['post_id'] == posts[1]['id'] and 'overall_score' in posted
+    got = client.get("/query", params={'q': f"Evaluate post {posts[2]['id']}"}).json()
+    assert got['post_id'] == posts[2]['id'] and 'overall_score' in got
+    assert asgi_server.evaluation_jobs.stats()['jobs']['done'] == done + 2
+
+
+def test_batch_and_streamed_batch(client):
+    body = {'queries': ["What are the most viewed posts?", {'type': 'search', 'q': 'validator rewards'},
+                        {'type': 'latest', 'limit': 2}]}
+    batch = client.post("/batch", json=body).json()
+    assert batch['query_type'] == 'batch' and batch['count'] == 3
+    assert [entry['index'] for entry in batch['results']] == [0, 1, 2]
+    assert batch['results'][0]['result']['query_type'] == 'most_viewed_posts'
+    assert batch['results'][1]['result'] == client.get("/query", params={'type': 'search',
+                                                                           'q': 'validator rewards'}).json()
+
+    with client.stream("POST", "/batch", json={**body, 'stream': True}) as response:
+        assert response.headers['content-type'].startswith('application/x-ndjson')
+        entries = [json.loads(line) for line in response.iter_lines() if line]
+    assert sorted(entry['index'] for entry in entries) == [0, 1, 2]
+
+    assert client.post("/batch", json={}).status_code == 400
+
+
+def test_evaluation_cap_is_sized_and_reported(client):
+    stats = client.get("/jobs").json()
+    assert stats['workers'] == 3
+    assert '/jobs' in client.get("/").json()['endpoints']
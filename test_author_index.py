@@ -0,0 +1,73 @@
+"""
+Tests for the author index behind author listings, summaries and leaderboards.
+"""
+
+import numpy as np
+import pytest
+
+from src.author_index import AuthorIndex
+from src.time_index import SECONDS_PER_DAY
+
+NOW = 1_750_000_000
+
+
+def post(author, category, views, days_old, commenters=()):
+    return {
+        'original_poster': author,
+        'category_name': category,
+        'views': views,
+        'comments': ''.join(f"[{name}]: reply\n\n" for name in commenters),
+        'created_ts': NOW - days_old * SECONDS_PER_DAY,
+    }
+
+
+# In time order, as the server keeps them
+POSTS = [
+    post('alice', 'Governance', 100, 400, ['bob', 'dave']),
+    post('bob', 'Research', 50, 200, ['alice']),
+    post('alice', 'Research', 10, 20, ['bob', 'bob']),
+    post('Carol', 'Governance', 500, 5),
+    post('bob', 'Governance', 5, 2, ['dave']),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return AuthorIndex(POSTS, np.array([p['created_ts'] for p in POSTS], dtype=np.int64))
+
+
+def test_posts_by_author(index):
+    assert index.resolve('ALICE') == 'alice'
+    assert index.resolve('@carol') == 'Carol'
+    assert index.resolve('nobody') is None
+    assert index.authored('alice').tolist() == [0, 2]
+    # One entry per reply
+    assert index.commented('bob').tolist() == [0, 2, 2]
+    assert index.authored('nobody').tolist() == []
+
+
+def test_author_summary(index):
+    summary = index.summary('bob')
+    assert summary['posts'] == 2 and summary['comments'] == 3
+    assert summary['threads_commented'] == 2
+    assert summary['total_views'] == 55
+    assert summary['posts_per_category'] == {'Research': 1, 'Governance': 1}
+    assert summary['comments_per_category'] == {'Governance': 1, 'Research': 2}
+    assert summary['first_post_at'] < summary['last_post_at']
+
+
+def test_top_authors_by_metric_and_period(index):
+    assert index.top('posts') == [('alice', 2), ('bob', 2), ('Carol', 1)]
+    assert index.top('comments') == [('bob', 3), ('dave', 2), ('alice', 1)]
+    assert index.top('views')[0] == ('Carol', 500)
+    assert index.top('views', category='Research') == [('bob', 50), ('alice', 10)]
+
+    month = index.period_start('month', now=NOW)
+    assert sorted(index.top('posts', start=month)) == [('Carol', 1), ('alice', 1), ('bob', 1)]
+    assert index.top('views', start=index.period_start(3, now=NOW)) == [('bob', 5)]
+    assert index.top('posts', limit=1) == [('alice', 2)]
+
+    with pytest.raises(ValueError):
+        index.top('likes')
+    with pytest.raises(ValueError):
+        index.period_start('decade')
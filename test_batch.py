@@ -0,0 +1,48 @@
+"""
+Tests for batches of queries answered together.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.http_api import InvalidQuery, MAX_BATCH_SIZE, batch_queries, run_batch
+
+
+@pytest.fixture(scope="module")
+def server():
+    from src.mcp_server import SolanaForumMCPServer
+    return SolanaForumMCPServer()
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def test_grouped_searches_match_individual_searches(server):
+    searches = [("validator rewards",), ("priority fees", 10), ("stake delegation", 5, "Governance"),
+                ("valdator rewards", 3, None, True, True)]
+    assert server.semantic_search_many(searches) == [server.semantic_search(*search) for search in searches]
+
+
+def test_batch_answers_every_query(server, executor):
+    queries = ["latest posts", {'type': 'search', 'q': 'validator rewards', 'limit': 3},
+               {'type': 'stats'}, "search for priority fees", {'type': 'nope'}, 42]
+    entries = sorted(run_batch(server, queries, executor), key=lambda entry: entry['index'])
+
+    assert [entry['index'] for entry in entries] == list(range(len(queries)))
+    assert [entry['status'] for entry in entries] == [200, 200, 200, 200, 400, 400]
+    assert entries[0]['result'] == server.query("latest posts")
+    assert entries[1]['result'] == server.semantic_search('validator rewards', 3)
+    assert entries[3]['result'] == server.query("search for priority fees")
+    assert 'error' in entries[4]['result']
+
+
+def test_batch_size_is_bounded():
+    assert batch_queries({'queries': ["latest posts"]}) == ["latest posts"]
+    for data in (None, {}, {'queries': []}, {'queries': "latest posts"},
+                 {'queries': ["latest posts"] * (MAX_BATCH_SIZE + 1)}):
+        with pytest.raises(InvalidQuery):
+            batch_queries(data)
@@ -0,0 +1,117 @@
+"""
+Tests for bulk evaluation jobs, retries and rate limiting against a local mock completions server.
+"""
+
+import time
+
+import pytest
+
+from src.bulk_evaluation import BulkEvaluationStore, BulkEvaluator
+from src.evaluation import PostEvaluator
+from src.evaluation_cache import EvaluationCache
+from src.rate_limit import RateLimiter, TokenBucket
+from src.scripts.mock_completions import MockCompletionsServer
+
+POST = "Title: Priority fees\n\nDescription: A proposal to change how priority fees are distributed."
+
+
+@pytest.fixture(scope="module")
+def server():
+    from src.mcp_server import SolanaForumMCPServer
+    return SolanaForumMCPServer(openai_api_key="test-key")
+
+
+def bulk_evaluator(server, mock, tmp_path, **options):
+    evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5,
+                              cache=EvaluationCache(tmp_path / "evaluations.sqlite3"),
+                              rate_limiter=RateLimiter(6000, 10 ** 7), **options)
+    return BulkEvaluator(server, store=BulkEvaluationStore(tmp_path / "evaluations.sqlite3"),
+                         concurrency=4, evaluator=evaluator)
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst():
+    bucket = TokenBucket(per_minute=600, capacity=2)
+    waits = [bucket.reserve(1) for _ in range(4)]
+    # Two go at once, then one every 0.1 s
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_rate_limited_requests_are_retried():
+    with MockCompletionsServer(latency=0.01, throttle=2, retry_after=0.05) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="combined", max_retries=2)
+        evaluations = evaluator.evaluate(POST)
+        evaluator.close()
+
+    assert mock.throttled == 2
+    assert evaluator.usage['retries'] == 2
+    assert not any(evaluation['failed'] for evaluation in evaluations.values())
+
+
+def test_bulk_job_stores_scores_and_resumes(server, tmp_path):
+    with MockCompletionsServer(latency=0.01, fail=["decentralization"]) as mock:
+        bulk = bulk_evaluator(server, mock, tmp_path, mode="separate", max_retries=0)
+        job_id = bulk.start(["sRFC"])
+        first = bulk.run(job_id, progress=False)
+        assert first['failed'] == first['total'] > 0
+        assert first['finished_at'] is None
+
+        # The failing perspective recovers; only the unfinished posts are sent again,
+        # and their other perspectives come from the cache
+        mock.fail.clear()
+        requests = mock.requests
+        second = bulk.run(job_id, progress=False)
+        assert second['done'] == second['total']
+        assert second['finished_at'] is not None
+        assert mock.requests - requests == second['total']
+
+    scores = bulk.store.top_scores(server.dataset, ["sRFC"], limit=100)
+    assert len(scores) == second['total']
+    assert scores == sorted(scores, key=lambda entry: -entry['overall_score'])
+
+
+def test_bulk_job_rejects_unknown_selections(server, tmp_path):
+    with MockCompletionsServer() as mock:
+        bulk = bulk_evaluator(server, mock, tmp_path)
+        with pytest.raises(ValueError):
+            bulk.start(["No such category"])
+        with pytest.raises(ValueError):
+            bulk.start(post_ids=[-1])
+        with pytest.raises(KeyError):
+            bulk.run("no-such-job")
+
+
+def test_bulk_evaluation_needs_an_api_key(tmp_path):
+    from src.mcp_server import SolanaForumMCPServer
+    keyless = SolanaForumMCPServer()
+    keyless.openai_api_key = keyless.evaluator.api_key = None
+    store = BulkEvaluationStore(tmp_path / "evaluations.sqlite3")
+    with pytest.raises(ValueError, match="API key"):
+        BulkEvaluator(keyless, store=store)
+    # Nothing was created for a job whose every request would fail
+    assert not store.path.exists()
+
+
+def test_bulk_evaluator_closes_the_evaluator_it_created(server, tmp_path):
+    store = BulkEvaluationStore(tmp_path / "evaluations.sqlite3")
+    with BulkEvaluator(server, store=store) as bulk:
+        assert bulk.evaluator is not server.evaluator
+    assert bulk.evaluator._executor._shutdown
+
+    # An evaluator passed in belongs to the caller
+    evaluator = PostEvaluator("test-key")
+    with BulkEvaluator(server, store=store, evaluator=evaluator):
+        pass
+    assert not evaluator._executor._shutdown
+    evaluator.close()
+
+
+def test_rate_limiter_holds_the_request_budget():
+    limiter = RateLimiter(requests_per_minute=1200, tokens_per_minute=None)
+    limiter.requests.level = 0
+    start = time.perf_counter()
+    for _ in range(5):
+        limiter.acquire(100)
+    # 20 requests per second once the burst is spent
+    assert time.perf_counter() - start == pytest.approx(0.25, abs=0.05)
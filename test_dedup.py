@@ -0,0 +1,42 @@
+"""
+Tests for near-duplicate detection with MinHash LSH.
+"""
+
+import random
+
+from src.dedup import DuplicateIndex, MinHashLSH
+
+WORDS = ("validator stake reward fee priority vote proposal inflation epoch leader slot block transaction "
+         "account program token mint burn governance delegate commission cluster rpc node client").split()
+
+
+def document(rng, length=60):
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def corpus():
+    rng = random.Random(7)
+    texts = [document(rng) for _ in range(30)]
+    # A cross-post of text 3 with its last words edited
+    words = texts[3].split()
+    texts.append(' '.join(words[:-2] + ['edited', 'ending']))
+    return texts
+
+
+def test_planted_near_duplicate_is_clustered():
+    texts = corpus()
+    index = DuplicateIndex(texts)
+    assert index.clusters == [[3, len(texts) - 1]]
+    assert index.lsh.similarity(3, len(texts) - 1) >= 0.8
+    assert index.duplicates_of(3) == [len(texts) - 1]
+
+
+def test_distinct_posts_are_left_alone():
+    texts = corpus()
+    index = DuplicateIndex(texts)
+    assert all(index.duplicates_of(i) == [] for i in range(len(texts) - 1) if i != 3)
+    assert index.dedupe([len(texts) - 1, 0, 3, 1]) == [len(texts) - 1, 0, 1]
+    assert index.dedupe(range(len(texts)), limit=5) == [0, 1, 2, 3, 4]
+
+    # Posts without text never match each other
+    assert MinHashLSH(['', '', 'short']).clusters(0.5) == []
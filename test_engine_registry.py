@@ -0,0 +1,68 @@
+"""
+Tests for the dataset engine registry.
+"""
+
+import pytest
+
+from src import engine_registry
+from src.engine_registry import EngineRegistry
+
+
+class Engine:
+    """Stands in for a dataset engine; its estimated size is set per dataset."""
+
+    def __init__(self, data_file, **options):
+        self.data_file = data_file
+        self.options = options
+
+
+SIZES = {'alpha': 40e6, 'beta': 40e6, 'gamma': 40e6, 'huge': 150e6}
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    for name in SIZES:
+        (tmp_path / f"{name}.json").write_text("[]")
+    monkeypatch.setattr(engine_registry, 'PROCESSED_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(engine_registry, 'SolanaForumMCPServer', Engine)
+    monkeypatch.setattr(engine_registry, 'deep_size', lambda engine: int(SIZES[engine.data_file]))
+    return EngineRegistry(memory_budget_mb=100, default_dataset='alpha', low_memory=True)
+
+
+def test_engines_are_built_once_and_reused(registry):
+    engine = registry.get()
+    assert engine.data_file == 'alpha' and engine.options == {'low_memory': True}
+    assert registry.get('alpha') is engine
+    assert registry.available() == ['alpha', 'beta', 'gamma', 'huge']
+    with pytest.raises(ValueError):
+        registry.get('missing')
+
+
+def test_least_recently_used_engine_is_evicted_over_budget(registry):
+    alpha = registry.get('alpha')
+    registry.get('beta')
+    assert list(registry.loaded()) == ['beta', 'alpha']
+
+    # Using alpha again makes beta the least recently used
+    assert registry.get('alpha') is alpha
+    registry.get('gamma')
+    assert list(registry.loaded()) == ['gamma', 'alpha']
+    assert registry.get('alpha') is alpha
+    assert registry.get('beta') is not None
+    assert list(registry.loaded()) == ['beta', 'alpha']
+
+
+def test_engine_over_budget_alone_is_kept(registry):
+    registry.get('alpha')
+    registry.get('huge')
+    assert list(registry.loaded()) == ['huge']
+    described = registry.describe()
+    assert described['loaded'] == {'huge': 150.0}
+    assert described['memory_budget_mb'] == 100
+
+
+def test_no_budget_keeps_every_engine(registry):
+    unlimited = EngineRegistry(memory_budget_mb=0, default_dataset='alpha')
+    for name in SIZES:
+        unlimited.get(name)
+    assert sorted(unlimited.loaded()) == sorted(SIZES)
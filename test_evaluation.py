@@ -0,0 +1,199 @@
+"""
+Tests for concurrent post evaluation against a local mock completions server.
+"""
+
+import json
+import time
+
+from src.evaluation import FALLBACK_SCORE, PERSPECTIVES, PROMPT_VERSION, PostEvaluator, parse_combined_evaluation
+from src.evaluation_cache import EvaluationCache, post_content_hash
+from src.prompt_packer import PromptPacker, count_tokens
+from src.scripts.mock_completions import MockCompletionsServer
+
+POST = "Title: Priority fees\n\nDescription: A proposal to change how priority fees are distributed."
+LATENCY = 0.3
+
+
+def test_perspectives_are_evaluated_concurrently():
+    with MockCompletionsServer(latency=LATENCY) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="separate")
+        start = time.perf_counter()
+        evaluations = evaluator.evaluate(POST)
+        elapsed = time.perf_counter() - start
+        evaluator.close()
+
+    assert list(evaluations) == list(PERSPECTIVES)
+    assert mock.requests == len(PERSPECTIVES)
+    assert mock.max_in_flight == len(PERSPECTIVES)
+    # About one round trip, not one per perspective
+    assert elapsed < 2 * LATENCY
+    for perspective, evaluation in evaluations.items():
+        assert 0.0 <= evaluation['score'] <= 1.0
+        assert evaluation['explanation'] == f"Mock evaluation from the perspective of {perspective}."
+
+
+def test_failed_perspective_does_not_fail_the_evaluation():
+    with MockCompletionsServer(latency=LATENCY, fail=["decentralization"]) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="separate", max_retries=0)
+        evaluations = evaluator.evaluate(POST)
+        evaluator.close()
+
+    failed = evaluations["decentralization"]
+    assert failed['score'] == FALLBACK_SCORE
+    assert failed['explanation'].startswith("Error calling OpenAI API")
+    assert all(not evaluations[p]['explanation'].startswith("Error") for p in PERSPECTIVES if p != "decentralization")
+
+
+def test_stalled_perspective_times_out():
+    with MockCompletionsServer(latency=LATENCY, stall=["ecosystem growth"], stall_seconds=5) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=1, mode="separate")
+        start = time.perf_counter()
+        evaluations = evaluator.evaluate(POST)
+        elapsed = time.perf_counter() - start
+        evaluator.close()
+
+    assert elapsed < 2
+    assert evaluations["ecosystem growth"]['score'] == FALLBACK_SCORE
+    assert "no response within 1 seconds" in evaluations["ecosystem growth"]['explanation']
+    assert not evaluations["technical innovation"]['explanation'].startswith("Error")
+
+
+def test_session_reuses_connections():
+    with MockCompletionsServer(latency=0.05) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="separate")
+        evaluator.evaluate(POST)
+        evaluator.evaluate(POST)
+        adapter = evaluator.session.get_adapter(mock.base_url)
+        pool = adapter.poolmanager.connection_from_url(mock.base_url)
+        evaluator.close()
+
+    # Five workers, so at most five connections were ever opened
+    assert pool.num_connections <= len(PERSPECTIVES)
+
+
+def test_combined_mode_scores_every_perspective_in_one_request():
+    with MockCompletionsServer(latency=LATENCY) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="combined")
+        evaluations = evaluator.evaluate(POST)
+        evaluator.close()
+
+    assert mock.requests == mock.combined_requests == 1
+    assert evaluator.usage['requests'] == 1
+    assert evaluator.usage['prompt_tokens'] > 0 and evaluator.usage['completion_tokens'] > 0
+    for perspective, evaluation in evaluations.items():
+        assert evaluation['score'] == MockCompletionsServer.score(perspective)
+
+
+def test_combined_mode_falls_back_for_invalid_perspectives():
+    with MockCompletionsServer(latency=LATENCY, malformed=["community benefit"]) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="combined")
+        evaluations = evaluator.evaluate(POST)
+        evaluator.close()
+
+    # One combined request, then one separate request for the invalid entry
+    assert mock.combined_requests == 1
+    assert mock.requests == 2
+    assert evaluations["community benefit"]['score'] == MockCompletionsServer.score("community benefit")
+
+
+def test_combined_mode_falls_back_when_the_request_fails():
+    with MockCompletionsServer(latency=LATENCY, fail_combined=True) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="combined", max_retries=0)
+        evaluations = evaluator.evaluate(POST)
+        evaluator.close()
+
+    assert mock.requests == 1 + len(PERSPECTIVES)
+    assert evaluator.usage['failures'] == 1
+    assert all(not evaluation['explanation'].startswith("Error") for evaluation in evaluations.values())
+
+
+def test_combined_parser_validates_each_entry():
+    content = "Here you go: " + json.dumps({
+        "technical_innovation": {"score": 0.8, "explanation": "Novel."},
+        "ecosystem_growth": {"score": 1.7, "explanation": "Out of range."},
+        "community_benefit": {"score": "0.5", "explanation": "Not a number."},
+        "economic_sustainability": {"score": 0.4, "explanation": " "},
+    })
+    assert parse_combined_evaluation(content, PERSPECTIVES) == {"technical innovation": (0.8, "Novel.")}
+    assert parse_combined_evaluation("not json", PERSPECTIVES) == {}
+
+
+def test_cached_evaluations_skip_the_model(tmp_path):
+    cache = EvaluationCache(tmp_path / "evaluations.sqlite3")
+    with MockCompletionsServer(latency=0.05) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, cache=cache)
+        first = evaluator.evaluate(POST)
+        second = evaluator.evaluate(POST)
+        edited = evaluator.evaluate(POST + " Edited.")
+        evaluator.close()
+
+    # The edited post misses; the unchanged one is served from the cache
+    assert mock.requests == 2
+    assert not any(evaluation['cached'] for evaluation in first.values())
+    assert all(evaluation['cached'] for evaluation in second.values())
+    assert not any(evaluation['cached'] for evaluation in edited.values())
+    assert {p: e['score'] for p, e in first.items()} == {p: e['score'] for p, e in second.items()}
+    assert cache.stats()['hits'] == len(PERSPECTIVES)
+
+    # A different model does not reuse the evaluations
+    other = PostEvaluator("test-key", base_url=mock.base_url, model="gpt-4o-mini", cache=cache)
+    assert cache.get(post_content_hash(POST), PERSPECTIVES, other.model, PROMPT_VERSION) == {}
+    other.close()
+
+
+def test_failed_evaluations_are_not_cached_and_can_be_invalidated(tmp_path):
+    cache = EvaluationCache(tmp_path / "evaluations.sqlite3")
+    with MockCompletionsServer(latency=0.05, fail=["decentralization"]) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="separate", cache=cache,
+                                  max_retries=0)
+        evaluator.evaluate(POST)
+        retried = evaluator.evaluate(POST)
+        evaluator.close()
+
+    assert mock.requests == len(PERSPECTIVES) + 1
+    assert not retried["decentralization"]['cached']
+    assert cache.stats()['entries'] == len(PERSPECTIVES) - 1
+    assert cache.invalidate(post_content_hash(POST)) == len(PERSPECTIVES) - 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_replies_without_a_score_fail_and_are_not_cached(tmp_path):
+    cache = EvaluationCache(tmp_path / "evaluations.sqlite3")
+    with MockCompletionsServer(latency=0.05, unscored=["decentralization"]) as mock:
+        evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5, mode="separate", cache=cache)
+        evaluations = evaluator.evaluate(POST)
+        retried = evaluator.evaluate(POST)
+        evaluator.close()
+
+    unscored = evaluations["decentralization"]
+    assert unscored['failed'] and unscored['score'] == FALLBACK_SCORE
+    assert unscored['explanation'].startswith("Error evaluating post: the reply has no score")
+    assert not any(evaluation['failed'] for name, evaluation in evaluations.items() if name != "decentralization")
+    # Only the scored perspectives were cached, so the unscored one is asked again
+    assert cache.stats()['entries'] == len(PERSPECTIVES) - 1
+    assert not retried["decentralization"]['cached'] and mock.requests == len(PERSPECTIVES) + 1
+
+
+def test_packed_content_fits_the_budget_and_keeps_comments():
+    description = " ".join(f"Paragraph {i} about vote credits and validator latency." for i in range(400))
+    excerpts = [("alice", "Validators voting late earn the same credits, so latency matters."),
+                ("bob", "We support the proposal. " * 40)]
+    packed = PromptPacker(budget=400).pack("Timely vote credits", description, excerpts)
+
+    assert count_tokens(packed.text) <= 400
+    assert packed.text.startswith("Title: Timely vote credits\n\nDescription: Paragraph 0")
+    assert "- [alice]: Validators voting late" in packed.text
+    assert packed.excerpts == 2 and packed.text.endswith(" ...")
+    assert packed.description_tokens < packed.original_tokens['description']
+    report = packed.report()
+    assert report['total'] == count_tokens(packed.text)
+    assert report['title'] + report['description'] + report['comments'] <= report['total']
+
+
+def test_short_posts_are_sent_whole_and_budget_zero_disables_packing():
+    packed = PromptPacker(budget=1500).pack("Priority fees", "A proposal to change how priority fees are distributed.")
+    assert packed.text == POST
+
+    unpacked = PromptPacker(budget=0).pack("Priority fees", "x " * 5000, [("alice", "A comment.")])
+    assert unpacked.text == "Title: Priority fees\n\nDescription: " + "x " * 5000
+    assert unpacked.excerpts == 0
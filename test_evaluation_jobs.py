@@ -0,0 +1,129 @@
+"""
+Tests for background evaluation jobs.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.evaluation import PostEvaluator
+from src.evaluation_jobs import EvaluationJobQueue
+from src.scripts.mock_completions import MockCompletionsServer
+
+
+def slow(value, seconds=0.2):
+    time.sleep(seconds)
+    return {'value': value}
+
+
+def broken():
+    raise RuntimeError("model unavailable")
+
+
+@pytest.fixture(scope="module")
+def server():
+    from src.mcp_server import SolanaForumMCPServer
+    return SolanaForumMCPServer(openai_api_key="test-key")
+
+
+def test_jobs_return_at_once_and_finish_in_the_background():
+    jobs = EvaluationJobQueue(workers=2)
+    start = time.perf_counter()
+    job = jobs.submit('a', slow, 'a', post_id=1)
+    assert time.perf_counter() - start < 0.05
+    assert job['status'] in ('queued', 'running') and job['post_id'] == 1
+
+    done = jobs.get(job['job_id'], wait=2)
+    assert done['status'] == 'done'
+    assert done['result'] == {'value': 'a'}
+    assert done['finished_at'] >= done['started_at'] >= done['submitted_at']
+    jobs.close()
+
+
+def test_identical_jobs_are_joined_and_the_queue_is_bounded():
+    jobs = EvaluationJobQueue(workers=1, queue_size=2)
+    first = jobs.submit('a', slow, 'a')
+    assert jobs.submit('a', slow, 'a')['job_id'] == first['job_id']
+
+    time.sleep(0.05)
+    queued = [jobs.submit(key, slow, key) for key in ('b', 'c')]
+    assert [job['queue_position'] for job in queued] == [1, 2]
+    assert jobs.submit('d', slow, 'd')['queue_full']
+
+    assert jobs.get(queued[-1]['job_id'], wait=2)['status'] == 'done'
+    assert jobs.stats()['jobs']['done'] == 3
+    # Finished jobs are no longer joined
+    assert jobs.submit('a', slow, 'a')['job_id'] != first['job_id']
+    jobs.close()
+
+
+def test_failures_are_recorded():
+    jobs = EvaluationJobQueue(workers=1)
+    job = jobs.get(jobs.submit('x', broken)['job_id'], wait=2)
+    assert job['status'] == 'failed'
+    assert job['error'] == "model unavailable"
+
+    job = jobs.get(jobs.submit('y', lambda: {'error': "Post not found"})['job_id'], wait=2)
+    assert job['status'] == 'failed' and job['result'] == {'error': "Post not found"}
+    jobs.close()
+
+
+def test_stream_yields_each_status_change():
+    jobs = EvaluationJobQueue(workers=1)
+    job = jobs.submit('a', slow, 'a', 0.3)
+    statuses = [event['status'] for event in jobs.stream(job['job_id'], heartbeat=0.1) if event]
+    assert statuses[-1] == 'done'
+    assert statuses == sorted(set(statuses), key=['queued', 'running', 'done'].index)
+    assert jobs.get('no-such-job') is None
+    jobs.close()
+
+
+def test_long_poll_returns_when_the_job_changes():
+    jobs = EvaluationJobQueue(workers=1)
+    gate = threading.Event()
+    job = jobs.submit('a', lambda: gate.wait(2) and {'value': 1})
+    job = jobs.get(job['job_id'], wait=1, since_version=0)
+    assert job['status'] == 'running'
+
+    threading.Timer(0.1, gate.set).start()
+    start = time.perf_counter()
+    job = jobs.get(job['job_id'], wait=2)
+    assert job['status'] == 'done'
+    assert time.perf_counter() - start < 1
+    jobs.close()
+
+
+def test_shared_jobs_are_visible_to_other_processes():
+    # Two queues on the same store stand for two preforked server workers
+    runner, other = EvaluationJobQueue(workers=1, shared=True), EvaluationJobQueue(workers=1, shared=True)
+    job = runner.submit('shared', slow, 'shared', 0.3, post_id=7)
+
+    seen = other.get(job['job_id'])
+    assert seen['status'] in ('queued', 'running') and seen['post_id'] == 7 and 'elapsed' in seen
+    done = other.get(job['job_id'], wait=5)
+    assert done['status'] == 'done' and done['result'] == {'value': 'shared'}
+    assert [event['status'] for event in other.stream(job['job_id'])] == ['done']
+
+    failed = runner.submit('broken', broken)
+    assert other.get(failed['job_id'], wait=5)['error'] == "model unavailable"
+    assert other.get('missing') is None
+    assert EvaluationJobQueue(shared=False).get(job['job_id']) is None
+
+
+def test_server_evaluates_posts_in_the_background(server):
+    with MockCompletionsServer(latency=0.2) as mock:
+        server.evaluator = PostEvaluator("test-key", base_url=mock.base_url, timeout=5)
+        server.evaluation_jobs = EvaluationJobQueue(workers=1)
+        post_id = server.posts[0]['id']
+
+        job = server.submit_evaluation(post_id)
+        assert job['status'] in ('queued', 'running') and job['dataset'] == server.dataset
+        assert server.submit_evaluation(post_id)['job_id'] == job['job_id']
+
+        job = server.evaluation_jobs.get(job['job_id'], wait=5)
+        assert job['status'] == 'done'
+        assert job['result']['post_id'] == post_id
+        assert mock.requests == 1
+
+    assert 'not found' in server.submit_evaluation(-1)['error']
@@ -0,0 +1,59 @@
+"""
+Tests for typo-tolerant query term correction.
+"""
+
+from src.fuzzy import FuzzyMatcher, edit_distance
+
+TERMS = ["validator", "validators", "governance", "inflation", "stake", "staking", "rewards",
+         "proposal", "fees", "feed", "the", "simd"]
+FREQUENCIES = [50, 10, 40, 20, 30, 25, 35, 15, 12, 3, 90, 8]
+
+
+def matcher():
+    return FuzzyMatcher(TERMS, FREQUENCIES, stop_words=["the", "with", "teh"])
+
+
+def test_edit_distance():
+    assert edit_distance("stake", "stake", 2) == 0
+    assert edit_distance("stake", "stale", 2) == 1
+    assert edit_distance("stake", "satke", 2) == 1
+    assert edit_distance("stake", "stakes", 2) == 1
+    assert edit_distance("validator", "vldtr", 2) == 3
+
+
+def test_corrects_one_edit_typos():
+    fuzzy = matcher()
+    assert fuzzy.correct("validater rewards") == ("validator rewards", {"validater": "validator"})
+    assert fuzzy.correct("inflaton") == ("inflation", {"inflaton": "inflation"})
+    assert fuzzy.correct("governancee proposl") == (
+        "governance proposal", {"governancee": "governance", "proposl": "proposal"})
+
+
+def test_corrects_transpositions():
+    fuzzy = matcher()
+    assert fuzzy.correct("satke") == ("stake", {"satke": "stake"})
+    assert fuzzy.correct("govrenance") == ("governance", {"govrenance": "governance"})
+
+
+def test_prefers_more_common_of_equally_close_terms():
+    # "feeq" is one edit from both "fees" and "feed"
+    assert matcher().correct("feeq") == ("fees", {"feeq": "fees"})
+
+
+def test_keeps_known_stop_and_digit_words():
+    fuzzy = matcher()
+    assert fuzzy.correct("teh staking") == ("teh staking", {})
+    assert fuzzy.correct("simd0096 validatr") == ("simd0096 validator", {"validatr": "validator"})
+    assert fuzzy.correct("Validators with stake") == ("Validators with stake", {})
+    # Short words and words too far from every term are left alone
+    assert fuzzy.correct("stk qwertyuiop") == ("stk qwertyuiop", {})
+
+
+def test_routed_queries_correct_only_topic_words():
+    from src.mcp_server import SolanaForumMCPServer
+    server = SolanaForumMCPServer()
+    for text in ["posts related to staking", "tell me about validators", "Give me details about post 3456",
+                 "what are people discussing regarding inflation"]:
+        result = server.query(text)
+        assert result['query_type'] == 'semantic_search' and 'corrections' not in result, text
+    assert server.query("give me results on stakng rewards")['corrections'] == {'stakng': 'staking'}
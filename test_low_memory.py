@@ -0,0 +1,52 @@
+"""
+Tests that low-memory mode answers queries like the default mode.
+"""
+
+import pytest
+
+from src.mcp_server import SolanaForumMCPServer
+
+
+@pytest.fixture(scope="module")
+def servers():
+    return SolanaForumMCPServer(low_memory=False), SolanaForumMCPServer(low_memory=True)
+
+
+def ids(result):
+    return [post['id'] for post in result['posts']]
+
+
+@pytest.mark.parametrize("call", [
+    lambda s: s.get_posts_by_category('Governance', 10),
+    lambda s: s.get_posts_by_category('governance', 5, dedup=True),
+    lambda s: s.find_duplicates(threshold=0.5),
+    lambda s: s.find_duplicates('RFP', 0.5),
+    lambda s: s.suggest('val'),
+    lambda s: s.search_comments('inflation', 5, 'Governance'),
+    lambda s: s.get_posts_by_author('jacobcreech', 5, include_comments=False),
+    lambda s: s.posts_between('2024-01-01', None, 'Governance', 10),
+])
+def test_results_match(servers, call):
+    normal, low_memory = servers
+    assert call(low_memory) == call(normal)
+
+
+@pytest.mark.parametrize("call", [
+    lambda s: s.get_latest_posts('Governance', 5),
+    lambda s: s.get_most_viewed_posts('Research', 5, dedup=True),
+    lambda s: s.get_most_commented_posts(5),
+    lambda s: s.query("most viewed posts in Governance"),
+    lambda s: s.query("most commented validator posts"),
+    lambda s: s.query("latest posts since 2024-01-01 in Governance"),
+    lambda s: s.semantic_search('validator rewards', 5, 'Governance'),
+])
+def test_listings_return_the_same_posts(servers, call):
+    normal, low_memory = servers
+    assert ids(call(low_memory)) == ids(call(normal))
+
+
+def test_topics_rank_posts_by_views(servers):
+    for server in servers:
+        for topic in server.get_topics('Governance')['topics']:
+            views = [post['views'] for post in topic['top_posts']]
+            assert views == sorted(views, reverse=True)
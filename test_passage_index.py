@@ -0,0 +1,41 @@
+"""
+Tests for the comment passage index.
+"""
+
+import numpy as np
+
+from src.passage_index import PassageIndex
+
+THREADS = [
+    "[alice]: Validator rewards look fine to me.\n\n"
+    "[bob]: The inflation schedule should taper faster after the next epoch.\n\n",
+    "[carol]: Priority fees spike during congestion.\n\n",
+    "",
+    "[dave]: Unrelated note about the documentation site.\n\n"
+    "[erin]: " + " ".join(["filler"] * 100) + " inflation schedule concerns at the very end\n\n",
+]
+
+
+def test_search_returns_the_matching_comment():
+    index = PassageIndex(THREADS)
+    results = index.search("inflation schedule", limit=5)
+
+    best = results[0]
+    assert (best['post_position'], best['comment']) == (0, 1)
+    assert index.author(best['passage']) == 'bob'
+    assert index.text(best['passage']).startswith("The inflation schedule")
+
+    # A long comment is windowed; the window holding the words matches
+    assert {(r['post_position'], r['comment']) for r in results} == {(0, 1), (3, 1)}
+    long_match = next(r for r in results if r['post_position'] == 3)
+    assert "inflation schedule" in index.text(long_match['passage'])
+    assert index.author(long_match['passage']) == 'erin'
+
+
+def test_search_filters_and_misses():
+    index = PassageIndex(THREADS)
+    allowed = np.array([False, True, True, True])
+    assert [r['post_position'] for r in index.search("inflation schedule", 5, allowed)] == [3]
+    assert index.search("nonexistentword") == []
+    assert index.search_post(1, "priority fees")[0]['comment'] == 0
+    assert index.search_post(2, "anything") == []
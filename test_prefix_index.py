@@ -0,0 +1,67 @@
+"""
+Tests for the search-as-you-type prefix index.
+"""
+
+import random
+
+from src.prefix_index import PrefixIndex, RANGE_LIMIT, tokenize
+
+TITLES = [
+    "SIMD-0096: Reward full priority fee to validator",
+    "Validator rewards and inflation",
+    "Gouvernance du réseau",
+    "Priority fees explained",
+    "Stake delegation program",
+]
+CATEGORIES = ["SIMD", "Research", "Governance", "Research", "Governance"]
+VIEWS = [500, 900, 50, 300, None]
+
+
+def test_suggest_ranks_by_views():
+    index = PrefixIndex(TITLES, CATEGORIES, VIEWS)
+    assert index.suggest("valid") == [1, 0]
+    assert index.suggest("prio") == [0, 3]
+    assert index.suggest("prio fee") == [0, 3]
+    assert index.suggest("priority valid") == [0]
+    assert index.suggest("valid", limit=1) == [1]
+
+
+def test_suggest_matches_word_starts_categories_and_accents():
+    index = PrefixIndex(TITLES, CATEGORIES, VIEWS)
+    # Prefixes only match the start of a word
+    assert index.suggest("alidator") == []
+    # Category names and hyphenated parts are indexed too
+    assert index.suggest("research") == [1, 3]
+    assert index.suggest("0096") == [0]
+    assert index.suggest("simd-00") == [0]
+    assert index.suggest("gouv") == [2]
+    assert index.suggest("reseau") == [2]
+    assert index.suggest("") == []
+    assert index.suggest("prio", limit=0) == []
+
+
+def test_suggest_categories():
+    index = PrefixIndex(TITLES, CATEGORIES, VIEWS)
+    assert index.suggest_categories("g") == ["Governance"]
+    assert index.suggest_categories(" re") == ["Research"]
+    assert index.suggest_categories("x") == []
+    assert index.suggest_categories("") == []
+
+
+def test_suggest_matches_brute_force_over_long_ranges():
+    rng = random.Random(7)
+    words = ["validator", "value", "vote", "voting", "stake", "staking", "fee", "fees", "rent"]
+    titles = [" ".join(rng.sample(words, 3)) for _ in range(500)]
+    categories = [rng.choice(["Research", "RFP"]) for _ in titles]
+    views = [rng.randrange(1000) for _ in titles]
+    index = PrefixIndex(titles, categories, views)
+    assert index.ranked, "expected prefixes longer than RANGE_LIMIT to be precomputed"
+
+    by_views = sorted(range(len(titles)), key=lambda i: (-views[i], i))
+    for text in ["v", "va", "vot", "st", "fee", "r", "rf", "vo st", "val fe r", "zzz"]:
+        typed = tokenize(text, parts=False)
+        expected = [i for i in by_views
+                    if all(any(t.startswith(w) for t in tokenize(titles[i]) + tokenize(categories[i]))
+                           for w in typed)]
+        assert index.suggest(text, limit=10) == expected[:10], text
+    assert len(index._candidates("v")) > RANGE_LIMIT
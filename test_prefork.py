@@ -0,0 +1,98 @@
+"""
+Tests for the preforked multi-worker API server.
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+import requests
+
+from src.prefork import worker_pids
+from src.scripts.mock_completions import MockCompletionsServer
+from src.utils import process_memory
+
+pytestmark = pytest.mark.skipif(process_memory() is None, reason="needs Linux /proc")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_process_memory_and_worker_pids():
+    memory = process_memory()
+    assert 0 < memory['uss'] <= memory['rss'] and memory['pss'] <= memory['rss']
+
+    pid = os.fork()
+    if not pid:
+        time.sleep(5)
+        os._exit(0)
+    try:
+        assert pid in worker_pids(os.getpid())
+    finally:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+
+def wait_for_workers(launcher, count, timeout=60):
+    deadline = time.monotonic() + timeout
+    while len(worker_pids(launcher.pid)) < count and time.monotonic() < deadline:
+        time.sleep(0.2)
+
+
+def test_workers_share_the_socket_and_are_restarted():
+    port = free_port()
+    launcher = subprocess.Popen([sys.executable, "-m", "src.prefork", "--workers", "2", "--host", "127.0.0.1",
+                                 "--port", str(port)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_workers(launcher, 2)
+        workers = worker_pids(launcher.pid)
+        assert len(workers) == 2
+
+        response = requests.get(f"http://127.0.0.1:{port}/query", params={'type': 'stats'}, timeout=10)
+        assert response.json()['total_posts'] > 0
+
+        # A worker that dies is replaced
+        os.kill(workers[0], signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        while (len(worker_pids(launcher.pid)) < 2 or workers[0] in worker_pids(launcher.pid)) \
+                and time.monotonic() < deadline:
+            time.sleep(0.2)
+        assert len(worker_pids(launcher.pid)) == 2
+        assert requests.get(f"http://127.0.0.1:{port}/query", params={'type': 'latest'}, timeout=10).ok
+    finally:
+        launcher.terminate()
+        assert launcher.wait(timeout=10) == 0
+
+
+def test_jobs_and_sharded_search_work_from_every_worker():
+    port = free_port()
+    with MockCompletionsServer(latency=0.5) as mock:
+        environment = {**os.environ, 'OPENAI_API_KEY': "test-key", 'OPENAI_BASE_URL': mock.base_url,
+                       'EVALUATION_CACHE': "0", 'SEARCH_WORKERS': "2"}
+        launcher = subprocess.Popen([sys.executable, "-m", "src.prefork", "--workers", "2", "--host", "127.0.0.1",
+                                     "--port", str(port)], env=environment,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_workers(launcher, 2)
+            url = f"http://127.0.0.1:{port}"
+            # Every request opens a new connection, so both workers answer some
+            for _ in range(4):
+                search = requests.get(f"{url}/query", params={'type': 'search', 'q': 'validator rewards'}, timeout=30)
+                assert search.json()['count'] > 0
+
+            post_id = requests.get(f"{url}/query", params={'type': 'latest', 'limit': 1}, timeout=10).json()['posts'][0]['id']
+            job = requests.post(f"{url}/evaluate", json={'post_id': post_id}, timeout=10).json()
+            for _ in range(6):
+                assert requests.get(f"{url}/jobs/{job['job_id']}", timeout=10).status_code == 200
+            done = requests.get(f"{url}/jobs/{job['job_id']}", params={'wait': 30}, timeout=40).json()
+            assert done['status'] == 'done' and done['result']['post_id'] == post_id
+        finally:
+            launcher.terminate()
+            assert launcher.wait(timeout=10) == 0
@@ -0,0 +1,145 @@
+"""
+Tests for the compiled natural language query router.
+"""
+
+import pytest
+
+from src.query_router import MAX_LIMIT, QueryRouter
+
+CATEGORIES = ['Announcements', 'Governance', 'RFP', 'Releases', 'Research', 'SIMD', 'sRFC']
+
+
+@pytest.fixture(scope="module")
+def router():
+    return QueryRouter(CATEGORIES)
+
+
+def parse(router, text):
+    return router.parse(text.lower().strip())
+
+
+@pytest.mark.parametrize("text, intent, category", [
+    ("What are the latest posts in the Governance category?", 'latest_posts', 'Governance'),
+    ("What is the most viewed post on Solana?", 'most_viewed_posts', None),
+    ("Which posts have the most comments?", 'most_commented_posts', None),
+    ("Show me forum statistics", 'forum_statistics', None),
+    ("Tell me about Solana validators", 'semantic_search', None),
+    ("Give me all posts on Governance", 'category_posts', 'Governance'),
+])
+def test_baseline_example_queries(router, text, intent, category):
+    parsed = parse(router, text)
+    assert parsed.intent == intent
+    assert parsed.category == category
+
+
+def test_post_references_route_to_evaluation(router):
+    parsed = parse(router, "For this post id 123, give me its evaluation")
+    assert parsed.intent == 'evaluate' and parsed.post_id == 123
+    assert parse(router, "show me #77").post_id == 77
+
+
+@pytest.mark.parametrize("text", ["Give me details about post 3456", "post 99999", "show me #77"])
+def test_bare_post_references_are_not_evaluated(router, text):
+    # Evaluating calls the model, so only an explicit request evaluates
+    assert parse(router, text).intent == 'semantic_search'
+
+
+@pytest.mark.parametrize("text", ["related posts 3294", "similar posts 3294", "similar to post 3294",
+                                  "posts similar to topic 3294", "related topics #3294"])
+def test_related_posts_read_the_post_id(router, text):
+    parsed = parse(router, text)
+    assert (parsed.intent, parsed.post_id, parsed.limit) == ('related_posts', 3294, None)
+
+
+def test_limits_are_capped_and_zero_is_kept(router):
+    assert parse(router, "show me 5 related posts to 3294").limit == 5
+    assert parse(router, "top 5000 posts").limit == MAX_LIMIT
+    parsed = parse(router, "top 0 posts")
+    assert parsed.limit == 0 and parsed.limit_or(5) == 0
+    assert parse(router, "top posts").limit_or(5) == 5
+
+
+def test_explicit_zero_limit_returns_no_posts():
+    from src.mcp_server import SolanaForumMCPServer
+    server = SolanaForumMCPServer()
+    for text in ["top 0 posts", "latest posts limit 0"]:
+        assert server.query(text)['count'] == 0
+    assert server.query("latest posts")['count'] == 5
+    related = server.query(f"related posts {server.posts[0]['id']}")
+    assert related['query_type'] == 'related_posts' and related['count'] == 5
+
+
+def test_terms_limits_and_categories_combine(router):
+    parsed = parse(router, "Latest validator posts in Governance")
+    assert (parsed.intent, parsed.category, parsed.terms) == ('latest_posts', 'Governance', ('validator',))
+
+    parsed = parse(router, "latest 3 posts in SIMD")
+    assert (parsed.intent, parsed.category, parsed.limit) == ('latest_posts', 'SIMD', 3)
+    assert parse(router, "top 10 posts").limit == 10
+
+    # A category name followed by a number is a topic, not a filter
+    parsed = parse(router, "SIMD-0096 fees")
+    assert parsed.intent == 'semantic_search' and parsed.category is None
+    assert parsed.terms == ('simd-0096', 'fees')
+
+
+def test_date_windows(router):
+    parsed = parse(router, "Posts between 2024-01-01 and 2024-06-30")
+    assert (parsed.intent, parsed.start, parsed.end) == ('posts_between', '2024-01-01', '2024-06-30')
+
+    parsed = parse(router, "posts from the last 30 days")
+    assert parsed.intent == 'posts_between' and parsed.days == 30 and parsed.has_window
+
+    assert parse(router, "main themes in Research this quarter").days == 91
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("Who are the most active users this year?", 'top_authors'),
+    ("Posts by jacobcreech", 'author_posts'),
+    ("what did @alice say", 'author_posts'),
+    ("find duplicate posts", 'find_duplicates'),
+    ("posts related to post 42", 'related_posts'),
+    ("what are people saying in the comments about inflation", 'comment_search'),
+    ("main themes in Research this quarter", 'topics'),
+    ("highest scored posts in sRFC", 'top_scored_posts'),
+    ("monthly activity trends in Governance", 'forum_analytics'),
+    ("reply latency per week", 'reply_latency'),
+])
+def test_intents(router, text, intent):
+    assert parse(router, text).intent == intent
+
+
+def test_intent_details(router):
+    assert parse(router, "Posts by jacobcreech").author == 'jacobcreech'
+    assert parse(router, "what did @alice say").author == 'alice'
+    assert parse(router, "latest posts without duplicates").dedup
+    assert parse(router, "monthly activity trends in Governance").period == 'month'
+    assert parse(router, "reply latency per week").period == 'week'
+
+    # "related to" names a topic unless a post is referenced
+    parsed = parse(router, "posts related to staking")
+    assert parsed.intent == 'semantic_search' and parsed.terms == ('staking',)
+
+    parsed = parse(router, "what are people saying in the comments about inflation")
+    assert parsed.terms == ('inflation',)
+
+
+def test_parses_are_memoized(router):
+    before = router.cache_info().hits
+    parse(router, "Show me forum statistics")
+    parse(router, "Show me forum statistics")
+    assert router.cache_info().hits >= before + 1
+
+
+@pytest.mark.parametrize("text, metric", [
+    ("Who are the most active users this year?", 'posts'),
+    ("who posts the most", 'posts'),
+    ("top authors by views", 'views'),
+    ("top authors by comments", 'comments'),
+    ("top commenters in Governance", 'comments'),
+    ("who comments the most", 'comments'),
+])
+def test_author_leaderboard_metrics(router, text, metric):
+    parsed = parse(router, text)
+    assert parsed.intent == 'top_authors'
+    assert parsed.metric == metric
@@ -0,0 +1,37 @@
+"""
+Tests for the precomputed related-posts graph.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from src.related_posts import RelatedPostsGraph
+
+
+def brute_force(matrix, position, k):
+    similarities = (matrix @ matrix[position].T).toarray().ravel()
+    similarities[position] = 0
+    # Stable: ties keep position order
+    order = [i for i in np.argsort(-similarities, kind='stable') if similarities[i] > 0]
+    return order[:k]
+
+
+def test_neighbours_match_a_brute_force_ranking():
+    matrix = normalize(sp.random(300, 80, density=0.05, format='csr', dtype=np.float32, random_state=3))
+    # Duplicate rows tie exactly with each other
+    matrix = sp.vstack([matrix, matrix[:10]]).tocsr()
+    for block_size in (512, 7):
+        graph = RelatedPostsGraph.build(matrix, k=5, block_size=block_size)
+        for position in range(matrix.shape[0]):
+            assert [i for i, _ in graph.neighbours(position)] == brute_force(matrix, position, 5)
+    assert graph.neighbours(0, 2) == graph.neighbours(0)[:2]
+
+
+def test_graph_is_saved_and_loaded(tmp_path):
+    matrix = normalize(sp.random(50, 30, density=0.1, format='csr', dtype=np.float32, random_state=4))
+    texts = [str(i) for i in range(50)]
+    built = RelatedPostsGraph.load_or_build(matrix, texts, str(tmp_path), k=3)
+    assert len(list(tmp_path.glob("related_*.npz"))) == 1
+    loaded = RelatedPostsGraph.load_or_build(matrix, texts, str(tmp_path), k=3)
+    assert np.array_equal(built.indices, loaded.indices) and np.array_equal(built.indptr, loaded.indptr)
@@ -0,0 +1,79 @@
+"""
+Tests for multi-process sharded semantic search.
+"""
+
+import json
+import os
+import select
+import signal
+
+import numpy as np
+import pytest
+
+from src.sharded_search import ShardedSearch, top_k
+
+QUERIES = ["validator rewards", "priority fees", "stake delegation inflation", "governance vote", "nothingmatches"]
+
+
+@pytest.fixture(scope="module")
+def server():
+    from src.mcp_server import SolanaForumMCPServer
+    return SolanaForumMCPServer()
+
+
+@pytest.mark.parametrize("strategy", ['category', 'hash'])
+def test_sharded_top_k_matches_unsharded(server, strategy):
+    shards = ShardedSearch(server.tfidf_matrix, server.df['category_name'].to_numpy(), workers=2,
+                           strategy=strategy)
+    try:
+        for query in QUERIES:
+            similarities = server._similarities(query)
+            query_vector = server.vectorizer.transform([query])
+            for category in (None, 'sRFC', 'Governance'):
+                for k in (1, 5, 20):
+                    positions, scores = shards.search(query_vector, k, category)
+                    assert positions.tolist() == server._top_matches(similarities, k, category, False)
+                    assert np.allclose(scores, similarities[positions])
+        assert shards.search(server.vectorizer.transform(["validator"]), 5, 'Nope')[0].tolist() == []
+    finally:
+        shards.close()
+
+
+def test_forked_process_searches_with_its_own_pool(server):
+    shards = ShardedSearch(server.tfidf_matrix, server.df['category_name'].to_numpy(), workers=2)
+    query_vector = server.vectorizer.transform(["validator rewards"])
+    expected = shards.search(query_vector, 5)[0].tolist()
+    reader, writer = os.pipe()
+    pid = os.fork()
+    if not pid:
+        # Like a preforked server worker: the inherited pool is unusable here
+        os.close(reader)
+        try:
+            positions = shards.search(query_vector, 5)[0].tolist()
+            shards.close()
+            os.write(writer, json.dumps(positions).encode())
+        finally:
+            os._exit(0)
+    os.close(writer)
+    try:
+        ready, _, _ = select.select([reader], [], [], 60)
+        assert ready, "search in the forked process did not answer"
+        assert json.loads(os.read(reader, 65536)) == expected
+        # Closing in the child left the shards of this process intact
+        assert shards.search(query_vector, 5)[0].tolist() == expected
+    finally:
+        os.close(reader)
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        os.waitpid(pid, 0)
+        shards.close()
+
+
+def test_top_k_breaks_ties_by_position():
+    scores = np.array([0.5, 0.9, 0.5, 0.1, 0.5])
+    positions, selected = top_k(scores, np.arange(10, 15), 3)
+    assert positions.tolist() == [11, 10, 12]
+    assert selected.tolist() == [0.9, 0.5, 0.5]
+    assert top_k(scores, np.arange(5), 0)[0].tolist() == []
@@ -0,0 +1,85 @@
+"""
+Tests for single-flight coalescing of concurrent identical calls.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.single_flight import SingleFlight, coalesced
+
+
+class SlowService:
+    def __init__(self):
+        self.single_flight = SingleFlight()
+        self.runs = 0
+
+    @coalesced
+    def lookup(self, key, limit=5):
+        self.runs += 1
+        time.sleep(0.2)
+        return {'key': key, 'limit': limit}
+
+    @coalesced
+    def broken(self, key):
+        self.runs += 1
+        time.sleep(0.2)
+        raise ValueError(key)
+
+
+def test_concurrent_identical_calls_share_one_run():
+    service = SlowService()
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(lambda _: service.lookup("a"), range(10)))
+
+    assert service.runs == 1
+    assert all(result is results[0] for result in results)
+    stats = service.single_flight.stats()
+    assert stats['lookup'] == {'calls': 10, 'executed': 1, 'coalesced': 9}
+    assert stats['in_flight'] == 0
+
+
+def test_arguments_by_position_or_keyword_are_the_same_call():
+    service = SlowService()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        calls = [executor.submit(service.lookup, "a"), executor.submit(service.lookup, key="a"),
+                 executor.submit(service.lookup, "a", 5), executor.submit(service.lookup, "a", limit=6)]
+        [call.result() for call in calls]
+
+    # limit=6 differs; the other three coalesce
+    assert service.runs == 2
+
+
+def test_later_calls_run_again():
+    service = SlowService()
+    service.lookup("a")
+    service.lookup("a")
+    assert service.runs == 2
+
+
+def test_exceptions_are_shared():
+    service = SlowService()
+    barrier = threading.Barrier(3)
+
+    def call():
+        barrier.wait()
+        with pytest.raises(ValueError):
+            service.broken("a")
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.runs == 1
+    assert service.single_flight.stats()['broken']['coalesced'] == 2
+
+
+def test_unhashable_arguments_are_not_coalesced():
+    service = SlowService()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda _: service.lookup(["a"]), range(2)))
+    assert service.runs == 2
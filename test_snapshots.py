@@ -0,0 +1,59 @@
+"""
+Tests for versioned dataset snapshots and their diffs.
+"""
+
+import pytest
+
+from src.utils.snapshots import SnapshotStore
+
+
+def topic(topic_id, title, views=10, comments=1, description="Body"):
+    return {'id': topic_id, 'title': title, 'description': description,
+            'views': views, 'comment_count': comments}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore('forum', directory=str(tmp_path))
+
+
+def test_write_and_load_versions(store, tmp_path):
+    first = {'Governance': [topic(1, "Vote"), topic(2, "Quorum")], 'RFP': [topic(3, "Grant")]}
+    version = store.write(first)
+    assert store.load(version) == first
+    assert store.latest() == version
+    # Identical downloads record nothing new
+    assert store.write(first) == version
+    assert len(store.versions()) == 1
+
+    second = {'Governance': [topic(1, "Vote"), topic(2, "Quorum", views=20)], 'RFP': [topic(3, "Grant")]}
+    newer = store.write(second)
+    assert [entry['version'] for entry in store.versions()] == [version, newer]
+    assert store.load(version) == first and store.load(newer) == second
+    # Unchanged topics share their stored record
+    assert len(list((tmp_path / 'forum' / 'objects').rglob('*.json.gz'))) == 4
+
+
+def test_diff_reports_new_removed_and_changed_topics(store):
+    before = store.write({
+        'Governance': [topic(1, "Vote", views=100, comments=5), topic(2, "Quorum"), topic(4, "Same")],
+        'RFP': [topic(3, "Grant", views=50)],
+    })
+    after = store.write({
+        'Governance': [topic(1, "Vote", views=140, comments=7, description="Edited body"), topic(4, "Same")],
+        'RFP': [topic(3, "Grant", views=45), topic(5, "New grant")],
+    })
+
+    diff = store.diff(before)
+    assert (diff['since'], diff['until']) == (before, after)
+    assert diff['new_topics'] == [{'id': 5, 'category_name': 'RFP', 'title': "New grant"}]
+    assert diff['removed_topics'] == [{'id': 2, 'category_name': 'Governance', 'title': "Quorum"}]
+    assert diff['edited_topics'] == [{'id': 1, 'category_name': 'Governance', 'title': "Vote"}]
+    # Largest changes first
+    assert [(c['id'], c['before'], c['after'], c['delta']) for c in diff['view_changes']] == [
+        (1, 100, 140, 40), (3, 50, 45, -5)]
+    assert [(c['id'], c['delta']) for c in diff['comment_changes']] == [(1, 2)]
+
+    assert store.diff(after, after)['new_topics'] == []
+    with pytest.raises(KeyError):
+        store.diff('missing')
@@ -0,0 +1,71 @@
+"""
+Tests for query-aware search snippets.
+"""
+
+import pytest
+
+from src.snippets import SnippetIndex
+
+FILLER = ' '.join(f"word{i}" for i in range(60))
+
+DESCRIPTIONS = [
+    f"Intro text. {FILLER} The validator rewards are paid each epoch. {FILLER} Closing.",
+    "Short   note\nabout  fees.",
+    "",
+    "Nothing relevant here at all.",
+]
+COMMENTS = [
+    "A comment about rewards.",
+    "",
+    "Validator stake and validator rewards, discussed in the comments.",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SnippetIndex({'description': DESCRIPTIONS, 'comments': COMMENTS})
+
+
+def test_window_covers_the_most_query_terms(index):
+    snippet = index.snippet(0, "validator rewards epoch")
+    assert snippet['field'] == 'description'
+    # The window around the three terms wins over the comment matching one
+    assert "**validator** **rewards** are paid each **epoch**" in snippet['text']
+    assert snippet['text'].startswith('...') and snippet['text'].endswith('...')
+    # Four indexed words (stop words aside) lead into the first match
+    assert snippet['text'].startswith("...word56 word57 word58 word59 The **validator**")
+
+
+def test_matches_are_highlighted_case_insensitively(index):
+    snippet = index.snippet(2, "VALIDATOR Rewards")
+    assert snippet == {'field': 'comments',
+                       'text': "**Validator** stake and **validator** **rewards**, discussed in the comments"}
+    # Stop words are never matched
+    assert '**' not in index.snippet(3, "here at all the")['text']
+
+
+def test_text_is_truncated_to_the_window(index):
+    snippet = index.snippet(0, "nomatch", window=5)
+    assert snippet == {'field': 'description', 'text': "Intro text. word0 word1 word2..."}
+    assert index.snippet(0, "rewards", window=1)['text'] == "...word57 word58 word59 The validator **rewards**..."
+    # Whitespace is collapsed, and the text ends at the last indexed word
+    assert index.snippet(1, "fees")['text'] == "Short note about **fees**"
+
+
+def test_posts_without_text_have_no_snippet(index):
+    assert index.snippet(2, "nomatch")['field'] == 'comments'
+    empty = SnippetIndex({'description': [""], 'comments': [None]})
+    assert empty.snippet(0, "anything") is None
+
+
+def test_search_results_carry_snippets():
+    from src.mcp_server import SolanaForumMCPServer
+    server = SolanaForumMCPServer()
+    result = server.semantic_search("validator rewards", 5)
+    assert result['count'] == 5
+    for post in result['posts']:
+        assert post['snippet_field'] in ('description', 'comments')
+        assert post['snippet'] == server.snippet_index.snippet(
+            server.df.index[server.df['id'] == post['id']][0], "validator rewards")['text']
+    assert any('**' in post['snippet'] for post in result['posts'])
@@ -0,0 +1,108 @@
+"""
+Tests for the creation-time index and date-window queries.
+"""
+
+import numpy as np
+import pytest
+
+from src.time_index import (MISSING_TIMESTAMP, SECONDS_PER_DAY, TimeIndex, days_ago, format_timestamp,
+                            parse_time_bound, parse_timestamps)
+
+DAY = SECONDS_PER_DAY
+JAN_1 = 1704067200  # 2024-01-01T00:00:00Z
+
+
+@pytest.fixture
+def index():
+    values = [None, "not a date", "2024-01-01T00:00:00Z", "2024-01-01T12:00:00Z", "2024-01-02T00:00:00Z",
+              "2024-01-03T08:30:00+00:00", "2024-01-05T00:00:00Z"]
+    timestamps = parse_timestamps(values)
+    return TimeIndex(timestamps, ['A', 'B', 'A', 'B', 'A', 'B', 'A'])
+
+
+def test_parse_timestamps_marks_missing_values():
+    timestamps = parse_timestamps([None, "garbage", "2024-01-01T00:00:00Z", "2024-01-01T01:00:00+01:00"])
+    assert timestamps.tolist() == [MISSING_TIMESTAMP, MISSING_TIMESTAMP, JAN_1, JAN_1]
+
+
+def test_parse_time_bound():
+    assert parse_time_bound(None) is None and parse_time_bound('') is None
+    assert parse_time_bound("2024-01-01") == JAN_1
+    # A date-only end bound includes the whole day; a time does not
+    assert parse_time_bound("2024-01-01", is_end=True) == JAN_1 + DAY
+    assert parse_time_bound("2024-01-01T06:00:00", is_end=True) == JAN_1 + 6 * 3600
+    assert parse_time_bound(JAN_1) == JAN_1 and parse_time_bound(str(JAN_1)) == JAN_1
+    assert format_timestamp(JAN_1) == "2024-01-01T00:00:00+00:00"
+    assert days_ago(2, now=JAN_1) == JAN_1 - 2 * DAY
+    with pytest.raises(ValueError):
+        parse_time_bound("next tuesday")
+
+
+def test_window_bounds(index):
+    # Open windows skip the posts without a timestamp
+    assert index.window().tolist() == [2, 3, 4, 5, 6]
+    # The start is inclusive and the end exclusive
+    assert index.window(JAN_1 + 12 * 3600, JAN_1 + 2 * DAY).tolist() == [3, 4]
+    assert index.window(end=JAN_1).tolist() == []
+    assert index.window(end=parse_time_bound("2024-01-01", is_end=True)).tolist() == [2, 3]
+    assert index.window(JAN_1 + 10 * DAY).tolist() == []
+    assert index.window(MISSING_TIMESTAMP).tolist() == [2, 3, 4, 5, 6]
+
+
+def test_window_by_category(index):
+    assert index.window(category='A').tolist() == [2, 4, 6]
+    assert index.window(JAN_1 + 1, category='B').tolist() == [3, 5]
+    assert index.window(end=JAN_1 + 2 * DAY, category='A').tolist() == [2, 4]
+    assert index.window(category='missing').tolist() == []
+    assert index.latest(2, 'A').tolist() == [6, 4]
+    assert index.latest(0).tolist() == []
+
+
+@pytest.fixture(scope="module")
+def server():
+    from src.mcp_server import SolanaForumMCPServer
+    return SolanaForumMCPServer()
+
+
+def expected_ids(server, start=None, end=None, category=None):
+    """Ids of the dataset's posts in a window, newest first, by brute force."""
+    df = server.df
+    mask = df['created_ts'].to_numpy() != MISSING_TIMESTAMP
+    if start is not None:
+        mask &= df['created_ts'].to_numpy() >= start
+    if end is not None:
+        mask &= df['created_ts'].to_numpy() < end
+    if category:
+        mask &= (df['category_name'] == category).to_numpy()
+    return df['id'].to_numpy()[np.flatnonzero(mask)[::-1]].tolist()
+
+
+def test_posts_between_and_since(server):
+    result = server.posts_between("2024-01-01", "2024-06-30")
+    assert [post['id'] for post in result['posts']] == expected_ids(
+        server, parse_time_bound("2024-01-01"), parse_time_bound("2024-06-30", is_end=True))
+    assert result['end'] == "2024-07-01T00:00:00+00:00"
+
+    result = server.posts_between("2024-01-01", None, 'Governance', limit=3)
+    assert [post['id'] for post in result['posts']] == expected_ids(server, JAN_1, None, 'Governance')[:3]
+    assert 'error' in server.posts_between("not a date")
+
+    newest = int(server.df['created_ts'].max())
+    days = (days_ago(0) - newest) / DAY + 30
+    since = server.posts_since(days)
+    assert since['query_type'] == 'posts_since' and since['days'] == days
+    assert [post['id'] for post in since['posts']] == expected_ids(server, days_ago(days))
+
+
+def test_date_window_queries_route_to_the_index(server):
+    result = server.query("posts between 2024-01-01 and 2024-06-30 in Governance")
+    assert result['query_type'] == 'posts_between'
+    assert [post['id'] for post in result['posts']] == expected_ids(
+        server, JAN_1, parse_time_bound("2024-06-30", is_end=True), 'Governance')[:20]
+
+    result = server.query("posts since 2024-06-01 limit 50")
+    assert result['query_type'] == 'posts_between' and result['start'] == "2024-06-01T00:00:00+00:00"
+    assert [post['id'] for post in result['posts']] == expected_ids(server, parse_time_bound("2024-06-01"))[:50]
+
+    parsed = server.router.parse("posts from the last 30 days")
+    assert (parsed.intent, parsed.days) == ('posts_between', 30)
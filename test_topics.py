@@ -0,0 +1,117 @@
+"""
+Tests for topic clustering and theme queries.
+"""
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src import topics as topics_module
+from src.time_index import days_ago
+from src.topics import TopicModel, default_topic_count
+
+THEMES = {
+    'staking': "validator stake delegation rewards epoch staking yield",
+    'fees': "priority fee compute units transaction fees congestion",
+    'governance': "governance vote proposal quorum ballot voting",
+}
+
+
+def corpus():
+    """Twelve posts per theme, each using a rotating subset of the theme's words."""
+    texts, themes = [], []
+    for theme, words in THEMES.items():
+        words = words.split()
+        for i in range(12):
+            texts.append(' '.join(words[j % len(words)] for j in range(i, i + 4)))
+            themes.append(theme)
+    return texts, themes
+
+
+@pytest.fixture(scope="module")
+def built():
+    texts, themes = corpus()
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform(texts)
+    return texts, themes, matrix, vectorizer.get_feature_names_out()
+
+
+def test_clusters_follow_the_themes(built):
+    _, themes, matrix, names = built
+    model = TopicModel.build(matrix, names, n_topics=3, seed=0)
+    assert len(model.topics) == 3 and len(model.assignments) == len(themes)
+    for theme, words in THEMES.items():
+        labels = {int(model.assignments[i]) for i, t in enumerate(themes) if t == theme}
+        assert len(labels) == 1
+        assert set(model.topics[labels.pop()]['terms']) <= set(words.split())
+
+    # Topics are numbered by size and the build is deterministic
+    sizes = [topic['size'] for topic in model.topics]
+    assert sizes == sorted(sizes, reverse=True) and sum(sizes) == len(themes)
+    assert TopicModel.build(matrix, names, n_topics=3, seed=0).assignments.tolist() == model.assignments.tolist()
+    assert default_topic_count(8) == 2 and default_topic_count(10 ** 6) == topics_module.MAX_TOPICS
+
+
+def test_summarize_counts_topics_among_positions(built):
+    _, themes, matrix, names = built
+    model = TopicModel.build(matrix, names, n_topics=3, seed=0)
+    positions = np.array([0, 1, 2, 12, 24])
+    summary = model.summarize(positions)
+    assert [entry['count'] for entry in summary] == [3, 1, 1]
+    assert summary[0]['topic'] == model.assignments[0]
+    assert summary[0]['positions'].tolist() == [0, 1, 2]
+    assert model.summarize(np.array([], dtype=np.int64)) == []
+
+
+def test_saved_model_is_reused_and_rebuilt_when_stale(built, tmp_path, monkeypatch):
+    texts, _, matrix, names = built
+    model = TopicModel.load_or_build(matrix, names, texts, str(tmp_path), params=('a',))
+    assert len(list(tmp_path.glob('topics_*.json'))) == 1
+
+    def no_build(*args, **kwargs):
+        raise AssertionError("topics were rebuilt")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(TopicModel, 'build', no_build)
+        loaded = TopicModel.load_or_build(matrix, names, texts, str(tmp_path), params=('a',))
+    assert loaded.assignments.tolist() == model.assignments.tolist() and loaded.topics == model.topics
+
+    # Other settings or a changed layout version build a new file
+    TopicModel.load_or_build(matrix, names, texts, str(tmp_path), params=('b',))
+    monkeypatch.setattr(topics_module, 'TOPICS_VERSION', topics_module.TOPICS_VERSION + 1)
+    TopicModel.load_or_build(matrix, names, texts, str(tmp_path), params=('a',))
+    assert len(list(tmp_path.glob('topics_*.json'))) == 3
+
+
+@pytest.fixture(scope="module")
+def server():
+    from src.mcp_server import SolanaForumMCPServer
+    return SolanaForumMCPServer()
+
+
+def test_get_topics_filters_by_category_and_days(server):
+    everything = server.get_topics(limit=100)
+    assert everything['posts_considered'] == len(server.posts)
+    assert sum(topic['post_count'] for topic in everything['topics']) == len(server.posts)
+
+    governance = server.get_topics('Governance', limit=100)
+    expected = int((server.df['category_name'] == 'Governance').sum())
+    assert governance['posts_considered'] == expected
+    assert sum(topic['post_count'] for topic in governance['topics']) == expected
+    category_of = dict(zip(server.df['id'], server.df['category_name']))
+    assert all(category_of[post['id']] == 'Governance'
+               for topic in governance['topics'] for post in topic['top_posts'])
+
+    newest = int(server.df['created_ts'].max())
+    days = (days_ago(0) - newest) / 86400 + 365
+    recent = server.get_topics(period=days)
+    assert recent['posts_considered'] == len(server.time_index.window(days_ago(days)))
+    assert server.get_topics(limit=2)['count'] == 2
+    assert 'error' in server.get_topics(period='fortnight')
+
+
+def test_theme_queries_route_to_topics(server):
+    result = server.query("main themes in Governance")
+    assert result['query_type'] == 'topics' and result['category'] == 'Governance'
+    assert result == server.get_topics('Governance')
+    assert server.query("what are people talking about this year")['period'] == 365